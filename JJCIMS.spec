@@ -2,6 +2,21 @@
 
 # Collect extra data/modules needed at build time (e.g., tkinterdnd2 TKDND assets)
 from PyInstaller.utils.hooks import collect_data_files, collect_submodules
+import os
+import sys
+
+# Optional: pre-render resized assets (checkbox glyphs, logos, icon) into the
+# bundle so first launch skips decoding/resizing. Set JJCIMS_BUILD_ATLAS=0 to skip.
+atlas_datas = []
+if os.environ.get('JJCIMS_BUILD_ATLAS', '1') != '0':
+    try:
+        sys.path.insert(0, SPECPATH)
+        from backend.utils.image_manager import build_atlas, ATLAS_DIRNAME
+        atlas_dir = os.path.join(SPECPATH, 'build', ATLAS_DIRNAME)
+        build_atlas(atlas_dir)
+        atlas_datas = [(atlas_dir, ATLAS_DIRNAME)]
+    except Exception as e:
+        print(f'[Atlas] Skipping asset atlas: {e}')
 
 a = Analysis(
     ['main.py'],
@@ -48,7 +63,7 @@ a = Analysis(
         ('INSTALLATION_GUIDE.txt', '.'),
         ('INTEGRATION_GUIDE.txt', '.'),
         ('version_info.txt', '.'),
-    ] + collect_data_files('tkinterdnd2'),
+    ] + atlas_datas + collect_data_files('tkinterdnd2'),
     hiddenimports=[
         # Core dependencies
         'pyotp', 'qrcode', 'PIL', 'PIL.Image', 'PIL.ImageTk', 'cryptography', 'cryptography.fernet',
@@ -0,0 +1,188 @@
+"""Load script for the API's hot kiosk endpoints.
+
+    python load_test.py                      # in-process, SQLite stand-in
+    python load_test.py --url http://server:8000 --clients 100 --seconds 30
+
+Without --url a throwaway SQLite database is seeded with --items items and
+--employees employees, and the app is driven in-process through httpx's
+ASGI transport (startup/shutdown hooks included). That measures the app,
+the read cache and the database layer without network noise; against a real
+server (--url) the same report includes the network and the worker count.
+
+Each client loops over PATHS as fast as it can. The report lists latency
+percentiles per path and the total throughput and compares them with
+TARGETS; --check exits with status 1 when a target is missed.
+
+Targets for one API worker on one CPU core under a 50-kiosk burst (the
+in-process run shares that core with the simulated clients, so a real
+server does better):
+
+    total throughput             >= 600 req/s
+    /items/employee-dashboard    p95 <= 100 ms
+    /items/by-type/{type}        p95 <= 100 ms
+    /items/{name}/unit-of-measure p95 <= 150 ms
+    /changes?since=-1            p95 <= 150 ms
+
+The dashboard and by-type lists are served from the read cache (already
+gzip-compressed) after the first request, so their numbers should not move
+with item count.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+import httpx
+
+TYPES = ("CONSUMABLES", "TOOLS", "SPARE PARTS", "OFFICE")
+
+# p95 latency in ms per path, plus total requests per second
+TARGETS = {
+    "/items/employee-dashboard": 100,
+    "/items/by-type/{type}": 100,
+    "/items/{name}/unit-of-measure": 150,
+    "/changes?since=-1": 150,
+}
+TARGET_RPS = 600
+PATHS = tuple(TARGETS)
+
+
+def seed_stand_in(path, items, employees):
+    """Point the API at a new SQLite file and fill it; returns the app."""
+    os.environ["JJCIMS_DATABASE_URL"] = f"sqlite:///{path}"
+    os.environ.setdefault("JJCIMS_API_WARMUP", "1")
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import main
+
+    main.Base.metadata.create_all(bind=main.engine)
+    db = main.SessionLocal()
+    try:
+        db.add_all(
+            main.ItemDB(
+                NAME=f"Item {i:05d}",
+                BRAND=f"Brand {i % 40}",
+                TYPE=TYPES[i % len(TYPES)],
+                LOCATION=f"Rack {i % 25}",
+                UNIT_OF_MEASURE="pcs",
+                STATUS="In Stock",
+                BALANCE=i % 90,
+                IN=100,
+                OUT=i % 10,
+                Supplier=f"Supplier {i % 15}",
+                PO_no=f"PO-{i:06d}",
+            )
+            for i in range(items)
+        )
+        db.add_all(
+            main.EmployeeList(Username=f"user{i}", Password="x", Access_Level=1 + i % 3)
+            for i in range(employees)
+        )
+        db.commit()
+    finally:
+        db.close()
+    return main.app
+
+
+def concrete_path(template, items):
+    if "{type}" in template:
+        return template.replace("{type}", random.choice(TYPES))
+    if "{name}" in template:
+        return template.replace("{name}", f"Item {random.randrange(items):05d}")
+    return template
+
+
+async def client_loop(client, deadline, items, results):
+    while time.perf_counter() < deadline:
+        for template in PATHS:
+            started = time.perf_counter()
+            try:
+                response = await client.get(concrete_path(template, items))
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            results.setdefault(template, []).append((time.perf_counter() - started, ok))
+            # In-process requests served from cache never suspend; yield like
+            # a socket read would so the other clients and the server run
+            await asyncio.sleep(0)
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def report(results, seconds):
+    print(f"{'path':32} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}  target")
+    missed = []
+    total = 0
+    for template in PATHS:
+        samples = results.get(template, [])
+        total += len(samples)
+        latencies = [s for s, _ in samples]
+        errors = sum(1 for _, ok in samples if not ok)
+        p95 = percentile(latencies, 0.95) * 1000
+        met = p95 <= TARGETS[template] and not errors
+        if not met:
+            missed.append(template)
+        print(
+            f"{template:32} {percentile(latencies, 0.5) * 1000:8.1f} {p95:8.1f} "
+            f"{percentile(latencies, 0.99) * 1000:8.1f} {errors:7d}  "
+            f"{'ok' if met else 'MISSED'} (p95 <= {TARGETS[template]} ms)"
+        )
+    rps = total / seconds
+    if rps < TARGET_RPS:
+        missed.append("throughput")
+    print(f"{'total':32} {rps:8.0f} req/s  {'ok' if rps >= TARGET_RPS else 'MISSED'} (>= {TARGET_RPS})")
+    return missed
+
+
+async def run(args):
+    results = {}
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=30)
+        lifespan = None
+    else:
+        folder = tempfile.mkdtemp(prefix="jjcims-load-")
+        app = seed_stand_in(os.path.join(folder, "standin.db"), args.items, args.employees)
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://stand-in", timeout=30
+        )
+        lifespan = app.router.lifespan_context(app)
+        await lifespan.__aenter__()
+    try:
+        async with client:
+            deadline = time.perf_counter() + args.seconds
+            started = time.perf_counter()
+            await asyncio.gather(
+                *(client_loop(client, deadline, args.items, results) for _ in range(args.clients))
+            )
+            elapsed = time.perf_counter() - started
+    finally:
+        if lifespan is not None:
+            await lifespan.__aexit__(None, None, None)
+    print(f"{args.clients} clients, {elapsed:.1f} s, target {args.url or 'in-process stand-in'}")
+    return report(results, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load the JJCIMS API's kiosk endpoints")
+    parser.add_argument("--url", help="running API to load (default: in-process SQLite stand-in)")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--employees", type=int, default=200)
+    parser.add_argument("--check", action="store_true", help="exit 1 when a target is missed")
+    args = parser.parse_args()
+    missed = asyncio.run(run(args))
+    if args.check and missed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
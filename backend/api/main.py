@@ -1,14 +1,34 @@
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, Header, HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import create_engine, Column, Integer, String, Text, func
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import case, create_engine, inspect, or_, select, text, update, Column, Date, Float, Index, Integer, String, Text, DateTime, func
+from sqlalchemy.dialects.mysql import insert as mysql_insert, match
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import List, Optional
-from datetime import datetime
+from datetime import date, datetime, timedelta
+import asyncio
+import gzip
+import hashlib
+import json
+import threading
 import os
+import time
 from dotenv import load_dotenv
 
+import telemetry
+from telemetry import note_rows
+
+try:  # optional: several times faster JSON encoding of cached bodies
+    import orjson
+except ImportError:
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
@@ -19,11 +39,80 @@ MYSQL_HOST = os.getenv("MYSQL_HOST", "localhost")
 MYSQL_PORT = os.getenv("MYSQL_PORT", "3306")
 MYSQL_DATABASE = os.getenv("MYSQL_DATABASE", "jjcims_db")
 
-# SQLAlchemy setup
-DATABASE_URL = f"mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DATABASE}"
+# SQLAlchemy setup; JJCIMS_DATABASE_URL overrides the MySQL URL (e.g. a
+# sqlite:/// stand-in for load_test.py)
+DATABASE_URL = os.getenv(
+    "JJCIMS_DATABASE_URL",
+    f"mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DATABASE}",
+)
+# Async driver URL for the hot read endpoints (mysql+aiomysql://..., or
+# "off"); derived from DATABASE_URL when the driver is installed
+ASYNC_DATABASE_URL = os.getenv("JJCIMS_ASYNC_DATABASE_URL")
+
+# Connection pool, per worker process. pool_size + max_overflow bounds the
+# connections one worker opens; recycle stays under MySQL's wait_timeout and
+# pre_ping replaces connections the server dropped.
+DB_POOL_SIZE = int(os.getenv("JJCIMS_DB_POOL_SIZE", "10"))
+IDEMPOTENCY_KEEP_DAYS = int(os.getenv("JJCIMS_IDEMPOTENCY_KEEP_DAYS", "2"))
+DB_MAX_OVERFLOW = int(os.getenv("JJCIMS_DB_MAX_OVERFLOW", "20"))
+DB_POOL_RECYCLE = int(os.getenv("JJCIMS_DB_POOL_RECYCLE", "1800"))
+DB_POOL_TIMEOUT = float(os.getenv("JJCIMS_DB_POOL_TIMEOUT", "30"))
+DB_POOL_PRE_PING = os.getenv("JJCIMS_DB_POOL_PRE_PING", "1").lower() in ("1", "true", "yes")
+
+
+def _engine_options(url):
+    if url.startswith("sqlite"):
+        return {"connect_args": {"check_same_thread": False}}
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+def _async_url(url):
+    """Async driver URL for url, or None when no async driver is available."""
+    if ASYNC_DATABASE_URL:
+        return None if ASYNC_DATABASE_URL.lower() == "off" else ASYNC_DATABASE_URL
+    drivers = {"mysql+pymysql": ("mysql+aiomysql", "aiomysql"), "sqlite": ("sqlite+aiosqlite", "aiosqlite")}
+    scheme, _, rest = url.partition("://")
+    if scheme not in drivers:
+        return None
+    async_scheme, module = drivers[scheme]
+    try:
+        __import__(module)
+        __import__("greenlet")
+    except ImportError:
+        return None
+    return f"{async_scheme}://{rest}"
+
 
-engine = create_engine(DATABASE_URL)
+engine = create_engine(
+    DATABASE_URL,
+    # In-memory SQLite needs its single-connection pool
+    **({} if ":memory:" in DATABASE_URL else {"poolclass": telemetry.TimedQueuePool}),
+    **_engine_options(DATABASE_URL),
+)
+telemetry.instrument_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+async_engine = None
+AsyncSessionLocal = None
+if _async_url(DATABASE_URL):
+    try:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        async_engine = create_async_engine(
+            _async_url(DATABASE_URL),
+            **({} if ":memory:" in DATABASE_URL else {"poolclass": telemetry.TimedAsyncAdaptedQueuePool}),
+            **_engine_options(DATABASE_URL),
+        )
+        AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+        telemetry.instrument_engine(async_engine.sync_engine)
+    except Exception as e:
+        print(f"[API] Async engine unavailable, hot reads use the thread pool: {e}")
 Base = declarative_base()
 
 # Database models
@@ -42,6 +131,21 @@ class ItemDB(Base):
     OUT = Column(Integer)
     Supplier = Column(String(255))
     PO_no = Column(String(255))
+    # Bumped by every write; PUT /items/{id} compares it for optimistic concurrency
+    ROW_VERSION = Column(Integer, nullable=False, default=1, server_default="1")
+
+    __table_args__ = (
+        # Type/status filters and the kiosk's "not Out of Stock" listing
+        Index("ix_itemsdb_type_status", "TYPE", "STATUS"),
+        Index("ix_itemsdb_status", "STATUS"),
+        # /items/search; the ngram parser makes partial words (>= 2 chars) match
+        Index(
+            "ft_itemsdb_search",
+            "NAME", "BRAND", "TYPE", "LOCATION", "Supplier",
+            mysql_prefix="FULLTEXT",
+            mysql_with_parser="ngram",
+        ),
+    )
 
 class EmployeeLog(Base):
     __tablename__ = "emp_logs"
@@ -52,6 +156,8 @@ class EmployeeLog(Base):
     NAME = Column(String(255))
     DETAILS = Column(Text)
 
+    __table_args__ = (Index("ix_emp_logs_date_time", "DATE", "TIME"),)
+
 class AdminLog(Base):
     __tablename__ = "adm_logs"
     
@@ -61,6 +167,8 @@ class AdminLog(Base):
     USER = Column(String(255))
     DETAILS = Column(Text)
 
+    __table_args__ = (Index("ix_adm_logs_date_time", "DATE", "TIME"),)
+
 class EmployeeList(Base):
     __tablename__ = "emp_list"
     
@@ -70,6 +178,48 @@ class EmployeeList(Base):
     Access_Level = Column(Integer)
     TFA_Secret = Column(String(255))
 
+class StockMovement(Base):
+    """One stock movement (checkout or restock) written alongside its log line."""
+    __tablename__ = "stock_movements"
+
+    ID = Column(Integer, primary_key=True, autoincrement=True)
+    MOVE_KEY = Column(String(36), unique=True)  # client-generated, makes replays idempotent
+    ITEM_ID = Column(Integer)
+    ITEM_NAME = Column(String(255))
+    QTY = Column(Float)
+    DIRECTION = Column(String(3))  # OUT or IN
+    USER = Column(String(255))
+    MOVED_AT = Column(DateTime)
+
+    __table_args__ = (Index("ix_stock_movements_item_time", "ITEM_ID", "MOVED_AT"),)
+
+class StockDaily(Base):
+    """Per-item, per-day totals kept current as movements are inserted."""
+    __tablename__ = "stock_daily"
+
+    ITEM_ID = Column(Integer, primary_key=True)
+    DAY = Column(Date, primary_key=True, index=True)
+    QTY_OUT = Column(Float, default=0)
+    QTY_IN = Column(Float, default=0)
+    MOVES = Column(Integer, default=0)
+
+class AppliedRequest(Base):
+    """Idempotency-Key of a non-idempotent write, stored in the write's transaction."""
+    __tablename__ = "applied_requests"
+
+    KEY = Column(String(64), primary_key=True)
+    APPLIED_AT = Column(DateTime, index=True)
+
+class ChangeLog(Base):
+    """One row per write; the autoincrement id is the global change version."""
+    __tablename__ = "change_log"
+
+    version = Column(Integer, primary_key=True, autoincrement=True)
+    table_name = Column(String(50), index=True)
+    op = Column(String(10))  # upsert, delete or clear
+    row_id = Column(Integer, nullable=True)
+    changed_at = Column(DateTime, default=datetime.utcnow)
+
 # Pydantic models for API
 class ItemBase(BaseModel):
     NAME: str
@@ -87,11 +237,30 @@ class ItemBase(BaseModel):
 class ItemCreate(ItemBase):
     pass
 
+class ItemUpdate(BaseModel):
+    """Partial item update; only the fields sent are written.
+
+    ROW_VERSION makes the update conditional: it is rejected with 409 if
+    the row changed since the client read it.
+    """
+    NAME: Optional[str] = None
+    BRAND: Optional[str] = None
+    TYPE: Optional[str] = None
+    LOCATION: Optional[str] = None
+    UNIT_OF_MEASURE: Optional[str] = None
+    STATUS: Optional[str] = None
+    BALANCE: Optional[int] = None
+    IN: Optional[int] = None
+    OUT: Optional[int] = None
+    Supplier: Optional[str] = None
+    PO_no: Optional[str] = None
+    ROW_VERSION: Optional[int] = None
+
 class Item(ItemBase):
     ID: int
+    ROW_VERSION: int = 1
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class EmployeeLogBase(BaseModel):
     DATE: str
@@ -105,8 +274,7 @@ class EmployeeLogCreate(EmployeeLogBase):
 class EmployeeLogOut(EmployeeLogBase):
     id: int
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class AdminLogBase(BaseModel):
     DATE: str
@@ -120,8 +288,15 @@ class AdminLogCreate(AdminLogBase):
 class AdminLogOut(AdminLogBase):
     id: int
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+class StockMovementIn(BaseModel):
+    MOVE_KEY: str
+    ITEM_NAME: str
+    QTY: float
+    DIRECTION: str = "OUT"
+    USER: Optional[str] = None
+    MOVED_AT: datetime
 
 class EmployeeBase(BaseModel):
     Username: str
@@ -132,11 +307,17 @@ class EmployeeBase(BaseModel):
 class EmployeeCreate(EmployeeBase):
     pass
 
+class EmployeeBulkUpdate(BaseModel):
+    usernames: List[str]
+    fields: dict
+
+class EmployeeBulkDelete(BaseModel):
+    usernames: List[str]
+
 class Employee(EmployeeBase):
     id: int
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Database dependency
 def get_db():
@@ -146,9 +327,570 @@ def get_db():
     finally:
         db.close()
 
+# Change feed
+CHANGE_TABLES = ("ITEMSDB", "emp_logs", "adm_logs", "emp_list")
+CHANGE_MAX_WAIT = float(os.getenv("JJCIMS_CHANGES_MAX_WAIT", "30"))
+CHANGE_POLL_INTERVAL = float(os.getenv("JJCIMS_CHANGES_POLL", "1.0"))
+CHANGE_BATCH_LIMIT = int(os.getenv("JJCIMS_CHANGES_LIMIT", "500"))
+
+
+class ChangeNotifier:
+    """Wakes long-polling /changes requests when this worker commits a write.
+
+    Writes from other workers are picked up by the periodic re-check in
+    wait_for_changes, so the notifier is only a latency shortcut.
+    """
+
+    def __init__(self):
+        self.loop = None
+        self.event = None
+
+    def bind(self, loop):
+        self.loop = loop
+        self.event = asyncio.Event()
+
+    def notify(self):
+        if self.loop is None:
+            return
+        try:
+            self.loop.call_soon_threadsafe(self._wake)
+        except RuntimeError:
+            pass  # loop already closed during shutdown
+
+    def _wake(self):
+        # Swap in a fresh event so waiters that re-arm do not spin
+        event, self.event = self.event, asyncio.Event()
+        event.set()
+
+    async def wait(self, timeout):
+        if self.event is None:
+            await asyncio.sleep(timeout)
+            return
+        try:
+            await asyncio.wait_for(self.event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+change_notifier = ChangeNotifier()
+
+
+def record_change(db: Session, table: str, op: str, row_id: Optional[int] = None):
+    """Add a change_log row to the caller's transaction."""
+    db.add(ChangeLog(table_name=table, op=op, row_id=row_id))
+    db.info.setdefault("changed_tables", set()).add(table)
+
+
+def commit_changes(db: Session):
+    """Commit the session, drop cached reads of the changed tables and wake /changes waiters."""
+    db.commit()
+    read_cache.invalidate(db.info.pop("changed_tables", ()))
+    change_notifier.notify()
+
+
+# Responses smaller than this are not worth compressing (GZipMiddleware too)
+GZIP_MIN_BYTES = 1024
+GZIP_LEVEL = 6
+
+# Read cache
+READ_CACHE_ENTRIES = int(os.getenv("JJCIMS_READ_CACHE_ENTRIES", "512"))
+# How long a table version read from change_log is trusted before re-checking;
+# bounds staleness for writes made by *other* workers (own writes invalidate at once)
+READ_CACHE_VERSION_TTL = float(os.getenv("JJCIMS_READ_CACHE_TTL", "1.0"))
+
+
+class ReadCache:
+    """Serialized JSON responses keyed by endpoint and params.
+
+    Each entry remembers the table version it was built from; the version is
+    the table's latest change_log id, so a write by any worker makes the
+    entry stale. ETags are derived from the same version, which lets
+    If-None-Match requests be answered with 304 before any data query.
+    Large bodies are also kept gzip-compressed, so they are compressed once
+    per version instead of once per response.
+    """
+
+    def __init__(self, max_entries=READ_CACHE_ENTRIES, version_ttl=READ_CACHE_VERSION_TTL):
+        self.max_entries = max_entries
+        self.version_ttl = version_ttl
+        self._entries = {}  # key -> (version, etag, body, gzipped body or None, rows)
+        self._versions = {}  # table -> (version, checked_at)
+        self._generation = 0  # bumped by invalidate()
+        self._lock = threading.Lock()
+
+    def fresh_version(self, table: str) -> Optional[int]:
+        """The table version if it was checked within version_ttl, else None."""
+        with self._lock:
+            known = self._versions.get(table)
+        if known and time.monotonic() - known[1] < self.version_ttl:
+            return known[0]
+        return None
+
+    def version_age(self, table: str) -> Optional[float]:
+        """Seconds since table's version was checked (None if unknown)."""
+        with self._lock:
+            known = self._versions.get(table)
+        return time.monotonic() - known[1] if known else None
+
+    def refresh_versions(self, db: Session):
+        """Re-check every table's version with one grouped query."""
+        with self._lock:
+            generation = self._generation
+        now = time.monotonic()
+        versions = dict(
+            db.query(ChangeLog.table_name, func.max(ChangeLog.version))
+            .group_by(ChangeLog.table_name)
+            .all()
+        )
+        with self._lock:
+            # A write invalidated meanwhile; these versions may predate it
+            if generation != self._generation:
+                return
+            for table in CHANGE_TABLES:
+                self._versions[table] = (versions.get(table) or 0, now)
+
+    def table_version(self, db: Session, table: str) -> int:
+        version = self.fresh_version(table)
+        if version is not None:
+            return version
+        now = time.monotonic()
+        version = (
+            db.query(func.max(ChangeLog.version))
+            .filter(ChangeLog.table_name == table)
+            .scalar()
+            or 0
+        )
+        with self._lock:
+            self._versions[table] = (version, now)
+        return version
+
+    def invalidate(self, tables):
+        """Forget the cached versions of tables so the next read re-checks."""
+        with self._lock:
+            self._generation += 1
+            for table in tables:
+                self._versions.pop(table, None)
+
+    @staticmethod
+    def etag(key, version):
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:12]
+        return f'W/"{version}-{digest}"'
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and entry[0] == version:
+            return entry
+        return None
+
+    def put(self, key, version, etag, body, rows=None):
+        gzipped = gzip.compress(body, GZIP_LEVEL) if len(body) >= GZIP_MIN_BYTES else None
+        entry = (version, etag, body, gzipped, rows)
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.max_entries:
+                # Drop the oldest entry (dicts keep insertion order)
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = entry
+        return entry
+
+
+read_cache = ReadCache()
+
+
+def row_count(data):
+    return len(data) if isinstance(data, list) else 1
+
+
+def dumps_json(data) -> bytes:
+    """Compact JSON bytes; orjson when installed, jsonable_encoder otherwise."""
+    if orjson is not None:
+        return orjson.dumps(data, default=jsonable_encoder)
+    return json.dumps(jsonable_encoder(data), separators=(",", ":")).encode("utf-8")
+
+
+def cached_response(request: Request, entry):
+    """Response for a read cache entry, pre-compressed if the client accepts gzip."""
+    if entry[4] is not None:
+        note_rows(entry[4])
+    headers = {"ETag": entry[1], "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if entry[3] is not None and "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=entry[3], media_type="application/json", headers=headers)
+    return Response(content=entry[2], media_type="application/json", headers=headers)
+
+
+def cached_json(request: Request, db: Session, table: str, key, loader):
+    """Serve loader()'s JSON through the read cache with ETag/304 support.
+
+    loader is only called when the cached body is missing or stale; it may
+    raise HTTPException (e.g. 404), which is not cached.
+    """
+    version = read_cache.table_version(db, table)
+    etag = ReadCache.etag(key, version)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    entry = read_cache.get(key, version)
+    if entry is None:
+        data = loader()
+        entry = read_cache.put(key, version, etag, dumps_json(data), row_count(data))
+    return cached_response(request, entry)
+
+
+async def run_read(fn):
+    """Run fn(session) for a read-only query without blocking the event loop.
+
+    Uses the async engine when an async driver is installed (fn runs on a
+    sync facade over the async connection), otherwise a pooled session in
+    the thread pool.
+    """
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            return await db.run_sync(fn)
+
+    def call():
+        db = SessionLocal()
+        try:
+            return fn(db)
+        finally:
+            db.close()
+
+    return await run_in_threadpool(call)
+
+
+# Admission control for the hot reads: at most ADMIT_CONCURRENCY database
+# loads per endpoint at once, up to ADMIT_QUEUE more waiting (each for at
+# most ADMIT_WAIT seconds); beyond that the request gets 503 + Retry-After.
+ADMIT_CONCURRENCY = int(os.getenv("JJCIMS_ADMIT_CONCURRENCY", "4"))
+ADMIT_QUEUE = int(os.getenv("JJCIMS_ADMIT_QUEUE", "200"))
+ADMIT_WAIT = float(os.getenv("JJCIMS_ADMIT_WAIT", "10"))
+
+
+class SingleFlight:
+    """Concurrent calls with the same key share one in-flight computation.
+
+    The computation runs as its own task, so a caller that disconnects does
+    not cancel it for the others; its result or exception goes to everyone.
+    """
+
+    def __init__(self):
+        self._tasks = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def do(self, key, factory):
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _t: self._tasks.pop(key, None))
+            self.started += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def __contains__(self, key):
+        return key in self._tasks
+
+    @property
+    def in_flight(self):
+        return len(self._tasks)
+
+
+class AdmissionGate:
+    """Bounded concurrency with a bounded wait queue for one endpoint."""
+
+    def __init__(self, name, limit=ADMIT_CONCURRENCY, max_queue=ADMIT_QUEUE, wait=ADMIT_WAIT):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.wait = wait
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._semaphore = None
+        self._loop = None
+
+    def _get_semaphore(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:  # one per event loop (tests start several)
+            self._loop, self._semaphore = loop, asyncio.Semaphore(self.limit)
+        return self._semaphore
+
+    def _reject(self, reason):
+        self.rejected += 1
+        raise HTTPException(
+            status_code=503,
+            detail=f"{self.name} is busy ({reason}), retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
+    async def __aenter__(self):
+        semaphore = self._get_semaphore()
+        if self.waiting >= self.max_queue:
+            self._reject("queue full")
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(semaphore.acquire(), self.wait)
+        except asyncio.TimeoutError:
+            self._reject("queue wait timed out")
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        self.admitted += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.active -= 1
+        self._semaphore.release()
+        return False
+
+    def stats(self):
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "queued": self.waiting,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+read_flights = SingleFlight()
+admission_gates = {
+    name: AdmissionGate(name) for name in ("employee-dashboard", "by-type", "unit-of-measure")
+}
+
+
+async def _build_entry(key, version, etag, loader, gate):
+    if gate is None:
+        data = await run_read(loader)
+    else:
+        async with gate:
+            data = await run_read(loader)
+    return read_cache.put(key, version, etag, dumps_json(data), row_count(data))
+
+
+async def _refresh_versions():
+    await read_flights.do(("versions",), lambda: run_read(read_cache.refresh_versions))
+
+
+async def _refresh_versions_quietly():
+    try:
+        await _refresh_versions()
+    except Exception as e:
+        print(f"[API] Background version check failed: {e}")
+
+
+async def current_version(table: str) -> int:
+    """read_cache.table_version for async code.
+
+    All tables are re-checked by one shared query. Past half the TTL the
+    re-check starts in the background, so requests do not stall on it each
+    time the TTL runs out.
+    """
+    version = read_cache.fresh_version(table)
+    if version is None:
+        await _refresh_versions()
+        version = read_cache.fresh_version(table)
+        if version is None:  # invalidated by a write during the refresh
+            version = await run_read(lambda db: read_cache.table_version(db, table))
+    elif read_cache.version_age(table) > read_cache.version_ttl / 2:
+        if ("versions",) not in read_flights:
+            asyncio.ensure_future(_refresh_versions_quietly())
+    return version
+
+
+async def cached_json_async(request: Request, table: str, key, loader, gate=None):
+    """cached_json for async endpoints; loader(db) runs through run_read.
+
+    A cached body whose table version is still fresh is served without
+    touching the database at all. Concurrent misses for the same key (and
+    concurrent version re-checks for the same table) share one query, and
+    the query itself waits its turn at gate (an AdmissionGate) if given.
+    """
+    version = await current_version(table)
+    etag = ReadCache.etag(key, version)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    entry = read_cache.get(key, version)
+    if entry is None:
+        entry = await read_flights.do(
+            (key, version), lambda: _build_entry(key, version, etag, loader, gate)
+        )
+    return cached_response(request, entry)
+
+
+def _change_row(db: Session, table: str, row_id: int):
+    """Current state of a changed row, shaped like the matching list endpoint."""
+    if table == "ITEMSDB":
+        row = db.query(ItemDB).filter(ItemDB.ID == row_id).first()
+        return Item.model_validate(row, from_attributes=True).model_dump() if row else None
+    if table == "emp_logs":
+        row = db.query(EmployeeLog).filter(EmployeeLog.id == row_id).first()
+        return EmployeeLogOut.model_validate(row, from_attributes=True).model_dump() if row else None
+    if table == "adm_logs":
+        row = db.query(AdminLog).filter(AdminLog.id == row_id).first()
+        return AdminLogOut.model_validate(row, from_attributes=True).model_dump() if row else None
+    if table == "emp_list":
+        # Credentials are never pushed; clients fetch them on demand
+        row = db.query(EmployeeList).filter(EmployeeList.id == row_id).first()
+        if row is None:
+            return None
+        return {"id": row.id, "Username": row.Username, "Access_Level": row.Access_Level}
+    return None
+
+
+def collect_changes(db: Session, since: int, tables=None, limit: int = CHANGE_BATCH_LIMIT):
+    """Return the change batch after version since.
+
+    Changes are compacted to the latest operation per (table, id); a table
+    clear supersedes everything before it. When more than limit changes are
+    pending the batch is flagged reset and clients reload that data fully.
+    """
+    tables = [t for t in (tables or CHANGE_TABLES) if t in CHANGE_TABLES]
+    versions = dict(
+        db.query(ChangeLog.table_name, func.max(ChangeLog.version))
+        .group_by(ChangeLog.table_name)
+        .all()
+    )
+    current = max(versions.values(), default=0)
+    batch = {
+        "version": current,
+        "tables": {t: versions.get(t, 0) for t in tables},
+        "reset": False,
+        "changes": [],
+    }
+    if since < 0 or current <= since:
+        # since=-1 only asks for the current version
+        return batch
+
+    entries = (
+        db.query(ChangeLog)
+        .filter(ChangeLog.version > since, ChangeLog.table_name.in_(tables))
+        .order_by(ChangeLog.version)
+        .limit(limit + 1)
+        .all()
+    )
+    if len(entries) > limit:
+        batch["reset"] = True
+        return batch
+
+    latest = {}
+    for entry in entries:
+        if entry.op == "clear":
+            latest = {k: v for k, v in latest.items() if k[0] != entry.table_name}
+        latest[(entry.table_name, entry.row_id)] = entry
+    for (table, row_id), entry in sorted(latest.items(), key=lambda kv: kv[1].version):
+        change = {"version": entry.version, "table": table, "op": entry.op, "id": row_id}
+        if entry.op == "upsert":
+            change["row"] = _change_row(db, table, row_id)
+            if change["row"] is None:
+                change["op"] = "delete"  # deleted after this change was recorded
+        batch["changes"].append(change)
+    return batch
+
+
+def _collect_changes_once(since: int, tables):
+    db = SessionLocal()
+    try:
+        return collect_changes(db, since, tables)
+    finally:
+        db.close()
+
+
 # Create FastAPI app
 app = FastAPI(title="JJCIMS API")
 
+# Serving profile (see serve()); JJCIMS_API_WORKERS processes each hold
+# their own pool of JJCIMS_DB_POOL_SIZE (+ overflow) connections
+API_HOST = os.getenv("JJCIMS_API_HOST", "0.0.0.0")
+API_PORT = int(os.getenv("JJCIMS_API_PORT", "8000"))
+API_WORKERS = int(os.getenv("JJCIMS_API_WORKERS", "1"))
+API_APP = os.getenv("JJCIMS_API_APP", "main:app")
+API_GRACEFUL_SECONDS = int(os.getenv("JJCIMS_API_GRACEFUL_SECONDS", "15"))
+API_WARMUP = os.getenv("JJCIMS_API_WARMUP", "1").lower() in ("1", "true", "yes")
+shutting_down = threading.Event()
+
+
+@app.on_event("startup")
+async def start_change_feed():
+    ChangeLog.__table__.create(bind=engine, checkfirst=True)
+    change_notifier.bind(asyncio.get_running_loop())
+
+
+@app.on_event("startup")
+def ensure_ledger_tables():
+    for model in (StockMovement, StockDaily, AppliedRequest):
+        model.__table__.create(bind=engine, checkfirst=True)
+    # Keys only need to outlive client retries
+    db = SessionLocal()
+    try:
+        cutoff = datetime.now() - timedelta(days=IDEMPOTENCY_KEEP_DAYS)
+        db.query(AppliedRequest).filter(AppliedRequest.APPLIED_AT < cutoff).delete(
+            synchronize_session=False
+        )
+        db.commit()
+    except Exception as e:
+        print(f"[API] Could not prune applied_requests: {e}")
+    finally:
+        db.close()
+
+
+@app.on_event("startup")
+def ensure_row_version_column():
+    """Add ITEMSDB.ROW_VERSION to databases created before it existed."""
+    columns = {c["name"] for c in inspect(engine).get_columns(ItemDB.__tablename__)}
+    if "ROW_VERSION" not in columns:
+        with engine.begin() as conn:
+            conn.execute(text(
+                "ALTER TABLE ITEMSDB ADD COLUMN ROW_VERSION INT NOT NULL DEFAULT 1"
+            ))
+
+@app.on_event("startup")
+def ensure_indexes():
+    """Create the search/filter indexes on databases created before they existed."""
+    inspector = inspect(engine)
+    for model in (ItemDB, EmployeeLog, AdminLog):
+        existing = {ix["name"] for ix in inspector.get_indexes(model.__tablename__)}
+        for index in model.__table__.indexes:
+            if index.name and index.name not in existing:
+                print(f"[API] Creating index {index.name}")
+                index.create(bind=engine)
+
+
+@app.on_event("startup")
+async def warm_up():
+    """Open pool connections and build the kiosk dashboard body before traffic."""
+    if not API_WARMUP:
+        return
+    started = time.perf_counter()
+
+    def ping(db):
+        db.execute(text("SELECT 1"))
+
+    try:
+        await asyncio.gather(*(run_read(ping) for _ in range(min(DB_POOL_SIZE, 8))))
+        version = await run_read(lambda db: read_cache.table_version(db, "ITEMSDB"))
+        key = ("employee-dashboard",)
+        rows = await run_read(load_employee_dashboard)
+        read_cache.put(key, version, ReadCache.etag(key, version), dumps_json(rows), len(rows))
+        print(f"[API] Warm-up done in {(time.perf_counter() - started) * 1000:.0f} ms")
+    except Exception as e:
+        print(f"[API] Warm-up skipped: {e}")
+
+
+@app.on_event("shutdown")
+async def graceful_shutdown():
+    """Release long-polls, then close pooled connections."""
+    shutting_down.set()
+    change_notifier.notify()
+    if async_engine is not None:
+        await async_engine.dispose()
+    engine.dispose()
+    print("[API] Shut down cleanly")
+
+
 # Configure CORS to allow requests from any origin
 app.add_middleware(
     CORSMiddleware,
@@ -158,13 +900,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large responses (bulk streams) for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+# Outermost, so timings and sizes cover compression and CORS too
+app.add_middleware(telemetry.TimingMiddleware)
+
 # API endpoints for Items
 @app.get("/items/", response_model=List[Item])
-def read_items(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    items = db.query(ItemDB).offset(skip).limit(limit).all()
+def read_items(
+    skip: int = 0, limit: int = 100, name: Optional[str] = None, db: Session = Depends(get_db)
+):
+    """Items by ID; name narrows the list to items with exactly that NAME."""
+    query = db.query(ItemDB)
+    if name is not None:
+        query = query.filter(ItemDB.NAME == name)
+    items = query.order_by(ItemDB.ID).offset(skip).limit(limit).all()
+    note_rows(len(items))
     return items
 
-@app.get("/items/{item_id}", response_model=Item)
+@app.get("/items/{item_id:int}", response_model=Item)
 def read_item(item_id: int, db: Session = Depends(get_db)):
     item = db.query(ItemDB).filter(ItemDB.ID == item_id).first()
     if item is None:
@@ -173,79 +928,117 @@ def read_item(item_id: int, db: Session = Depends(get_db)):
 
 @app.post("/items/", response_model=Item)
 def create_item(item: ItemCreate, db: Session = Depends(get_db)):
-    db_item = ItemDB(**item.dict())
+    db_item = ItemDB(**item.model_dump())
     db.add(db_item)
-    db.commit()
+    db.flush()
+    record_change(db, "ITEMSDB", "upsert", db_item.ID)
+    commit_changes(db)
     db.refresh(db_item)
     return db_item
 
-@app.put("/items/{item_id}", response_model=Item)
-def update_item(item_id: int, item: ItemBase, db: Session = Depends(get_db)):
-    db_item = db.query(ItemDB).filter(ItemDB.ID == item_id).first()
-    if db_item is None:
-        raise HTTPException(status_code=404, detail="Item not found")
-    
-    for key, value in item.dict().items():
-        setattr(db_item, key, value)
-    
-    db.commit()
-    db.refresh(db_item)
-    return db_item
+@app.put("/items/{item_id:int}", response_model=Item)
+def update_item(
+    item_id: int,
+    item: ItemUpdate,
+    db: Session = Depends(get_db),
+):
+    """Update the fields sent, optionally only if ROW_VERSION still matches.
+
+    The write is a single conditional UPDATE, so a concurrent checkout
+    between the client's read and this call is never overwritten; the client
+    gets 409 with the current row and can re-apply its change.
+    """
+    fields = item.model_dump(exclude_unset=True)
+    expected = fields.pop("ROW_VERSION", None)
+
+    stmt = update(ItemDB).where(ItemDB.ID == item_id)
+    if expected is not None:
+        stmt = stmt.where(ItemDB.ROW_VERSION == expected)
+    result = db.execute(
+        stmt.values(ROW_VERSION=ItemDB.ROW_VERSION + 1, **fields)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        db.rollback()
+        current = db.query(ItemDB).filter(ItemDB.ID == item_id).first()
+        if current is None:
+            raise HTTPException(status_code=404, detail="Item not found")
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "message": "Item was changed by another client",
+                "current": Item.model_validate(current, from_attributes=True).model_dump(),
+            },
+        )
+
+    record_change(db, "ITEMSDB", "upsert", item_id)
+    commit_changes(db)
+    return db.query(ItemDB).filter(ItemDB.ID == item_id).first()
 
-@app.delete("/items/{item_id}")
+@app.delete("/items/{item_id:int}")
 def delete_item(item_id: int, db: Session = Depends(get_db)):
     db_item = db.query(ItemDB).filter(ItemDB.ID == item_id).first()
     if db_item is None:
         raise HTTPException(status_code=404, detail="Item not found")
     
     db.delete(db_item)
-    db.commit()
+    record_change(db, "ITEMSDB", "delete", item_id)
+    commit_changes(db)
     return {"detail": "Item deleted successfully"}
 
 # API endpoints for Employee Logs
 @app.get("/employee-logs/", response_model=List[EmployeeLogOut])
 def read_employee_logs(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     logs = db.query(EmployeeLog).order_by(EmployeeLog.DATE.desc(), EmployeeLog.TIME.desc()).offset(skip).limit(limit).all()
+    note_rows(len(logs))
     return logs
 
 @app.post("/employee-logs/", response_model=EmployeeLogOut)
 def create_employee_log(log: EmployeeLogCreate, db: Session = Depends(get_db)):
-    db_log = EmployeeLog(**log.dict())
+    db_log = EmployeeLog(**log.model_dump())
     db.add(db_log)
-    db.commit()
+    db.flush()
+    record_change(db, "emp_logs", "upsert", db_log.id)
+    commit_changes(db)
     db.refresh(db_log)
     return db_log
 
 @app.delete("/employee-logs/")
 def clear_employee_logs(db: Session = Depends(get_db)):
     db.query(EmployeeLog).delete()
-    db.commit()
+    record_change(db, "emp_logs", "clear")
+    commit_changes(db)
     return {"detail": "Employee logs cleared"}
 
 # API endpoints for Admin Logs
 @app.get("/admin-logs/", response_model=List[AdminLogOut])
 def read_admin_logs(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     logs = db.query(AdminLog).order_by(AdminLog.DATE.desc(), AdminLog.TIME.desc()).offset(skip).limit(limit).all()
+    note_rows(len(logs))
     return logs
 
 @app.post("/admin-logs/", response_model=AdminLogOut)
 def create_admin_log(log: AdminLogCreate, db: Session = Depends(get_db)):
-    db_log = AdminLog(**log.dict())
+    db_log = AdminLog(**log.model_dump())
     db.add(db_log)
-    db.commit()
+    db.flush()
+    record_change(db, "adm_logs", "upsert", db_log.id)
+    commit_changes(db)
     db.refresh(db_log)
     return db_log
 
 @app.delete("/admin-logs/")
 def clear_admin_logs(db: Session = Depends(get_db)):
     db.query(AdminLog).delete()
-    db.commit()
+    record_change(db, "adm_logs", "clear")
+    commit_changes(db)
     return {"detail": "Admin logs cleared"}
 
 # API endpoints for Employees
 @app.get("/employees/", response_model=List[Employee])
 def read_employees(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     employees = db.query(EmployeeList).offset(skip).limit(limit).all()
+    note_rows(len(employees))
     return employees
 
 @app.get("/employees/{username}", response_model=Employee)
@@ -257,9 +1050,11 @@ def read_employee(username: str, db: Session = Depends(get_db)):
 
 @app.post("/employees/", response_model=Employee)
 def create_employee(employee: EmployeeCreate, db: Session = Depends(get_db)):
-    db_employee = EmployeeList(**employee.dict())
+    db_employee = EmployeeList(**employee.model_dump())
     db.add(db_employee)
-    db.commit()
+    db.flush()
+    record_change(db, "emp_list", "upsert", db_employee.id)
+    commit_changes(db)
     db.refresh(db_employee)
     return db_employee
 
@@ -269,45 +1064,233 @@ def update_employee(username: str, employee: EmployeeBase, db: Session = Depends
     if db_employee is None:
         raise HTTPException(status_code=404, detail="Employee not found")
     
-    for key, value in employee.dict().items():
+    for key, value in employee.model_dump().items():
         setattr(db_employee, key, value)
     
-    db.commit()
+    record_change(db, "emp_list", "upsert", db_employee.id)
+    commit_changes(db)
     db.refresh(db_employee)
     return db_employee
 
+EMPLOYEE_BULK_FIELDS = {"Access_Level", "Password", "TFA_Secret"}
+
+
+def _access_level_number(value):
+    """'Level 3' (as the GUI stores it) or 3 -> 3."""
+    if value is None or isinstance(value, int):
+        return value
+    digits = "".join(ch for ch in str(value) if ch.isdigit())
+    if not digits:
+        raise HTTPException(status_code=400, detail=f"Invalid access level: {value}")
+    return int(digits)
+
+
+@app.post("/employees/bulk-update")
+def bulk_update_employees(body: EmployeeBulkUpdate, db: Session = Depends(get_db)):
+    """Apply the same field values to every listed username in one transaction."""
+    unknown = set(body.fields) - EMPLOYEE_BULK_FIELDS
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unsupported fields: {sorted(unknown)}")
+    fields = dict(body.fields)
+    if "Access_Level" in fields:
+        fields["Access_Level"] = _access_level_number(fields["Access_Level"])
+    ids = [row_id for (row_id,) in db.query(EmployeeList.id).filter(EmployeeList.Username.in_(body.usernames))]
+    if ids and fields:
+        db.execute(
+            update(EmployeeList)
+            .where(EmployeeList.id.in_(ids))
+            .values(**fields)
+            .execution_options(synchronize_session=False)
+        )
+        for row_id in ids:
+            record_change(db, "emp_list", "upsert", row_id)
+        commit_changes(db)
+    return {"updated": len(ids)}
+
+@app.post("/employees/bulk-delete")
+def bulk_delete_employees(body: EmployeeBulkDelete, db: Session = Depends(get_db)):
+    """Delete every listed username in one transaction."""
+    ids = [row_id for (row_id,) in db.query(EmployeeList.id).filter(EmployeeList.Username.in_(body.usernames))]
+    if ids:
+        db.query(EmployeeList).filter(EmployeeList.id.in_(ids)).delete(synchronize_session=False)
+        for row_id in ids:
+            record_change(db, "emp_list", "delete", row_id)
+        commit_changes(db)
+    return {"deleted": len(ids)}
+
 # Custom query endpoints (recreating original queries.py functionality)
 @app.put("/items/{name}/out/{qty}")
-def update_item_out(name: str, qty: int, db: Session = Depends(get_db)):
-    """Increment the OUT counter for an item by name."""
-    db_item = db.query(ItemDB).filter(ItemDB.NAME == name).first()
-    if db_item is None:
+def update_item_out(
+    name: str,
+    qty: int,
+    idempotency_key: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+):
+    """Increment the OUT counter for an item by name.
+
+    The increment happens inside MySQL (OUT = OUT + qty) so concurrent
+    checkouts of the same item never lose a movement. The row is addressed
+    by primary key to keep the row lock short and single-row.
+
+    With an Idempotency-Key header the key is stored in the same transaction,
+    so a client that resends after a timeout cannot count the checkout twice.
+    """
+    item_id = db.query(ItemDB.ID).filter(ItemDB.NAME == name).order_by(ItemDB.ID).limit(1).scalar()
+    if item_id is None:
         raise HTTPException(status_code=404, detail="Item not found")
-    
-    db_item.OUT += qty
-    db.commit()
+    if idempotency_key:
+        db.add(AppliedRequest(KEY=idempotency_key[:64], APPLIED_AT=datetime.now()))
+        try:
+            db.flush()
+        except IntegrityError:
+            db.rollback()
+            return {"detail": f"Updated OUT quantity for {name} by {qty}", "replayed": True}
+
+    result = db.execute(
+        update(ItemDB)
+        .where(ItemDB.ID == item_id)
+        .values(
+            OUT=func.coalesce(ItemDB.OUT, 0) + qty,
+            ROW_VERSION=ItemDB.ROW_VERSION + 1,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Item not found")
+    record_change(db, "ITEMSDB", "upsert", item_id)
+    commit_changes(db)
     return {"detail": f"Updated OUT quantity for {name} by {qty}"}
 
+# Hot kiosk reads: async endpoints, cached bodies, plain column tuples
+# instead of ORM objects and per-row model validation
+ITEM_FIELDS = tuple(Item.model_fields)
+ITEM_SELECT = [getattr(ItemDB, f) for f in ITEM_FIELDS]
+
+
+# Changes since the last index above this many rows rebuild it in full
+UNIT_INDEX_PATCH_MAX = int(os.getenv("JJCIMS_UNIT_INDEX_PATCH_MAX", "200"))
+
+_unit_index = {}  # latest only: version, units {NAME: UNIT_OF_MEASURE}, names {ID: NAME}
+
+
+def _load_unit_index(db: Session):
+    rows = db.execute(
+        select(ItemDB.ID, ItemDB.NAME, ItemDB.UNIT_OF_MEASURE).order_by(ItemDB.ID.desc())
+    ).all()
+    # Lowest ID wins for duplicate names
+    return {name: unit for _, name, unit in rows}, {item_id: name for item_id, name, _ in rows}
+
+
+def _patch_unit_index(db: Session, previous, version):
+    """(units, names) of previous updated with the ITEMSDB changes up to version.
+
+    Reads the change_log rows since previous["version"]; only the changed
+    IDs and the names they had or now have are re-read (by the indexed ID
+    and NAME columns). Returns None when a full reload is cheaper or
+    required (a clear, or more than UNIT_INDEX_PATCH_MAX changes).
+    """
+    changes = db.execute(
+        select(ChangeLog.op, ChangeLog.row_id)
+        .where(
+            ChangeLog.table_name == "ITEMSDB",
+            ChangeLog.version > previous["version"],
+            ChangeLog.version <= version,
+        )
+        .limit(UNIT_INDEX_PATCH_MAX + 1)
+    ).all()
+    if len(changes) > UNIT_INDEX_PATCH_MAX or any(
+        op not in ("upsert", "delete") or row_id is None for op, row_id in changes
+    ):
+        return None
+    changed_ids = {row_id for _, row_id in changes}
+    units, names = dict(previous["units"]), dict(previous["names"])
+    affected = {names.pop(item_id) for item_id in changed_ids if item_id in names}
+    if changed_ids:
+        affected.update(
+            db.execute(select(ItemDB.NAME).where(ItemDB.ID.in_(changed_ids))).scalars()
+        )
+    if affected:
+        for name in affected:
+            units.pop(name, None)
+        rows = db.execute(
+            select(ItemDB.ID, ItemDB.NAME, ItemDB.UNIT_OF_MEASURE)
+            .where(ItemDB.NAME.in_(affected))
+            .order_by(ItemDB.ID.desc())
+        ).all()
+        for item_id, name, unit in rows:
+            units[name] = unit
+            names[item_id] = name
+    return units, names
+
+
+async def unit_index(version):
+    """Every item's unit of measure as {NAME: UNIT_OF_MEASURE} for an ITEMSDB version.
+
+    Kiosks look units up by many different names; one shared map turns a
+    burst of distinct lookups into a single coalesced query. When the
+    version moves on, only the rows named in change_log since the last
+    index are re-read; the whole table is read only on start, after a
+    clear or after a large batch of changes.
+    """
+    if _unit_index.get("version") == version:
+        return _unit_index["units"]
+    previous = dict(_unit_index)
+
+    def load(db):
+        if previous and previous["version"] < version:
+            patched = _patch_unit_index(db, previous, version)
+            if patched is not None:
+                return patched
+        return _load_unit_index(db)
+
+    async def build():
+        async with admission_gates["unit-of-measure"]:
+            units, names = await run_read(load)
+        if version >= _unit_index.get("version", -1):
+            _unit_index.update(version=version, units=units, names=names)
+        return units
+
+    return await read_flights.do(("unit-index", version), build)
+
+
 @app.get("/items/{name}/unit-of-measure")
-def get_unit_of_measure(name: str, db: Session = Depends(get_db)):
+async def get_unit_of_measure(name: str, request: Request):
     """Return the unit of measure string for an item name."""
-    db_item = db.query(ItemDB).filter(ItemDB.NAME == name).first()
-    if db_item is None:
+    version = await current_version("ITEMSDB")
+    units = await unit_index(version)
+    if name not in units:
         raise HTTPException(status_code=404, detail="Item not found")
-    
-    return {"unit_of_measure": db_item.UNIT_OF_MEASURE}
+    etag = ReadCache.etag(("unit-of-measure", name), version)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    note_rows(1)
+    body = dumps_json({"unit_of_measure": units[name]})
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def load_employee_dashboard(db: Session):
+    rows = db.execute(select(ItemDB.ID, ItemDB.NAME, ItemDB.Supplier, ItemDB.PO_no)).all()
+    return [list(row) for row in rows]
 
 @app.get("/items/employee-dashboard")
-def fetch_items_for_employee_dashboard(db: Session = Depends(get_db)):
+async def fetch_items_for_employee_dashboard(request: Request):
     """Return rows for the employee dashboard item list."""
-    items = db.query(ItemDB.ID, ItemDB.NAME, ItemDB.Supplier, ItemDB.PO_no).all()
-    return items
+    return await cached_json_async(
+        request, "ITEMSDB", ("employee-dashboard",), load_employee_dashboard,
+        admission_gates["employee-dashboard"],
+    )
 
 @app.get("/items/by-type/{category}")
-def fetch_items_by_type(category: str, db: Session = Depends(get_db)):
+async def fetch_items_by_type(category: str, request: Request):
     """Return item rows filtered by TYPE."""
-    items = db.query(ItemDB).filter(ItemDB.TYPE == category).all()
-    return items
+    def load(db):
+        rows = db.execute(select(*ITEM_SELECT).where(ItemDB.TYPE == category)).all()
+        return [dict(zip(ITEM_FIELDS, row)) for row in rows]
+
+    return await cached_json_async(
+        request, "ITEMSDB", ("by-type", category), load, admission_gates["by-type"]
+    )
 
 @app.get("/employees/{username_lower}/2fa-and-access")
 def get_emp_2fa_and_access(username_lower: str, db: Session = Depends(get_db)):
@@ -318,6 +1301,338 @@ def get_emp_2fa_and_access(username_lower: str, db: Session = Depends(get_db)):
     
     return {"2fa_secret": db_employee.TFA_Secret, "access_level": db_employee.Access_Level}
 
-if __name__ == "__main__":
+@app.get("/metrics")
+def read_metrics():
+    """Prometheus text-format metrics of this worker process."""
+    pools = [("sync", engine.pool)]
+    if async_engine is not None:
+        pools.append(("async", async_engine.sync_engine.pool))
+    extra = telemetry.pool_lines(pools)
+    gates = admission_gates.items()
+    extra += telemetry.gauge_lines(
+        "jjcims_admission_active", "Hot-read loads running, per endpoint gate.",
+        [((name,), gate.active) for name, gate in gates], ("gate",),
+    )
+    extra += telemetry.gauge_lines(
+        "jjcims_admission_queued", "Hot-read loads waiting for their gate.",
+        [((name,), gate.waiting) for name, gate in gates], ("gate",),
+    )
+    extra += telemetry.gauge_lines(
+        "jjcims_admission_rejected_total", "Hot-read requests turned away with 503.",
+        [((name,), gate.rejected) for name, gate in gates], ("gate",), kind="counter",
+    )
+    extra += telemetry.gauge_lines(
+        "jjcims_single_flight_coalesced_total", "Reads that shared another request's query.",
+        [((), read_flights.coalesced)], kind="counter",
+    )
+    return Response(
+        content=telemetry.render(extra),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+@app.get("/admission")
+def read_admission():
+    """Queue depth and counters of the hot-read admission gates and coalescing."""
+    return {
+        "gates": {name: gate.stats() for name, gate in admission_gates.items()},
+        "single_flight": {
+            "in_flight": read_flights.in_flight,
+            "started": read_flights.started,
+            "coalesced": read_flights.coalesced,
+        },
+    }
+
+# Change feed endpoint
+@app.get("/changes")
+async def read_changes(since: int = -1, tables: Optional[str] = None, wait: float = 0):
+    """Long-poll for changes after version since.
+
+    Returns as soon as anything changed (or immediately when wait is 0),
+    otherwise after wait seconds with an empty change list. tables is an
+    optional comma-separated filter. Clients pass the returned version as
+    the next since; since=-1 returns the current version straight away.
+    """
+    table_filter = [t.strip() for t in tables.split(",")] if tables else None
+    if since < 0:
+        # Versions from the read cache (at most READ_CACHE_TTL old); a lower
+        # version only makes the client's next poll repeat a few changes
+        versions = {t: await current_version(t) for t in CHANGE_TABLES}
+        return {
+            "version": max(versions.values(), default=0),
+            "tables": {t: versions[t] for t in (table_filter or CHANGE_TABLES) if t in versions},
+            "reset": False,
+            "changes": [],
+        }
+    deadline = time.monotonic() + max(0.0, min(wait, CHANGE_MAX_WAIT))
+    while True:
+        # Kiosks at the same version poll with the same since; share the query
+        batch = await read_flights.do(
+            ("changes", since, tables),
+            lambda: run_in_threadpool(_collect_changes_once, since, table_filter),
+        )
+        if batch["changes"] or batch["reset"] or shutting_down.is_set():
+            note_rows(len(batch["changes"]))
+            return batch
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return batch
+        await change_notifier.wait(min(remaining, CHANGE_POLL_INTERVAL))
+
+# Stock movement ledger
+@app.post("/stock-movements")
+def create_stock_movements(moves: List[StockMovementIn], db: Session = Depends(get_db)):
+    """Insert a batch of movements and bump stock_daily in one transaction.
+
+    Movements whose MOVE_KEY already exists are skipped, so clients can
+    safely resend a batch after a timeout or crash.
+    """
+    keys = [m.MOVE_KEY for m in moves]
+    known = {
+        k for (k,) in db.query(StockMovement.MOVE_KEY).filter(StockMovement.MOVE_KEY.in_(keys))
+    }
+    names = {m.ITEM_NAME for m in moves}
+    ids = {}
+    for item_id, name in (
+        db.query(ItemDB.ID, ItemDB.NAME).filter(ItemDB.NAME.in_(names)).order_by(ItemDB.ID.desc())
+    ):
+        ids[name] = item_id  # lowest ID wins, like the by-name OUT update
+
+    daily = {}
+    inserted = 0
+    for move in moves:
+        if move.MOVE_KEY in known:
+            continue
+        known.add(move.MOVE_KEY)
+        direction = move.DIRECTION.upper()
+        if direction not in ("OUT", "IN"):
+            raise HTTPException(status_code=400, detail=f"Unknown direction: {move.DIRECTION}")
+        item_id = ids.get(move.ITEM_NAME)
+        db.add(StockMovement(
+            MOVE_KEY=move.MOVE_KEY, ITEM_ID=item_id, ITEM_NAME=move.ITEM_NAME,
+            QTY=move.QTY, DIRECTION=direction, USER=move.USER, MOVED_AT=move.MOVED_AT,
+        ))
+        inserted += 1
+        if item_id is None:
+            continue
+        totals = daily.setdefault((item_id, move.MOVED_AT.date()), [0.0, 0.0, 0])
+        totals[0 if direction == "OUT" else 1] += move.QTY
+        totals[2] += 1
+
+    if daily:
+        values = [
+            {"ITEM_ID": i, "DAY": d, "QTY_OUT": t[0], "QTY_IN": t[1], "MOVES": t[2]}
+            for (i, d), t in daily.items()
+        ]
+        if engine.dialect.name == "mysql":
+            stmt = mysql_insert(StockDaily).values(values)
+            db.execute(stmt.on_duplicate_key_update(
+                QTY_OUT=StockDaily.QTY_OUT + stmt.inserted.QTY_OUT,
+                QTY_IN=StockDaily.QTY_IN + stmt.inserted.QTY_IN,
+                MOVES=StockDaily.MOVES + stmt.inserted.MOVES,
+            ))
+        else:
+            for row in values:
+                bumped = db.execute(
+                    update(StockDaily)
+                    .where(StockDaily.ITEM_ID == row["ITEM_ID"], StockDaily.DAY == row["DAY"])
+                    .values(
+                        QTY_OUT=StockDaily.QTY_OUT + row["QTY_OUT"],
+                        QTY_IN=StockDaily.QTY_IN + row["QTY_IN"],
+                        MOVES=StockDaily.MOVES + row["MOVES"],
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                if bumped.rowcount == 0:
+                    db.add(StockDaily(**row))
+    db.commit()
+    return {"inserted": inserted}
+
+@app.get("/stock-usage")
+def read_stock_usage(start: date, end: date, db: Session = Depends(get_db)):
+    """Return [item_id, qty_out, qty_in] per item over [start, end]."""
+    rows = (
+        db.query(StockDaily.ITEM_ID, func.sum(StockDaily.QTY_OUT), func.sum(StockDaily.QTY_IN))
+        .filter(StockDaily.DAY >= start, StockDaily.DAY <= end)
+        .group_by(StockDaily.ITEM_ID)
+        .all()
+    )
+    return [list(row) for row in rows]
+
+@app.get("/stock-usage/{item_id:int}")
+def read_item_stock_usage(item_id: int, start: date, end: date, db: Session = Depends(get_db)):
+    """Return totals for one item over [start, end]."""
+    qty_out, qty_in = (
+        db.query(func.sum(StockDaily.QTY_OUT), func.sum(StockDaily.QTY_IN))
+        .filter(StockDaily.ITEM_ID == item_id, StockDaily.DAY >= start, StockDaily.DAY <= end)
+        .one()
+    )
+    return {"qty_out": qty_out or 0, "qty_in": qty_in or 0}
+
+@app.get("/stock-usage/{item_id:int}/daily")
+def read_item_daily_usage(item_id: int, start: date, end: date, db: Session = Depends(get_db)):
+    """Return [day, qty_out, qty_in] for one item, days with movements only."""
+    rows = (
+        db.query(StockDaily.DAY, StockDaily.QTY_OUT, StockDaily.QTY_IN)
+        .filter(StockDaily.ITEM_ID == item_id, StockDaily.DAY >= start, StockDaily.DAY <= end)
+        .order_by(StockDaily.DAY)
+        .all()
+    )
+    return [[row[0].isoformat(), row[1], row[2]] for row in rows]
+
+# Search
+SEARCH_MAX_PAGE_SIZE = 500
+SEARCH_FIELDS = (ItemDB.NAME, ItemDB.BRAND, ItemDB.TYPE, ItemDB.LOCATION, ItemDB.Supplier)
+
+
+class ItemSearchHit(Item):
+    score: float = 0.0
+
+
+class ItemSearchPage(BaseModel):
+    total: int
+    page: int
+    page_size: int
+    items: List[ItemSearchHit]
+
+
+def _search_score(terms):
+    """Relevance expression for the search terms.
+
+    MySQL uses the FULLTEXT (ngram) index. Other dialects, and one-character
+    terms (which ngram does not index), fall back to counting LIKE matches.
+    """
+    if engine.dialect.name == "mysql" and all(len(t) >= 2 for t in terms):
+        return match(*SEARCH_FIELDS, against=" ".join(terms)).in_natural_language_mode()
+    score = None
+    for field in SEARCH_FIELDS:
+        for term in terms:
+            hit = case((func.lower(field).like(f"%{term}%"), 1), else_=0)
+            score = hit if score is None else score + hit
+    return score
+
+
+@app.get("/items/search", response_model=ItemSearchPage)
+def search_items(
+    q: str,
+    type: Optional[str] = None,
+    status: Optional[str] = None,
+    exclude_status: Optional[str] = None,
+    page: int = 1,
+    page_size: int = 50,
+    db: Session = Depends(get_db),
+):
+    """Ranked item search over NAME/BRAND/TYPE/LOCATION/SUPPLIER.
+
+    Any term may match any field (like the GUI's LIKE search); items that
+    match more terms or fields rank first. type/status filter exactly,
+    exclude_status drops one status (NULL/empty status is kept).
+    """
+    terms = [t for t in q.lower().split() if t]
+    if not terms:
+        raise HTTPException(status_code=400, detail="Empty search")
+    page = max(page, 1)
+    page_size = max(1, min(page_size, SEARCH_MAX_PAGE_SIZE))
+
+    score = _search_score(terms)
+    query = db.query(ItemDB, score.label("score")).filter(score > 0)
+
+    if type is not None:
+        query = query.filter(ItemDB.TYPE == type)
+    if status is not None:
+        query = query.filter(ItemDB.STATUS == status)
+    if exclude_status is not None:
+        query = query.filter(
+            or_(ItemDB.STATUS != exclude_status, ItemDB.STATUS.is_(None), ItemDB.STATUS == "")
+        )
+
+    total = query.count()
+    rows = (
+        query.order_by(score.desc(), ItemDB.NAME)
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+        .all()
+    )
+    items = []
+    for item, item_score in rows:
+        hit = Item.model_validate(item, from_attributes=True).model_dump()
+        hit["score"] = float(item_score or 0)
+        items.append(hit)
+    note_rows(len(items))
+    return {"total": total, "page": page, "page_size": page_size, "items": items}
+
+# Streaming bulk endpoints
+STREAM_CHUNK_ROWS = int(os.getenv("JJCIMS_STREAM_CHUNK", "1000"))
+
+STREAM_RESOURCES = {
+    "items": (ItemDB, lambda: [ItemDB.ID]),
+    "employees": (EmployeeList, lambda: [EmployeeList.id]),
+    "employee-logs": (EmployeeLog, lambda: [EmployeeLog.DATE.desc(), EmployeeLog.TIME.desc()]),
+    "admin-logs": (AdminLog, lambda: [AdminLog.DATE.desc(), AdminLog.TIME.desc()]),
+}
+
+
+def _stream_ndjson(columns, order_by):
+    """Yield a header line, then one JSON array per row, chunk by chunk.
+
+    Rows come from a server-side cursor so neither the API process nor the
+    client ever holds the whole table as one JSON document.
+    """
+    db = SessionLocal()
+    try:
+        yield json.dumps({"columns": [c.name for c in columns]}) + "\n"
+        result = db.execute(
+            select(*columns)
+            .order_by(*order_by)
+            .execution_options(stream_results=True, yield_per=STREAM_CHUNK_ROWS)
+        )
+        for rows in result.partitions(STREAM_CHUNK_ROWS):
+            note_rows(len(rows))
+            yield "".join(json.dumps(list(row), default=str) + "\n" for row in rows)
+    finally:
+        db.close()
+
+
+@app.get("/stream/{resource}")
+def stream_rows(resource: str, fields: Optional[str] = None):
+    """Stream every row of items, employees, employee-logs or admin-logs as NDJSON.
+
+    The first line is {"columns": [...]}; each following line is one row as a
+    JSON array in that column order. fields is an optional comma-separated
+    projection. Unlike the list endpoints there is no row limit.
+    """
+    if resource not in STREAM_RESOURCES:
+        raise HTTPException(status_code=404, detail="Unknown resource")
+    model, order_by = STREAM_RESOURCES[resource]
+    available = {c.name.lower(): c for c in model.__table__.columns}
+    if fields:
+        try:
+            columns = [available[f.strip().lower()] for f in fields.split(",") if f.strip()]
+        except KeyError as e:
+            raise HTTPException(status_code=400, detail=f"Unknown field: {e.args[0]}")
+    else:
+        columns = list(model.__table__.columns)
+    return StreamingResponse(
+        _stream_ndjson(columns, order_by()), media_type="application/x-ndjson"
+    )
+
+def serve():
+    """Run the API with the JJCIMS_API_* serving profile.
+
+    More than one worker needs the app as an import string (JJCIMS_API_APP,
+    "main:app" when started from backend/api). On SIGTERM/Ctrl+C in-flight
+    requests get JJCIMS_API_GRACEFUL_SECONDS to finish; long-polls on
+    /changes return at once.
+    """
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+
+    uvicorn.run(
+        API_APP if API_WORKERS > 1 else app,
+        host=API_HOST,
+        port=API_PORT,
+        workers=API_WORKERS,
+        timeout_graceful_shutdown=API_GRACEFUL_SECONDS,
+        access_log=os.getenv("JJCIMS_API_ACCESS_LOG", "0") == "1",
+    )
+
+if __name__ == "__main__":
+    serve()
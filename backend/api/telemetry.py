@@ -0,0 +1,322 @@
+"""Request timing and Prometheus-style metrics for the API.
+
+TimingMiddleware times every HTTP request and records, per route template:
+
+* latency histogram, request count by status, response bytes and the
+  number of rows the endpoint returned (note_rows),
+* the requests currently in flight.
+
+SQLAlchemy events (instrument_engine) add query time and connection hold
+time; TimedQueuePool / TimedAsyncAdaptedQueuePool add the time spent
+waiting for a pooled connection (labelled pool="sync" / pool="async").
+Query and pool-wait time are also summed per request and sent back in a
+Server-Timing header::
+
+    Server-Timing: app;dur=12.4, db;dur=3.1;desc="2 queries", pool;dur=0.0
+
+render() returns everything in the Prometheus text format (served by
+GET /metrics). Metrics live in the process, so with several workers each
+scrape sees the worker that answered it.
+"""
+
+import bisect
+import contextvars
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+ROWS_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000)
+INF_BOUND = 'le="+Inf"'
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values, extra=None):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Bucketed observations per label set."""
+
+    def __init__(self, name, help_text, buckets, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self.labels = tuple(labels)
+        self._series = {}  # label values -> [bucket counts, sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((k, [list(v[0]), v[1], v[2]]) for k, v in self._series.items())
+        for values, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                le = _labels(self.labels, values, f'le="{_number(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            lines.append(f"{self.name}_bucket{_labels(self.labels, values, INF_BOUND)} {count}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, values)} {_number(float(total))}")
+            lines.append(f"{self.name}_count{_labels(self.labels, values)} {count}")
+        return lines
+
+
+class Counter:
+    """Monotonic counts per label set."""
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for values, value in items:
+            lines.append(f"{self.name}{_labels(self.labels, values)} {_number(value)}")
+        return lines
+
+
+def gauge_lines(name, help_text, samples, labels=(), kind="gauge"):
+    """Render samples read elsewhere: an iterable of (label values, value)."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    for values, value in samples:
+        lines.append(f"{name}{_labels(labels, values)} {_number(value)}")
+    return lines
+
+
+# -------------------------
+# Metrics
+# -------------------------
+REQUEST_SECONDS = Histogram(
+    "jjcims_http_request_duration_seconds", "Time to answer a request.",
+    LATENCY_BUCKETS, ("method", "route"),
+)
+REQUESTS = Counter(
+    "jjcims_http_requests_total", "Requests answered, by status code.",
+    ("method", "route", "status"),
+)
+RESPONSE_BYTES = Histogram(
+    "jjcims_http_response_bytes", "Response body size on the wire.",
+    BYTES_BUCKETS, ("method", "route"),
+)
+RESPONSE_ROWS = Histogram(
+    "jjcims_http_response_rows", "Rows returned per request (endpoints that report them).",
+    ROWS_BUCKETS, ("method", "route"),
+)
+REQUEST_DB_SECONDS = Histogram(
+    "jjcims_http_request_db_seconds", "Database query time spent per request.",
+    LATENCY_BUCKETS, ("method", "route"),
+)
+QUERY_SECONDS = Histogram(
+    "jjcims_db_query_seconds", "Time of single SQL statements.", LATENCY_BUCKETS,
+)
+POOL_WAIT_SECONDS = Histogram(
+    "jjcims_db_pool_wait_seconds", "Time spent waiting to check out a pooled connection.",
+    LATENCY_BUCKETS, ("pool",),
+)
+CONNECTION_HOLD_SECONDS = Histogram(
+    "jjcims_db_connection_hold_seconds", "Time a connection stayed checked out (session time).",
+    LATENCY_BUCKETS,
+)
+
+in_flight = 0
+
+
+class RequestTiming:
+    """Per-request totals, shared with worker threads through request_timing."""
+
+    __slots__ = ("started", "db", "queries", "pool_wait", "rows")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db = 0.0
+        self.queries = 0
+        self.pool_wait = 0.0
+        self.rows = None
+
+    def server_timing(self):
+        app_ms = (time.perf_counter() - self.started) * 1000
+        return (
+            f"app;dur={app_ms:.1f}, db;dur={self.db * 1000:.1f};desc=\"{self.queries} queries\", "
+            f"pool;dur={self.pool_wait * 1000:.1f}"
+        )
+
+
+# The RequestTiming object is mutable, so updates made in thread-pool copies
+# of the context reach the middleware
+request_timing = contextvars.ContextVar("request_timing", default=None)
+
+
+def note_rows(count):
+    """Record how many rows the current request returns."""
+    timing = request_timing.get()
+    if timing is not None:
+        timing.rows = (timing.rows or 0) + count
+
+
+class TimingMiddleware:
+    """Pure ASGI middleware, so streamed bodies are timed to their last chunk."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        global in_flight
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        timing = RequestTiming()
+        token = request_timing.set(timing)
+        state = {"status": 500, "bytes": 0}
+
+        async def timed_send(message):
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timing.server_timing().encode("latin-1")))
+                message = dict(message, headers=headers)
+            elif message["type"] == "http.response.body":
+                state["bytes"] += len(message.get("body", b""))
+            await send(message)
+
+        in_flight += 1
+        try:
+            await self.app(scope, receive, timed_send)
+        finally:
+            in_flight -= 1
+            request_timing.reset(token)
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            method = scope.get("method", "")
+            REQUEST_SECONDS.observe(time.perf_counter() - timing.started, method, path)
+            REQUESTS.inc(method, path, str(state["status"]))
+            RESPONSE_BYTES.observe(state["bytes"], method, path)
+            REQUEST_DB_SECONDS.observe(timing.db, method, path)
+            if timing.rows is not None:
+                RESPONSE_ROWS.observe(timing.rows, method, path)
+
+
+# -------------------------
+# SQLAlchemy
+# -------------------------
+class _TimedCheckout:
+    """Pool mixin that records how long checkouts wait for a connection."""
+
+    pool_label = "sync"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started
+            POOL_WAIT_SECONDS.observe(waited, self.pool_label)
+            timing = request_timing.get()
+            if timing is not None:
+                timing.pool_wait += waited
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    """QueuePool of the sync engine, with checkout wait timing."""
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool of the async engine, with checkout wait timing."""
+
+    pool_label = "async"
+
+
+def instrument_engine(engine):
+    """Time statements and connection checkouts of a (sync) engine."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _query_started(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _query_finished(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("query_started")
+        if not started:
+            return
+        elapsed = time.perf_counter() - started.pop()
+        QUERY_SECONDS.observe(elapsed)
+        timing = request_timing.get()
+        if timing is not None:
+            timing.db += elapsed
+            timing.queries += 1
+
+    @event.listens_for(engine, "checkout")
+    def _checked_out(dbapi_connection, record, proxy):
+        record.info["checked_out_at"] = time.perf_counter()
+
+    @event.listens_for(engine, "checkin")
+    def _checked_in(dbapi_connection, record):
+        started = record.info.pop("checked_out_at", None)
+        if started is not None:
+            CONNECTION_HOLD_SECONDS.observe(time.perf_counter() - started)
+
+
+def pool_lines(pools):
+    """Gauges for the size, checked-out and overflow connections of pools.
+
+    pools is an iterable of (label, pool); each metric family is written
+    once, with one sample per pool (Prometheus rejects repeated families).
+    """
+    pools = list(pools)
+    lines = []
+    for metric, attr in (("size", "size"), ("checked_out", "checkedout"),
+                         ("checked_in", "checkedin"), ("overflow", "overflow")):
+        samples = [
+            ((name,), getattr(pool, attr)())
+            for name, pool in pools
+            if getattr(pool, attr, None) is not None
+        ]
+        if samples:
+            lines += gauge_lines(
+                f"jjcims_db_pool_{metric}", f"Connection pool {metric.replace('_', ' ')}.",
+                samples, ("pool",),
+            )
+    return lines
+
+
+def render(extra_lines=()):
+    """All metrics in the Prometheus text exposition format."""
+    lines = gauge_lines("jjcims_http_requests_in_flight", "Requests being answered.", [((), in_flight)])
+    for metric in (REQUEST_SECONDS, REQUESTS, RESPONSE_BYTES, RESPONSE_ROWS, REQUEST_DB_SECONDS,
+                   QUERY_SECONDS, POOL_WAIT_SECONDS, CONNECTION_HOLD_SECONDS):
+        lines += metric.render()
+    lines += list(extra_lines)
+    return "\n".join(lines) + "\n"
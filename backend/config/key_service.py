@@ -0,0 +1,516 @@
+"""Process-wide Fernet key service.
+
+The key that protects emp_list passwords and 2FA secrets is read once and
+the cipher is built once and shared. Every workstation must use the same
+key as the shared database, so the key file is looked up in this order:
+
+* JJCIMS_FERNET_KEY_FILE, if set;
+* fernet_key.py next to the database (the shared key file);
+* backend/config/fernet_key.py (the copy shipped with each install).
+
+A missing key file is an error (never a freshly generated key, which would
+make every stored value unreadable); the legacy per-window copies are only
+adopted to create it. The service has the same
+encrypt(bytes)/decrypt(bytes) interface as a Fernet object, so it can be
+passed wherever a Fernet instance was passed before.
+
+Decryption goes through a MultiFernet over the primary key, retired keys
+(FERNET_OLD_KEYS in the key file) and the keys of the legacy per-window
+copies (frontend/gui/config, frontend/config), so values written under any
+of them still decrypt. New values are always encrypted with the primary key.
+
+Key rotation:
+
+* begin_rotation() writes a fresh primary key to the shared key file next
+  to the database (JJCIMS_FERNET_KEY_FILE if set), keeps the previous ones
+  as FERNET_OLD_KEYS and marks a rotation as pending in key_rotation.json
+  beside it. It refuses to run when there is no shared location, since the
+  re-encrypted emp_list would lock every other workstation out;
+* KeyRotationJob re-encrypts every emp_list [Password] and [2FA Secret]
+  under the primary key in one transaction (lock errors are retried with
+  backoff), reporting progress as it goes;
+* an interrupted job leaves the rotation pending; resume_pending() reruns
+  it (re-encrypting is idempotent) and the state becomes "done".
+
+Other workstations pick the new key up from the shared file: a value that
+no cached key decrypts makes the service reload the key file once.
+Old keys are kept for decryption until retire_old_keys() is called.
+
+Usage from the command line::
+
+    python -m backend.config.key_service rotate
+    python -m backend.config.key_service status
+"""
+
+import ast
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
+
+CONFIG_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(CONFIG_DIR))
+KEY_FILENAME = "fernet_key.py"
+STATE_FILENAME = "key_rotation.json"
+KEY_FILE_OVERRIDE = os.environ.get("JJCIMS_FERNET_KEY_FILE")
+LOCAL_KEY_FILE = os.path.join(CONFIG_DIR, KEY_FILENAME)
+LEGACY_KEY_FILES = (
+    os.path.join(PROJECT_ROOT, "frontend", "gui", "config", KEY_FILENAME),
+    os.path.join(PROJECT_ROOT, "frontend", "config", KEY_FILENAME),
+)
+
+
+def shared_key_file():
+    """fernet_key.py next to the shared database, or None if it cannot be resolved."""
+    try:
+        from backend.database.path_utils import get_db_path
+
+        return os.path.join(os.path.dirname(os.path.abspath(get_db_path())), KEY_FILENAME)
+    except Exception as e:
+        print(f"[KEYS] Database location unknown, no shared key file: {e}")
+        return None
+
+
+def read_key_file(path):
+    """(FERNET_KEY, FERNET_OLD_KEYS) from a key file, without executing it."""
+    primary, old = None, []
+    with open(path, "r", encoding="utf-8") as fh:
+        tree = ast.parse(fh.read(), filename=path)
+    for node in tree.body:
+        if not isinstance(node, ast.Assign) or len(node.targets) != 1:
+            continue
+        name = getattr(node.targets[0], "id", None)
+        if name == "FERNET_KEY":
+            primary = ast.literal_eval(node.value)
+        elif name == "FERNET_OLD_KEYS":
+            old = list(ast.literal_eval(node.value))
+    to_bytes = lambda k: k.encode("ascii") if isinstance(k, str) else k
+    return (to_bytes(primary) if primary else None), [to_bytes(k) for k in old if k]
+
+
+def write_key_file(path, primary, old_keys=()):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    lines = [
+        "# Fernet key for emp_list passwords and 2FA secrets.\n",
+        "# Managed by backend.config.key_service - keep this file secure.\n",
+        f"FERNET_KEY = {primary!r}\n",
+        f"FERNET_OLD_KEYS = {list(old_keys)!r}\n",
+    ]
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as fh:
+        fh.writelines(lines)
+    os.replace(tmp, path)
+
+
+class KeyService:
+    """Loads the key once and hands out one shared (Multi)Fernet cipher.
+
+    key_path pins the key file (and rotation target); by default it is
+    resolved as described in the module docstring.
+    """
+
+    def __init__(self, key_path=KEY_FILE_OVERRIDE, legacy_paths=LEGACY_KEY_FILES,
+                 state_path=None, local_path=LOCAL_KEY_FILE):
+        self.fixed_key_path = key_path
+        self.local_path = local_path
+        self.legacy_paths = tuple(legacy_paths)
+        self.fixed_state_path = state_path
+        self.key_path = None  # file the current keys were read from
+        self._lock = threading.RLock()
+        self._primary = None
+        self._old = []
+        self._cipher = None
+
+    # -------------------------
+    # Key file location
+    # -------------------------
+    def rotation_key_path(self):
+        """Where rotation writes the new key: the pinned or the shared key file."""
+        return self.fixed_key_path or shared_key_file()
+
+    def resolve_key_path(self):
+        if self.fixed_key_path:
+            return self.fixed_key_path
+        shared = shared_key_file()
+        if shared and os.path.exists(shared):
+            return shared
+        return self.local_path
+
+    @property
+    def state_path(self):
+        if self.fixed_state_path:
+            return self.fixed_state_path
+        key_path = self.rotation_key_path() or self.local_path
+        return os.path.join(os.path.dirname(key_path), STATE_FILENAME)
+
+    # -------------------------
+    # Keys
+    # -------------------------
+    def _load(self):
+        key_path = self.resolve_key_path()
+        primary, old = None, []
+        try:
+            primary, old = read_key_file(key_path)
+        except FileNotFoundError:
+            pass
+        legacy = []
+        for path in self.legacy_paths:
+            try:
+                key, _ = read_key_file(path)
+            except Exception:
+                continue
+            if key:
+                legacy.append(key)
+        if not primary:
+            if not legacy:
+                raise RuntimeError(
+                    f"Fernet key file {key_path} is missing or has no FERNET_KEY. "
+                    "Copy fernet_key.py from a working installation (or place it "
+                    "next to the database); a new key would make every stored "
+                    "password and 2FA secret unreadable."
+                )
+            # Upgrade: adopt the key of a legacy per-window copy
+            primary = legacy[0]
+            write_key_file(key_path, primary, old)
+            print(f"[KEYS] Wrote key file {key_path} from a legacy copy")
+        self.key_path = key_path
+        keys = [primary]
+        for key in old + legacy:
+            if key not in keys:
+                keys.append(key)
+        self._primary = primary
+        self._old = keys[1:]
+        self._cipher = MultiFernet([Fernet(k) for k in keys])
+
+    @property
+    def cipher(self):
+        with self._lock:
+            if self._cipher is None:
+                self._load()
+            return self._cipher
+
+    @property
+    def primary_key(self):
+        with self._lock:
+            if self._primary is None:
+                self._load()
+            return self._primary
+
+    def reload(self):
+        """Drop the cached keys (after the key file changed)."""
+        with self._lock:
+            self.key_path = None
+            self._primary = None
+            self._old = []
+            self._cipher = None
+
+    # -------------------------
+    # Fernet-compatible API
+    # -------------------------
+    def encrypt(self, data):
+        return self.cipher.encrypt(data)
+
+    def decrypt(self, token, ttl=None):
+        try:
+            return self.cipher.decrypt(token, ttl)
+        except InvalidToken:
+            # Another workstation may have rotated the shared key meanwhile
+            if not self._reload_if_changed():
+                raise
+            return self.cipher.decrypt(token, ttl)
+
+    def rotate(self, token):
+        return self.cipher.rotate(token)
+
+    def _reload_if_changed(self):
+        """Reload the keys if the key file now holds keys we do not have."""
+        with self._lock:
+            try:
+                primary, old = read_key_file(self.resolve_key_path())
+            except Exception:
+                return False
+            known = [self._primary] + self._old
+            if all(key in known for key in [primary] + old if key):
+                return False
+            print("[KEYS] Key file changed, reloading keys")
+            self.reload()
+            return True
+
+    def encrypt_text(self, text):
+        return self.encrypt(text.encode("utf-8")).decode("utf-8")
+
+    def decrypt_text(self, token):
+        """Plain text of token; raises InvalidToken if no known key fits."""
+        if isinstance(token, str):
+            token = token.encode("utf-8")
+        return self.decrypt(token).decode("utf-8")
+
+    def is_current(self, token):
+        """True if token is encrypted with the primary key."""
+        if isinstance(token, str):
+            token = token.encode("utf-8")
+        try:
+            Fernet(self.primary_key).decrypt(token)
+            return True
+        except InvalidToken:
+            return False
+
+    # -------------------------
+    # Rotation
+    # -------------------------
+    def load_state(self):
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return {}
+
+    def save_state(self, state):
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.state_path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(state, fh, indent=1)
+        os.replace(tmp, self.state_path)
+
+    def begin_rotation(self):
+        """Make a new primary key (old ones kept for decryption); mark pending.
+
+        The key is written to the shared key file every workstation reads;
+        without one (database location unknown) the rotation is refused.
+        """
+        with self._lock:
+            target = self.rotation_key_path()
+            if not target:
+                raise RuntimeError(
+                    "Cannot rotate keys: no shared key file location. Set "
+                    "JJCIMS_FERNET_KEY_FILE to a path every workstation reads."
+                )
+            previous = self.primary_key
+            old = [previous] + [k for k in self._old if k != previous]
+            new_key = Fernet.generate_key()
+            write_key_file(target, new_key, old)
+            self.reload()
+            self.save_state(
+                {
+                    "status": "pending",
+                    "started": datetime.now().isoformat(timespec="seconds"),
+                    "rows_done": 0,
+                    "rows_total": None,
+                }
+            )
+            print(f"[KEYS] New primary key written to {target}; re-encryption pending")
+            return new_key
+
+    def rotation_pending(self):
+        return self.load_state().get("status") == "pending"
+
+    def retire_old_keys(self):
+        """Forget every key but the primary (only once all data was rotated)."""
+        with self._lock:
+            if self.rotation_pending():
+                raise RuntimeError("Key rotation has not finished yet")
+            primary = self.primary_key
+            write_key_file(self.key_path, primary, [])
+            self.reload()
+
+
+class KeyRotationJob:
+    """Re-encrypts emp_list passwords and 2FA secrets under the primary key."""
+
+    COLUMNS = ("Password", "2FA Secret")
+
+    def __init__(self, service=None, connector_factory=None, on_progress=None):
+        self.service = service
+        self.connector_factory = connector_factory
+        self.on_progress = on_progress
+        self.status = "idle"
+        self.rows_done = 0
+        self.rows_total = 0
+        self.values_rotated = 0
+        self.values_skipped = 0
+        self.error = None
+        self._thread = None
+
+    def progress(self):
+        return {
+            "status": self.status,
+            "rows_done": self.rows_done,
+            "rows_total": self.rows_total,
+            "values_rotated": self.values_rotated,
+            "values_skipped": self.values_skipped,
+            "error": str(self.error) if self.error else None,
+        }
+
+    def _report(self):
+        if self.on_progress:
+            try:
+                self.on_progress(self.progress())
+            except Exception as e:
+                print(f"[KEYS] Progress callback failed: {e}")
+
+    def _connector(self):
+        if self.connector_factory is not None:
+            return self.connector_factory()
+        from backend.database import get_connector
+
+        return get_connector()
+
+    def _rotate_value(self, service, value):
+        if not value:
+            return value, False
+        try:
+            if service.is_current(value):
+                return value, False
+            return service.rotate(value.encode("utf-8")).decode("utf-8"), True
+        except InvalidToken:
+            # Not encrypted with any known key (e.g. a plain legacy value)
+            self.values_skipped += 1
+            return value, False
+
+    def _rotate_all(self, connector, service):
+        """Read every account, then write the re-encrypted values as one transaction.
+
+        The UPDATEs go through the database's write queue (one ticket, so the
+        queue's lock backoff and version bump apply). Each one only matches
+        while the row still holds the values that were read; an account
+        changed in between keeps its new value, which stays readable.
+        """
+        from backend.database.unit_of_work import transaction
+
+        rows = connector.fetchall(
+            "SELECT [Username], [Password], [2FA Secret] FROM [emp_list]"
+        ) or []
+        self.rows_total = len(rows)
+        self.rows_done = self.values_rotated = self.values_skipped = 0
+        self._report()
+        tx = transaction(connector)
+        for username, password, secret in rows:
+            new_password, changed_pw = self._rotate_value(service, password)
+            new_secret, changed_secret = self._rotate_value(service, secret)
+            if changed_pw or changed_secret:
+                query = "UPDATE [emp_list] SET [Password]=?, [2FA Secret]=? WHERE [Username]=?"
+                params = [new_password, new_secret, username]
+                for column, old in zip(self.COLUMNS, (password, secret)):
+                    if old is None:
+                        query += f" AND [{column}] IS NULL"
+                    else:
+                        query += f" AND [{column}]=?"
+                        params.append(old)
+                tx.execute(query, tuple(params))
+                self.values_rotated += int(changed_pw) + int(changed_secret)
+            self.rows_done += 1
+            self._report()
+        tx.commit()
+
+    def run(self):
+        """Rotate every stored value in one transaction; returns progress()."""
+        service = self.service or get_key_service()
+        self.status = "running"
+        self.error = None
+        self._report()
+        try:
+            connector = self._connector()
+            if hasattr(connector, "fetch_changes"):
+                raise RuntimeError(
+                    "Key rotation must run against the Access database, not the API"
+                )
+            self._rotate_all(connector, service)
+            service.save_state(
+                {
+                    "status": "done",
+                    "finished": datetime.now().isoformat(timespec="seconds"),
+                    "rows_done": self.rows_done,
+                    "rows_total": self.rows_total,
+                    "values_rotated": self.values_rotated,
+                    "values_skipped": self.values_skipped,
+                }
+            )
+            self.status = "done"
+            print(
+                f"[KEYS] Re-encrypted {self.values_rotated} value(s) in "
+                f"{self.rows_total} account(s)"
+            )
+        except Exception as e:
+            # Transaction rolled back; the rotation stays pending for a rerun
+            self.status = "failed"
+            self.error = e
+            print(f"[KEYS] Key rotation failed, will resume later: {e}")
+        self._report()
+        return self.progress()
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self.run, name="KeyRotation", daemon=True)
+        self._thread.start()
+
+    def join(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def resume_pending(self):
+        """Start the job in the background if a rotation was left pending."""
+        service = self.service or get_key_service()
+        if service.rotation_pending():
+            print("[KEYS] Resuming pending key rotation")
+            self.start()
+            return True
+        return False
+
+
+_service = None
+_job = None
+_singleton_lock = threading.Lock()
+
+
+def get_key_service():
+    """Return the process-wide KeyService."""
+    global _service
+    with _singleton_lock:
+        if _service is None:
+            _service = KeyService()
+        return _service
+
+
+def get_key_rotation_job():
+    """Return the process-wide KeyRotationJob (not started)."""
+    global _job
+    with _singleton_lock:
+        if _job is None:
+            _job = KeyRotationJob()
+        return _job
+
+
+def rotate_keys(on_progress=None, wait=False):
+    """Begin a rotation and re-encrypt stored values in the background."""
+    get_key_service().begin_rotation()
+    job = get_key_rotation_job()
+    job.on_progress = on_progress
+    job.start()
+    if wait:
+        job.join()
+    return job
+
+
+if __name__ == "__main__":
+    import sys
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "status"
+    if command == "rotate":
+        job = rotate_keys(
+            on_progress=lambda p: print(
+                f"[KEYS] {p['status']}: {p['rows_done']}/{p['rows_total']} accounts"
+            ),
+            wait=True,
+        )
+        sys.exit(0 if job.status == "done" else 1)
+    if command == "resume":
+        job = get_key_rotation_job()
+        if job.resume_pending():
+            job.join()
+        print(job.progress())
+    else:
+        print(get_key_service().load_state() or {"status": "never rotated"})
@@ -4,11 +4,14 @@ import os
 
 # Try to import the MySQL connector, but don't fail if it's not available
 try:
-    from .mysql_connector import MySQLConnector
+    from .mysql_connector import ItemConflictError, MySQLConnector
     MYSQL_AVAILABLE = True
 except ImportError:
     MYSQL_AVAILABLE = False
 
+    class ItemConflictError(Exception):
+        """Never raised without the MySQL connector; defined so callers can catch it."""
+
 # Determine which database connector to use based on environment variable
 DB_TYPE = os.environ.get("JJCIMS_DB_TYPE", "access").lower()
 
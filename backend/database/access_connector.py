@@ -1,6 +1,12 @@
+import os
 import pyodbc
-import time
 from .path_utils import resolve_db_path
+from .table_versions import version_bumps
+from .unit_of_work import UnitOfWork
+from .write_queue import LockBackoff, get_write_queue
+
+# Reads never queue behind writes; they only back off while the file is locked
+_read_backoff = LockBackoff(attempts=5)
 
 
 class AccessConnector:
@@ -17,19 +23,66 @@ class AccessConnector:
         self.connection = None
 
     def connect(self):
-        self.connection = pyodbc.connect(
+        self.connection = self._connect_raw()
+        return self.connection
+
+    def _connect_raw(self):
+        return pyodbc.connect(
             f"DRIVER={{Microsoft Access Driver (*.mdb, *.accdb)}};DBQ={self.db_path};"
         )
-        return self.connection
 
-    def execute_query(self, query, params=None, retries=3, delay=2):
-        """Execute a query with optional params and simple retry-on-locking logic.
+    @property
+    def write_queue(self):
+        """The process-wide single writer for this database file."""
+        key = os.path.normcase(os.path.abspath(self.db_path))
+        return get_write_queue(key, self._connect_raw, version_bumps(key, self._connect_raw))
 
-        This method opens a fresh connection for each attempt to avoid using
-        closed/half-closed connections after failures.
+    def execute_query(self, query, params=None, retries=None, delay=None):
+        """Execute a write and wait for it to commit.
+
+        The statement goes through this database's write queue, so writes
+        from every window of the process are serialized and batched, and
+        lock errors are retried with jittered exponential backoff. The
+        caller waits through that backoff: Tk handlers on busy paths should
+        use submit_query / submit_statements with an on_tk callback instead.
+        retries/delay are accepted for compatibility and ignored.
         """
-        last_exc = None
-        for attempt in range(retries):
+        self.write_queue.execute(query, params)
+
+    def executemany(self, query, seq_of_params):
+        """Run query once per parameter row in one transaction (fast_executemany)."""
+        rows = [tuple(p) for p in seq_of_params]
+        if rows:
+            self.write_queue.execute_statements([(query, rows, True)])
+
+    def transaction(self):
+        """Unit of work whose writes commit together (see unit_of_work.py)."""
+        return UnitOfWork(self)
+
+    def commit_statements(self, statements):
+        """Run [(query, params, many), ...] in one transaction and wait for it."""
+        self.write_queue.execute_statements(statements)
+
+    def submit_statements(self, statements, callback=None):
+        """Queue [(query, params, many), ...] as one transaction without waiting."""
+        return self.write_queue.submit_statements(statements, callback)
+
+    def submit_query(self, query, params=None, callback=None, coalesce_key=None):
+        """Queue a write without waiting; returns a WriteTicket.
+
+        callback(ticket) runs once the write committed or failed (check
+        ticket.error). Pending writes with the same coalesce_key collapse
+        into the latest one.
+        """
+        return self.write_queue.submit(query, params, callback, coalesce_key)
+
+    def write_metrics(self):
+        return self.write_queue.metrics()
+
+    def _read(self, query, params, fetch):
+        """Run a SELECT on a fresh connection, backing off while the file is locked."""
+
+        def attempt():
             connection = self.connect()
             cursor = connection.cursor()
             try:
@@ -37,18 +90,7 @@ class AccessConnector:
                     cursor.execute(query, params)
                 else:
                     cursor.execute(query)
-                connection.commit()
-                return
-            except pyodbc.Error as e:
-                last_exc = e
-                if "locked" in str(e).lower():
-                    if attempt < retries - 1:
-                        time.sleep(delay)
-                        continue
-                    else:
-                        raise
-                else:
-                    raise
+                return fetch(cursor)
             finally:
                 try:
                     cursor.close()
@@ -58,9 +100,8 @@ class AccessConnector:
                     connection.close()
                 except Exception:
                     pass
-        # If we exhausted retries, re-raise last exception
-        if last_exc:
-            raise last_exc
+
+        return _read_backoff.run(attempt)
 
     def get_2fa_secret(self, username):
         """Fetch the 2FA Secret for the given username from the emp_list table."""
@@ -83,79 +124,17 @@ class AccessConnector:
             except Exception:
                 pass
 
-    def fetchall(self, query, params=None, retries=3, delay=2):
+    def fetchall(self, query, params=None, retries=None, delay=None):
         """Execute a SELECT query and return all rows.
 
-        Uses the same retry-on-lock logic as execute_query and ensures
-        connections/cursors are closed.
+        Lock errors are retried with jittered backoff; connections and
+        cursors are always closed.
         """
-        last_exc = None
-        for attempt in range(retries):
-            connection = self.connect()
-            cursor = connection.cursor()
-            try:
-                if params:
-                    cursor.execute(query, params)
-                else:
-                    cursor.execute(query)
-                rows = cursor.fetchall()
-                return rows
-            except pyodbc.Error as e:
-                last_exc = e
-                if "locked" in str(e).lower():
-                    if attempt < retries - 1:
-                        time.sleep(delay)
-                        continue
-                    else:
-                        raise
-                else:
-                    raise
-            finally:
-                try:
-                    cursor.close()
-                except Exception:
-                    pass
-                try:
-                    connection.close()
-                except Exception:
-                    pass
-        if last_exc:
-            raise last_exc
+        return self._read(query, params, lambda cursor: cursor.fetchall())
 
-    def fetchone(self, query, params=None, retries=3, delay=2):
+    def fetchone(self, query, params=None, retries=None, delay=None):
         """Execute a SELECT query and return a single row (or None)."""
-        last_exc = None
-        for attempt in range(retries):
-            connection = self.connect()
-            cursor = connection.cursor()
-            try:
-                if params:
-                    cursor.execute(query, params)
-                else:
-                    cursor.execute(query)
-                row = cursor.fetchone()
-                return row
-            except pyodbc.Error as e:
-                last_exc = e
-                if "locked" in str(e).lower():
-                    if attempt < retries - 1:
-                        time.sleep(delay)
-                        continue
-                    else:
-                        raise
-                else:
-                    raise
-            finally:
-                try:
-                    cursor.close()
-                except Exception:
-                    pass
-                try:
-                    connection.close()
-                except Exception:
-                    pass
-        if last_exc:
-            raise last_exc
+        return self._read(query, params, lambda cursor: cursor.fetchone())
 
     def close(self):
         """Close any existing database connection."""
@@ -0,0 +1,506 @@
+"""Write-behind audit log writer.
+
+UI actions hand their adm_logs / emp_logs rows to a process-wide
+AuditLogWriter instead of writing them inline. Each row is appended to a
+local journal file straight away (so nothing is lost if the app dies) and a
+background thread flushes batches into the database, each batch as one
+ticket on the database's write queue (one executemany per table, one
+commit, serialized with every other write of the process). stock_movements rows (see stock_ledger) ride the
+same journal so a checkout's ledger entry is flushed with its log line.
+
+The journal is local to the machine and the process
+(%LOCALAPPDATA%/JJCIMS/audit_journal-<db>-<host>-<pid>.jsonl), never next to
+the shared database, and each writer holds an OS lock on its own journal
+while it runs. On start-up the writer re-queues rows left in journals of
+the same database whose lock it can take, i.e. whose process is gone (a
+crash or a failed flush); journals of live processes are left alone.
+Delivery is at-least-once: a crash between the database commit and the
+journal rewrite can replay the last batch.
+"""
+
+import atexit
+import glob
+import hashlib
+import json
+import os
+import socket
+import tempfile
+import threading
+from datetime import datetime
+
+from .path_utils import get_db_path
+
+EMP_LOG_INSERT = (
+    "INSERT INTO [emp_logs] ([DATE], [TIME], [NAME], [DETAILS]) VALUES (?, ?, ?, ?)"
+)
+ADMIN_LOG_INSERT = (
+    "INSERT INTO [adm_logs] ([DATE],[TIME],[USER],[DETAILS]) VALUES (?,?,?,?)"
+)
+
+_INSERT_SQL = {
+    "emp_logs": EMP_LOG_INSERT,
+    "adm_logs": ADMIN_LOG_INSERT,
+}
+LEDGER_TABLE = "stock_movements"
+
+# Older databases may lack adm_logs; it is created on first use
+_CREATE_ADMIN_LOGS = (
+    "CREATE TABLE [adm_logs] (ID AUTOINCREMENT PRIMARY KEY, [DATE] DATETIME, "
+    "[TIME] TEXT(8), [USER] TEXT(255), [DETAILS] TEXT(255))"
+)
+_ensured_admin_logs = set()  # db paths whose adm_logs table is known to exist
+_TABLES = set(_INSERT_SQL) | {LEDGER_TABLE}
+
+JOURNAL_PREFIX = "audit_journal"
+FLUSH_INTERVAL_MS = int(os.environ.get("JJCIMS_AUDIT_FLUSH_MS", "500"))
+FLUSH_BATCH_SIZE = int(os.environ.get("JJCIMS_AUDIT_BATCH", "50"))
+
+
+def journal_dir():
+    """Machine-local directory for audit journals (JJCIMS_AUDIT_JOURNAL_DIR overrides)."""
+    override = os.environ.get("JJCIMS_AUDIT_JOURNAL_DIR")
+    if override:
+        return override
+    base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    if not os.path.isdir(base):
+        base = tempfile.gettempdir()
+    return os.path.join(base, "JJCIMS")
+
+
+def _journal_prefix():
+    """audit_journal-<db>: journals of the same database share this prefix."""
+    db = os.path.normcase(os.path.abspath(get_db_path()))
+    return f"{JOURNAL_PREFIX}-{hashlib.sha1(db.encode('utf-8')).hexdigest()[:10]}"
+
+
+def default_journal_path():
+    """This process's journal: audit_journal-<db>-<host>-<pid>.jsonl."""
+    host = "".join(c if c.isalnum() else "_" for c in socket.gethostname()) or "host"
+    return os.path.join(journal_dir(), f"{_journal_prefix()}-{host}-{os.getpid()}.jsonl")
+
+
+def ensure_admin_logs_table(connector):
+    """Create adm_logs if it is missing, on its own connection (DDL only)."""
+    key = getattr(connector, "db_path", None)
+    if key is not None and key in _ensured_admin_logs:
+        return
+    connection = connector.connect()
+    cursor = connection.cursor()
+    try:
+        if cursor.tables(table="adm_logs", tableType="TABLE").fetchone() is None:
+            print("[LOGGING] Creating adm_logs table")
+            cursor.execute(_CREATE_ADMIN_LOGS)
+            connection.commit()
+    finally:
+        try:
+            cursor.close()
+        except Exception:
+            pass
+        try:
+            connection.close()
+        except Exception:
+            pass
+    if key is not None:
+        _ensured_admin_logs.add(key)
+
+
+def _try_lock(path):
+    """Non-blocking exclusive lock on path + '.lock'; the open handle, or None if held."""
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        handle = open(path + ".lock", "a+")
+    except OSError:
+        return None
+    try:
+        if os.name == "nt":
+            import msvcrt
+
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        return None
+    return handle
+
+
+def _release(handle, path):
+    """Drop a lock taken by _try_lock and remove its lock file."""
+    try:
+        if os.name == "nt":
+            import msvcrt
+
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+    except OSError:
+        pass
+    handle.close()
+    try:
+        os.remove(path + ".lock")
+    except OSError:
+        pass
+
+
+class AuditLogWriter:
+    """Durable, asynchronous writer for adm_logs and emp_logs rows.
+
+    connector_factory is called from the flush thread to obtain a connector;
+    rows are flushed every flush_interval_ms or as soon as batch_size rows are
+    waiting, whichever comes first. With the default journal_path, orphaned
+    journals of the same database (see the module docstring) are adopted.
+    """
+
+    def __init__(
+        self,
+        connector_factory,
+        journal_path=None,
+        flush_interval_ms=FLUSH_INTERVAL_MS,
+        batch_size=FLUSH_BATCH_SIZE,
+    ):
+        self.connector_factory = connector_factory
+        self.orphan_pattern = None
+        if journal_path is None:
+            journal_path = default_journal_path()
+            self.orphan_pattern = os.path.join(
+                os.path.dirname(journal_path), _journal_prefix() + "-*.jsonl"
+            )
+        self.journal_path = journal_path
+        self.flush_interval = max(flush_interval_ms, 10) / 1000.0
+        self.batch_size = max(batch_size, 1)
+
+        self._pending = []  # entries not yet committed to the database
+        self._in_flight = 0  # leading entries of _pending currently being written
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # one batch writer at a time
+        self._wakeup = threading.Condition(self._lock)
+        self._idle = threading.Condition(self._lock)
+        self._stopping = False
+        self._journal = None
+        self._thread = None
+        self._owner_lock = _try_lock(self.journal_path)
+        if self._owner_lock is None:
+            print(f"[LOGGING] Audit journal {self.journal_path} is locked by another process")
+
+        self._recover()
+
+    # -------------------------
+    # Public API
+    # -------------------------
+    def start(self):
+        """Start the background flush thread (idempotent)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(
+                target=self._run, name="AuditLogWriter", daemon=True
+            )
+            self._thread.start()
+
+    def enqueue(self, table, row):
+        """Journal a row for table ('emp_logs', 'adm_logs' or 'stock_movements') and return immediately."""
+        if table not in _TABLES:
+            raise ValueError(f"Unsupported audit table: {table}")
+        with self._lock:
+            self._seq += 1
+            entry = {"seq": self._seq, "table": table, "row": list(row)}
+            self._append_to_journal(entry)
+            self._pending.append(entry)
+            if len(self._pending) - self._in_flight >= self.batch_size:
+                self._wakeup.notify()
+
+    def flush(self, timeout=None):
+        """Block until every queued row has been written (or timeout expires).
+
+        Returns True when the queue drained, False otherwise. Views that read
+        the log tables call this first so freshly queued rows show up.
+        """
+        with self._lock:
+            if not self._pending:
+                return True
+            if self._thread is not None and self._thread.is_alive():
+                self._wakeup.notify()
+                self._idle.wait_for(lambda: not self._pending, timeout)
+                return not self._pending
+        # No flush thread (not started or already stopped): write inline
+        self._flush_once()
+        return self.pending_count() == 0
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def close(self, timeout=5.0):
+        """Flush outstanding rows and stop the background thread."""
+        with self._lock:
+            self._stopping = True
+            self._wakeup.notify()
+            thread = self._thread
+        if thread is not None and thread.is_alive():
+            thread.join(timeout)
+        # Whatever the thread could not write stays in the journal for next start
+        if self._pending:
+            try:
+                self._flush_once()
+            except Exception as e:
+                print(f"[LOGGING] Audit flush on exit failed: {e}")
+        with self._lock:
+            if self._journal is not None:
+                try:
+                    self._journal.close()
+                except Exception:
+                    pass
+                self._journal = None
+            if self._owner_lock is not None and not self._pending:
+                _release(self._owner_lock, self.journal_path)
+                self._owner_lock = None
+
+    # -------------------------
+    # Journal handling
+    # -------------------------
+    @staticmethod
+    def _read_journal(path):
+        entries = []
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                for line in fh:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Torn final line from a crash mid-append; skip it
+                        continue
+                    if entry.get("table") in _TABLES:
+                        entries.append(entry)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"[LOGGING] Could not read audit journal {path}: {e}")
+            return None
+        return entries
+
+    def _recover(self):
+        """Re-queue rows of our own journal and of journals whose process is gone."""
+        recovered = []
+        adopted = []  # (path, lock handle) of orphaned journals
+        if self._owner_lock is not None:
+            recovered += self._read_journal(self.journal_path) or []
+        if self.orphan_pattern and self._owner_lock is not None:
+            # Lock files alone are left by a process that died with nothing pending
+            paths = set(glob.glob(self.orphan_pattern))
+            paths.update(lock[: -len(".lock")] for lock in glob.glob(self.orphan_pattern + ".lock"))
+            for path in sorted(paths):
+                if os.path.normcase(path) == os.path.normcase(self.journal_path):
+                    continue
+                lock = _try_lock(path)
+                if lock is None:
+                    continue  # owned by a live process
+                entries = self._read_journal(path)
+                if entries is None:
+                    _release(lock, path)
+                    continue
+                recovered += entries
+                adopted.append((path, lock))
+        if recovered:
+            print(f"[LOGGING] Recovered {len(recovered)} audit row(s) from journal")
+        for seq, entry in enumerate(recovered, 1):
+            entry["seq"] = seq
+        self._pending = recovered
+        self._seq = len(recovered)
+        # Our journal holds the adopted rows before the orphans are removed
+        self._rewrite_journal()
+        for path, lock in adopted:
+            for stale in (path, path + ".tmp"):
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+            _release(lock, path)
+
+    def _open_journal(self):
+        if self._journal is None:
+            os.makedirs(os.path.dirname(self.journal_path) or ".", exist_ok=True)
+            self._journal = open(self.journal_path, "a", encoding="utf-8")
+        return self._journal
+
+    def _append_to_journal(self, entry):
+        try:
+            fh = self._open_journal()
+            fh.write(json.dumps(entry, default=str) + "\n")
+            fh.flush()
+            os.fsync(fh.fileno())
+        except OSError as e:
+            # Still queued in memory; only crash-durability is lost
+            print(f"[LOGGING] Audit journal append failed: {e}")
+
+    def _rewrite_journal(self):
+        """Replace the journal with the rows that are still pending (lock held)."""
+        if self._journal is not None:
+            try:
+                self._journal.close()
+            except Exception:
+                pass
+            self._journal = None
+        try:
+            if not self._pending:
+                if os.path.exists(self.journal_path):
+                    os.remove(self.journal_path)
+                return
+            tmp_path = self.journal_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                for entry in self._pending:
+                    fh.write(json.dumps(entry, default=str) + "\n")
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp_path, self.journal_path)
+        except OSError as e:
+            print(f"[LOGGING] Audit journal rewrite failed: {e}")
+
+    # -------------------------
+    # Flushing
+    # -------------------------
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._stopping and len(self._pending) < self.batch_size:
+                    self._wakeup.wait(self.flush_interval)
+                stopping = self._stopping
+            try:
+                self._flush_once()
+            except Exception as e:
+                # Rows stay queued and journaled; retry on the next tick
+                print(f"[LOGGING] Audit flush failed, will retry: {e}")
+                if stopping:
+                    return
+                with self._lock:
+                    self._wakeup.wait(self.flush_interval)
+            if stopping:
+                return
+
+    def _flush_once(self):
+        """Write everything currently pending in batches of batch_size."""
+        with self._flush_lock:
+            self._drain()
+
+    def _drain(self):
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._idle.notify_all()
+                    return
+                batch = self._pending[: self.batch_size]
+                self._in_flight = len(batch)
+            try:
+                self._write_batch(batch)
+            finally:
+                with self._lock:
+                    self._in_flight = 0
+            with self._lock:
+                del self._pending[: len(batch)]
+                self._rewrite_journal()
+
+    def _write_batch(self, batch):
+        grouped = {}
+        for entry in batch:
+            grouped.setdefault(entry["table"], []).append(tuple(entry["row"]))
+
+        from .stock_ledger import ensure_ledger_tables, movement_statements
+
+        connector = self.connector_factory()
+        try:
+            write_queue = getattr(connector, "write_queue", None)
+            if write_queue is None:
+                # Connector without a write queue (HTTP API): forward row by row
+                for table, rows in grouped.items():
+                    if table == LEDGER_TABLE:
+                        connector.post_stock_movements(rows)
+                        continue
+                    for row in rows:
+                        connector.execute_query(_INSERT_SQL[table], row)
+                self._written(grouped)
+                return
+
+            statements = []
+            for table, rows in grouped.items():
+                if table == "adm_logs":
+                    ensure_admin_logs_table(connector)
+                if table == LEDGER_TABLE:
+                    # DDL commits on its own connection, never inside the log batch
+                    ensure_ledger_tables(connector)
+                    statements += movement_statements(connector, rows)
+                else:
+                    statements.append((_INSERT_SQL[table], rows, True))
+            # One ticket on the database's single writer: the rows commit
+            # together, after any GUI write already queued
+            write_queue.submit_statements(statements).result()
+            self._written(grouped)
+        finally:
+            try:
+                connector.close()
+            except Exception:
+                pass
+
+    @staticmethod
+    def _written(grouped):
+        """Keep the log search index current with rows just committed."""
+        from .log_index import note_written
+
+        for table, rows in grouped.items():
+            try:
+                note_written(table, rows)
+            except Exception as e:
+                print(f"[AUDIT] Log index update failed: {e}")
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_audit_writer():
+    """Return the process-wide AuditLogWriter, starting it on first use."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            from . import get_connector
+
+            _writer = AuditLogWriter(get_connector)
+            _writer.start()
+            atexit.register(_writer.close)
+        return _writer
+
+
+def enqueue_log(table, who, details, when=None):
+    """Queue one audit row stamped with the current time (or when=(date, time))."""
+    if when is None:
+        now = datetime.now()
+        date_str = now.strftime("%Y-%m-%d")
+        time_str = now.strftime("%H:%M:%S")
+    else:
+        date_str, time_str = when
+    get_audit_writer().enqueue(table, (date_str, time_str, who, details))
+
+
+def enqueue_movement(item_name, qty, direction="OUT", user=None):
+    """Queue one stock_movements row (written with the audit rows)."""
+    from .stock_ledger import new_movement
+
+    get_audit_writer().enqueue(
+        LEDGER_TABLE, new_movement(item_name, qty, direction, user)
+    )
+
+
+def flush_audit_log(timeout=5.0):
+    """Flush queued audit rows if the writer has been started; no-op otherwise."""
+    if _writer is None:
+        return True
+    return _writer.flush(timeout)
@@ -0,0 +1,278 @@
+"""Change feed for keeping open screens current across workstations.
+
+A process-wide ChangeFeed runs one background watcher and hands change
+batches to the Tk thread of every attached screen:
+
+* MySQL mode long-polls the API's ``GET /changes`` endpoint and receives the
+  changed rows themselves, so screens can patch only those rows.
+* Access mode has no server to ask. The watcher stats the database file
+  (mtime and size) and, only when it changed, reads the table_versions rows
+  that every write bumps (see table_versions.py): one tiny query instead of
+  re-reading whole tables. Tables whose version moved get a new version
+  and a reset batch; screens reload them. Status recomputes do not bump
+  versions, so the dashboard's own [Update Status] run does not trigger a
+  refresh loop.
+
+Batches have the same shape in both modes::
+
+    {"version": int, "tables": {table: version}, "reset": bool,
+     "changes": [{"version", "table", "op", "id", "row"}]}
+
+op is "upsert", "delete" or "clear".
+"""
+
+import os
+import queue
+import threading
+
+from .path_utils import get_db_path
+
+ALL_TABLES = ("ITEMSDB", "emp_logs", "adm_logs", "emp_list")
+
+LONG_POLL_SECONDS = float(os.environ.get("JJCIMS_CHANGES_WAIT", "25"))
+FILE_POLL_SECONDS = float(os.environ.get("JJCIMS_CHANGES_FILE_POLL", "1.0"))
+ERROR_BACKOFF_SECONDS = 5.0
+PUMP_INTERVAL_MS = 500
+
+
+class ChangeListener:
+    """Delivers batches for one widget on its Tk thread.
+
+    Batches queued between two pumps are merged, so a burst of writes causes
+    a single callback.
+    """
+
+    def __init__(self, feed, widget, callback, tables, interval_ms):
+        self.feed = feed
+        self.widget = widget
+        self.callback = callback
+        self.tables = set(tables or ALL_TABLES)
+        self.interval_ms = interval_ms
+        self.queue = queue.Queue()
+        self._job = None
+        self._cancelled = False
+
+    def wants(self, batch):
+        if batch.get("reset"):
+            return bool(self.tables & set(batch.get("tables", ())))
+        return any(c.get("table") in self.tables for c in batch.get("changes", ()))
+
+    def schedule(self):
+        try:
+            self._job = self.widget.after(self.interval_ms, self._pump)
+        except Exception:
+            self.cancel()
+
+    def _pump(self):
+        self._job = None
+        if self._cancelled:
+            return
+        try:
+            if not self.widget.winfo_exists():
+                self.cancel()
+                return
+        except Exception:
+            self.cancel()
+            return
+        merged = None
+        while True:
+            try:
+                batch = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            merged = batch if merged is None else merge_batches(merged, batch)
+        if merged is not None:
+            merged = filter_batch(merged, self.tables)
+            try:
+                self.callback(merged)
+            except Exception as e:
+                print(f"[ChangeFeed] Listener callback failed: {e}")
+        self.schedule()
+
+    def cancel(self):
+        """Stop delivering batches to this widget."""
+        self._cancelled = True
+        if self._job is not None:
+            try:
+                self.widget.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+        self.feed._remove(self)
+
+
+def merge_batches(older, newer):
+    """Combine two consecutive batches, keeping the latest change per row."""
+    tables = dict(older.get("tables", {}))
+    tables.update(newer.get("tables", {}))
+    merged = {
+        "version": max(older.get("version", 0), newer.get("version", 0)),
+        "tables": tables,
+        "reset": bool(older.get("reset") or newer.get("reset")),
+        "changes": [],
+    }
+    latest = {}
+    for change in list(older.get("changes", ())) + list(newer.get("changes", ())):
+        if change.get("op") == "clear":
+            latest = {k: v for k, v in latest.items() if k[0] != change["table"]}
+        latest[(change["table"], change.get("id"))] = change
+    merged["changes"] = sorted(latest.values(), key=lambda c: c.get("version", 0))
+    return merged
+
+
+def filter_batch(batch, tables):
+    """Restrict a batch to the given tables."""
+    return {
+        "version": batch.get("version", 0),
+        "tables": {t: v for t, v in batch.get("tables", {}).items() if t in tables},
+        "reset": bool(batch.get("reset")),
+        "changes": [c for c in batch.get("changes", ()) if c.get("table") in tables],
+    }
+
+
+class ChangeFeed:
+    """One background watcher per process, fanned out to attached screens."""
+
+    def __init__(self, connector_factory=None, db_path=None):
+        self.connector_factory = connector_factory
+        self.db_path = db_path
+        self.version = 0
+        self.tables = {t: 0 for t in ALL_TABLES}
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # -------------------------
+    # Public API
+    # -------------------------
+    def attach(self, widget, callback, tables=None, interval_ms=PUMP_INTERVAL_MS):
+        """Call callback(batch) on widget's Tk thread whenever tables change.
+
+        Returns a ChangeListener; call cancel() on it when the screen closes
+        (it also stops by itself once the widget is destroyed).
+        """
+        listener = ChangeListener(self, widget, callback, tables, interval_ms)
+        with self._lock:
+            self._listeners.append(listener)
+        listener.schedule()
+        self.start()
+        return listener
+
+    def start(self):
+        with self._lock:
+            self._stop.clear()
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="ChangeFeed", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def publish(self, batch):
+        """Hand a batch to every interested listener (any thread)."""
+        self.version = max(self.version, batch.get("version", 0))
+        self.tables.update(batch.get("tables", {}))
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            if listener.wants(batch):
+                listener.queue.put(batch)
+
+    def _remove(self, listener):
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+            if not self._listeners:
+                self._stop.set()
+
+    # -------------------------
+    # Watchers
+    # -------------------------
+    def _connector(self):
+        if self.connector_factory is not None:
+            return self.connector_factory()
+        from . import get_connector
+
+        return get_connector()
+
+    def _run(self):
+        connector = self._connector()
+        if hasattr(connector, "fetch_changes"):
+            self._watch_api(connector)
+        else:
+            self._watch_file(connector)
+
+    def _watch_api(self, connector):
+        since = -1  # first request only learns the current version
+        while not self._stop.is_set():
+            try:
+                batch = connector.fetch_changes(
+                    since, wait=0 if since < 0 else LONG_POLL_SECONDS
+                )
+            except Exception as e:
+                print(f"[ChangeFeed] Change poll failed, retrying: {e}")
+                self._stop.wait(ERROR_BACKOFF_SECONDS)
+                continue
+            if since >= 0 and (batch.get("changes") or batch.get("reset")):
+                self.publish(batch)
+            since = max(since, batch.get("version", 0))
+
+    def _file_stamp(self, path):
+        try:
+            st = os.stat(path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _watch_file(self, connector):
+        from .table_versions import ensure_versions_table, read_versions
+
+        path = self.db_path or get_db_path()
+        stamp = self._file_stamp(path)
+        ensure_versions_table(connector.connect, os.path.normcase(os.path.abspath(path)))
+        try:
+            versions = read_versions(connector)
+        except Exception as e:
+            print(f"[ChangeFeed] Initial version read failed: {e}")
+            versions = {}
+        while not self._stop.wait(FILE_POLL_SECONDS):
+            current = self._file_stamp(path)
+            if current is None or current == stamp:
+                continue
+            try:
+                latest = read_versions(connector)
+            except Exception as e:
+                # Locked by a writer, or table_versions not created yet
+                print(f"[ChangeFeed] Version read failed, retrying: {e}")
+                continue
+            stamp = current
+            changed = [t for t in ALL_TABLES if latest.get(t) != versions.get(t)]
+            versions = latest
+            if not changed:
+                continue
+            version = self.version + 1
+            self.publish(
+                {
+                    "version": version,
+                    "tables": {t: version for t in changed},
+                    "reset": True,
+                    "changes": [],
+                }
+            )
+
+
+_feed = None
+_feed_lock = threading.Lock()
+
+
+def get_change_feed():
+    """Return the process-wide ChangeFeed."""
+    global _feed
+    with _feed_lock:
+        if _feed is None:
+            _feed = ChangeFeed()
+        return _feed
@@ -0,0 +1,310 @@
+"""Local read replica of ITEMSDB and emp_list for MySQL/API mode.
+
+With ``JJCIMS_LOCAL_REPLICA=1`` each client keeps an embedded SQLite copy of
+the item table and the employee list, so kiosk browsing (dashboard list,
+by-type lists, search, unit of measure, usernames) never waits on the API:
+
+* A background thread loads both tables once through ``/stream`` and then
+  follows ``GET /changes`` (long-poll) from the stored version, applying the
+  pushed rows. A reset batch, a change log that went backwards or a
+  different API URL triggers a full reload.
+* MySQLConnector answers the mapped reads from the replica once it is ready
+  and keeps forwarding every write to the API. After a write it calls
+  sync_now(), which pulls the resulting changes at once so the client reads
+  its own writes.
+* The file survives restarts; a kiosk that cannot reach the server keeps
+  browsing the last synced data.
+
+Credentials (Password, 2FA Secret) are not replicated: the change feed never
+pushes them and those lookups stay on the API.
+"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from .change_feed import ERROR_BACKOFF_SECONDS, LONG_POLL_SECONDS
+
+REPLICA_ENABLED = os.environ.get("JJCIMS_LOCAL_REPLICA", "0").lower() in ("1", "true", "yes")
+REPLICA_TABLES = ("ITEMSDB", "emp_list")
+
+# Same order as the API's ItemDB columns (and so /stream/items)
+ITEM_COLUMNS = (
+    "ID", "NAME", "BRAND", "TYPE", "LOCATION", "UNIT_OF_MEASURE", "STATUS",
+    "BALANCE", "IN", "OUT", "Supplier", "PO_no", "ROW_VERSION",
+)
+EMPLOYEE_COLUMNS = ("id", "Username", "Access_Level")
+SEARCH_COLUMNS = ("NAME", "BRAND", "TYPE", "LOCATION", "Supplier")
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS items ("
+    + ", ".join(f'"{c}"' + (" INTEGER PRIMARY KEY" if c == "ID" else "") for c in ITEM_COLUMNS)
+    + ")",
+    'CREATE INDEX IF NOT EXISTS ix_items_type ON items ("TYPE")',
+    'CREATE INDEX IF NOT EXISTS ix_items_name ON items ("NAME")',
+    "CREATE TABLE IF NOT EXISTS employees (id INTEGER PRIMARY KEY, Username TEXT, Access_Level INTEGER)",
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)",
+)
+
+
+def _default_path():
+    override = os.environ.get("JJCIMS_REPLICA_PATH")
+    if override:
+        return override
+    base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    if not os.path.isdir(base):
+        base = tempfile.gettempdir()
+    return os.path.join(base, "JJCIMS", "replica.sqlite3")
+
+
+def _placeholders(columns):
+    return ", ".join("?" for _ in columns)
+
+
+_ITEM_INSERT = (
+    "INSERT OR REPLACE INTO items ("
+    + ", ".join(f'"{c}"' for c in ITEM_COLUMNS)
+    + f") VALUES ({_placeholders(ITEM_COLUMNS)})"
+)
+_EMPLOYEE_INSERT = (
+    f"INSERT OR REPLACE INTO employees (id, Username, Access_Level) VALUES ({_placeholders(EMPLOYEE_COLUMNS)})"
+)
+
+
+class LocalReplica:
+    """SQLite copy of ITEMSDB and emp_list kept current from /changes."""
+
+    def __init__(self, connector_factory=None, path=None, api_url=None):
+        self.connector_factory = connector_factory
+        self.path = path or _default_path()
+        self.api_url = api_url
+        self.version = -1
+        self.ready = False
+        self.last_sync = None  # time.time() of the last successful sync
+        self._db = None
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # -------------------------
+    # Lifecycle
+    # -------------------------
+    def start(self):
+        """Start the sync thread (idempotent); reads stay remote until ready."""
+        with self._lock:
+            self._stop.clear()
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="LocalReplica", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def wait_ready(self, timeout=None):
+        """Block until the replica can serve reads or timeout passes."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.ready:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            time.sleep(0.05)
+        return self.ready
+
+    def _connector(self):
+        if self.connector_factory is not None:
+            return self.connector_factory()
+        from .mysql_connector import MySQLConnector
+
+        return MySQLConnector(self.api_url)
+
+    def _open(self):
+        if self._db is not None:
+            return self._db
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        db = sqlite3.connect(self.path, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        for statement in SCHEMA:
+            db.execute(statement)
+        db.commit()
+        self._db = db
+        meta = dict(db.execute("SELECT key, value FROM meta"))
+        if meta.get("api_url") == str(self.api_url) and "version" in meta:
+            self.version = int(meta["version"])
+        return db
+
+    def _run(self):
+        connector = self._connector()
+        try:
+            with self._lock:
+                self._open()
+        except Exception as e:
+            print(f"[LocalReplica] Could not open {self.path}, reads stay remote: {e}")
+            return
+        while not self._stop.is_set():
+            try:
+                if self.version < 0:
+                    self.reload(connector)
+                else:
+                    self.sync(connector, wait=LONG_POLL_SECONDS if self.ready else 0)
+            except Exception as e:
+                if self.version >= 0 and not self.ready:
+                    # Server unreachable; browse the last synced copy meanwhile
+                    print(f"[LocalReplica] Serving last synced data (version {self.version}): {e}")
+                    self.ready = True
+                else:
+                    print(f"[LocalReplica] Sync failed, retrying: {e}")
+                self._stop.wait(ERROR_BACKOFF_SECONDS)
+
+    # -------------------------
+    # Sync
+    # -------------------------
+    def reload(self, connector=None):
+        """Replace both tables with a full copy from the API."""
+        connector = connector or self._connector()
+        version = connector.fetch_changes(-1, tables=REPLICA_TABLES).get("version", 0)
+        items = list(connector.stream_rows("items", ITEM_COLUMNS))
+        employees = list(connector.stream_rows("employees", EMPLOYEE_COLUMNS))
+        with self._lock:
+            db = self._open()
+            with db:
+                db.execute("DELETE FROM items")
+                db.execute("DELETE FROM employees")
+                db.executemany(_ITEM_INSERT, items)
+                db.executemany(_EMPLOYEE_INSERT, employees)
+                self._set_version(db, version)
+        self._synced()
+        print(f"[LocalReplica] Loaded {len(items)} items, {len(employees)} employees (version {version})")
+
+    def sync(self, connector=None, wait=0):
+        """Apply the changes after the stored version; returns True if applied.
+
+        Changes are fetched without holding the lock and dropped if another
+        sync advanced the version meanwhile (the next call picks them up).
+        """
+        connector = connector or self._connector()
+        since = self.version
+        batch = connector.fetch_changes(since, tables=REPLICA_TABLES, wait=wait)
+        if batch.get("reset") or batch.get("version", 0) < since:
+            self.reload(connector)
+            return True
+        with self._lock:
+            if since != self.version:
+                return False
+            db = self._open()
+            with db:
+                for change in batch.get("changes", ()):
+                    self._apply_change(db, change)
+                self._set_version(db, max(since, batch.get("version", 0)))
+        self._synced()
+        return True
+
+    def sync_now(self):
+        """Pull pending changes right away (after a write); never raises."""
+        if self.version < 0:
+            return False
+        try:
+            return self.sync(wait=0)
+        except Exception as e:
+            print(f"[LocalReplica] Reconcile after write failed, sync thread will catch up: {e}")
+            return False
+
+    def _synced(self):
+        self.last_sync = time.time()
+        self.ready = True
+
+    def _set_version(self, db, version):
+        db.executemany(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            (("version", str(version)), ("api_url", str(self.api_url))),
+        )
+        self.version = version
+
+    @staticmethod
+    def _apply_change(db, change):
+        table, op, row = change.get("table"), change.get("op"), change.get("row")
+        if table == "ITEMSDB":
+            if op == "clear":
+                db.execute("DELETE FROM items")
+            elif op == "upsert" and row:
+                db.execute(_ITEM_INSERT, tuple(row.get(c) for c in ITEM_COLUMNS))
+            else:
+                db.execute('DELETE FROM items WHERE "ID" = ?', (change.get("id"),))
+        elif table == "emp_list":
+            if op == "clear":
+                db.execute("DELETE FROM employees")
+            elif op == "upsert" and row:
+                db.execute(_EMPLOYEE_INSERT, tuple(row.get(c) for c in EMPLOYEE_COLUMNS))
+            else:
+                db.execute("DELETE FROM employees WHERE id = ?", (change.get("id"),))
+
+    # -------------------------
+    # Reads (shaped like the matching API responses)
+    # -------------------------
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._open().execute(sql, params).fetchall()
+
+    def employee_dashboard_rows(self):
+        """Rows of GET /items/employee-dashboard: [ID, NAME, Supplier, PO_no]."""
+        return [list(r) for r in self._query('SELECT "ID", "NAME", "Supplier", "PO_no" FROM items ORDER BY "ID"')]
+
+    def items_by_type(self, category):
+        """Item dicts of GET /items/by-type/{category}."""
+        rows = self._query('SELECT * FROM items WHERE "TYPE" = ? ORDER BY "ID"', (category,))
+        return [dict(zip(ITEM_COLUMNS, r)) for r in rows]
+
+    def all_items(self):
+        """Row tuples of GET /stream/items."""
+        return self._query('SELECT * FROM items ORDER BY "ID"')
+
+    def unit_of_measure(self, name):
+        rows = self._query('SELECT "UNIT_OF_MEASURE" FROM items WHERE "NAME" = ? ORDER BY "ID" LIMIT 1', (name,))
+        return rows[0] if rows else None
+
+    def usernames(self):
+        return self._query("SELECT Username FROM employees ORDER BY id")
+
+    def search_items(self, text, exclude_status=None, item_type=None):
+        """Ranked hits like GET /items/search (the API's LIKE-count ranking)."""
+        terms = [t for t in str(text).lower().split() if t]
+        if not terms:
+            return []
+        hits = [
+            f'(instr(lower(coalesce("{c}", \'\')), ?) > 0)'
+            for c in SEARCH_COLUMNS
+            for _ in terms
+        ]
+        params = [t for _ in SEARCH_COLUMNS for t in terms]
+        sql = f'SELECT *, {" + ".join(hits)} AS score FROM items'
+        where = []
+        if item_type is not None:
+            where.append('"TYPE" = ?')
+            params.append(item_type)
+        if exclude_status is not None:
+            where.append('("STATUS" IS NULL OR "STATUS" = \'\' OR "STATUS" <> ?)')
+            params.append(exclude_status)
+        sql = f"SELECT * FROM ({sql}{' WHERE ' + ' AND '.join(where) if where else ''}) WHERE score > 0"
+        rows = self._query(sql + ' ORDER BY score DESC, "NAME"', params)
+        return [dict(zip(ITEM_COLUMNS + ("score",), r)) for r in rows]
+
+
+_replica = None
+_replica_lock = threading.Lock()
+
+
+def get_local_replica(api_url=None):
+    """Return the process-wide LocalReplica, or None when it is disabled."""
+    global _replica
+    if not REPLICA_ENABLED:
+        return None
+    with _replica_lock:
+        if _replica is None:
+            if api_url is None:
+                from .mysql_connector import API_BASE_URL as api_url
+            _replica = LocalReplica(api_url=api_url)
+        return _replica
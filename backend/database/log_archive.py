@@ -0,0 +1,375 @@
+"""Log retention and compressed cold storage for emp_logs / adm_logs.
+
+Rows older than RETENTION_DAYS are moved out of the hot tables into
+gzip-compressed JSON-lines files, one per table and month, next to the
+database::
+
+    <db dir>/log_archive/index.json
+    <db dir>/log_archive/emp_logs/2025-01.jsonl.gz
+    <db dir>/log_archive/adm_logs/2025-01.jsonl.gz
+
+index.json records rows and first/last DATE per partition, so reads over a
+date range only open the partitions that overlap it. Archiving appends to
+the partition files first and deletes from the table afterwards; the index
+remembers each partition's size before the append ("pending"), so a run
+interrupted between the two steps is rolled back and redone on the next
+run instead of archiving rows twice.
+
+LogRetentionJob runs archive_all on a background thread at startup and then
+every ARCHIVE_INTERVAL_HOURS. A lock file keeps two workstations from
+archiving the same database at once.
+"""
+
+import gzip
+import json
+import os
+import tempfile
+import threading
+import time as _time
+from datetime import date, datetime, time, timedelta
+
+from .path_utils import get_db_path
+
+LOG_TABLES = {"emp_logs": "NAME", "adm_logs": "USER"}
+ARCHIVE_DIRNAME = "log_archive"
+INDEX_FILENAME = "index.json"
+LOCK_FILENAME = "archive.lock"
+
+RETENTION_DAYS = int(os.environ.get("JJCIMS_LOG_RETENTION_DAYS", "180"))
+ARCHIVE_INTERVAL_HOURS = float(os.environ.get("JJCIMS_LOG_ARCHIVE_INTERVAL_HOURS", "24"))
+STARTUP_DELAY_SECONDS = 60
+STALE_LOCK_SECONDS = 3600
+
+
+def archive_dir(db_path=None):
+    """Directory holding the archive for db_path (JJCIMS_LOG_ARCHIVE_DIR overrides)."""
+    override = os.environ.get("JJCIMS_LOG_ARCHIVE_DIR")
+    if override:
+        return override
+    db_path = db_path or get_db_path()
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), ARCHIVE_DIRNAME)
+
+
+def _date_text(value):
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.strftime("%Y-%m-%d")
+    return str(value).split(" ")[0]
+
+
+def _time_text(value):
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, time)):
+        return value.strftime("%H:%M:%S")
+    return str(value).split(" ")[-1]
+
+
+def _partition_of(day_text):
+    return day_text[:7] if len(day_text) >= 7 else "undated"
+
+
+class LogArchive:
+    """Date-partitioned, gzip-compressed archive of old log rows."""
+
+    def __init__(self, root=None, db_path=None):
+        self.root = root or archive_dir(db_path)
+        self._lock = threading.RLock()
+
+    # -------------------------
+    # Index
+    # -------------------------
+    @property
+    def index_path(self):
+        return os.path.join(self.root, INDEX_FILENAME)
+
+    def load_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self, index):
+        self._write_atomic(
+            self.index_path,
+            json.dumps(index, indent=1, sort_keys=True).encode("utf-8"),
+        )
+
+    def _partition_path(self, table, partition):
+        return os.path.join(self.root, table, f"{partition}.jsonl.gz")
+
+    @staticmethod
+    def _write_atomic(target, data):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(target), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, target)
+        except Exception:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+
+    # -------------------------
+    # Partition IO
+    # -------------------------
+    def _read_partition(self, table, partition):
+        path = self._partition_path(table, partition)
+        if not os.path.exists(path):
+            return []
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            return [json.loads(line) for line in fh if line.strip()]
+
+    def _write_partition(self, table, partition, rows):
+        payload = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in rows)
+        self._write_atomic(
+            self._partition_path(table, partition),
+            gzip.compress(payload.encode("utf-8")),
+        )
+
+    def _describe(self, rows):
+        days = [r[0] for r in rows if r and r[0]]
+        return {
+            "rows": len(rows),
+            "first": min(days) if days else "",
+            "last": max(days) if days else "",
+        }
+
+    # -------------------------
+    # Reads
+    # -------------------------
+    def partitions(self, table, start=None, end=None):
+        """Partition names of table overlapping [start, end] ('YYYY-MM-DD')."""
+        start = _date_text(start) if start else ""
+        end = _date_text(end) if end else ""
+        entries = self.load_index().get(table, {}).get("partitions", {})
+        names = []
+        for name, meta in entries.items():
+            if end and meta.get("first") and meta["first"] > end:
+                continue
+            if start and meta.get("last") and meta["last"] < start:
+                continue
+            names.append(name)
+        return sorted(names)
+
+    def read(self, table, start=None, end=None, newest_first=True):
+        """Archived rows [DATE, TIME, NAME/USER, DETAILS] within [start, end]."""
+        start_text = _date_text(start) if start else ""
+        end_text = _date_text(end) if end else ""
+        rows = []
+        with self._lock:
+            for partition in self.partitions(table, start, end):
+                for row in self._read_partition(table, partition):
+                    if start_text and row[0] < start_text:
+                        continue
+                    if end_text and row[0] > end_text:
+                        continue
+                    rows.append(row)
+        rows.sort(key=lambda r: (r[0], r[1]), reverse=newest_first)
+        return rows
+
+    def row_count(self, table):
+        entries = self.load_index().get(table, {}).get("partitions", {})
+        return sum(meta.get("rows", 0) for meta in entries.values())
+
+    # -------------------------
+    # Archiving
+    # -------------------------
+    def _recover(self, connector, table, index):
+        """Resolve a run interrupted between appending and deleting."""
+        entry = index.get(table, {})
+        pending = entry.get("pending")
+        if not pending:
+            return
+        row = connector.fetchone(
+            f"SELECT COUNT(*) FROM [{table}] WHERE [DATE] < ?", (pending["cutoff"],)
+        )
+        if row and row[0]:
+            # Delete never happened: drop the rows appended by that run
+            print(f"[ARCHIVE] Rolling back interrupted archive run for {table}")
+            for partition, before in pending["rows_before"].items():
+                rows = self._read_partition(table, partition)[:before]
+                if rows:
+                    self._write_partition(table, partition, rows)
+                    entry["partitions"][partition] = self._describe(rows)
+                else:
+                    try:
+                        os.remove(self._partition_path(table, partition))
+                    except OSError:
+                        pass
+                    entry["partitions"].pop(partition, None)
+        entry.pop("pending", None)
+        self._save_index(index)
+
+    def archive_table(self, connector, table, cutoff):
+        """Move rows of table with DATE < cutoff into the archive; returns the count."""
+        user_col = LOG_TABLES[table]
+        cutoff_text = _date_text(cutoff)
+        with self._lock:
+            index = self.load_index()
+            index.setdefault(table, {}).setdefault("partitions", {})
+            self._recover(connector, table, index)
+
+            rows = connector.fetchall(
+                f"SELECT [DATE], [TIME], [{user_col}], [DETAILS] FROM [{table}] "
+                "WHERE [DATE] < ? ORDER BY [DATE], [TIME]",
+                (cutoff_text,),
+            ) or []
+            if not rows:
+                return 0
+
+            by_partition = {}
+            for r in rows:
+                day = _date_text(r[0])
+                by_partition.setdefault(_partition_of(day), []).append(
+                    [day, _time_text(r[1]), r[2] or "", r[3] or ""]
+                )
+
+            entry = index[table]
+            entry["pending"] = {
+                "cutoff": cutoff_text,
+                "rows_before": {
+                    p: entry["partitions"].get(p, {}).get("rows", 0)
+                    for p in by_partition
+                },
+            }
+            self._save_index(index)
+
+            for partition, new_rows in by_partition.items():
+                merged = self._read_partition(table, partition) + new_rows
+                self._write_partition(table, partition, merged)
+                entry["partitions"][partition] = self._describe(merged)
+            self._save_index(index)
+
+            connector.execute_query(
+                f"DELETE FROM [{table}] WHERE [DATE] < ?", (cutoff_text,)
+            )
+            entry.pop("pending", None)
+            entry["archived_through"] = cutoff_text
+            self._save_index(index)
+            print(f"[ARCHIVE] Archived {len(rows)} {table} row(s) older than {cutoff_text}")
+            return len(rows)
+
+    def archive_all(self, connector, retention_days=RETENTION_DAYS, today=None):
+        """Archive every log table; returns {table: rows archived}."""
+        from .audit_log import flush_audit_log
+
+        flush_audit_log()
+        cutoff = (today or date.today()) - timedelta(days=max(int(retention_days), 0))
+        if not self._acquire():
+            print("[ARCHIVE] Another workstation is archiving; skipping this run")
+            return {}
+        try:
+            return {
+                table: self.archive_table(connector, table, cutoff)
+                for table in LOG_TABLES
+            }
+        finally:
+            self._release()
+
+    # -------------------------
+    # Cross-process lock
+    # -------------------------
+    def _acquire(self):
+        path = os.path.join(self.root, LOCK_FILENAME)
+        os.makedirs(self.root, exist_ok=True)
+        try:
+            if _time.time() - os.path.getmtime(path) > STALE_LOCK_SECONDS:
+                os.remove(path)
+        except OSError:
+            pass
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            os.write(fd, str(os.getpid()).encode("ascii"))
+            os.close(fd)
+            return True
+        except FileExistsError:
+            return False
+
+    def _release(self):
+        try:
+            os.remove(os.path.join(self.root, LOCK_FILENAME))
+        except OSError:
+            pass
+
+
+class LogRetentionJob:
+    """Background thread running LogArchive.archive_all on a schedule."""
+
+    def __init__(self, archive=None, connector_factory=None,
+                 interval_hours=ARCHIVE_INTERVAL_HOURS,
+                 startup_delay=STARTUP_DELAY_SECONDS):
+        self.archive = archive
+        self.connector_factory = connector_factory
+        self.interval = max(float(interval_hours), 0.01) * 3600
+        self.startup_delay = startup_delay
+        self.last_result = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="LogRetention", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def run_once(self):
+        if self.connector_factory is not None:
+            connector = self.connector_factory()
+        else:
+            from . import get_connector
+
+            connector = get_connector()
+        if hasattr(connector, "fetch_changes"):
+            # MySQL mode: retention belongs to the server, not the clients
+            return {}
+        archive = self.archive or get_log_archive()
+        self.last_result = archive.archive_all(connector)
+        return self.last_result
+
+    def _run(self):
+        if self._stop.wait(self.startup_delay):
+            return
+        while True:
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"[ARCHIVE] Retention run failed: {e}")
+            if self._stop.wait(self.interval):
+                return
+
+
+_archives = {}
+_job = None
+_singleton_lock = threading.Lock()
+
+
+def get_log_archive(db_path=None):
+    """Return the LogArchive for db_path (default database)."""
+    root = archive_dir(db_path)
+    with _singleton_lock:
+        archive = _archives.get(root)
+        if archive is None:
+            archive = LogArchive(root)
+            _archives[root] = archive
+        return archive
+
+
+def get_log_retention_job():
+    """Return the process-wide LogRetentionJob (not started)."""
+    global _job
+    with _singleton_lock:
+        if _job is None:
+            _job = LogRetentionJob()
+        return _job
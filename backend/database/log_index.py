@@ -0,0 +1,443 @@
+"""Inverted index over emp_logs / adm_logs for log search.
+
+Each indexed row gets a document id; the index keeps
+
+* token postings  - lowercase words of DETAILS (item names, brands, actions)
+* user postings   - NAME (emp_logs) / USER (adm_logs)
+* date buckets    - one posting list per DATE, with the days kept sorted so
+  a date range is a bisect plus a union of buckets
+
+so a query is a set intersection over posting lists rather than a LIKE scan
+of the table. Query text supports plain terms (all must match, prefix
+match), "quoted phrases" (e.g. multi-word item names), ``user:<name>``,
+``from:YYYY-MM-DD`` and ``to:YYYY-MM-DD``.
+
+The index is persisted next to the database as a JSON snapshot
+(log_index/<table>.json) plus an append-only delta file
+(<table>.delta.jsonl) and kept current incrementally: rows written by this
+process's audit writer are added as they commit, and before each search the
+table's fingerprint (COUNT, MAX(DATE), MAX(TIME)) is compared with the
+indexed one. New rows from other workstations are appended to the delta
+file, which is folded into the snapshot once it grows past
+DELTA_COMPACT_ROWS; deletions (clears, single-row deletes, archiving)
+trigger a rebuild. Syncing reads the database and touches disk, so the GUI
+runs it off the Tk thread.
+
+The index reads the Access file directly (COUNT/MAX fingerprint, date-bounded
+range reads), which the API connector does not map, so it is Access-only;
+index_supported() tells callers whether log search is available.
+"""
+
+import bisect
+import json
+import os
+import re
+import tempfile
+import threading
+import uuid
+from datetime import date, datetime, time
+
+from .access_connector import AccessConnector
+from .log_archive import LOG_TABLES
+from .path_utils import get_db_path
+
+INDEX_DIRNAME = "log_index"
+INDEX_VERSION = 2
+DELTA_COMPACT_ROWS = 20000  # fold the delta file into the snapshot past this
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_QUERY_RE = re.compile(r'(\w+):("[^"]*"|\S+)|"([^"]*)"|(\S+)')
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall(str(text or "").lower())
+
+
+def _date_text(value):
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.strftime("%Y-%m-%d")
+    return str(value).split(" ")[0]
+
+
+def _time_text(value):
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, time)):
+        return value.strftime("%H:%M:%S")
+    return str(value).split(" ")[-1]
+
+
+def normalize_row(row):
+    """[DATE, TIME, NAME/USER, DETAILS] as display strings."""
+    return [
+        _date_text(row[0]),
+        _time_text(row[1]),
+        "" if row[2] is None else str(row[2]),
+        "" if row[3] is None else str(row[3]),
+    ]
+
+
+class LogQuery:
+    """Parsed search text."""
+
+    def __init__(self, text):
+        self.terms = []
+        self.phrases = []
+        self.user = None
+        self.start = None
+        self.end = None
+        for field, value, phrase, word in _QUERY_RE.findall(text or ""):
+            if field:
+                value = value.strip('"')
+                field = field.lower()
+                if field == "user":
+                    self.user = value.lower()
+                    continue
+                if field == "from":
+                    self.start = value
+                    continue
+                if field == "to":
+                    self.end = value
+                    continue
+                word = f"{field} {value}"
+            if phrase:
+                self.phrases.append(phrase.lower())
+                self.terms.extend(tokenize(phrase))
+            elif word:
+                self.terms.extend(tokenize(word))
+
+    def matches(self, row):
+        """Check a normalized row directly (used for archived rows)."""
+        if self.start and row[0] < self.start:
+            return False
+        if self.end and row[0] > self.end:
+            return False
+        if self.user and row[2].lower() != self.user:
+            return False
+        tokens = tokenize(row[3])
+        for term in self.terms:
+            if not any(t.startswith(term) for t in tokens):
+                return False
+        details = row[3].lower()
+        return all(p in details for p in self.phrases)
+
+
+class LogIndex:
+    """Inverted index for one log table."""
+
+    def __init__(self, table, path=None):
+        self.table = table
+        self.user_col = LOG_TABLES[table]
+        self.path = path
+        self.delta_path = (
+            os.path.splitext(path)[0] + ".delta.jsonl" if path else None
+        )
+        self._lock = threading.RLock()
+        self._reset()
+        self._loaded = False
+
+    def _reset(self):
+        self.docs = []  # doc id -> normalized row
+        self.tokens = {}  # token -> [doc ids]
+        self.users = {}  # lowercase user -> [doc ids]
+        self.days = {}  # 'YYYY-MM-DD' -> [doc ids]
+        self.fingerprint = None
+        self.generation = None  # snapshot id; delta lines of other ids are stale
+        self._unsaved = []  # rows added since the last save
+        self._delta_rows = 0
+        self._saved_fingerprint = None
+        self._sorted_tokens = None
+        self._sorted_days = None
+
+    # -------------------------
+    # Maintenance
+    # -------------------------
+    def add_rows(self, rows):
+        """Index rows ([DATE, TIME, NAME/USER, DETAILS]) appended to the table."""
+        with self._lock:
+            for row in rows:
+                row = normalize_row(row)
+                doc = len(self.docs)
+                self.docs.append(row)
+                for token in set(tokenize(row[3])):
+                    self.tokens.setdefault(token, []).append(doc)
+                self.users.setdefault(row[2].lower(), []).append(doc)
+                self.days.setdefault(row[0], []).append(doc)
+                self._unsaved.append(row)
+            self._sorted_tokens = None
+            self._sorted_days = None
+
+    def note_written(self, rows):
+        """Rows committed by this process; fingerprint is re-checked on search."""
+        with self._lock:
+            if self._loaded:
+                self.add_rows(rows)
+                self.fingerprint = None
+
+    def _fingerprint(self, connector):
+        row = connector.fetchone(
+            f"SELECT COUNT(*), MAX([DATE]), MAX([TIME]) FROM [{self.table}]"
+        )
+        if not row:
+            return None
+        return [int(row[0] or 0), _date_text(row[1]), _time_text(row[2])]
+
+    def _fetch(self, connector, since_day=None):
+        query = (
+            f"SELECT [DATE], [TIME], [{self.user_col}], [DETAILS] FROM [{self.table}]"
+        )
+        params = ()
+        if since_day:
+            query += " WHERE [DATE] >= ?"
+            params = (since_day,)
+        return [normalize_row(r) for r in connector.fetchall(query + " ORDER BY [DATE], [TIME]", params) or []]
+
+    def rebuild(self, connector):
+        with self._lock:
+            self._reset()
+            self.add_rows(self._fetch(connector))
+            self.fingerprint = self._fingerprint(connector)
+            self._loaded = True
+            self.compact()
+
+    def sync(self, connector):
+        """Bring the index up to date with the table; returns True if it changed."""
+        with self._lock:
+            if not self._loaded:
+                self.load()
+            current = self._fingerprint(connector)
+            if current is not None and current == self.fingerprint:
+                return False
+            if not self.docs or current is None or current[0] < len(self.docs):
+                self.rebuild(connector)
+                return True
+            # Append rows on/after the newest indexed day that are not yet indexed
+            newest = max(self.days) if self.days else ""
+            known = {}
+            for doc in self.days.get(newest, ()):
+                key = tuple(self.docs[doc])
+                known[key] = known.get(key, 0) + 1
+            fresh = []
+            for row in self._fetch(connector, newest or None):
+                key = tuple(row)
+                if row[0] == newest and known.get(key):
+                    known[key] -= 1
+                    continue
+                fresh.append(row)
+            if len(self.docs) + len(fresh) != current[0]:
+                # Something was deleted and something else added: start over
+                self.rebuild(connector)
+                return True
+            self.add_rows(fresh)
+            self.fingerprint = current
+            self.save()
+            return True
+
+    # -------------------------
+    # Persistence
+    # -------------------------
+    def load(self):
+        self._loaded = True
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+            if data.get("version") != INDEX_VERSION:
+                return
+            self.docs = data["docs"]
+            self.tokens = data["tokens"]
+            self.users = data["users"]
+            self.days = data["days"]
+            self.fingerprint = data.get("fingerprint")
+            self.generation = data.get("generation")
+        except Exception as e:
+            print(f"[LOG INDEX] Ignoring unreadable index {self.path}: {e}")
+            self._reset()
+            return
+        self._load_delta()
+        self._unsaved = []
+        self._saved_fingerprint = self.fingerprint
+
+    def _load_delta(self):
+        """Replay delta lines written after the snapshot."""
+        if not os.path.exists(self.delta_path):
+            return
+        try:
+            with open(self.delta_path, "r", encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # torn last line from an interrupted append
+                    if entry.get("generation") != self.generation:
+                        continue
+                    self.add_rows(entry.get("rows") or [])
+                    self.fingerprint = entry.get("fingerprint")
+                    self._delta_rows += len(entry.get("rows") or [])
+        except Exception as e:
+            print(f"[LOG INDEX] Ignoring unreadable delta {self.delta_path}: {e}")
+
+    def save(self):
+        """Append rows added since the last save to the delta file."""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._unsaved and self.fingerprint == self._saved_fingerprint:
+                return
+            if self.generation is None or (
+                self._delta_rows + len(self._unsaved) > DELTA_COMPACT_ROWS
+            ):
+                self.compact()
+                return
+            entry = {
+                "generation": self.generation,
+                "fingerprint": self.fingerprint,
+                "rows": self._unsaved,
+            }
+            try:
+                with open(self.delta_path, "a", encoding="utf-8") as fh:
+                    fh.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            except Exception as e:
+                print(f"[LOG INDEX] Could not append to {self.delta_path}: {e}")
+                return
+            self._delta_rows += len(self._unsaved)
+            self._unsaved = []
+            self._saved_fingerprint = self.fingerprint
+
+    def compact(self):
+        """Rewrite the snapshot with everything indexed and drop the delta file."""
+        if not self.path:
+            return
+        with self._lock:
+            generation = uuid.uuid4().hex
+            data = {
+                "version": INDEX_VERSION,
+                "table": self.table,
+                "generation": generation,
+                "fingerprint": self.fingerprint,
+                "docs": self.docs,
+                "tokens": self.tokens,
+                "users": self.users,
+                "days": self.days,
+            }
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                fd, tmp = tempfile.mkstemp(
+                    dir=os.path.dirname(self.path), suffix=".tmp"
+                )
+                with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                    json.dump(data, fh, separators=(",", ":"))
+                os.replace(tmp, self.path)
+            except Exception as e:
+                print(f"[LOG INDEX] Could not save {self.path}: {e}")
+                return
+            # Lines of the old generation are skipped on load even if this fails
+            try:
+                if os.path.exists(self.delta_path):
+                    os.remove(self.delta_path)
+            except OSError as e:
+                print(f"[LOG INDEX] Could not remove {self.delta_path}: {e}")
+            self.generation = generation
+            self._delta_rows = 0
+            self._unsaved = []
+            self._saved_fingerprint = self.fingerprint
+
+    # -------------------------
+    # Queries
+    # -------------------------
+    def _token_docs(self, term):
+        """Union of postings for every token starting with term."""
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self.tokens)
+        keys = self._sorted_tokens
+        found = set()
+        i = bisect.bisect_left(keys, term)
+        while i < len(keys) and keys[i].startswith(term):
+            found.update(self.tokens[keys[i]])
+            i += 1
+        return found
+
+    def _day_docs(self, start, end):
+        if self._sorted_days is None:
+            self._sorted_days = sorted(self.days)
+        keys = self._sorted_days
+        lo = bisect.bisect_left(keys, start) if start else 0
+        hi = bisect.bisect_right(keys, end) if end else len(keys)
+        found = set()
+        for day in keys[lo:hi]:
+            found.update(self.days[day])
+        return found
+
+    def search(self, query, limit=None):
+        """Rows matching query (LogQuery or text), newest first."""
+        if not isinstance(query, LogQuery):
+            query = LogQuery(query)
+        with self._lock:
+            candidates = None
+            for term in sorted(set(query.terms), key=len, reverse=True):
+                docs = self._token_docs(term)
+                candidates = docs if candidates is None else candidates & docs
+                if not candidates:
+                    return []
+            if query.user is not None:
+                docs = set(self.users.get(query.user, ()))
+                candidates = docs if candidates is None else candidates & docs
+            if query.start or query.end:
+                docs = self._day_docs(query.start, query.end)
+                candidates = docs if candidates is None else candidates & docs
+            if candidates is None:
+                candidates = range(len(self.docs))
+            rows = [self.docs[d] for d in candidates]
+        if query.phrases:
+            rows = [
+                r for r in rows if all(p in r[3].lower() for p in query.phrases)
+            ]
+        rows.sort(key=lambda r: (r[0], r[1]), reverse=True)
+        return rows[:limit] if limit else rows
+
+
+def index_dir(db_path=None):
+    db_path = db_path or get_db_path()
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), INDEX_DIRNAME)
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_log_index(table, db_path=None):
+    """Return the persistent LogIndex for table of db_path (default database)."""
+    path = os.path.join(index_dir(db_path), f"{table}.json")
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is None:
+            index = LogIndex(table, path)
+            _indexes[path] = index
+        return index
+
+
+def note_written(table, rows):
+    """Audit writer hook: index rows just committed to table."""
+    if table not in LOG_TABLES:
+        return
+    with _indexes_lock:
+        indexes = [i for i in _indexes.values() if i.table == table]
+    for index in indexes:
+        index.note_written(rows)
+
+
+def index_supported(connector):
+    """True when connector can feed the log index (Access connections only)."""
+    return isinstance(connector, AccessConnector)
+
+
+def search_logs(connector, table, text, limit=None, db_path=None):
+    """Sync the index of table with the database and run text against it."""
+    if not index_supported(connector):
+        raise RuntimeError("Log search is only available with the Access database")
+    index = get_log_index(table, db_path)
+    index.sync(connector)
+    return index.search(text, limit)
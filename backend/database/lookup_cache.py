@@ -0,0 +1,186 @@
+"""Shared lookup-value cache for the item form combo boxes.
+
+The Add/Update item dialogs offer the distinct BRAND, TYPE, LOCATION,
+UNIT OF MEASURE and SUPPLIER values already used in ITEMSDB. Instead of one
+SELECT DISTINCT per field (plus COUNT(*) checks on every selection) the
+cache reads all five columns in a single pass, keeps a usage count per
+value, and is kept current by the item write paths via add_item /
+update_item / remove_item.
+"""
+
+import threading
+from collections import Counter
+
+LOOKUP_FIELDS = ("BRAND", "TYPE", "LOCATION", "UNIT OF MEASURE", "SUPPLIER")
+
+_LOAD_QUERY = (
+    "SELECT [NAME], [BRAND], [TYPE], [LOCATION], [UNIT OF MEASURE], [SUPPLIER] "
+    "FROM ITEMSDB"
+)
+
+
+def _normalize_field(field):
+    """Accept 'BRAND', '[BRAND]' or 'UNIT_OF_MEASURE' style field names."""
+    return str(field).strip("[]").replace("_", " ").upper()
+
+
+def _clean(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+class LookupCache:
+    """Per-field value counts for ITEMSDB lookup columns.
+
+    Membership and usage checks are dictionary lookups; the sorted value
+    list per field is rebuilt lazily only after a change to that field.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._counts = {field: Counter() for field in LOOKUP_FIELDS}
+        self._items = {}  # NAME -> {field: value}
+        self._sorted = {}
+        self._loaded = False
+
+    # -------------------------
+    # Loading
+    # -------------------------
+    def load(self, connector):
+        """(Re)build the cache from ITEMSDB with one query."""
+        rows = connector.fetchall(_LOAD_QUERY) or []
+        counts = {field: Counter() for field in LOOKUP_FIELDS}
+        items = {}
+        for row in rows:
+            values = {
+                field: _clean(row[i + 1]) for i, field in enumerate(LOOKUP_FIELDS)
+            }
+            for field, value in values.items():
+                if value is not None:
+                    counts[field][value] += 1
+            name = _clean(row[0])
+            if name is not None:
+                items[name] = values
+        with self._lock:
+            self._counts = counts
+            self._items = items
+            self._sorted = {}
+            self._loaded = True
+
+    def ensure_loaded(self, connector=None):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            if connector is None or not hasattr(connector, "fetchall"):
+                from . import get_connector
+
+                connector = get_connector()
+            self.load(connector)
+
+    def invalidate(self):
+        """Drop everything; the next read reloads from the database."""
+        with self._lock:
+            self._loaded = False
+            self._sorted = {}
+
+    # -------------------------
+    # Reads
+    # -------------------------
+    def values(self, field, connector=None):
+        """Return the sorted distinct values for field."""
+        self.ensure_loaded(connector)
+        field = _normalize_field(field)
+        with self._lock:
+            cached = self._sorted.get(field)
+            if cached is None:
+                cached = sorted(self._counts.get(field, ()), key=str.lower)
+                self._sorted[field] = cached
+            return list(cached)
+
+    def contains(self, field, value, connector=None):
+        return self.count(field, value, connector) > 0
+
+    def count(self, field, value, connector=None):
+        """Number of items currently using value for field."""
+        self.ensure_loaded(connector)
+        value = _clean(value)
+        if value is None:
+            return 0
+        with self._lock:
+            return self._counts.get(_normalize_field(field), {}).get(value, 0)
+
+    # -------------------------
+    # Incremental maintenance
+    # -------------------------
+    def add_item(self, name, fields):
+        """Record a newly inserted item. fields maps lookup field -> value."""
+        if not self._loaded:
+            return
+        with self._lock:
+            values = {field: None for field in LOOKUP_FIELDS}
+            for field, value in fields.items():
+                field = _normalize_field(field)
+                if field in values:
+                    values[field] = _clean(value)
+            self._apply(values, +1)
+            name = _clean(name)
+            if name is not None:
+                self._items[name] = values
+
+    def update_item(self, name, fields, new_name=None):
+        """Apply changed lookup fields for the item currently called name."""
+        if not self._loaded:
+            return
+        with self._lock:
+            old = self._items.get(_clean(name))
+            if old is None:
+                # Unknown item (e.g. inserted by another workstation): resync
+                self.invalidate()
+                return
+            new = dict(old)
+            for field, value in fields.items():
+                field = _normalize_field(field)
+                if field in new:
+                    new[field] = _clean(value)
+            self._apply(old, -1)
+            self._apply(new, +1)
+            self._items.pop(_clean(name), None)
+            self._items[_clean(new_name) or _clean(name)] = new
+
+    def remove_item(self, name):
+        """Forget an item deleted by NAME."""
+        if not self._loaded:
+            return
+        with self._lock:
+            old = self._items.pop(_clean(name), None)
+            if old is None:
+                self.invalidate()
+                return
+            self._apply(old, -1)
+
+    def _apply(self, values, delta):
+        for field, value in values.items():
+            if value is None:
+                continue
+            counter = self._counts[field]
+            before = counter.get(value, 0)
+            after = before + delta
+            if after > 0:
+                counter[value] = after
+            else:
+                counter.pop(value, None)
+            # Sorted list only changes when a value appears or disappears
+            if (before > 0) != (after > 0):
+                self._sorted.pop(field, None)
+
+
+_cache = LookupCache()
+
+
+def get_lookup_cache():
+    """Return the process-wide LookupCache."""
+    return _cache
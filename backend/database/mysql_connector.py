@@ -1,6 +1,14 @@
+import json
 import requests
+import re
+import threading
 import time
 import os
+import uuid
+from collections import OrderedDict
+from . import stock_ledger
+from .local_replica import get_local_replica
+from .unit_of_work import UnitOfWork, replay_statements
 from dotenv import load_dotenv
 from typing import List, Dict, Any, Optional, Tuple, Union
 
@@ -9,6 +17,165 @@ load_dotenv()
 
 API_BASE_URL = os.getenv("JJCIMS_API_URL", "http://localhost:8000")
 
+# Access column names (as used in the GUI's SQL) -> API item field names
+_ITEM_FIELDS = {
+    "ID": "ID",
+    "NAME": "NAME",
+    "BRAND": "BRAND",
+    "TYPE": "TYPE",
+    "LOCATION": "LOCATION",
+    "UNIT OF MEASURE": "UNIT_OF_MEASURE",
+    "UNIT_OF_MEASURE": "UNIT_OF_MEASURE",
+    "STATUS": "STATUS",
+    "BALANCE": "BALANCE",
+    "IN": "IN",
+    "OUT": "OUT",
+    "SUPPLIER": "Supplier",
+    "PO NO": "PO_no",
+    "PO_NO": "PO_no",
+}
+# emp_list column names -> API employee field names (bulk updates)
+_EMPLOYEE_FIELDS = {
+    "ACCESS LEVEL": "Access_Level",
+    "PASSWORD": "Password",
+    "2FA SECRET": "TFA_Secret",
+}
+# Stock counters are never re-applied blindly after a conflict
+_COUNTER_FIELDS = {"IN", "OUT", "BALANCE"}
+_SET_COLUMN_RE = re.compile(r"\[?([^\[\],=]+?)\]?\s*=\s*\?")
+# LIKE search shapes built by search_bar.search_items / MainBrowser.search_items
+_SUGGEST_RE = re.compile(
+    r"^select distinct \[([^\]]+)\] from \[itemsdb\] where lcase\(\[\1\]\) like \?", re.S
+)
+_LIKE_SEARCH_RE = re.compile(r"^select (.+?) from \[itemsdb\]\s+where (.+)$", re.S)
+_SELECT_COLUMN_RE = re.compile(r"\[([^\]]+)\]")
+_OUT_OF_STOCK_FILTER = "[status] <> 'out of stock'"
+SEARCH_PAGE_SIZE = 500
+CONFLICT_RETRIES = 3
+
+# Local copies of cacheable GET responses: url -> (etag, parsed json).
+# Shared by all connector instances since callers create them freely.
+CONDITIONAL_CACHE_SIZE = int(os.getenv("JJCIMS_CLIENT_CACHE_ENTRIES", "256"))
+_conditional_cache = OrderedDict()
+_conditional_lock = threading.Lock()
+
+# Server-Timing reported by the API: printed for every call with
+# JJCIMS_LOG_SERVER_TIMING=1, otherwise only for calls slower than
+# JJCIMS_SLOW_REQUEST_MS (0 disables)
+LOG_SERVER_TIMING = os.getenv("JJCIMS_LOG_SERVER_TIMING", "0").lower() in ("1", "true", "yes")
+SLOW_REQUEST_MS = float(os.getenv("JJCIMS_SLOW_REQUEST_MS", "1000"))
+
+
+def parse_server_timing(header):
+    """Parse a Server-Timing header into {name: milliseconds}."""
+    timings = {}
+    for metric in (header or "").split(","):
+        parts = [p.strip() for p in metric.split(";")]
+        if not parts[0]:
+            continue
+        duration = 0.0
+        for param in parts[1:]:
+            key, _, value = param.partition("=")
+            if key.strip() == "dur":
+                try:
+                    duration = float(value)
+                except ValueError:
+                    pass
+        timings[parts[0]] = duration
+    return timings
+
+
+class _TimedHTTP:
+    """requests.get/post/put/delete that time each call against Server-Timing.
+
+    The gap between the client's wall time and the server's "app" time is
+    the network (and client) share of a slow call.
+    """
+
+    def __init__(self):
+        self.last_server_timing = {}
+
+    def request(self, method, url, **kwargs):
+        started = time.perf_counter()
+        response = requests.request(method, url, **kwargs)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        try:
+            timings = parse_server_timing(response.headers.get("Server-Timing"))
+            self.last_server_timing = timings
+            if LOG_SERVER_TIMING or (SLOW_REQUEST_MS and elapsed_ms >= SLOW_REQUEST_MS):
+                server_ms = timings.get("app")
+                detail = ", ".join(f"{k} {v:.1f} ms" for k, v in timings.items()) or "no Server-Timing"
+                network = f", network+client {elapsed_ms - server_ms:.1f} ms" if server_ms is not None else ""
+                print(
+                    f"[MySQLConnector] {method} {url.split('?')[0]} {response.status_code} "
+                    f"in {elapsed_ms:.1f} ms (server: {detail}{network})"
+                )
+        except Exception as e:
+            print(f"[MySQLConnector] Could not read Server-Timing: {e}")
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+
+_http = _TimedHTTP()
+
+
+class ItemConflictError(Exception):
+    """PUT /items/{id} was rejected because the row changed (HTTP 409).
+
+    current holds the row as it is now (including ROW_VERSION).
+    """
+
+    def __init__(self, message, current=None):
+        super().__init__(message)
+        self.current = current or {}
+
+
+class _ApiCursor:
+    """Minimal DB-API style cursor over the connector's query mapping.
+
+    GUI code written against pyodbc (connect().cursor().execute(...)) works
+    unchanged for every query shape the connector knows how to route.
+    """
+
+    description = None
+
+    def __init__(self, connector):
+        self.connector = connector
+        self._rows = []
+
+    def execute(self, query, params=None):
+        if query.lstrip().lower().startswith("select"):
+            self._rows = list(self.connector.fetchall(query, params) or [])
+        else:
+            self.connector.execute_query(query, params)
+            self._rows = []
+        return self
+
+    def executemany(self, query, seq_of_params):
+        for params in seq_of_params:
+            self.connector.execute_query(query, params)
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def close(self):
+        self._rows = []
+
 
 class MySQLConnector:
     """Replacement for AccessConnector that connects to MySQL through FastAPI.
@@ -21,6 +188,7 @@ class MySQLConnector:
         """Initialize the connector with the API URL."""
         self.api_url = api_url or API_BASE_URL
         # No actual connection is maintained, all operations are stateless HTTP requests
+        self.connection = self
     
     def connect(self):
         """Simulate connection method for compatibility.
@@ -29,13 +197,57 @@ class MySQLConnector:
         """
         return self
     
+    def cursor(self):
+        """Return a cursor that routes statements through the API mapping."""
+        return _ApiCursor(self)
+    
+    def commit(self):
+        """Every API call commits on the server; nothing to do here."""
+    
+    def rollback(self):
+        """API calls cannot be rolled back from the client; nothing to do here."""
+    
+    def executemany(self, query, seq_of_params):
+        """Forward query once per parameter row (each call commits on the server)."""
+        for params in seq_of_params:
+            self.execute_query(query, params)
+
+    def transaction(self):
+        """Unit of work; statements are replayed in order on commit.
+
+        Each API call commits on the server, so this groups the calls but
+        is not atomic across them.
+        """
+        return UnitOfWork(self)
+
+    def commit_statements(self, statements):
+        replay_statements(self, statements)
+
+    def _replica(self):
+        """The local replica when enabled, bound to this API and ready, else None."""
+        replica = get_local_replica()
+        if replica is None or replica.api_url != self.api_url:
+            return None
+        replica.start()
+        return replica if replica.ready else None
+
     def execute_query(self, query, params=None, retries=3, delay=2):
         """Execute a query by forwarding to the appropriate API endpoint.
         
         This method translates common SQL operations to API calls. It's not a general SQL
         executor but rather maps known query patterns to specific API endpoints.
+        With the local replica enabled its pending changes are pulled right
+        after the write, so following reads see it.
         """
+        self._forward_query(query, params, retries, delay)
+        replica = self._replica()
+        if replica is not None:
+            replica.sync_now()
+
+    def _forward_query(self, query, params, retries, delay):
         last_exc = None
+        # Same key on every attempt, so the server applies a resent checkout once
+        request_key = uuid.uuid4().hex
         for attempt in range(retries):
             try:
                 # Extract operation and table from query
@@ -46,10 +258,29 @@ class MySQLConnector:
                     # Extract item name and quantity
                     name = params[1]
                     qty = params[0]
-                    response = requests.put(f"{self.api_url}/items/{name}/out/{qty}")
+                    response = _http.put(
+                        f"{self.api_url}/items/{name}/out/{qty}",
+                        headers={"Idempotency-Key": request_key},
+                    )
                     response.raise_for_status()
                     return
                 
+                # Handle partial item updates by ID (queries.update_item_by_id),
+                # conditional on the ROW_VERSION the caller read
+                elif query_lower.startswith("update itemsdb set") and query_lower.rstrip().endswith("where id = ? and [row_version] = ?"):
+                    set_clause = query[len("UPDATE ITEMSDB SET"):query_lower.rindex("where")]
+                    columns = _SET_COLUMN_RE.findall(set_clause)
+                    fields = dict(zip(columns, params[:-2]))
+                    self.update_item(params[-2], fields, expected_version=params[-1])
+                    return
+
+                elif query_lower.startswith("update itemsdb set") and query_lower.rstrip().endswith("where id = ?"):
+                    set_clause = query[len("UPDATE ITEMSDB SET"):query_lower.rindex("where")]
+                    columns = _SET_COLUMN_RE.findall(set_clause)
+                    fields = dict(zip(columns, params[:-1]))
+                    self.update_item(params[-1], fields)
+                    return
+                
                 # Handle INSERT operations for logs
                 elif query_lower.startswith("insert into [emp_logs]"):
                     # Extract log data
@@ -60,7 +291,7 @@ class MySQLConnector:
                         "NAME": name,
                         "DETAILS": details
                     }
-                    response = requests.post(f"{self.api_url}/employee-logs/", json=payload)
+                    response = _http.post(f"{self.api_url}/employee-logs/", json=payload)
                     response.raise_for_status()
                     return
                 
@@ -74,19 +305,19 @@ class MySQLConnector:
                         "USER": user,
                         "DETAILS": details
                     }
-                    response = requests.post(f"{self.api_url}/admin-logs/", json=payload)
+                    response = _http.post(f"{self.api_url}/admin-logs/", json=payload)
                     response.raise_for_status()
                     return
                 
                 # Handle DELETE operations for logs
                 elif query_lower == "delete from [emp_logs]":
-                    response = requests.delete(f"{self.api_url}/employee-logs/")
+                    response = _http.delete(f"{self.api_url}/employee-logs/")
                     response.raise_for_status()
                     return
                 
                 # Handle DELETE operations for admin logs
                 elif query_lower == "delete from [adm_logs]":
-                    response = requests.delete(f"{self.api_url}/admin-logs/")
+                    response = _http.delete(f"{self.api_url}/admin-logs/")
                     response.raise_for_status()
                     return
                 
@@ -94,15 +325,28 @@ class MySQLConnector:
                 elif query_lower.startswith("delete from itemsdb where name ="):
                     name = params[0]
                     # Find item ID first
-                    response = requests.get(f"{self.api_url}/items/?name={name}")
+                    response = _http.get(f"{self.api_url}/items/", params={"name": name, "limit": 1})
                     response.raise_for_status()
                     items = response.json()
                     if items:
                         item_id = items[0]["ID"]
-                        response = requests.delete(f"{self.api_url}/items/{item_id}")
+                        response = _http.delete(f"{self.api_url}/items/{item_id}")
                         response.raise_for_status()
                     return
                 
+                # Handle set-based user updates (queries.bulk_* helpers)
+                elif query_lower.startswith("update [emp_list] set") and " where [username] in (" in query_lower:
+                    set_clause = query[len("UPDATE [emp_list] SET"):query_lower.index(" where ")]
+                    columns = _SET_COLUMN_RE.findall(set_clause)
+                    self.bulk_update_employees(
+                        params[len(columns):], dict(zip(columns, params[:len(columns)]))
+                    )
+                    return
+                
+                elif query_lower.startswith("delete from [emp_list] where [username] in ("):
+                    self.bulk_delete_employees(params)
+                    return
+                
                 # For other queries, we would need to map them to specific API endpoints
                 # This is a simplified implementation and would need to be expanded
                 raise NotImplementedError(f"Query not supported: {query}")
@@ -121,7 +365,7 @@ class MySQLConnector:
     def get_2fa_secret(self, username):
         """Fetch the 2FA Secret for the given username."""
         try:
-            response = requests.get(f"{self.api_url}/employees/{username.lower()}/2fa-and-access")
+            response = _http.get(f"{self.api_url}/employees/{username.lower()}/2fa-and-access")
             response.raise_for_status()
             data = response.json()
             return data.get("2fa_secret")
@@ -132,8 +376,10 @@ class MySQLConnector:
     def fetchall(self, query, params=None, retries=3, delay=2):
         """Execute a SELECT query and return all rows.
         
-        Maps common SELECT queries to API endpoints.
+        Maps common SELECT queries to API endpoints. Item and username lists
+        come from the local replica when it is enabled and ready.
         """
+        replica = self._replica()
         last_exc = None
         for attempt in range(retries):
             try:
@@ -141,41 +387,51 @@ class MySQLConnector:
                 
                 # Get items for employee dashboard
                 if "select id, [items], [supplier], [po no] from [itemsdb]" in query_lower:
-                    response = requests.get(f"{self.api_url}/items/employee-dashboard")
-                    response.raise_for_status()
-                    return response.json()
+                    if replica is not None:
+                        return replica.employee_dashboard_rows()
+                    return self.get_json("/items/employee-dashboard")
                 
                 # Get items by type
                 elif "select id, name, brand, type, location, unit_of_measure, status, balance from itemsdb where type =" in query_lower:
                     category = params[0]
-                    response = requests.get(f"{self.api_url}/items/by-type/{category}")
-                    response.raise_for_status()
-                    return response.json()
+                    if replica is not None:
+                        return replica.items_by_type(category)
+                    return self.get_json(f"/items/by-type/{category}")
                 
-                # Get employee logs
+                # Get employee logs (streamed, no row cap)
                 elif "select [date], [time], [name], [details] from [emp_logs]" in query_lower:
-                    response = requests.get(f"{self.api_url}/employee-logs/")
-                    response.raise_for_status()
-                    return response.json()
+                    return list(self.stream_rows("employee-logs", ("DATE", "TIME", "NAME", "DETAILS")))
                 
-                # Get admin logs
+                # Get admin logs (streamed, no row cap)
                 elif "select [date], [time], [user], [details] from [adm_logs]" in query_lower:
-                    response = requests.get(f"{self.api_url}/admin-logs/")
-                    response.raise_for_status()
-                    return response.json()
+                    return list(self.stream_rows("admin-logs", ("DATE", "TIME", "USER", "DETAILS")))
                 
-                # Get all items
+                # Get all items (streamed, no row cap)
                 elif "select * from [itemsdb]" in query_lower:
-                    response = requests.get(f"{self.api_url}/items/")
-                    response.raise_for_status()
-                    return response.json()
+                    if replica is not None:
+                        return replica.all_items()
+                    return list(self.stream_rows("items"))
+                
+                # Ranked server-side search for the GUI's LIKE search shapes
+                elif _SUGGEST_RE.match(query_lower.strip()) or (
+                    _LIKE_SEARCH_RE.match(query_lower.strip()) and "like ?" in query_lower
+                ):
+                    return self._search_rows(query_lower.strip(), params)
+                
+                # Stock usage aggregates (stock_ledger range queries)
+                elif query == stock_ledger.USAGE_BY_ITEM_SQL:
+                    start, end = params
+                    return [tuple(r) for r in self._get_usage("/stock-usage", start, end)]
+                
+                elif query == stock_ledger.ITEM_DAILY_SQL:
+                    item_id, start, end = params
+                    return [tuple(r) for r in self._get_usage(f"/stock-usage/{item_id}/daily", start, end)]
                 
                 # Get employee usernames
                 elif "select username from [emp_list]" in query_lower:
-                    response = requests.get(f"{self.api_url}/employees/")
-                    response.raise_for_status()
-                    employees = response.json()
-                    return [(e["Username"],) for e in employees]
+                    if replica is not None:
+                        return replica.usernames()
+                    return list(self.stream_rows("employees", ("Username",)))
                 
                 # For other queries, we would need to map them to specific API endpoints
                 raise NotImplementedError(f"Query not supported: {query}")
@@ -201,15 +457,16 @@ class MySQLConnector:
                 # Get unit of measure for an item
                 if "select [unit of measure] from itemsdb where [name] =" in query_lower:
                     name = params[0]
-                    response = requests.get(f"{self.api_url}/items/{name}/unit-of-measure")
-                    response.raise_for_status()
-                    data = response.json()
+                    replica = self._replica()
+                    if replica is not None:
+                        return replica.unit_of_measure(name)
+                    data = self.get_json(f"/items/{name}/unit-of-measure")
                     return (data.get("unit_of_measure"),)
                 
                 # Get employee 2FA secret and access level
                 elif "select [2fa secret], [access level] from [emp_list] where lcase([username])=" in query_lower:
                     username_lower = params[0]
-                    response = requests.get(f"{self.api_url}/employees/{username_lower}/2fa-and-access")
+                    response = _http.get(f"{self.api_url}/employees/{username_lower}/2fa-and-access")
                     response.raise_for_status()
                     data = response.json()
                     return (data.get("2fa_secret"), data.get("access_level"))
@@ -217,7 +474,7 @@ class MySQLConnector:
                 # Get user by username (case-sensitive)
                 elif "select * from [emp_list] where [username]=" in query_lower:
                     username = params[0]
-                    response = requests.get(f"{self.api_url}/employees/{username}")
+                    response = _http.get(f"{self.api_url}/employees/{username}")
                     response.raise_for_status()
                     data = response.json()
                     # Convert to a row-like format similar to pyodbc
@@ -227,13 +484,19 @@ class MySQLConnector:
                 # Get user by lowercase username
                 elif "select * from [emp_list] where lcase([username])=" in query_lower:
                     username_lower = params[0]
-                    response = requests.get(f"{self.api_url}/employees/{username_lower}")
+                    response = _http.get(f"{self.api_url}/employees/{username_lower}")
                     response.raise_for_status()
                     data = response.json()
                     # Convert to a row-like format similar to pyodbc
                     return (data.get("id"), data.get("Username"), data.get("Password"), 
                            data.get("Access_Level"), data.get("TFA_Secret"))
                 
+                # Stock usage totals for one item
+                elif query == stock_ledger.ITEM_USAGE_SQL:
+                    item_id, start, end = params
+                    data = self._get_usage(f"/stock-usage/{item_id}", start, end)
+                    return (data.get("qty_out"), data.get("qty_in"))
+                
                 # Check if table exists
                 elif "select name from msysobjects where type=1 and flags=0 and name=?" in query_lower:
                     # For API, assume all standard tables exist
@@ -266,6 +529,228 @@ class MySQLConnector:
         if last_exc:
             raise last_exc
     
+    def get_json(self, path):
+        """GET path with If-None-Match, reusing the local copy on 304.
+
+        Unchanged data costs one header-only round trip instead of a query
+        and a full payload.
+        """
+        url = f"{self.api_url}{path}"
+        with _conditional_lock:
+            cached = _conditional_cache.get(url)
+        headers = {"If-None-Match": cached[0]} if cached else None
+        response = _http.get(url, headers=headers)
+        if response.status_code == 304 and cached:
+            with _conditional_lock:
+                if url in _conditional_cache:
+                    _conditional_cache.move_to_end(url)
+            return cached[1]
+        response.raise_for_status()
+        data = response.json()
+        etag = response.headers.get("ETag")
+        if etag:
+            with _conditional_lock:
+                _conditional_cache[url] = (etag, data)
+                _conditional_cache.move_to_end(url)
+                while len(_conditional_cache) > CONDITIONAL_CACHE_SIZE:
+                    _conditional_cache.popitem(last=False)
+        return data
+
+    def stream_rows(self, resource, fields=None):
+        """Yield row tuples from GET /stream/{resource} as they arrive.
+
+        The response is NDJSON (gzip-compressed on the wire); only the
+        projected fields are transferred when fields is given.
+        """
+        params = {"fields": ",".join(fields)} if fields else None
+        with _http.get(
+            f"{self.api_url}/stream/{resource}",
+            params=params,
+            stream=True,
+            headers={"Accept-Encoding": "gzip"},
+        ) as response:
+            response.raise_for_status()
+            lines = response.iter_lines(chunk_size=65536)
+            header = next(lines, None)
+            if header is None:
+                return
+            json.loads(header)  # {"columns": [...]} in the order of each row
+            for line in lines:
+                if line:
+                    yield tuple(json.loads(line))
+
+    def post_stock_movements(self, rows):
+        """Send stock_ledger movement rows to POST /stock-movements (idempotent)."""
+        payload = [
+            {
+                "MOVE_KEY": move_key,
+                "ITEM_NAME": item_name,
+                "QTY": qty,
+                "DIRECTION": direction,
+                "USER": user,
+                "MOVED_AT": moved_at.replace(" ", "T"),
+            }
+            for move_key, item_name, qty, direction, user, moved_at in rows
+        ]
+        response = _http.post(f"{self.api_url}/stock-movements", json=payload)
+        response.raise_for_status()
+        return response.json()
+
+    def _get_usage(self, path, start, end):
+        params = {"start": start.strftime("%Y-%m-%d"), "end": end.strftime("%Y-%m-%d")}
+        response = _http.get(f"{self.api_url}{path}", params=params)
+        response.raise_for_status()
+        return response.json()
+
+    def search_items(self, text, exclude_status=None, item_type=None):
+        """Return every hit of GET /items/search (ranked), fetching all pages.
+
+        Served by the local replica (same ranking as the API's LIKE fallback)
+        when it is enabled and ready.
+        """
+        replica = self._replica()
+        if replica is not None:
+            return replica.search_items(text, exclude_status, item_type)
+        hits = []
+        page = 1
+        while True:
+            params = {"q": text, "page": page, "page_size": SEARCH_PAGE_SIZE}
+            if exclude_status:
+                params["exclude_status"] = exclude_status
+            if item_type:
+                params["type"] = item_type
+            response = _http.get(f"{self.api_url}/items/search", params=params)
+            response.raise_for_status()
+            data = response.json()
+            hits.extend(data.get("items", []))
+            if len(hits) >= data.get("total", 0) or not data.get("items"):
+                return hits
+            page += 1
+
+    def _search_rows(self, query_lower, params):
+        """Answer a LCASE(...) LIKE ? search query from /items/search.
+
+        The LIKE patterns' terms become the search text; rows come back in
+        relevance order, shaped like the SELECT list of the original query.
+        """
+        terms = []
+        for param in params or ():
+            for term in str(param).strip("%").split():
+                if term and term not in terms:
+                    terms.append(term)
+        if not terms:
+            return []
+        exclude = "Out of Stock" if _OUT_OF_STOCK_FILTER in query_lower else None
+        hits = self.search_items(" ".join(terms), exclude_status=exclude)
+
+        suggest = _SUGGEST_RE.match(query_lower)
+        if suggest:
+            key = _ITEM_FIELDS.get(suggest.group(1).upper())
+            needle = terms[0]
+            seen = []
+            for hit in hits:
+                value = hit.get(key) if key else None
+                if value and needle in str(value).lower() and value not in seen:
+                    seen.append(value)
+            return [(value,) for value in seen]
+
+        select_list = _LIKE_SEARCH_RE.match(query_lower).group(1)
+        keys = [
+            _ITEM_FIELDS.get(col.strip().upper())
+            for col in _SELECT_COLUMN_RE.findall(select_list)
+        ]
+        # Columns the API does not have (e.g. MIN STOCK) come back as None
+        return [tuple(hit.get(k) if k else None for k in keys) for hit in hits]
+
+    def bulk_update_employees(self, usernames, fields):
+        """Set the same emp_list fields for every username (one request, one transaction)."""
+        payload = {}
+        for column, value in fields.items():
+            key = _EMPLOYEE_FIELDS.get(str(column).strip("[] ").upper())
+            if key is None:
+                raise NotImplementedError(f"Employee column not supported: {column}")
+            payload[key] = value
+        response = _http.post(
+            f"{self.api_url}/employees/bulk-update",
+            json={"usernames": list(usernames), "fields": payload},
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def bulk_delete_employees(self, usernames):
+        """Delete every username from emp_list (one request, one transaction)."""
+        response = _http.post(
+            f"{self.api_url}/employees/bulk-delete", json={"usernames": list(usernames)}
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def item_by_name(self, name):
+        """Current row of item NAME (API field names, with ID and ROW_VERSION) or None."""
+        response = _http.get(f"{self.api_url}/items/", params={"name": name, "limit": 1})
+        response.raise_for_status()
+        items = response.json()
+        return items[0] if items else None
+
+    def update_item(self, item_id, fields, expected_version=None, original=None):
+        """Write the given item fields through PUT /items/{id}.
+
+        fields may use Access column names ('UNIT OF MEASURE', 'PO NO').
+        With expected_version the update only applies to that ROW_VERSION and
+        a concurrent change raises ItemConflictError (with the current row)
+        for the caller to re-read and decide. It is re-sent against the new
+        version only when original (the values the caller read, same keys as
+        fields) shows that the other client changed none of these fields and
+        no stock counter (IN/OUT/BALANCE) is written, whose old value would
+        undo another client's checkout.
+        """
+        payload = {}
+        for column, value in fields.items():
+            key = _ITEM_FIELDS.get(str(column).strip("[] ").upper())
+            if key is None:
+                raise NotImplementedError(f"Item column not supported: {column}")
+            payload[key] = value
+        touches_counters = any(k.upper() in _COUNTER_FIELDS for k in payload)
+        base = None
+        if original is not None:
+            base = {_ITEM_FIELDS.get(str(c).strip("[] ").upper()): v for c, v in original.items()}
+
+        for attempt in range(CONFLICT_RETRIES + 1):
+            body = dict(payload)
+            if expected_version is not None:
+                body["ROW_VERSION"] = expected_version
+            response = _http.put(f"{self.api_url}/items/{item_id}", json=body)
+            if response.status_code != 409:
+                response.raise_for_status()
+                return response.json()
+            detail = response.json().get("detail", {})
+            current = detail.get("current", {}) if isinstance(detail, dict) else {}
+            untouched = base is not None and all(
+                key in base and str(current.get(key)) == str(base[key]) for key in payload
+            )
+            if touches_counters or not untouched or attempt == CONFLICT_RETRIES:
+                raise ItemConflictError(
+                    f"Item {item_id} was changed by another client", current
+                )
+            print(f"[MySQLConnector] Item {item_id} changed concurrently (other fields), retrying update")
+            expected_version = current.get("ROW_VERSION")
+        return None
+
+    def fetch_changes(self, since=-1, tables=None, wait=0):
+        """Long-poll the API change feed for changes after version since.
+
+        Returns the batch dict from GET /changes: version, per-table
+        versions, a reset flag and the compacted change rows.
+        """
+        params = {"since": since, "wait": wait}
+        if tables:
+            params["tables"] = ",".join(tables)
+        response = _http.get(
+            f"{self.api_url}/changes", params=params, timeout=wait + 10
+        )
+        response.raise_for_status()
+        return response.json()
+
     def close(self):
         """Close any existing database connection.
         
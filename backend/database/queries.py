@@ -2,15 +2,47 @@
 
 Place common SQL strings and small convenience wrappers here so UI code
 doesn't need to construct or execute raw SQL strings directly.
+
+Every helper takes a connector or a unit of work, so several of them can
+be committed together:
+
+    with queries.transaction(connector) as tx:
+        queries.delete_items_by_name(tx, names)
+        queries.insert_admin_logs(tx, [(user, details), ...])
 """
 
 from datetime import datetime
 
+from .audit_log import ADMIN_LOG_INSERT, enqueue_log, enqueue_movement, flush_audit_log
+from . import stock_ledger
+from .unit_of_work import run_now, transaction  # noqa: F401  (re-exported for callers)
+
+
+def _stamp(when=None):
+    if when is None:
+        now = datetime.now()
+        return now.strftime("%Y-%m-%d"), now.strftime("%H:%M:%S")
+    return when
+
+
+def update_item_out(connector, name, qty, callback=None):
+    """Increment the OUT counter for an item by name.
 
-def update_item_out(connector, name, qty):
-    """Increment the OUT counter for an item by name."""
+    The increment is done by the database (never read-modify-write), so
+    concurrent checkouts of the same item are all counted.
+
+    With a callback the write does not block on connectors with a write
+    queue: it is queued and callback(ticket) fires once it committed or
+    failed (check ticket.error). Elsewhere it runs synchronously and then
+    calls callback(ticket) the same way. The ticket is returned.
+    """
     query = "UPDATE ITEMSDB SET [OUT] = [OUT] + ? WHERE [NAME] = ?"
-    connector.execute_query(query, (qty, name))
+    if callback is None:
+        connector.execute_query(query, (qty, name))
+        return None
+    if hasattr(connector, "submit_query"):
+        return connector.submit_query(query, (qty, name), callback)
+    return run_now(lambda: connector.execute_query(query, (qty, name)), callback)
 
 
 def get_unit_of_measure(connector, name):
@@ -25,18 +57,59 @@ def get_unit_of_measure(connector, name):
 
 def insert_emp_log(connector, name, details, when=None):
     """Insert a log entry into emp_logs. when may be (date_str, time_str) or None."""
-    if when is None:
-        now = datetime.now()
-        date_str = now.strftime("%Y-%m-%d")
-        time_str = now.strftime("%H:%M:%S")
-    else:
-        date_str, time_str = when
+    date_str, time_str = _stamp(when)
     connector.execute_query(
         "INSERT INTO [emp_logs] ([DATE], [TIME], [NAME], [DETAILS]) VALUES (?, ?, ?, ?)",
         (date_str, time_str, name, details),
     )
 
 
+def queue_emp_log(name, details, when=None):
+    """Queue an emp_logs entry on the write-behind audit writer (non-blocking)."""
+    enqueue_log("emp_logs", name, details, when)
+
+
+def queue_stock_movement(item_name, qty, direction="OUT", user=None):
+    """Queue a stock_movements ledger row alongside the log (non-blocking)."""
+    enqueue_movement(item_name, qty, direction, user)
+
+
+# -------------------------
+# Stock usage (stock_daily aggregates)
+# -------------------------
+def _day_range(start, end):
+    return stock_ledger.as_day(start), stock_ledger.as_day(end)
+
+
+def fetch_usage_by_item(connector, start, end):
+    """Return {item_id: (qty_out, qty_in)} for every item with movements in [start, end].
+
+    start/end are dates (inclusive); reads one aggregate row per item-day.
+    """
+    flush_audit_log()
+    rows = connector.fetchall(stock_ledger.USAGE_BY_ITEM_SQL, _day_range(start, end)) or []
+    return {row[0]: (row[1] or 0, row[2] or 0) for row in rows}
+
+
+def fetch_item_usage(connector, item_id, start, end):
+    """Return (qty_out, qty_in) for one item over [start, end]."""
+    flush_audit_log()
+    row = connector.fetchone(
+        stock_ledger.ITEM_USAGE_SQL, (item_id,) + _day_range(start, end)
+    )
+    if not row:
+        return (0, 0)
+    return (row[0] or 0, row[1] or 0)
+
+
+def fetch_item_daily_usage(connector, item_id, start, end):
+    """Return [(day, qty_out, qty_in), ...] for one item, days with movements only."""
+    flush_audit_log()
+    return connector.fetchall(
+        stock_ledger.ITEM_DAILY_SQL, (item_id,) + _day_range(start, end)
+    ) or []
+
+
 def get_emp_2fa_and_access(connector, username_lower):
     """Return (2FA Secret, Access Level) for a lowercase username or None."""
     return connector.fetchone(
@@ -58,6 +131,32 @@ def fetch_items_by_type(connector, category):
     )
 
 
+ITEM_CATALOG_QUERY = (
+    "SELECT [ID], [NAME], [BRAND], [TYPE], [LOCATION], [UNIT OF MEASURE], [STATUS], [BALANCE] "
+    "FROM [ITEMSDB] WHERE [STATUS] <> 'Out of Stock' OR [STATUS] IS NULL OR [STATUS] = ''"
+)
+
+
+def fetch_item_catalog(connector):
+    """Rows of the employee dashboard's item table (everything not out of stock)."""
+    return connector.fetchall(ITEM_CATALOG_QUERY)
+
+
+def fetch_item_types(connector):
+    """Sorted distinct, non-empty TYPE values (the dashboard's type buttons)."""
+    rows = connector.fetchall(
+        "SELECT DISTINCT [TYPE] FROM [ITEMSDB] WHERE [TYPE] IS NOT NULL AND [TYPE] <> ''"
+    )
+    return sorted(set(row[0].strip() for row in rows if row[0]))
+
+
+def fetch_employee_names(connector):
+    """First, last and middle name plus username of every emp_list row."""
+    return connector.fetchall(
+        "SELECT [First Name], [Last Name], [Middle Name], [Username] FROM [emp_list]"
+    )
+
+
 # -------------------------
 # User / Auth helpers
 # -------------------------
@@ -104,6 +203,81 @@ def set_user_2fa_secret(connector, username, encrypted_secret):
     )
 
 
+# -------------------------
+# Bulk user operations (one statement, one transaction, one audit row)
+# -------------------------
+BULK_AUDIT_NAMES = 50  # usernames spelled out in the audit entry
+
+
+def _unique_usernames(usernames):
+    return list(dict.fromkeys(u for u in usernames if u))
+
+
+def _in_clause(values):
+    return ", ".join("?" * len(values))
+
+
+def _queue_bulk_audit(actor, action, usernames):
+    if not actor:
+        return
+    shown = ", ".join(usernames[:BULK_AUDIT_NAMES])
+    if len(usernames) > BULK_AUDIT_NAMES:
+        shown += f" and {len(usernames) - BULK_AUDIT_NAMES} more"
+    queue_admin_log(actor, f"{action} for {len(usernames)} user(s): {shown}")
+
+
+def bulk_set_access_level(connector, usernames, new_level, actor=None):
+    """Set [Access Level] for every username in one UPDATE; returns the count.
+
+    Demoting to Level 1 also clears Password and 2FA Secret, as a single
+    demotion does.
+    """
+    usernames = _unique_usernames(usernames)
+    if not usernames:
+        return 0
+    if new_level == "Level 1":
+        query = (
+            "UPDATE [emp_list] SET [Access Level]=?, [Password]=?, [2FA Secret]=? "
+            f"WHERE [Username] IN ({_in_clause(usernames)})"
+        )
+        params = (new_level, None, None, *usernames)
+    else:
+        query = (
+            "UPDATE [emp_list] SET [Access Level]=? "
+            f"WHERE [Username] IN ({_in_clause(usernames)})"
+        )
+        params = (new_level, *usernames)
+    connector.execute_query(query, params)
+    _queue_bulk_audit(actor, f"Bulk access level change to {new_level}", usernames)
+    return len(usernames)
+
+
+def bulk_reset_passwords(connector, usernames, encrypted_password, actor=None):
+    """Give every username the same (temporary) password in one UPDATE."""
+    usernames = _unique_usernames(usernames)
+    if not usernames:
+        return 0
+    connector.execute_query(
+        f"UPDATE [emp_list] SET [Password]=? WHERE [Username] IN ({_in_clause(usernames)})",
+        (encrypted_password, *usernames),
+    )
+    _queue_bulk_audit(actor, "Bulk password reset", usernames)
+    return len(usernames)
+
+
+def bulk_delete_users(connector, usernames, actor=None):
+    """Remove every username from emp_list in one DELETE."""
+    usernames = _unique_usernames(usernames)
+    if not usernames:
+        return 0
+    connector.execute_query(
+        f"DELETE FROM [emp_list] WHERE [Username] IN ({_in_clause(usernames)})",
+        tuple(usernames),
+    )
+    _queue_bulk_audit(actor, "Bulk employee removal", usernames)
+    return len(usernames)
+
+
 # -------------------------
 # Admin / Items CRUD
 # -------------------------
@@ -116,21 +290,56 @@ def add_item(connector, item_fields_tuple):
     )
 
 
-def update_item_by_id(connector, item_id, fields_dict):
+def update_item_by_name(connector, name, fields_dict):
+    """Update only the fields provided in fields_dict for the item NAME."""
+    if not fields_dict:
+        return
+    set_clause = ", ".join([f"[{k}] = ?" for k in fields_dict.keys()])
+    params = tuple(fields_dict.values()) + (name,)
+    connector.execute_query(f"UPDATE ITEMSDB SET {set_clause} WHERE NAME = ?", params)
+
+
+def update_item_by_id(connector, item_id, fields_dict, expected_version=None):
     """Update only the fields provided in fields_dict for the given ID.
 
     fields_dict: {column_name: value}
+
+    expected_version is the ROW_VERSION read with the row (fetch_item_current);
+    the update then only applies if nobody changed the row since. In MySQL
+    mode this becomes a conditional PUT /items/{id} and a concurrent change
+    raises ItemConflictError carrying the current row.
     """
     if not fields_dict:
         return
     set_clause = ", ".join([f"[{k}] = ?" for k in fields_dict.keys()])
     params = tuple(fields_dict.values()) + (item_id,)
     query = f"UPDATE ITEMSDB SET {set_clause} WHERE ID = ?"
+    if expected_version is not None:
+        query += " AND [ROW_VERSION] = ?"
+        params += (expected_version,)
     connector.execute_query(query, params)
 
 
+def fetch_item_current(connector, name):
+    """Current row of item NAME including ID and ROW_VERSION, or None.
+
+    Only connectors that version rows (MySQL/API mode) support this; the
+    Access file has no ROW_VERSION column, so there it returns None.
+    """
+    lookup = getattr(connector, "item_by_name", None)
+    return lookup(name) if lookup is not None else None
+
+
+DELETE_ITEM_BY_NAME = "DELETE FROM ITEMSDB WHERE NAME = ?"
+
+
 def delete_item_by_name(connector, name):
-    connector.execute_query("DELETE FROM ITEMSDB WHERE NAME = ?", (name,))
+    connector.execute_query(DELETE_ITEM_BY_NAME, (name,))
+
+
+def delete_items_by_name(connector, names):
+    """Delete several items with one executemany."""
+    connector.executemany(DELETE_ITEM_BY_NAME, [(name,) for name in names])
 
 
 def fetch_item_unit_of_measure(connector, name):
@@ -141,43 +350,153 @@ def fetch_item_unit_of_measure(connector, name):
 # Logs & dashboards
 # -------------------------
 def insert_admin_log(connector, user, details, when=None):
-    if when is None:
-        from datetime import datetime
+    date_str, time_str = _stamp(when)
+    connector.execute_query(ADMIN_LOG_INSERT, (date_str, time_str, user, details))
 
-        now = datetime.now()
-        date_str = now.strftime("%Y-%m-%d")
-        time_str = now.strftime("%H:%M:%S")
-    else:
-        date_str, time_str = when
-    connector.execute_query(
-        "INSERT INTO [adm_logs] ([DATE],[TIME],[USER],[DETAILS]) VALUES (?,?,?,?)",
-        (date_str, time_str, user, details),
+
+def insert_admin_logs(connector, entries, when=None):
+    """Insert [(user, details), ...] into adm_logs with one executemany.
+
+    Use inside a transaction to commit log rows with the change they describe.
+    """
+    date_str, time_str = _stamp(when)
+    connector.executemany(
+        ADMIN_LOG_INSERT,
+        [(date_str, time_str, user, details) for user, details in entries],
     )
 
 
+def queue_admin_log(user, details, when=None):
+    """Queue an adm_logs entry on the write-behind audit writer (non-blocking)."""
+    enqueue_log("adm_logs", user, details, when)
+
+
 def fetch_emp_logs(connector, limit=500):
+    flush_audit_log()
     return connector.fetchall(
         "SELECT [DATE], [TIME], [NAME], [DETAILS] FROM [emp_logs] ORDER BY [DATE] DESC, [TIME] DESC"
     )
 
 
 def fetch_admin_logs(connector, limit=500):
+    flush_audit_log()
     return connector.fetchall(
         "SELECT [DATE], [TIME], [USER], [DETAILS] FROM [adm_logs] ORDER BY [DATE] DESC, [TIME] DESC"
     )
 
 
 def clear_emp_logs(connector):
+    flush_audit_log()
     connector.execute_query("DELETE FROM [emp_logs]")
 
 
 def clear_admin_logs(connector):
+    flush_audit_log()
     connector.execute_query("DELETE FROM [adm_logs]")
 
 
 # -------------------------
 # Utility
 # -------------------------
+STATUS_FALLBACK_SQL = (
+    "UPDATE ITEMSDB "
+    "SET STATUS = IIf(BALANCE > 0 AND BALANCE <= [MIN STOCK], 'Low in Stock', "
+    "IIf(BALANCE = 0, 'Out of Stock', 'In Stock')) "
+    "WHERE BALANCE IS NOT NULL AND [MIN STOCK] IS NOT NULL;"
+)
+
+
+def recompute_item_status(connector):
+    """Recompute ITEMSDB.STATUS with plain SQL (usable inside a transaction)."""
+    connector.execute_query(STATUS_FALLBACK_SQL)
+
+
+def refresh_item_status(connector, callback=None):
+    """Run the Access [Update Status] and statssum queries.
+
+    On connectors with a write queue this does not block: both commands are
+    queued (repeated refreshes coalesce into one run), the plain STATUS
+    UPDATE is queued if they fail, and callback(ticket) fires once the
+    refresh is done. Elsewhere it runs synchronously and then calls callback.
+    Returns the last WriteTicket, or None when run synchronously.
+    """
+    if not hasattr(connector, "submit_query"):
+        try:
+            connector.execute_query("EXEC [Update Status]")
+            connector.execute_query("EXEC statssum")
+        except Exception as e:
+            print(f"[QUERIES] Status queries failed, using fallback SQL: {e}")
+            try:
+                connector.execute_query(STATUS_FALLBACK_SQL)
+            except Exception as fallback_error:
+                print(f"[QUERIES] Fallback SQL also failed: {fallback_error}")
+        if callback:
+            callback(None)
+        return None
+
+    errors = []
+
+    def finished(ticket):
+        error = errors[0] if errors else ticket.error
+        if error is None:
+            if callback:
+                callback(ticket)
+            return
+        print(f"[QUERIES] Status queries failed, using fallback SQL: {error}")
+        connector.submit_query(
+            STATUS_FALLBACK_SQL, callback=callback, coalesce_key="status-fallback"
+        )
+
+    connector.submit_query(
+        "EXEC [Update Status]",
+        callback=lambda ticket: ticket.error and errors.append(ticket.error),
+        coalesce_key="update-status",
+    )
+    return connector.submit_query(
+        "EXEC statssum", callback=finished, coalesce_key="statssum"
+    )
+
+
+# -------------------------
+# Add-item drafts (ANI_DRAFTS)
+# -------------------------
+DRAFT_COLUMNS = (
+    "[Date], [Item Name], [Brand], [Type], [Location], "
+    "[Unit of Measure], [In], [Minimum Stock], [Price per Unit], [Supplier]"
+)
+
+
+def fetch_item_drafts(connector):
+    return connector.fetchall(
+        "SELECT [Date], [Item Name] FROM ANI_DRAFTS ORDER BY [Date] DESC"
+    )
+
+
+def fetch_item_draft(connector, item_name, date):
+    return connector.fetchone(
+        "SELECT [Item Name], [Brand], [Type], [Location], [Unit of Measure], "
+        "[In], [Minimum Stock], [Price per Unit], [Supplier] "
+        "FROM ANI_DRAFTS WHERE [Item Name] = ? AND [Date] = ?",
+        (item_name, date),
+    )
+
+
+def delete_item_draft(connector, item_name, date):
+    connector.execute_query(
+        "DELETE FROM ANI_DRAFTS WHERE [Item Name] = ? AND [Date] = ?",
+        (item_name, date),
+    )
+
+
+def save_item_draft(connector, values):
+    """Insert a draft; values: tuple in DRAFT_COLUMNS order."""
+    with transaction(connector) as tx:
+        tx.execute_query(
+            f"INSERT INTO ANI_DRAFTS ({DRAFT_COLUMNS}) VALUES ({', '.join('?' * len(values))})",
+            tuple(values),
+        )
+
+
 def table_exists(connector, table_name):
     row = connector.fetchone(
         "SELECT Name FROM MSysObjects WHERE Type=1 AND Flags=0 AND Name=?",
@@ -0,0 +1,164 @@
+"""Vectorized restock forecasting.
+
+Turns the stock_daily usage aggregates into per-item forecasts for the
+restock view, computed with NumPy over every row at once instead of a
+Python loop per item:
+
+* AVG DAILY USE  - quantity checked out per day over the lookback window
+* DAYS LEFT      - BALANCE / average daily use (infinite without usage)
+* REORDER QTY    - order-up-to MIN STOCK plus expected use over lead time
+  and cover period, minus what is on hand (never negative, rounded up)
+
+purchase_plan groups the reorder quantities per supplier for export.
+Restock membership is a single vectorized mask here so search and the
+restock loader agree: STATUS Low/Out of Stock, BALANCE <= MIN STOCK, or
+(restock_mask) stock that runs out within the lead time at recent use.
+"""
+
+import os
+from datetime import date, timedelta
+
+import numpy as np
+
+LOOKBACK_DAYS = int(os.environ.get("JJCIMS_FORECAST_LOOKBACK_DAYS", "30"))
+LEAD_TIME_DAYS = float(os.environ.get("JJCIMS_FORECAST_LEAD_TIME_DAYS", "7"))
+COVER_DAYS = float(os.environ.get("JJCIMS_FORECAST_COVER_DAYS", "14"))
+
+FORECAST_COLUMNS = ("AVG DAILY USE", "DAYS LEFT", "REORDER QTY")
+RESTOCK_STATUSES = ("out of stock", "low in stock")
+NO_USAGE = "—"
+
+
+def as_float_array(values):
+    """Convert a column of DB values (int, Decimal, str, None) to float64.
+
+    None and unparseable values become NaN.
+    """
+    try:
+        return np.asarray(values, dtype=float)
+    except (TypeError, ValueError):
+        pass
+    out = np.empty(len(values), dtype=float)
+    for i, value in enumerate(values):
+        try:
+            out[i] = float(str(value).replace(",", "").replace("₱", ""))
+        except (TypeError, ValueError):
+            out[i] = np.nan
+    return out
+
+
+def needs_restock(status, balance, min_stock):
+    """Boolean mask of rows that belong on the restock list."""
+    status = np.char.lower(
+        np.asarray(["" if s is None else str(s) for s in status], dtype=str)
+    )
+    flagged = np.isin(status, RESTOCK_STATUSES)
+    balance = np.nan_to_num(as_float_array(balance))
+    min_stock = np.nan_to_num(as_float_array(min_stock))
+    return flagged | (balance <= min_stock)
+
+
+def restock_mask(status, balance, min_stock, days_left, lead_time_days=LEAD_TIME_DAYS):
+    """needs_restock, plus rows whose DAYS LEFT is within the lead time."""
+    return needs_restock(status, balance, min_stock) | (
+        np.asarray(days_left, dtype=float) <= lead_time_days
+    )
+
+
+def usage_for(item_ids, usage):
+    """Align {item_id: (qty_out, qty_in)} to item_ids; missing ids use 0."""
+    ids = as_float_array(item_ids)
+    if not usage:
+        return np.zeros(len(ids))
+    keys = np.fromiter(usage.keys(), dtype=float, count=len(usage))
+    outs = np.fromiter((u[0] for u in usage.values()), dtype=float, count=len(usage))
+    order = np.argsort(keys)
+    keys, outs = keys[order], outs[order]
+    pos = np.clip(np.searchsorted(keys, ids), 0, len(keys) - 1)
+    return np.where(keys[pos] == ids, outs[pos], 0.0)
+
+
+def forecast(balance, min_stock, qty_out, window_days=LOOKBACK_DAYS,
+             lead_time_days=LEAD_TIME_DAYS, cover_days=COVER_DAYS):
+    """Return {"avg_daily", "days_left", "reorder_qty"} arrays.
+
+    qty_out is the total checked out per item over window_days.
+    """
+    balance = np.nan_to_num(as_float_array(balance))
+    min_stock = np.nan_to_num(as_float_array(min_stock))
+    avg_daily = np.asarray(qty_out, dtype=float) / max(float(window_days), 1.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        days_left = np.where(
+            avg_daily > 0, np.maximum(balance, 0) / avg_daily, np.inf
+        )
+    target = min_stock + avg_daily * (lead_time_days + cover_days)
+    reorder_qty = np.ceil(np.clip(target - balance, 0, None))
+    return {
+        "avg_daily": avg_daily,
+        "days_left": days_left,
+        "reorder_qty": reorder_qty,
+    }
+
+
+def load_usage(connector, lookback_days=LOOKBACK_DAYS, today=None):
+    """Usage per item over the last lookback_days; {} if the ledger is unavailable."""
+    from .queries import fetch_usage_by_item
+
+    end = today or date.today()
+    start = end - timedelta(days=max(int(lookback_days), 1) - 1)
+    try:
+        return fetch_usage_by_item(connector, start, end)
+    except Exception as e:
+        print(f"[FORECAST] Usage history unavailable, forecasting without it: {e}")
+        return {}
+
+
+def format_forecast(result):
+    """Display strings for FORECAST_COLUMNS, one tuple per row."""
+    avg = result["avg_daily"]
+    days = result["days_left"]
+    qty = result["reorder_qty"]
+    return [
+        (
+            f"{avg[i]:,.2f}",
+            f"{days[i]:,.0f}" if np.isfinite(days[i]) else NO_USAGE,
+            f"{int(qty[i]):,}",
+        )
+        for i in range(len(qty))
+    ]
+
+
+def purchase_plan(names, suppliers, reorder_qty, unit_price):
+    """Group non-zero reorder quantities by supplier.
+
+    Returns [{"supplier", "total_qty", "total_cost", "lines": [(name, qty,
+    unit_price, cost), ...]}, ...] sorted by supplier name.
+    """
+    qty = np.asarray(reorder_qty, dtype=float)
+    price = np.nan_to_num(as_float_array(unit_price))
+    keep = np.flatnonzero(qty > 0)
+    if not len(keep):
+        return []
+    supplier_keys = np.asarray(
+        [str(suppliers[i] or "").strip() or "(No supplier)" for i in keep]
+    )
+    labels, group = np.unique(supplier_keys, return_inverse=True)
+    cost = qty[keep] * price[keep]
+    total_qty = np.bincount(group, weights=qty[keep], minlength=len(labels))
+    total_cost = np.bincount(group, weights=cost, minlength=len(labels))
+    plan = []
+    for g, label in enumerate(labels):
+        members = keep[group == g]
+        lines = [
+            (names[i], int(qty[i]), float(price[i]), float(qty[i] * price[i]))
+            for i in members
+        ]
+        plan.append(
+            {
+                "supplier": str(label),
+                "total_qty": int(total_qty[g]),
+                "total_cost": float(total_cost[g]),
+                "lines": lines,
+            }
+        )
+    return plan
@@ -0,0 +1,220 @@
+"""Structured stock-movement ledger.
+
+Every checkout (and any other stock change that goes through
+record_movement) becomes one stock_movements row with the item ID,
+quantity, direction, user and timestamp, instead of only a free-text
+emp_logs line. Alongside each insert the stock_daily aggregate row for
+(item, day) is bumped, so usage over any date range is a sum over at most
+one row per item per day rather than a scan/parse of the logs.
+
+Movements travel through the write-behind audit writer (same journal, same
+write-queue ticket as the log line they accompany). Each movement carries a
+unique MOVE_KEY so a batch replayed after a crash is not counted twice.
+"""
+
+import uuid
+from datetime import date, datetime
+
+MOVEMENTS_TABLE = "stock_movements"
+DAILY_TABLE = "stock_daily"
+
+DIRECTION_OUT = "OUT"
+DIRECTION_IN = "IN"
+
+# Access DDL; the MySQL API creates the equivalent tables from its models
+_CREATE_MOVEMENTS = (
+    "CREATE TABLE [stock_movements] ("
+    "[ID] COUNTER PRIMARY KEY, [MOVE_KEY] TEXT(36), [ITEM_ID] LONG, "
+    "[ITEM_NAME] TEXT(255), [QTY] DOUBLE, [DIRECTION] TEXT(3), "
+    "[USER] TEXT(255), [MOVED_AT] DATETIME)"
+)
+_CREATE_MOVEMENTS_INDEXES = (
+    "CREATE UNIQUE INDEX [ux_stock_movements_key] ON [stock_movements] ([MOVE_KEY])",
+    "CREATE INDEX [ix_stock_movements_item_time] ON [stock_movements] ([ITEM_ID], [MOVED_AT])",
+)
+_CREATE_DAILY = (
+    "CREATE TABLE [stock_daily] ("
+    "[ITEM_ID] LONG NOT NULL, [DAY] DATETIME NOT NULL, [QTY_OUT] DOUBLE, "
+    "[QTY_IN] DOUBLE, [MOVES] LONG, "
+    "CONSTRAINT [pk_stock_daily] PRIMARY KEY ([ITEM_ID], [DAY]))"
+)
+_CREATE_DAILY_INDEXES = (
+    "CREATE INDEX [ix_stock_daily_day] ON [stock_daily] ([DAY])",
+)
+
+_LOOKUP_CHUNK = 100  # values per IN (...) list
+_STORED_KEYS_SQL = "SELECT [MOVE_KEY] FROM [stock_movements] WHERE [MOVE_KEY] IN ({})"
+_ITEM_IDS_SQL = "SELECT [NAME], [ID] FROM [ITEMSDB] WHERE [NAME] IN ({})"
+_INSERT_MOVEMENT_SQL = (
+    "INSERT INTO [stock_movements] ([MOVE_KEY], [ITEM_ID], [ITEM_NAME], [QTY], "
+    "[DIRECTION], [USER], [MOVED_AT]) VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+_DAILY_EXISTS_SQL = (
+    "SELECT [ITEM_ID], [DAY] FROM [stock_daily] WHERE [DAY] IN ({}) AND [ITEM_ID] IN ({})"
+)
+_BUMP_DAILY_SQL = (
+    "UPDATE [stock_daily] SET [QTY_OUT] = [QTY_OUT] + ?, [QTY_IN] = [QTY_IN] + ?, "
+    "[MOVES] = [MOVES] + ? WHERE [ITEM_ID] = ? AND [DAY] = ?"
+)
+_INSERT_DAILY_SQL = (
+    "INSERT INTO [stock_daily] ([ITEM_ID], [DAY], [QTY_OUT], [QTY_IN], [MOVES]) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+
+# Range queries used by queries.py (MySQLConnector routes these shapes)
+USAGE_BY_ITEM_SQL = (
+    "SELECT [ITEM_ID], SUM([QTY_OUT]), SUM([QTY_IN]) FROM [stock_daily] "
+    "WHERE [DAY] >= ? AND [DAY] <= ? GROUP BY [ITEM_ID]"
+)
+ITEM_USAGE_SQL = (
+    "SELECT SUM([QTY_OUT]), SUM([QTY_IN]) FROM [stock_daily] "
+    "WHERE [ITEM_ID] = ? AND [DAY] >= ? AND [DAY] <= ?"
+)
+ITEM_DAILY_SQL = (
+    "SELECT [DAY], [QTY_OUT], [QTY_IN] FROM [stock_daily] "
+    "WHERE [ITEM_ID] = ? AND [DAY] >= ? AND [DAY] <= ? ORDER BY [DAY]"
+)
+
+_ensured = set()  # db identities whose ledger tables are known to exist
+
+
+def new_movement(item_name, qty, direction=DIRECTION_OUT, user=None, moved_at=None):
+    """Build a journal-safe movement row (all JSON-serializable values)."""
+    if direction not in (DIRECTION_OUT, DIRECTION_IN):
+        raise ValueError(f"Unknown stock direction: {direction}")
+    moved_at = moved_at or datetime.now()
+    return (
+        uuid.uuid4().hex,
+        item_name,
+        float(qty),
+        direction,
+        user,
+        moved_at.strftime("%Y-%m-%d %H:%M:%S"),
+    )
+
+
+def as_day(value):
+    """Normalize a date/datetime/'YYYY-MM-DD' value to a midnight datetime."""
+    if isinstance(value, datetime):
+        return datetime(value.year, value.month, value.day)
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    return datetime.strptime(str(value)[:10], "%Y-%m-%d")
+
+
+def _table_exists(cursor, name):
+    try:
+        return cursor.tables(table=name, tableType="TABLE").fetchone() is not None
+    except Exception:
+        return False
+
+
+def ensure_ledger_tables(connector):
+    """Create the ledger tables in an Access database if they are missing.
+
+    Runs on its own connection and commits only the DDL, so it must be
+    called before a batch is opened, never from inside one.
+    """
+    key = getattr(connector, "db_path", None)
+    if key is not None and key in _ensured:
+        return
+    connection = connector.connect()
+    cursor = connection.cursor()
+    try:
+        if not _table_exists(cursor, MOVEMENTS_TABLE):
+            print("[LEDGER] Creating stock_movements table")
+            cursor.execute(_CREATE_MOVEMENTS)
+            for ddl in _CREATE_MOVEMENTS_INDEXES:
+                cursor.execute(ddl)
+        if not _table_exists(cursor, DAILY_TABLE):
+            print("[LEDGER] Creating stock_daily table")
+            cursor.execute(_CREATE_DAILY)
+            for ddl in _CREATE_DAILY_INDEXES:
+                cursor.execute(ddl)
+        connection.commit()
+    finally:
+        try:
+            cursor.close()
+        except Exception:
+            pass
+        try:
+            connection.close()
+        except Exception:
+            pass
+    if key is not None:
+        _ensured.add(key)
+
+
+def _lookup(connector, query, values, *fixed):
+    """fetchall query once per chunk of values; query has one IN list per {}.
+
+    fixed are lists placed before the chunked one (each fits in one IN list).
+    """
+    values = list(values)
+    rows = []
+    for start in range(0, len(values), _LOOKUP_CHUNK):
+        chunk = values[start:start + _LOOKUP_CHUNK]
+        lists = list(fixed) + [chunk]
+        sql = query.format(*(", ".join("?" * len(v)) for v in lists))
+        rows.extend(connector.fetchall(sql, tuple(v for lst in lists for v in lst)) or [])
+    return rows
+
+
+def movement_statements(connector, rows):
+    """Statements that persist movement rows (from new_movement) in one ticket.
+
+    Returns [(query, params, many), ...] for the audit writer to submit with
+    its log rows as one write-queue ticket; the caller has already run
+    ensure_ledger_tables. The lookups (stored MOVE_KEYs, item IDs, existing
+    stock_daily rows) are a few IN-list reads made first, so the ticket
+    itself is plain inserts and updates. Rows whose MOVE_KEY is already
+    stored (a replayed batch) are skipped, so the daily aggregates are bumped
+    exactly once per movement. If another workstation inserts the same
+    stock_daily row in between, the ticket fails on the primary key and the
+    audit writer's retry takes the update path.
+    """
+    rows = list(rows)
+    if not rows:
+        return []
+    stored = {
+        r[0] for r in _lookup(connector, _STORED_KEYS_SQL, {row[0] for row in rows})
+    }
+    item_ids = {
+        r[0]: r[1] for r in _lookup(connector, _ITEM_IDS_SQL, {row[1] for row in rows})
+    }
+    movements = []
+    daily = {}  # (item_id, day) -> [qty_out, qty_in, moves]
+    for move_key, item_name, qty, direction, user, moved_at in rows:
+        if move_key in stored:
+            continue
+        stored.add(move_key)  # the same movement twice in one batch
+        item_id = item_ids.get(item_name)
+        moved_at = datetime.strptime(moved_at, "%Y-%m-%d %H:%M:%S")
+        movements.append((move_key, item_id, item_name, qty, direction, user, moved_at))
+        if item_id is None:
+            # Unknown item: keep the movement, nothing to aggregate against
+            continue
+        totals = daily.setdefault((item_id, as_day(moved_at)), [0.0, 0.0, 0])
+        totals[0 if direction == DIRECTION_OUT else 1] += qty
+        totals[2] += 1
+
+    existing = set()
+    if daily:
+        days = sorted({day for _, day in daily})
+        ids = {item_id for item_id, _ in daily}
+        existing = {
+            (r[0], as_day(r[1]))
+            for r in _lookup(connector, _DAILY_EXISTS_SQL, ids, days)
+        }
+    bumps = []
+    inserts = []
+    for (item_id, day), (qty_out, qty_in, moves) in daily.items():
+        if (item_id, day) in existing:
+            bumps.append((qty_out, qty_in, moves, item_id, day))
+        else:
+            inserts.append((item_id, day, qty_out, qty_in, moves))
+    return [
+        (_INSERT_MOVEMENT_SQL, movements, True),
+        (_BUMP_DAILY_SQL, bumps, True),
+        (_INSERT_DAILY_SQL, inserts, True),
+    ]
@@ -0,0 +1,125 @@
+"""Per-table version rows for change detection on a shared Access file.
+
+table_versions holds one row per watched table with a counter that every
+write to that table bumps in the same transaction. Screens on other
+workstations (see change_feed) poll this one tiny table instead of
+re-reading and hashing whole tables to find out what changed.
+
+Writes made through the write queue are bumped automatically: the queue's
+before_commit hook (version_bumps) looks at the statements of a batch and
+adds one UPDATE per touched table. Code that still writes on its own
+connection calls bump(cursor, tables) before committing.
+
+Recomputations derived from data whose own write already bumped the
+version ([Update Status], statssum, the STATUS fallback UPDATE) do not bump
+it; otherwise every screen would reload after its own status refresh.
+"""
+
+import re
+import threading
+
+from .change_feed import ALL_TABLES
+
+VERSIONS_TABLE = "table_versions"
+
+_CREATE_VERSIONS = (
+    "CREATE TABLE [table_versions] ([TABLE_NAME] TEXT(64) PRIMARY KEY, [VERSION] LONG)"
+)
+_SEED_SQL = "INSERT INTO [table_versions] ([TABLE_NAME], [VERSION]) VALUES (?, 0)"
+BUMP_SQL = "UPDATE [table_versions] SET [VERSION] = [VERSION] + 1 WHERE [TABLE_NAME] = ?"
+READ_SQL = "SELECT [TABLE_NAME], [VERSION] FROM [table_versions]"
+
+_WRITE_TARGET = re.compile(
+    r"^\s*(?:insert\s+into|update|delete(?:\s+\*)?\s+from)\s+\[?(\w+)\]?",
+    re.IGNORECASE,
+)
+_DERIVED_PREFIXES = ("exec ", "update itemsdb set status = iif(")
+_TRACKED = {table.lower(): table for table in ALL_TABLES}
+
+_ensured = set()  # database keys whose versions table is known to exist
+_ensure_lock = threading.Lock()
+
+
+def touched_tables(statements):
+    """Watched tables written by [(query, params, many), ...]."""
+    tables = set()
+    for query, _, _ in statements:
+        if not query:
+            continue
+        normalized = " ".join(query.lower().split())
+        if normalized.startswith(_DERIVED_PREFIXES):
+            continue
+        match = _WRITE_TARGET.match(query)
+        if match:
+            table = _TRACKED.get(match.group(1).lower())
+            if table:
+                tables.add(table)
+    return tables
+
+
+def ensure_versions_table(connect, key):
+    """Create table_versions with a row per watched table if missing.
+
+    Runs on its own connection from connect() and commits only this; returns
+    False (after logging) when the table cannot be created right now.
+    """
+    with _ensure_lock:
+        if key in _ensured:
+            return True
+        connection = None
+        cursor = None
+        try:
+            connection = connect()
+            cursor = connection.cursor()
+            exists = cursor.tables(table=VERSIONS_TABLE, tableType="TABLE").fetchone()
+            if not exists:
+                print("[VERSIONS] Creating table_versions table")
+                cursor.execute(_CREATE_VERSIONS)
+                known = set()
+            else:
+                cursor.execute(READ_SQL)
+                known = {row[0] for row in cursor.fetchall()}
+            for table in ALL_TABLES:
+                if table not in known:
+                    cursor.execute(_SEED_SQL, (table,))
+            connection.commit()
+        except Exception as e:
+            print(f"[VERSIONS] Could not prepare table_versions: {e}")
+            return False
+        finally:
+            for handle in (cursor, connection):
+                try:
+                    if handle is not None:
+                        handle.close()
+                except Exception:
+                    pass
+        _ensured.add(key)
+        return True
+
+
+def version_bumps(key, connect):
+    """WriteQueue before_commit hook: the bump statements for a batch."""
+
+    def before_commit(statements):
+        tables = touched_tables(statements)
+        if not tables or not ensure_versions_table(connect, key):
+            return []
+        return [(BUMP_SQL, [(table,) for table in sorted(tables)], True)]
+
+    return before_commit
+
+
+def bump(cursor, tables):
+    """Bump tables inside the caller's transaction (writes outside the queue)."""
+    for table in tables:
+        try:
+            cursor.execute(BUMP_SQL, (table,))
+        except Exception as e:
+            # Old database without table_versions: the write itself still counts
+            print(f"[VERSIONS] Could not bump {table}: {e}")
+
+
+def read_versions(connector):
+    """{table: version} for every watched table (one small query)."""
+    rows = connector.fetchall(READ_SQL) or []
+    return {row[0]: row[1] for row in rows}
@@ -0,0 +1,129 @@
+"""Unit of work: group several writes into one commit.
+
+    with connector.transaction() as tx:
+        queries.delete_items_by_name(tx, names)
+        queries.insert_admin_logs(tx, rows)
+
+Inside the block writes (execute_query / execute / executemany) are
+collected; leaving the block commits them together, an exception discards
+them. commit() and rollback() can also be called explicitly, after which
+the unit of work can be reused; submit(callback) commits without blocking
+the caller. A UnitOfWork accepts the same calls as a
+connector, so the queries.py helpers take either.
+
+On Access the statements travel to the database's write queue as a single
+ticket: one connection, one transaction, one commit, rolled back as a
+whole on error (and retried as a whole on lock errors). Reads made inside
+the block (fetchall / fetchone) go straight to the connector and do not see
+the uncommitted writes.
+
+Connectors without transactions (MySQLConnector, whose API calls each
+commit on the server) replay the statements in order on commit; a failure
+part-way leaves the earlier statements applied.
+"""
+
+
+class UnitOfWork:
+    """Collects writes for connector and commits them together."""
+
+    def __init__(self, connector):
+        self.connector = connector
+        self.statements = []
+        self.committed = 0
+
+    # -------------------------
+    # Writes
+    # -------------------------
+    def execute(self, query, params=None):
+        self.statements.append((query, params, False))
+        return self
+
+    def execute_query(self, query, params=None, retries=None, delay=None):
+        self.execute(query, params)
+
+    def executemany(self, query, seq_of_params):
+        rows = [tuple(p) for p in seq_of_params]
+        if rows:
+            self.statements.append((query, rows, True))
+        return self
+
+    # -------------------------
+    # Reads (see committed data only)
+    # -------------------------
+    def fetchall(self, query, params=None, retries=None, delay=None):
+        return self.connector.fetchall(query, params)
+
+    def fetchone(self, query, params=None, retries=None, delay=None):
+        return self.connector.fetchone(query, params)
+
+    # -------------------------
+    # Completion
+    # -------------------------
+    def commit(self):
+        statements, self.statements = self.statements, []
+        if not statements:
+            return
+        run = getattr(self.connector, "commit_statements", None)
+        if run is not None:
+            run(statements)
+        else:
+            replay_statements(self.connector, statements)
+        self.committed += len(statements)
+
+    def submit(self, callback):
+        """Commit without waiting where the connector has a write queue.
+
+        callback(ticket) fires once the statements committed or failed
+        (check ticket.error); the ticket is returned. Other connectors
+        replay the statements synchronously, then call callback the same way.
+        """
+        statements, self.statements = self.statements, []
+        self.committed += len(statements)
+        run = getattr(self.connector, "submit_statements", None)
+        if run is None:
+            return run_now(lambda: replay_statements(self.connector, statements), callback)
+        return run(statements, callback)
+
+    def rollback(self):
+        self.statements = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+
+def replay_statements(connector, statements):
+    """Run statements one by one through connector.execute_query."""
+    for query, params, many in statements:
+        if many:
+            for row in params:
+                connector.execute_query(query, row)
+        else:
+            connector.execute_query(query, params)
+
+
+def run_now(fn, callback):
+    """Run fn() here and report it like a queued write: callback(ticket)."""
+    from .write_queue import WriteTicket
+
+    ticket = WriteTicket(None, None, callback)
+    try:
+        fn()
+    except Exception as e:
+        ticket._finish(e)
+    else:
+        ticket._finish()
+    return ticket
+
+
+def transaction(connector):
+    """connector.transaction() if it has one, else a replaying UnitOfWork."""
+    if hasattr(connector, "transaction"):
+        return connector.transaction()
+    return UnitOfWork(connector)
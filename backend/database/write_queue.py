@@ -0,0 +1,399 @@
+"""Single-writer command queue for a shared Access database.
+
+Every write a process makes to one .accdb goes through one WriteQueue and
+its worker thread, so windows of the same process never race each other
+for the file lock. The worker drains whatever is pending and runs it as a
+batch on one connection with one commit; a lock error rolls the batch back
+and retries it after a jittered exponential backoff (full jitter, capped),
+so several workstations contending for the file spread out instead of all
+sleeping a fixed 2 s and colliding again.
+
+Commands can be coalesced: a command submitted with a coalesce_key replaces
+a still-pending command with the same key (e.g. repeated EXEC [Update
+Status] runs), and every submitter is notified when the surviving command
+completes.
+
+A ticket may also carry several statements (a unit of work, see
+unit_of_work.py); they always run in the same transaction, and executemany
+statements use pyodbc's fast_executemany (JJCIMS_FAST_EXECUTEMANY=0 turns
+it off; it is also switched off for the process if the driver rejects it).
+
+A before_commit hook can add statements to every batch's transaction;
+AccessConnector uses it to bump the per-table version rows the change feed
+polls (see table_versions.py).
+
+Completion is reported through WriteTicket (wait()/result()) or a callback.
+Callbacks run on the writer thread; wrap them with on_tk(widget, fn) to have
+them run on a Tk thread instead. metrics() reports queue depth, batches,
+lock retries and time spent waiting on locks.
+"""
+
+import os
+import queue
+import random
+import threading
+import time
+
+BACKOFF_BASE_SECONDS = float(os.environ.get("JJCIMS_LOCK_BACKOFF_BASE_MS", "50")) / 1000.0
+BACKOFF_CAP_SECONDS = float(os.environ.get("JJCIMS_LOCK_BACKOFF_CAP_MS", "2000")) / 1000.0
+MAX_LOCK_ATTEMPTS = int(os.environ.get("JJCIMS_LOCK_MAX_ATTEMPTS", "8"))
+MAX_BATCH = int(os.environ.get("JJCIMS_WRITE_BATCH", "50"))
+TK_POLL_MS = 50
+FAST_EXECUTEMANY = os.environ.get("JJCIMS_FAST_EXECUTEMANY", "1") != "0"
+
+_LOCK_MARKERS = ("locked", "in use", "could not use", "3218", "3260", "3050")
+# ODBC states/messages of a driver that cannot do fast_executemany
+# (optional feature not implemented, driver lacks the function, function
+# sequence error, invalid buffer length for the bound parameter arrays)
+_FAST_EXECUTEMANY_MARKERS = (
+    "hyc00", "im001", "hy010", "hy090",
+    "optional feature not implemented", "driver does not support",
+    "function sequence error", "invalid string or buffer length",
+)
+
+
+def is_lock_error(exc):
+    """True for Access/ODBC errors caused by another user holding a lock."""
+    text = str(exc).lower()
+    return any(marker in text for marker in _LOCK_MARKERS)
+
+
+def is_fast_executemany_rejection(exc):
+    """True for driver errors that mean fast_executemany itself is unsupported."""
+    if isinstance(exc, MemoryError):
+        return True  # parameter arrays too large for the driver's buffers
+    text = str(exc).lower()
+    return any(marker in text for marker in _FAST_EXECUTEMANY_MARKERS)
+
+
+class LockBackoff:
+    """Full-jitter exponential backoff: sleep U(0, min(cap, base * 2**n))."""
+
+    def __init__(self, base=BACKOFF_BASE_SECONDS, cap=BACKOFF_CAP_SECONDS,
+                 attempts=MAX_LOCK_ATTEMPTS):
+        self.base = base
+        self.cap = cap
+        self.attempts = max(int(attempts), 1)
+
+    def delay(self, attempt):
+        return random.uniform(0, min(self.cap, self.base * (2 ** attempt)))
+
+    def run(self, fn, on_wait=None):
+        """Call fn() until it succeeds or a non-lock error / the last attempt."""
+        for attempt in range(self.attempts):
+            try:
+                return fn()
+            except Exception as e:
+                if not is_lock_error(e) or attempt == self.attempts - 1:
+                    raise
+                pause = self.delay(attempt)
+                if on_wait:
+                    on_wait(pause)
+                time.sleep(pause)
+
+
+class _FastExecutemanyRejected(Exception):
+    """The driver refused fast_executemany; the transaction is re-run without it."""
+
+
+def _executemany(cursor, query, rows, fast):
+    if fast:
+        try:
+            cursor.fast_executemany = True
+        except AttributeError:
+            fast = False
+    try:
+        cursor.executemany(query, rows)
+    except Exception as e:
+        if fast and not is_lock_error(e) and is_fast_executemany_rejection(e):
+            raise _FastExecutemanyRejected(str(e)) from e
+        raise
+
+
+class WriteTicket:
+    """Completion handle for one submitted command (or unit of work).
+
+    statements: optional [(query, params, many), ...] run in one transaction;
+    many=True means params is a sequence of parameter rows (executemany).
+    """
+
+    def __init__(self, query, params, callback=None, coalesce_key=None, statements=None):
+        self.query = query
+        self.params = params
+        self.statements = statements or [(query, params, False)]
+        self.coalesce_key = coalesce_key
+        self.callbacks = [callback] if callback else []
+        self.error = None
+        self.submitted_at = time.monotonic()
+        self.completed_at = None
+        self._done = threading.Event()
+
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def result(self, timeout=None):
+        """Block until the command ran; re-raise its error if it failed."""
+        if not self._done.wait(timeout):
+            raise TimeoutError("Write did not complete in time")
+        if self.error is not None:
+            raise self.error
+
+    def _finish(self, error=None):
+        self.error = error
+        self.completed_at = time.monotonic()
+        self._done.set()
+        for callback in self.callbacks:
+            try:
+                callback(self)
+            except Exception as e:
+                print(f"[WRITE QUEUE] Completion callback failed: {e}")
+
+
+class WriteQueue:
+    """One writer thread serializing all writes of this process to one database."""
+
+    def __init__(self, connect, backoff=None, max_batch=MAX_BATCH, name="WriteQueue",
+                 before_commit=None):
+        self.connect = connect
+        self.before_commit = before_commit
+        self.backoff = backoff or LockBackoff()
+        self.max_batch = max(int(max_batch), 1)
+        self.name = name
+        self._pending = []
+        self._by_key = {}
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "coalesced": 0,
+            "batches": 0,
+            "lock_retries": 0,
+            "lock_wait_seconds": 0.0,
+            "lock_wait_max_seconds": 0.0,
+            "queue_wait_max_seconds": 0.0,
+        }
+
+    # -------------------------
+    # Public API
+    # -------------------------
+    def submit(self, query, params=None, callback=None, coalesce_key=None):
+        """Queue a write; returns a WriteTicket immediately (never blocks)."""
+        with self._cond:
+            self._stats["submitted"] += 1
+            if coalesce_key is not None and coalesce_key in self._by_key:
+                ticket = self._by_key[coalesce_key]
+                ticket.query, ticket.params = query, params
+                ticket.statements = [(query, params, False)]
+                if callback:
+                    ticket.callbacks.append(callback)
+                self._stats["coalesced"] += 1
+                return ticket
+            ticket = WriteTicket(query, params, callback, coalesce_key)
+            self._pending.append(ticket)
+            if coalesce_key is not None:
+                self._by_key[coalesce_key] = ticket
+            self._ensure_worker()
+            self._cond.notify()
+            return ticket
+
+    def execute(self, query, params=None, timeout=None):
+        """Queue a write and wait for it (runs inline on the writer thread)."""
+        self.execute_statements([(query, params, False)], timeout)
+
+    def submit_statements(self, statements, callback=None):
+        """Queue several statements to commit together; returns a WriteTicket."""
+        statements = list(statements)
+        with self._cond:
+            self._stats["submitted"] += 1
+            ticket = WriteTicket(None, None, callback, statements=statements)
+            self._pending.append(ticket)
+            self._ensure_worker()
+            self._cond.notify()
+            return ticket
+
+    def execute_statements(self, statements, timeout=None):
+        """Run statements in one transaction and wait for the commit."""
+        if threading.current_thread() is self._thread:
+            ticket = WriteTicket(None, None, statements=list(statements))
+            self._run_batch([ticket])
+            ticket.result(0)
+            return
+        self.submit_statements(statements).result(timeout)
+
+    def metrics(self):
+        with self._cond:
+            stats = dict(self._stats)
+            stats["queue_depth"] = len(self._pending)
+        return stats
+
+    # -------------------------
+    # Worker
+    # -------------------------
+    def _ensure_worker(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                batch = self._pending[: self.max_batch]
+                del self._pending[: len(batch)]
+                for ticket in batch:
+                    if ticket.coalesce_key is not None:
+                        self._by_key.pop(ticket.coalesce_key, None)
+                now = time.monotonic()
+                waited = max(now - t.submitted_at for t in batch)
+                self._stats["queue_wait_max_seconds"] = max(
+                    self._stats["queue_wait_max_seconds"], waited
+                )
+            try:
+                self._run_batch(batch)
+            except Exception as e:
+                print(f"[WRITE QUEUE] Unexpected writer error: {e}")
+
+    def _record_wait(self, pause):
+        with self._cond:
+            self._stats["lock_retries"] += 1
+            self._stats["lock_wait_seconds"] += pause
+            self._stats["lock_wait_max_seconds"] = max(
+                self._stats["lock_wait_max_seconds"], pause
+            )
+
+    def _apply(self, batch):
+        global FAST_EXECUTEMANY
+        try:
+            self._apply_once(batch, FAST_EXECUTEMANY)
+        except _FastExecutemanyRejected as e:
+            FAST_EXECUTEMANY = False
+            print(f"[WRITE QUEUE] fast_executemany not supported, disabled: {e}")
+            self._apply_once(batch, False)
+
+    def _apply_once(self, batch, fast):
+        statements = [statement for ticket in batch for statement in ticket.statements]
+        if self.before_commit is not None:
+            statements += self.before_commit(statements)
+        connection = self.connect()
+        cursor = connection.cursor()
+        try:
+            for query, params, many in statements:
+                if many:
+                    if params:
+                        _executemany(cursor, query, params, fast)
+                elif params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+            connection.commit()
+        except Exception:
+            try:
+                connection.rollback()
+            except Exception:
+                pass
+            raise
+        finally:
+            try:
+                cursor.close()
+            except Exception:
+                pass
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    def _run_batch(self, batch):
+        with self._cond:
+            self._stats["batches"] += 1
+        try:
+            self.backoff.run(lambda: self._apply(batch), on_wait=self._record_wait)
+        except Exception as e:
+            if len(batch) > 1 and not is_lock_error(e):
+                # One bad command must not fail the others: run them singly
+                for ticket in batch:
+                    self._run_batch([ticket])
+                return
+            with self._cond:
+                self._stats["failed"] += len(batch)
+            for ticket in batch:
+                ticket._finish(e)
+            return
+        with self._cond:
+            self._stats["completed"] += len(batch)
+        for ticket in batch:
+            ticket._finish()
+
+
+class _TkDispatcher:
+    """Runs callbacks handed over from other threads on one Tk root."""
+
+    def __init__(self, root):
+        self.root = root
+        self.queue = queue.Queue()
+        self.outstanding = 0
+        self._job = None
+
+    def wrap(self, fn):
+        self.outstanding += 1
+        if self._job is None:
+            self._job = self.root.after(TK_POLL_MS, self._pump)
+        return lambda ticket: self.queue.put((fn, ticket))
+
+    def _pump(self):
+        self._job = None
+        while True:
+            try:
+                fn, ticket = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            self.outstanding -= 1
+            try:
+                fn(ticket)
+            except Exception as e:
+                print(f"[WRITE QUEUE] Tk callback failed: {e}")
+        if self.outstanding > 0:
+            try:
+                self._job = self.root.after(TK_POLL_MS, self._pump)
+            except Exception:
+                self.outstanding = 0
+
+
+def on_tk(widget, fn):
+    """Wrap fn(ticket) so it runs on widget's Tk thread (call from that thread)."""
+    root = widget._root()
+    dispatcher = getattr(root, "_write_dispatcher", None)
+    if dispatcher is None:
+        dispatcher = _TkDispatcher(root)
+        root._write_dispatcher = dispatcher
+    return dispatcher.wrap(fn)
+
+
+_queues = {}
+_queues_lock = threading.Lock()
+
+
+def get_write_queue(key, connect, before_commit=None):
+    """Return the process-wide WriteQueue for key (normally the database path)."""
+    with _queues_lock:
+        write_queue = _queues.get(key)
+        if write_queue is None:
+            write_queue = WriteQueue(
+                connect,
+                name=f"WriteQueue-{os.path.basename(str(key))}",
+                before_commit=before_commit,
+            )
+            _queues[key] = write_queue
+        return write_queue
+
+
+def all_write_metrics():
+    """{key: metrics} for every write queue in this process."""
+    with _queues_lock:
+        queues = dict(_queues)
+    return {key: q.metrics() for key, q in queues.items()}
@@ -0,0 +1,231 @@
+"""
+Frame Clock
+===========
+A single after() loop per Tk root that drives every active animation.
+
+Toast fades, the stats-panel tip slider and the loading-screen spinner used
+to run their own after() chains. They now register an Animation with the
+root's FrameClock, which steps all of them on one tick, skips widgets that
+are withdrawn or minimized, slows down when nothing is visible, and stops
+ticking entirely when no animation is registered.
+
+Animations play precomputed frame sequences (alpha values, positions,
+pre-rendered sprites), so a tick only applies a value that already exists.
+When ENABLE_ANIMATIONS is off in performance_config, animations jump
+straight to their final frame.
+"""
+
+import time
+import tkinter as tk
+
+from ..config.performance_config import ENABLE_ANIMATIONS
+
+TICK_MS = 16  # ~60fps while something visible is animating
+IDLE_TICK_MS = 250  # while every animated widget is hidden/minimized
+
+
+class Animation:
+    """Plays frames through apply(frame) at one frame per interval_ms.
+
+    frames: precomputed sequence; the frame index is derived from elapsed
+        time, so playback speed does not depend on tick jitter.
+    loop: repeat forever (until cancel()) instead of finishing.
+    on_done: called once after the last frame of a non-looping animation.
+    """
+
+    def __init__(self, widget, frames, apply, interval_ms=TICK_MS, loop=False,
+                 on_done=None):
+        self.widget = widget
+        self.frames = list(frames)
+        self.apply = apply
+        self.interval = max(interval_ms, 1) / 1000.0
+        self.loop = loop
+        self.on_done = on_done
+        self.index = -1
+        self.cancelled = False
+        self._elapsed = 0.0
+        self._last = None
+
+    def cancel(self):
+        self.cancelled = True
+
+    def _visible(self):
+        try:
+            return bool(self.widget.winfo_viewable())
+        except tk.TclError:
+            return False
+
+    def _alive(self):
+        try:
+            return bool(self.widget.winfo_exists())
+        except tk.TclError:
+            return False
+
+    def _show(self, index):
+        if index != self.index:
+            self.index = index
+            self.apply(self.frames[index])
+
+    def step(self, now):
+        """Advance to the frame for now; returns True when finished."""
+        if self._last is not None:
+            self._elapsed += now - self._last
+        self._last = now
+        index = int(self._elapsed / self.interval)
+        if self.loop:
+            self._show(index % len(self.frames))
+            return False
+        if index >= len(self.frames) - 1:
+            self._show(len(self.frames) - 1)
+            return True
+        self._show(index)
+        return False
+
+    def pause(self):
+        # Hidden time does not count towards playback
+        self._last = None
+
+    def finish(self):
+        """Jump to the final frame (first frame for loops) and fire on_done."""
+        if self.frames:
+            self._show(0 if self.loop else len(self.frames) - 1)
+        if self.on_done and not self.loop:
+            self.on_done()
+
+
+class FrameClock:
+    """Batches every registered Animation of one Tk root onto a single tick."""
+
+    def __init__(self, root):
+        self.root = root
+        self.animations = []
+        self._job = None
+
+    def add(self, animation):
+        if not animation.frames:
+            if animation.on_done:
+                animation.on_done()
+            return animation
+        if not ENABLE_ANIMATIONS:
+            animation.finish()
+            return animation
+        self.animations.append(animation)
+        if self._job is None:
+            self._job = self.root.after(0, self._tick)
+        return animation
+
+    def remove(self, animation):
+        animation.cancel()
+
+    @staticmethod
+    def _done(animation):
+        if animation.on_done and not animation.loop:
+            try:
+                animation.on_done()
+            except Exception as e:
+                print(f"[FrameClock] on_done error: {e}")
+
+    def _tick(self):
+        self._job = None
+        now = time.monotonic()
+        any_visible = False
+        for animation in list(self.animations):
+            if animation.cancelled:
+                self.animations.remove(animation)
+                continue
+            if not animation._alive():
+                # Widget destroyed mid-animation: still let cleanup run
+                self.animations.remove(animation)
+                self._done(animation)
+                continue
+            if not animation._visible():
+                animation.pause()
+                continue
+            any_visible = True
+            try:
+                done = animation.step(now)
+            except tk.TclError:
+                done, animation.on_done = True, None
+            except Exception as e:
+                print(f"[FrameClock] Animation error: {e}")
+                done, animation.on_done = True, None
+            if done:
+                self.animations.remove(animation)
+                self._done(animation)
+
+        if self.animations:
+            try:
+                self._job = self.root.after(
+                    TICK_MS if any_visible else IDLE_TICK_MS, self._tick
+                )
+            except tk.TclError:
+                self.animations.clear()
+
+
+def get_frame_clock(widget):
+    """Return the FrameClock for widget's Tk root, creating it on first use."""
+    root = widget._root()
+    clock = getattr(root, "_frame_clock", None)
+    if clock is None:
+        clock = FrameClock(root)
+        root._frame_clock = clock
+    return clock
+
+
+def animate(widget, frames, apply, interval_ms=TICK_MS, loop=False, on_done=None):
+    """Register an Animation for widget on its root's FrameClock."""
+    animation = Animation(widget, frames, apply, interval_ms, loop, on_done)
+    return get_frame_clock(widget).add(animation)
+
+
+def linear_frames(start, end, steps):
+    """Precompute steps+1 evenly spaced values from start to end inclusive."""
+    steps = max(int(steps), 1)
+    return [start + (end - start) * i / steps for i in range(steps + 1)]
+
+
+def fade_window(window, start, end, duration_ms=180, on_done=None, step_ms=20):
+    """Fade a toplevel's -alpha from start to end using the shared clock."""
+    frames = linear_frames(start, end, max(duration_ms // step_ms, 1))
+    return animate(
+        window,
+        frames,
+        lambda alpha: window.attributes("-alpha", alpha),
+        interval_ms=step_ms,
+        on_done=on_done,
+    )
+
+
+class SpriteSequence:
+    """Precomputed PIL frames converted to PhotoImages on first display.
+
+    Used for rotations and other per-frame image effects so the UI thread
+    never runs PIL filters while animating.
+    """
+
+    def __init__(self, frames, master=None):
+        self.frames = list(frames)
+        self.master = master
+        self._photos = [None] * len(self.frames)
+
+    def __len__(self):
+        return len(self.frames)
+
+    def photo(self, index):
+        from PIL import ImageTk
+
+        photo = self._photos[index]
+        if photo is None:
+            photo = ImageTk.PhotoImage(self.frames[index], master=self.master)
+            self._photos[index] = photo
+        return photo
+
+    @classmethod
+    def rotations(cls, image, step_degrees, master=None, resample=None):
+        """Frames of image rotated clockwise in step_degrees increments."""
+        from PIL import Image
+
+        resample = resample or Image.Resampling.BILINEAR
+        count = max(int(round(360 / step_degrees)), 1)
+        frames = [image.rotate(-i * step_degrees, resample=resample) for i in range(count)]
+        return cls(frames, master)
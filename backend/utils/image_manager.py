@@ -1,33 +1,269 @@
-"""Image manager to handle PhotoImage references and caching."""
+"""Image manager to handle PhotoImage references and caching.
+
+Besides the in-process PhotoImage registry, ImageManager keeps a persistent
+on-disk cache of resized/converted images so that logos, icons and checkbox
+glyphs are decoded and LANCZOS-resized once per source version instead of
+on every window. Cache files are keyed by the SHA-1 of the source bytes, the
+target size and the colour mode, so editing an asset invalidates it
+automatically.
+
+A pre-generated atlas (see build_atlas / ``python -m backend.utils.image_manager``)
+can be shipped inside the PyInstaller bundle; it is consulted before the
+per-user cache.
+"""
 from PIL import Image, ImageTk
+import hashlib
 import os
+import sys
+import tempfile
+import threading
+import tkinter as tk
+
+ATLAS_DIRNAME = "asset_atlas"
+
+# Assets every launch needs; pre-rendered by build_atlas.
+# (path relative to the project root, size or None, mode)
+ATLAS_SPECS = [
+    ("frontend/assets/adm_select.png", (25, 25), "RGBA"),
+    ("frontend/assets/adm_dselect.png", (25, 25), "RGBA"),
+    ("frontend/assets/selected.png", (25, 25), "RGBA"),
+    ("frontend/assets/deselected.png", (25, 25), "RGBA"),
+    ("frontend/assets/winLogo.png", (500, 500), "RGBA"),
+    ("frontend/assets/JJCFPIS.png", (600, 600), "RGBA"),
+]
+ICON_SIZES = [(256, 256), (128, 128), (64, 64), (48, 48), (32, 32), (16, 16)]
+
+
+def _project_root():
+    return os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _default_cache_dir():
+    override = os.environ.get("JJCIMS_ASSET_CACHE")
+    if override:
+        return override
+    base = os.environ.get("LOCALAPPDATA") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    if not os.path.isdir(base):
+        base = tempfile.gettempdir()
+    return os.path.join(base, "JJCIMS", "asset_cache")
+
+
+def _bundled_atlas_dir():
+    meipass = getattr(sys, "_MEIPASS", None)
+    if meipass:
+        return os.path.join(meipass, ATLAS_DIRNAME)
+    return os.path.join(_project_root(), "build", ATLAS_DIRNAME)
+
 
 class ImageManager:
     _instance = None
-    _images = {}
-    
+    _images = {}  # (interp id, path, size, mode) -> PhotoImage
+    _interps = {}  # interp id -> tkapp, keeps ids from being reused
+    _pil_cache = {}  # (path, size, mode) -> PIL image
+    _hashes = {}  # path -> (mtime, size, sha1)
+    _lock = threading.RLock()
+    cache_dir = _default_cache_dir()
+    atlas_dir = _bundled_atlas_dir()
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(ImageManager, cls).__new__(cls)
         return cls._instance
-    
+
+    # -------------------------
+    # Cache keys
+    # -------------------------
+    @classmethod
+    def _source_hash(cls, path):
+        """SHA-1 of the source file, memoized on (mtime, size)."""
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = cls._hashes.get(path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        h = hashlib.sha1()
+        with open(path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(65536), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        cls._hashes[path] = (stamp, digest)
+        return digest
+
+    @staticmethod
+    def _cache_name(digest, size, mode, ext="png"):
+        dims = f"{size[0]}x{size[1]}" if size else "orig"
+        return f"{digest[:20]}_{dims}_{mode or 'native'}.{ext}"
+
+    # -------------------------
+    # PIL level (thread-safe, usable before Tk exists)
+    # -------------------------
+    @classmethod
+    def get_pil(cls, path, size=None, mode=None):
+        """Return a resized/converted PIL image, using the atlas and disk cache."""
+        path = os.path.abspath(path)
+        size = tuple(size) if size else None
+        key = (path, size, mode)
+        with cls._lock:
+            cached = cls._pil_cache.get(key)
+        if cached is not None:
+            return cached.copy()
+
+        digest = cls._source_hash(path)
+        name = cls._cache_name(digest, size, mode)
+        image = None
+        for folder in (cls.atlas_dir, cls.cache_dir):
+            candidate = os.path.join(folder, name)
+            if os.path.exists(candidate):
+                try:
+                    with Image.open(candidate) as img:
+                        image = img.copy()
+                    break
+                except Exception:
+                    image = None
+
+        if image is None:
+            image = cls._render(path, size, mode)
+            cls._store(image, os.path.join(cls.cache_dir, name))
+
+        with cls._lock:
+            cls._pil_cache[key] = image
+        return image.copy()
+
+    @staticmethod
+    def _render(path, size, mode):
+        with Image.open(path) as img:
+            img.load()
+            image = img.convert(mode) if mode and img.mode != mode else img.copy()
+        if size and image.size != size:
+            image = image.resize(size, Image.Resampling.LANCZOS)
+        return image
+
+    @staticmethod
+    def _store(image, target):
+        """Write image to the disk cache atomically; failures are non-fatal."""
+        try:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(suffix=".png", dir=os.path.dirname(target))
+            os.close(fd)
+            image.save(tmp, format="PNG")
+            os.replace(tmp, target)
+        except Exception as e:
+            print(f"[ImageManager] Could not write cache file {target}: {e}")
+
     @classmethod
-    def load_image(cls, path, size=None):
-        """Load an image and maintain its reference."""
-        key = f"{path}_{size if size else 'original'}"
-        if key not in cls._images:
+    def get_ico(cls, path, sizes=None):
+        """Return a cached multi-size .ico converted from path."""
+        path = os.path.abspath(path)
+        sizes = sizes or ICON_SIZES
+        digest = cls._source_hash(path)
+        name = cls._cache_name(digest, sizes[0], "ico", ext="ico")
+        for folder in (cls.atlas_dir, cls.cache_dir):
+            candidate = os.path.join(folder, name)
+            if os.path.exists(candidate):
+                return candidate
+        target = os.path.join(cls.cache_dir, name)
+        os.makedirs(cls.cache_dir, exist_ok=True)
+        with Image.open(path) as img:
+            img.load()
+            fd, tmp = tempfile.mkstemp(suffix=".ico", dir=cls.cache_dir)
+            os.close(fd)
+            img.save(tmp, format="ICO", sizes=sizes)
+        os.replace(tmp, target)
+        return target
+
+    # -------------------------
+    # PhotoImage registry (Tk thread only)
+    # -------------------------
+    @classmethod
+    def load_image(cls, path, size=None, mode=None, master=None):
+        """Load an image and maintain its reference.
+
+        PhotoImages are shared by every window of the same Tk interpreter, so
+        repeated tables/dialogs reuse one image instead of decoding again.
+        """
+        try:
+            root = master or tk._get_default_root()
+            interp = root.tk
+        except Exception:
+            root, interp = None, None
+        size = tuple(size) if size else None
+        key = (id(interp), os.path.abspath(path), size, mode)
+        photo = cls._images.get(key)
+        if photo is not None:
             try:
-                image = Image.open(path)
-                if size:
-                    image = image.resize(size, Image.Resampling.LANCZOS)
-                photo = ImageTk.PhotoImage(image)
-                cls._images[key] = photo
-            except Exception as e:
-                print(f"Error loading image {path}: {e}")
-                return None
-        return cls._images[key]
-    
+                photo.width()  # raises if the image/interpreter is gone
+                return photo
+            except tk.TclError:
+                cls._images.pop(key, None)
+        try:
+            image = cls.get_pil(path, size, mode)
+            photo = ImageTk.PhotoImage(image, master=root)
+        except Exception as e:
+            print(f"Error loading image {path}: {e}")
+            return None
+        cls._images[key] = photo
+        if interp is not None:
+            cls._interps[id(interp)] = interp
+        return photo
+
     @classmethod
     def clear_cache(cls):
-        """Clear the image cache."""
+        """Clear the in-memory image caches (disk cache is kept)."""
         cls._images.clear()
+        cls._interps.clear()
+        with cls._lock:
+            cls._pil_cache.clear()
+
+    @classmethod
+    def purge_disk_cache(cls):
+        """Delete every file in the per-user disk cache."""
+        if not os.path.isdir(cls.cache_dir):
+            return
+        for entry in os.listdir(cls.cache_dir):
+            try:
+                os.remove(os.path.join(cls.cache_dir, entry))
+            except OSError:
+                pass
+
+
+def build_atlas(out_dir, specs=None, root=None):
+    """Pre-render specs into out_dir (used at build time for the bundle).
+
+    Returns the number of files written.
+    """
+    root = root or _project_root()
+    specs = specs if specs is not None else ATLAS_SPECS
+    os.makedirs(out_dir, exist_ok=True)
+    written = 0
+    for rel_path, size, mode in specs:
+        src = os.path.join(root, rel_path)
+        if not os.path.exists(src):
+            print(f"[Atlas] Skipping missing asset: {rel_path}")
+            continue
+        digest = ImageManager._source_hash(os.path.abspath(src))
+        image = ImageManager._render(src, tuple(size) if size else None, mode)
+        ImageManager._store(
+            image, os.path.join(out_dir, ImageManager._cache_name(digest, size, mode))
+        )
+        written += 1
+
+    icon_png = os.path.join(root, "frontend", "assets", "JJCIMS.png")
+    if os.path.exists(icon_png):
+        digest = ImageManager._source_hash(os.path.abspath(icon_png))
+        target = os.path.join(
+            out_dir, ImageManager._cache_name(digest, ICON_SIZES[0], "ico", ext="ico")
+        )
+        with Image.open(icon_png) as img:
+            img.save(target, format="ICO", sizes=ICON_SIZES)
+        written += 1
+    return written
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else os.path.join(
+        _project_root(), "build", ATLAS_DIRNAME
+    )
+    count = build_atlas(target)
+    print(f"[Atlas] Wrote {count} pre-rendered asset(s) to {target}")
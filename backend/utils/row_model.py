@@ -0,0 +1,216 @@
+"""
+Row Model
+=========
+Typed rows behind a ttk.Treeview so column sorting never re-parses display
+strings or goes back to the database.
+
+Loaders hand the native row values (numbers, Decimals, dates) to set_rows
+alongside the formatted rows they display. Each column gets a kind
+(number, date or text) and, the first time it is sorted on, one
+precomputed sort key per row. A header click is then an in-memory sort of
+row ids plus a single set_children call.
+
+Sorting is stable and multi-column: the clicked column becomes the primary
+key and the previously sorted columns stay as tie-breakers (up to
+MAX_SORT_COLUMNS). Permutations are cached per sort spec until the rows
+change, so toggling back and forth between columns is a dictionary lookup.
+Empty values always sort last.
+
+Tables filled by code that does not call set_rows (e.g. search results)
+still sort: the model is built once from the displayed strings ("₱1,234.00",
+"2024/01/31", "—") and reused until the rows change.
+"""
+
+from datetime import date, datetime
+
+MAX_SORT_COLUMNS = 3
+_MODEL_ATTR = "_row_model"
+
+NUMBER = "number"
+DATE = "date"
+TEXT = "text"
+
+NUMERIC_COLUMNS = {
+    "IN",
+    "OUT",
+    "BALANCE",
+    "MIN STOCK",
+    "DEFICIT",
+    "PRICE PER UNIT",
+    "COST",
+    "AVG DAILY USE",
+    "DAYS LEFT",
+    "REORDER QTY",
+    "QUANTITY",
+    "QTY",
+}
+DATE_COLUMNS = {"LAST PO", "DATE"}
+# Display text meaning "never" in numeric columns (e.g. DAYS LEFT without usage)
+INFINITE_TEXT = {"—", "∞"}
+
+
+def column_kind(col):
+    name = str(col).replace("_", " ").upper()
+    if name in NUMERIC_COLUMNS:
+        return NUMBER
+    if name in DATE_COLUMNS:
+        return DATE
+    return TEXT
+
+
+def _number_key(value):
+    if isinstance(value, bool):
+        return float(value)
+    if isinstance(value, (int, float)):
+        return None if value != value else float(value)  # NaN -> empty
+    text = str(value).strip()
+    if not text:
+        return None
+    if text in INFINITE_TEXT:
+        return float("inf")
+    try:
+        return float(text.replace("₱", "").replace(",", "").strip())
+    except ValueError:
+        try:
+            return float(value)  # Decimal and friends
+        except (TypeError, ValueError):
+            return None
+
+
+def _date_key(value):
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(value, date):
+        return value.strftime("%Y-%m-%d")
+    text = str(value).strip()
+    if not text:
+        return None
+    day = text.split(" ")[0].split("T")[0].replace("/", "-")
+    parts = day.split("-")
+    if len(parts) == 3 and all(p.isdigit() for p in parts):
+        if len(parts[2]) == 4:  # m/d/Y
+            parts = [parts[2], parts[0], parts[1]]
+        return "-".join(p.zfill(2) for p in parts) + text[len(day):]
+    return text
+
+
+def sort_key(kind, value):
+    """Comparable key for value in a column of kind; None means empty."""
+    if value is None:
+        return None
+    if kind == NUMBER:
+        return _number_key(value)
+    if kind == DATE:
+        return _date_key(value)
+    text = str(value).strip().casefold()
+    return text or None
+
+
+class RowModel:
+    """Native row values of one table, keyed by Treeview iid."""
+
+    def __init__(self, columns, rows, kinds=None):
+        self.columns = list(columns)
+        self.kinds = [
+            (kinds or {}).get(col) or column_kind(col) for col in self.columns
+        ]
+        self.iids = []
+        self.values = []
+        for iid, values in rows:
+            self.iids.append(str(iid))
+            self.values.append(tuple(values))
+        self._keys = {}  # column index -> [sort key per row]
+        self._orders = {}  # sort spec -> [iid, ...]
+        self.spec = []  # [(column, reverse), ...] most significant first
+        self.stale = False
+
+    def matches(self, children):
+        return (
+            not self.stale
+            and len(children) == len(self.iids)
+            and set(children) == set(self.iids)
+        )
+
+    def _column_keys(self, index):
+        keys = self._keys.get(index)
+        if keys is None:
+            kind = self.kinds[index]
+            keys = [
+                sort_key(kind, row[index] if index < len(row) else None)
+                for row in self.values
+            ]
+            self._keys[index] = keys
+        return keys
+
+    def order(self, spec):
+        """Row iids ordered by spec [(column, reverse), ...], cached per spec."""
+        spec = tuple((col, bool(rev)) for col, rev in spec if col in self.columns)
+        cached = self._orders.get(spec)
+        if cached is not None:
+            return cached
+        positions = list(range(len(self.iids)))
+        # Stable sorts from the least to the most significant column
+        for col, reverse in reversed(spec):
+            keys = self._column_keys(self.columns.index(col))
+            filled = [p for p in positions if keys[p] is not None]
+            empty = [p for p in positions if keys[p] is None]
+            filled.sort(key=keys.__getitem__, reverse=reverse)
+            positions = filled + empty
+        cached = [self.iids[p] for p in positions]
+        self._orders[spec] = cached
+        return cached
+
+
+def set_rows(table, rows, columns=None, kinds=None):
+    """Record the native values behind table's rows.
+
+    rows: iterable of (iid, native values) in column order.
+    columns: column ids of the values (default: the table's columns).
+    kinds: optional {column: "number" | "date" | "text"} overrides.
+    """
+    model = RowModel(columns or table["columns"], rows, kinds)
+    previous = getattr(table, _MODEL_ATTR, None)
+    if previous is not None:
+        model.spec = [s for s in previous.spec if s[0] in model.columns]
+    setattr(table, _MODEL_ATTR, model)
+    return model
+
+
+def invalidate(table):
+    """Mark the model stale after rows were edited (the sort spec is kept)."""
+    model = getattr(table, _MODEL_ATTR, None)
+    if model is not None:
+        model.stale = True
+
+
+def get_model(table):
+    """The table's RowModel, rebuilt from displayed values if the rows changed."""
+    children = table.get_children("")
+    model = getattr(table, _MODEL_ATTR, None)
+    if model is not None and model.matches(children) and model.columns == list(table["columns"]):
+        return model
+    return set_rows(table, ((iid, table.item(iid, "values")) for iid in children))
+
+
+def resort(table):
+    """Re-apply the table's last sort after its rows were reloaded."""
+    model = get_model(table)
+    if model.spec:
+        order = model.order(model.spec)
+        if list(table.get_children("")) != order:
+            table.set_children("", *order)
+    return model.spec
+
+
+def sort_table(table, col, reverse=False):
+    """Reorder table by col (then by the previous sort columns) in memory.
+
+    Returns the active sort spec [(column, reverse), ...].
+    """
+    model = get_model(table)
+    spec = [(col, bool(reverse))] + [s for s in model.spec if s[0] != col]
+    model.spec = spec[:MAX_SORT_COLUMNS]
+    order = model.order(model.spec)
+    if list(table.get_children("")) != order:
+        table.set_children("", *order)
+    return model.spec
@@ -0,0 +1,168 @@
+"""
+Table Diff
+==========
+Row-level refresh for ttk.Treeview tables keyed by a stable row id.
+
+Instead of deleting every row and inserting the new result set (which
+loses scroll position, selection and checkbox state and costs one Tcl call
+per row plus a move per row to sort), sync_rows compares the new rows
+against what the table already shows:
+
+* rows whose key disappeared are deleted in one call,
+* rows whose values changed are updated in place,
+* new rows are inserted with the key as their iid, in bulk,
+* the display order is applied with a single set_children call, and only
+  when it differs.
+
+The last values written per row are remembered on the table, so unchanged
+rows cost a dictionary lookup, not a Tcl round-trip. Works with plain
+Treeviews and both CheckboxTreeview variants (checked state lives on the
+iid, so it survives; checks on deleted rows are dropped).
+"""
+
+import tkinter as tk
+import tkinter.font as tkfont
+
+from . import row_model
+from .table_loader import bulk_insert, text_width
+
+_CACHE_ATTR = "_diff_rows"  # iid -> (values as str tuple, tags)
+_WIDTH_ATTR = "_diff_widths"  # column -> widest measured text (px)
+
+
+def _as_text(values):
+    return tuple("" if v is None else str(v) for v in values)
+
+
+def _row_cache(table):
+    """Shadow copy of the rows this module wrote, rebuilt if the table diverged."""
+    cache = getattr(table, _CACHE_ATTR, None)
+    children = table.get_children("")
+    if cache is None or len(cache) != len(children) or any(
+        iid not in cache for iid in children
+    ):
+        cache = {}
+        for iid in children:
+            item = table.item(iid)
+            cache[iid] = (_as_text(item.get("values") or ()), tuple(item.get("tags") or ()))
+        setattr(table, _CACHE_ATTR, cache)
+    return cache, children
+
+
+def reset(table):
+    """Forget the shadow copy (call after code outside this module edits rows)."""
+    if hasattr(table, _CACHE_ATTR):
+        delattr(table, _CACHE_ATTR)
+
+
+def sync_rows(table, rows, tags=None):
+    """Make table show rows, touching only what changed.
+
+    rows: ordered iterable of (key, values); key becomes the row iid.
+    tags: optional callable(values) -> tuple of tags for a row.
+    Returns {"inserted", "updated", "deleted", "moved"} counts.
+    """
+    stats = {"inserted": 0, "updated": 0, "deleted": 0, "moved": False}
+    try:
+        first_visible = table.yview()[0]
+    except (tk.TclError, TypeError):
+        first_visible = None
+    try:
+        selected = set(table.selection())
+        focused = table.focus()
+    except tk.TclError:
+        selected, focused = set(), ""
+
+    cache, children = _row_cache(table)
+    wanted = []
+    seen = set()
+    for key, values in rows:
+        key = str(key)
+        if key in seen:
+            continue  # duplicate key: first one wins
+        seen.add(key)
+        wanted.append((key, values))
+
+    stale = [iid for iid in children if iid not in seen]
+    if stale:
+        table.delete(*stale)
+        for iid in stale:
+            cache.pop(iid, None)
+        stats["deleted"] = len(stale)
+        checked = getattr(table, "_checked_items", None)
+        refs = getattr(table, "_image_refs", None)
+        for iid in stale:
+            if checked is not None:
+                checked.discard(iid)
+            if refs is not None:
+                refs.pop(iid, None)
+
+    changed = []
+    new_keys, new_rows = [], []
+    for key, values in wanted:
+        text = _as_text(values)
+        row_tags = tuple(tags(values)) if tags else ()
+        current = cache.get(key)
+        if current is None:
+            new_keys.append(key)
+            new_rows.append(tuple(values))
+            stats["inserted"] += 1
+            changed.append(text)
+        elif current != (text, row_tags):
+            table.item(key, values=tuple(values), tags=row_tags)
+            stats["updated"] += 1
+            changed.append(text)
+        else:
+            continue
+        cache[key] = (text, row_tags)
+
+    if new_rows:
+        bulk_insert(table, new_rows, iids=new_keys, tags=tags)
+
+    order = [key for key, _ in wanted]
+    if list(table.get_children("")) != order:
+        table.set_children("", *order)
+        stats["moved"] = True
+
+    keep = [iid for iid in selected if iid in cache]
+    if keep != list(selected):
+        table.selection_set(keep)
+    if focused and focused in cache:
+        table.focus(focused)
+    if first_visible is not None and (stats["inserted"] or stats["deleted"] or stats["moved"]):
+        table.yview_moveto(first_visible)
+    table._diff_changed = changed
+    if changed or stale:
+        row_model.invalidate(table)  # loaders re-register typed values
+    return stats
+
+
+def grow_column_widths(table, rows=None, padding=20, font=None, max_width=None):
+    """Widen columns to fit rows (default: rows changed by the last sync_rows).
+
+    Only the given rows are measured; widths never shrink, so a refresh that
+    changed one row measures one row.
+    """
+    font = font or tkfont.nametofont("TkDefaultFont")
+    columns = list(table["columns"])
+    widths = getattr(table, _WIDTH_ATTR, None)
+    full = widths is None or set(widths) != set(columns)
+    if full:
+        widths = {col: text_width(font, col) for col in columns}
+        setattr(table, _WIDTH_ATTR, widths)
+        rows = [entry[0] for entry in getattr(table, _CACHE_ATTR, {}).values()]
+    elif rows is None:
+        rows = getattr(table, "_diff_changed", ())
+    grown = False
+    for values in rows:
+        for col, value in zip(columns, values):
+            width = text_width(font, value)
+            if width > widths[col]:
+                widths[col] = width
+                grown = True
+    if full or grown:
+        for col in columns:
+            width = widths[col] + padding
+            if max_width:
+                width = min(width, max_width)
+            table.column(col, width=width)
@@ -0,0 +1,235 @@
+"""
+Table Loader
+============
+Bulk population of ttk.Treeview tables.
+
+Filling a table row by row costs several Python -> Tcl round-trips per row
+(format, insert, move, and one font.measure per cell for auto-sizing). This
+module does the same work in bulk:
+
+* format_columns formats a result set one column at a time with a single
+  formatter per column; date strings are parsed once per distinct value.
+* bulk_insert sends rows to Tk in chunks through one small Tcl proc, so
+  20k rows are a handful of Tcl calls instead of 20k ``insert`` calls.
+  Checkbox tables get their unchecked icon on every row.
+* fit_columns sizes columns from the longest distinct values of each
+  column (a few dozen per column, not every cell), with text widths
+  memoized per font.
+"""
+
+import heapq
+import itertools
+from datetime import date, datetime, time
+from decimal import Decimal
+from functools import lru_cache
+
+import tkinter.font as tkfont
+
+CHUNK_ROWS = 5000
+SAMPLE_LONGEST = 25  # distinct values measured per column when auto-sizing
+
+_PROC = "::jjcims_bulk_insert"
+_PROC_BODY = """
+proc ::jjcims_bulk_insert {tv parent image rows} {
+    foreach {iid vals tags} $rows {
+        if {$image eq ""} {
+            $tv insert $parent end -id $iid -values $vals -tags $tags
+        } else {
+            $tv insert $parent end -id $iid -values $vals -tags $tags -image $image -text {}
+        }
+    }
+}
+"""
+_iid_counter = itertools.count(1)
+
+
+# -------------------------
+# Formatting
+# -------------------------
+def text(value):
+    return "" if value is None else value
+
+
+def display_value(value):
+    """Numbers as 1,234 / 1,234.50; strings without stray quotes."""
+    if value is None:
+        return ""
+    if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+        number = float(value)
+        if number.is_integer():
+            return f"{int(number):,}"
+        return f"{number:,.2f}"
+    return str(value).strip("'\"")
+
+
+def currency(value):
+    if value is None:
+        return ""
+    try:
+        return f"₱{float(value):,.2f}"
+    except (TypeError, ValueError):
+        return "₱0.00"
+
+
+@lru_cache(maxsize=4096)
+def _parse_day(value):
+    day = value.split(" ")[0].split("T")[0].split(".")[0]
+    for fmt in ("%Y-%m-%d", "%Y/%m/%d", "%m/%d/%Y"):
+        try:
+            return datetime.strptime(day, fmt).date()
+        except ValueError:
+            continue
+    return day
+
+
+def _day_text(value, fmt):
+    if value is None or value == "":
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.strftime(fmt)
+    parsed = _parse_day(str(value))
+    return parsed.strftime(fmt) if isinstance(parsed, date) else parsed
+
+
+def slash_date(value):
+    """Dates as YYYY/MM/DD (item LAST PO)."""
+    return _day_text(value, "%Y/%m/%d")
+
+
+def iso_date(value):
+    """Dates as YYYY-MM-DD (log DATE)."""
+    return _day_text(value, "%Y-%m-%d")
+
+
+def clock_time(value):
+    """Times as HH:MM:SS (log TIME)."""
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, time)):
+        return value.strftime("%H:%M:%S")
+    return str(value).split(" ")[-1]
+
+
+ITEM_FORMATTERS = {
+    "PRICE PER UNIT": currency,
+    "COST": currency,
+    "LAST PO": slash_date,
+}
+LOG_FORMATTERS = {"DATE": iso_date, "TIME": clock_time}
+
+
+def format_columns(rows, columns, formatters=None, default=text):
+    """Format rows column by column; returns a list of tuples.
+
+    formatters maps column name (case-insensitive) to a callable applied to
+    every value of that column; other columns use default.
+    """
+    if not rows:
+        return []
+    formatters = {k.upper(): f for k, f in (formatters or {}).items()}
+    width = len(columns)
+    rows = [
+        tuple(r) + (None,) * (width - len(r)) if len(r) < width else tuple(r)
+        for r in rows
+    ]
+    formatted = [
+        list(map(formatters.get(str(col).upper(), default), values))
+        for col, values in zip(columns, zip(*rows))
+    ]
+    return list(zip(*formatted))
+
+
+# -------------------------
+# Insertion
+# -------------------------
+def _ensure_proc(table):
+    root = table._root()
+    if not getattr(root, "_bulk_insert_proc", False):
+        table.tk.eval(_PROC_BODY)
+        root._bulk_insert_proc = True
+
+
+def bulk_insert(table, rows, iids=None, tags=None, parent="", image=None):
+    """Append rows to table in a few Tcl calls; returns the row iids.
+
+    iids: optional row ids (default: fresh unique ids).
+    tags: optional callable(values) -> tuple of tags.
+    image: row image; defaults to the unchecked icon of checkbox tables.
+    """
+    rows = [tuple(r) for r in rows]
+    if iids is None:
+        iids = [f"row{next(_iid_counter)}" for _ in rows]
+    else:
+        iids = [str(i) for i in iids]
+    if not rows:
+        return iids
+    if image is None:
+        image = getattr(table, "deselected_icon", None)
+    image_name = str(image) if image is not None else ""
+    _ensure_proc(table)
+    flat = []
+    for iid, values in zip(iids, rows):
+        flat.append(iid)
+        flat.append(values)
+        flat.append(tuple(tags(values)) if tags else ())
+    step = CHUNK_ROWS * 3
+    for start in range(0, len(flat), step):
+        table.tk.call(_PROC, table._w, parent, image_name, tuple(flat[start:start + step]))
+    refs = getattr(table, "_image_refs", None)
+    if refs is not None and image is not None:
+        for iid in iids:
+            refs[iid] = image
+    return iids
+
+
+def load_rows(table, rows, iids=None, tags=None):
+    """Replace every row of table with rows (one delete + bulk_insert)."""
+    children = table.get_children("")
+    if children:
+        table.delete(*children)
+    for attr in ("_checked_items", "_image_refs"):
+        store = getattr(table, attr, None)
+        if store is not None:
+            store.clear()
+    return bulk_insert(table, rows, iids=iids, tags=tags)
+
+
+# -------------------------
+# Column widths
+# -------------------------
+_width_cache = {}
+_WIDTH_CACHE_LIMIT = 50000
+
+
+def text_width(font, value):
+    """font.measure(value), memoized per font."""
+    key = (str(font), value)
+    width = _width_cache.get(key)
+    if width is None:
+        if len(_width_cache) > _WIDTH_CACHE_LIMIT:
+            _width_cache.clear()
+        width = font.measure(value)
+        _width_cache[key] = width
+    return width
+
+
+def fit_columns(table, rows, columns=None, padding=20, font=None,
+                min_width=None, max_width=None, sample=SAMPLE_LONGEST):
+    """Size columns to the widest of the longest distinct values per column.
+
+    rows are the display rows; only the `sample` longest distinct strings of
+    each column (plus the heading) are measured.
+    """
+    font = font or tkfont.nametofont("TkDefaultFont")
+    columns = list(columns or table["columns"])
+    values_by_column = list(zip(*rows)) if rows else [()] * len(columns)
+    for col, values in zip(columns, values_by_column):
+        distinct = {"" if v is None else str(v) for v in values}
+        candidates = heapq.nlargest(sample, distinct, key=len)
+        candidates.append(str(col))
+        width = max(text_width(font, v) for v in candidates) + padding
+        if min_width:
+            width = max(width, min_width)
+        if max_width:
+            width = min(width, max_width)
+        table.column(col, width=width)
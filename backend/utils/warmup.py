@@ -0,0 +1,162 @@
+"""
+Warm-up
+=======
+Parallel start-up work shared by the loading screen and the first windows.
+
+The loading screen registers named, weighted steps (resolve the database
+path and open a first connection, prefetch the item catalog, emp_list and
+type/facet lists, decode common images, render splash text, import the
+window modules) and starts them on a small thread pool. A step can wait for
+others (``after=``), e.g. every query waits for the first connection so the
+ODBC driver is loaded once.
+
+progress() returns the finished share of the total weight and the label of
+a step still running, so the splash shows real progress and closes as soon
+as ``done`` is set instead of after a fixed time.
+
+Prefetched query results are published with put() and handed to the first
+window that asks with take(): each result is used once and only while it
+is younger than WARMUP_MAX_AGE seconds, so every later refresh still reads
+the database.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+WARMUP_WORKERS = int(os.environ.get("JJCIMS_WARMUP_WORKERS", "4"))
+WARMUP_MAX_AGE = float(os.environ.get("JJCIMS_WARMUP_MAX_AGE", "120"))
+
+
+class _Step:
+    __slots__ = ("label", "fn", "weight", "after", "finished")
+
+    def __init__(self, label, fn, weight, after):
+        self.label = label
+        self.fn = fn
+        self.weight = weight
+        self.after = tuple(after)
+        self.finished = threading.Event()
+
+
+class WarmUp:
+    """Runs warm-up steps in parallel and keeps their prefetched results."""
+
+    def __init__(self, workers=WARMUP_WORKERS, max_age=WARMUP_MAX_AGE):
+        self.workers = max(1, workers)
+        self.max_age = max_age
+        self.done = threading.Event()
+        self.errors = {}  # label -> exception
+        self.elapsed = None  # seconds, once done
+        self._steps = {}
+        self._running = []
+        self._finished_weight = 0.0
+        self._remaining = 0
+        self._results = {}  # key -> (stored at, value)
+        self._lock = threading.Lock()
+        self._started = None
+
+    # -------------------------
+    # Steps
+    # -------------------------
+    def add(self, label, fn, weight=1.0, after=()):
+        """Register fn as a step; it starts once the steps named in after finished."""
+        with self._lock:
+            if self._started is not None:
+                raise RuntimeError("warm-up already started")
+            self._steps[label] = _Step(label, fn, float(weight), after)
+
+    def start(self):
+        """Start every registered step (idempotent); returns immediately."""
+        with self._lock:
+            if self._started is not None:
+                return
+            self._started = time.perf_counter()
+            steps = list(self._steps.values())
+            self._remaining = len(steps)
+        if not steps:
+            self._finish()
+            return
+        # Submitted in registration order, so a step's prerequisites always
+        # hold a worker before it does and waiting cannot starve the pool
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="WarmUp")
+        for step in steps:
+            executor.submit(self._run, step)
+        executor.shutdown(wait=False)
+
+    def _run(self, step):
+        for name in step.after:
+            prerequisite = self._steps.get(name)
+            if prerequisite is not None:
+                prerequisite.finished.wait()
+        with self._lock:
+            self._running.append(step.label)
+        try:
+            step.fn()
+        except Exception as e:
+            self.errors[step.label] = e
+            print(f"[WarmUp] {step.label} failed: {e}")
+        finally:
+            with self._lock:
+                self._running.remove(step.label)
+                self._finished_weight += step.weight
+                self._remaining -= 1
+                last = self._remaining == 0
+            step.finished.set()
+            if last:
+                self._finish()
+
+    def _finish(self):
+        self.elapsed = time.perf_counter() - (self._started or time.perf_counter())
+        self.done.set()
+        print(f"[WarmUp] Done in {self.elapsed * 1000:.0f} ms ({len(self.errors)} step(s) failed)")
+
+    def progress(self):
+        """(percent 0-100, label of a running step or None)."""
+        with self._lock:
+            total = sum(step.weight for step in self._steps.values())
+            percent = 100 if not total else int(self._finished_weight / total * 100)
+            running = self._running[0] if self._running else None
+        if self.done.is_set():
+            return 100, None
+        return min(percent, 99), running
+
+    def labels(self):
+        """Labels of the registered steps, in registration order."""
+        with self._lock:
+            return list(self._steps)
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+    # -------------------------
+    # Prefetched results
+    # -------------------------
+    def put(self, key, value):
+        with self._lock:
+            self._results[key] = (time.monotonic(), value)
+
+    def take(self, key):
+        """Return and forget the prefetched value for key, or None if absent/stale."""
+        with self._lock:
+            entry = self._results.pop(key, None)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self.max_age:
+            return None
+        return value
+
+
+_warm_up = None
+_warm_up_lock = threading.Lock()
+
+
+def get_warm_up():
+    """Return the process-wide WarmUp."""
+    global _warm_up
+    with _warm_up_lock:
+        if _warm_up is None:
+            _warm_up = WarmUp()
+        return _warm_up
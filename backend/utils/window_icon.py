@@ -6,8 +6,7 @@ Provides functions to set consistent window icons across all GUI windows.
 
 import os
 import tkinter as tk
-from PIL import Image, ImageTk
-import tempfile
+from .image_manager import ImageManager, ICON_SIZES
 
 
 def set_window_icon(window):
@@ -56,62 +55,21 @@ def set_window_icon(window):
         if os.path.exists(png_path):
             print(f"Falling back to PNG icon: {png_path}")
 
-            # Load the PNG image
-            icon_image = Image.open(png_path)
-            original_size = icon_image.size
-            print(f"Original PNG icon size: {original_size}")
-
-            # Create a temporary ICO file with multiple sizes for better Windows taskbar integration
-            with tempfile.NamedTemporaryFile(suffix=".ico", delete=False) as temp_ico:
-                # Create multiple sizes for ICO format (Windows standard)
-                icon_sizes = [
-                    (256, 256),
-                    (128, 128),
-                    (64, 64),
-                    (48, 48),
-                    (32, 32),
-                    (16, 16),
-                ]
-                icon_images = []
-
-                for size in icon_sizes:
-                    resized = icon_image.resize(size, Image.Resampling.LANCZOS)
-                    icon_images.append(resized)
-
-                # Save as ICO with multiple sizes
-                icon_images[0].save(temp_ico.name, format="ICO", sizes=icon_sizes)
-                temp_ico_path = temp_ico.name
-
-            # Try to set the temporary ICO file
+            # Multi-size ICO converted once and kept in the asset cache
             try:
-                window.iconbitmap(temp_ico_path)
-                print(f"Successfully set icon using temporary .ico file")
-
-                # Store the temp file path for cleanup later
-                if not hasattr(window, "_temp_ico_path"):
-                    window._temp_ico_path = temp_ico_path
+                cached_ico_path = ImageManager.get_ico(png_path, ICON_SIZES)
+                window.iconbitmap(cached_ico_path)
+                print(f"Successfully set icon using cached .ico file")
                 return
 
             except Exception as e:
-                print(f"Failed to set temporary .ico icon: {e}")
-                # Clean up temp file if it failed
-                try:
-                    os.unlink(temp_ico_path)
-                except:
-                    pass
+                print(f"Failed to set cached .ico icon: {e}")
 
-                # Final fallback to PhotoImage method
+                # Final fallback to PhotoImage method (shared registry keeps the reference)
                 print("Using final fallback PhotoImage method...")
-
-                # Use largest possible sizes for PhotoImage method
-                icon_1024 = icon_image  # Keep original quality
-                icon_photo = ImageTk.PhotoImage(icon_1024)
-                window.iconphoto(True, icon_photo)
-
-                # Keep reference to prevent garbage collection
-                if not hasattr(window, "_icon_refs"):
-                    window._icon_refs = []
-                window._icon_refs.append(icon_photo)
+                icon_photo = ImageManager.load_image(png_path, master=window)
+                if icon_photo is not None:
+                    window.iconphoto(True, icon_photo)
 
         else:
             print(f"Warning: No icon files found. Checked:")
@@ -143,58 +101,21 @@ def set_window_icon_from_path(window, icon_path):
                 except Exception as e:
                     print(f"Failed to set ICO icon: {e}")
 
-            # For other formats, convert to ICO
-            icon_image = Image.open(icon_path)
-            original_size = icon_image.size
-            print(f"Original icon size: {original_size}")
-
-            # Create a temporary ICO file
-            with tempfile.NamedTemporaryFile(suffix=".ico", delete=False) as temp_ico:
-                icon_sizes = [
-                    (256, 256),
-                    (128, 128),
-                    (64, 64),
-                    (48, 48),
-                    (32, 32),
-                    (16, 16),
-                ]
-                icon_images = []
-
-                for size in icon_sizes:
-                    resized = icon_image.resize(size, Image.Resampling.LANCZOS)
-                    icon_images.append(resized)
-
-                # Save as ICO with multiple sizes
-                icon_images[0].save(temp_ico.name, format="ICO", sizes=icon_sizes)
-                temp_ico_path = temp_ico.name
-
-            # Try to set the temporary ICO file
+            # For other formats, convert to ICO once (kept in the asset cache)
             try:
-                window.iconbitmap(temp_ico_path)
-                print(f"Successfully set icon using temporary ICO file")
-
-                # Store the temp file path for cleanup later
-                if not hasattr(window, "_temp_ico_path"):
-                    window._temp_ico_path = temp_ico_path
+                cached_ico_path = ImageManager.get_ico(icon_path, ICON_SIZES)
+                window.iconbitmap(cached_ico_path)
+                print(f"Successfully set icon using cached ICO file")
                 return
 
             except Exception as e:
-                print(f"Failed to set temporary ICO icon: {e}")
-                # Clean up temp file if it failed
-                try:
-                    os.unlink(temp_ico_path)
-                except:
-                    pass
+                print(f"Failed to set cached ICO icon: {e}")
 
-                # Final fallback to PhotoImage
+                # Final fallback to PhotoImage (shared registry keeps the reference)
                 print("Using fallback PhotoImage method...")
-                icon_photo = ImageTk.PhotoImage(icon_image)
-                window.iconphoto(True, icon_photo)
-
-                # Keep reference to prevent garbage collection
-                if not hasattr(window, "_icon_refs"):
-                    window._icon_refs = []
-                window._icon_refs.append(icon_photo)
+                icon_photo = ImageManager.load_image(icon_path, master=window)
+                if icon_photo is not None:
+                    window.iconphoto(True, icon_photo)
 
         else:
             print(f"Warning: Icon file not found at {icon_path}")
@@ -42,7 +42,16 @@ from .functions.admdash_f.admdash_imp import (
     Admin2FA,
     UpdateItemsWindow,
 )
+from backend.config.key_service import get_key_rotation_job, get_key_service
 from backend.database import get_connector, get_db_path
+from backend.database.change_feed import get_change_feed
+from backend.database.log_archive import get_log_retention_job
+from backend.database.lookup_cache import get_lookup_cache
+from backend.database.queries import refresh_item_status, transaction
+from backend.database.write_queue import on_tk
+from backend.utils import row_model
+from backend.utils.frame_clock import fade_window
+from backend.utils.table_loader import ITEM_FORMATTERS, format_columns
 
 # Central resolved DB path (ensures import side-effect uses get_db_path)
 DB_PATH = get_db_path()
@@ -128,26 +137,22 @@ class ToastNotification:
 
     def show_toast(self):
         self.toast.deiconify()  # Show window
-        # Animate opacity from 0 to 0.9
-        self.animate_in(0.0)
-
-    def animate_in(self, alpha):
-        if alpha < 0.9:
-            self.toast.attributes("-alpha", alpha)
-            self.toast.after(20, lambda: self.animate_in(alpha + 0.1))
-        else:
-            self.toast.attributes("-alpha", 0.9)
+        # Animate opacity from 0 to 0.9 on the shared frame clock
+        fade_window(self.toast, 0.0, 0.9)
 
     def hide_toast(self):
-        # Animate opacity from 0.9 to 0
-        self.animate_out(0.9)
+        # Animate opacity from 0.9 to 0, then close
+        if getattr(self, "_hiding", False):
+            return
+        self._hiding = True
+        fade_window(self.toast, 0.9, 0.0, on_done=self._destroy)
 
-    def animate_out(self, alpha):
-        if alpha > 0:
-            self.toast.attributes("-alpha", alpha)
-            self.toast.after(20, lambda: self.animate_out(alpha - 0.1))
-        else:
-            self.toast.destroy()
+    def _destroy(self):
+        try:
+            if self.toast.winfo_exists():
+                self.toast.destroy()
+        except tk.TclError:
+            pass
 
 
 def show_toast(parent, message, type="info", duration=3000):
@@ -158,11 +163,10 @@ def show_toast(parent, message, type="info", duration=3000):
 # Add the `src` directory to the Python module search path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-# DB and Fernet key paths
+# DB path
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 # Updated to use main JJCIMS database for employee list
 DB_PATH = get_db_path()
-FERNET_KEY_PATH = os.path.abspath(os.path.join(BASE_DIR, "config", "fernet_key.py"))
 
 
 def create_rounded_search_bar(parent, search_callback, width=300, height=35):
@@ -499,6 +503,17 @@ class AdminDashboard:
         # Ensure the default view is consistent
         self.current_view = "ITEMS_LIST"
 
+        # Keep the open view current when other workstations write
+        self.change_listener = get_change_feed().attach(
+            self.root, self._on_remote_change
+        )
+
+        # Move old log rows into the compressed archive in the background
+        get_log_retention_job().start()
+
+        # Finish re-encrypting credentials if a key rotation was interrupted
+        get_key_rotation_job().resume_pending()
+
         # --- SEARCH BAR (rounded with search icon) positioned beside tabs ---
         # Wait for tabs_and_search_frame to be created, then add search bar
         if self.root and self.root.winfo_exists():
@@ -636,6 +651,20 @@ class AdminDashboard:
             pady=5,
         )
 
+        self.show_archived_logs = False
+        self.archived_logs_button = tk.Button(
+            self.sidebar,
+            text="Show Archived Logs",
+            command=self.toggle_archived_logs,
+            bg="#0d1331",
+            fg="#fffde7",
+            font=("Segoe UI", 12, "bold"),
+            width=18,
+            anchor="w",
+            padx=10,
+            pady=5,
+        )
+
         # Settings button with 2FA
         settings_img_path = os.path.abspath(
             os.path.join(os.path.dirname(__file__), "..", "assets", "settings.png")
@@ -676,11 +705,7 @@ class AdminDashboard:
                         "error", "2FA Error", "2FA secret not found for this user."
                     )
                     return
-                from cryptography.fernet import Fernet
-                from gui.config.fernet_key import FERNET_KEY
-
-                fernet = Fernet(FERNET_KEY)
-                secret = fernet.decrypt(secret_enc.encode()).decode()
+                secret = get_key_service().decrypt_text(secret_enc)
                 if self.root and self.root.winfo_exists():
                     Admin2FA(self.root, secret=secret, on_success=on_2fa_success)
             except Exception as e:
@@ -740,6 +765,7 @@ class AdminDashboard:
                 self.export_csv_button: "Export data to a CSV file",
                 self.clear_admin_logs_button: "Clear all admin logs",
                 self.clear_employee_logs_button: "Clear all employee logs",
+                self.archived_logs_button: "Include log entries moved to the archive",
                 getattr(
                     self, "delete_log_button", None
                 ): "Delete the selected log entry"
@@ -872,6 +898,9 @@ class AdminDashboard:
     def on_close(self):
         """Properly cleanup and close the admin dashboard, robustly cancelling all after callbacks."""
         try:
+            if getattr(self, "change_listener", None):
+                self.change_listener.cancel()
+                self.change_listener = None
             # Cancel all scheduled after callbacks
             if hasattr(self, "_after_ids"):
                 for after_id in list(self._after_ids):
@@ -964,29 +993,8 @@ class AdminDashboard:
         else:
             self.sort_states[col] = reverse
 
-        # Get all items
-        items = [(self.table.set(k, col), k) for k in self.table.get_children("")]
-
-        # Convert values for sorting
-        def convert_value(value):
-            if not value:
-                return 0 if col in self.numeric_columns else ""
-
-            if col in self.numeric_columns:
-                # Remove currency symbols and commas for numeric columns
-                cleaned = value.replace("₱", "").replace(",", "").strip()
-                try:
-                    return float(cleaned)
-                except ValueError:
-                    return 0
-            return value.lower()  # Case-insensitive string sorting
-
-        # Sort items
-        items.sort(key=lambda x: convert_value(x[0]), reverse=reverse)
-
-        # Rearrange items in sorted positions
-        for index, (_, k) in enumerate(items):
-            self.table.move(k, "", index)
+        # Reorder in memory on typed values (never touches the database)
+        row_model.sort_table(self.table, col, reverse)
 
         # Update all column headers to show sort indicators
         for header in self.table["columns"]:
@@ -1059,49 +1067,7 @@ class AdminDashboard:
 
     def format_row(self, row, columns):
         """Format row values, especially for currency columns and dates."""
-        formatted_row = []
-        for idx, value in enumerate(row):
-            if value is None:
-                formatted_row.append("")
-            elif columns[idx] == "LAST PO" and value:
-                try:
-                    from datetime import datetime
-
-                    # Handle different types of date inputs
-                    if isinstance(value, str):
-                        # Split on space or 'T' to remove time component if present
-                        date_part = value.split(" ")[0].split("T")[0]
-                        # Remove any time component that might be remaining
-                        date_part = date_part.split(".")[0]
-
-                        # Try different possible date formats
-                        for fmt in ["%Y-%m-%d", "%Y/%m/%d"]:
-                            try:
-                                dt = datetime.strptime(date_part, fmt)
-                                formatted_row.append(dt.strftime("%Y/%m/%d"))
-                                break
-                            except ValueError:
-                                continue
-                        else:
-                            # If no format matched, just use the date part
-                            formatted_row.append(date_part)
-                    else:
-                        # Handle datetime objects
-                        formatted_row.append(value.strftime("%Y/%m/%d"))
-                except Exception:
-                    # If parsing fails, just take the first 10 characters if it's a string
-                    if isinstance(value, str):
-                        formatted_row.append(value[:10].replace("-", "/"))
-                    else:
-                        formatted_row.append(str(value))
-            elif columns[idx] in {"PRICE PER UNIT", "COST"}:
-                try:
-                    formatted_row.append(f"₱{float(value):,.2f}")
-                except ValueError:
-                    formatted_row.append("₱0.00")
-            else:
-                formatted_row.append(value)
-        return tuple(formatted_row)
+        return format_columns([row], columns, ITEM_FORMATTERS)[0]
 
     def refresh_current_view(self):
         """Refresh the currently active view (items list or restock list)."""
@@ -1129,6 +1095,52 @@ class AdminDashboard:
             print("[DEBUG] Refreshing items list view...")
             self.load_data()
 
+    def _on_remote_change(self, batch):
+        """Refresh the active view when the change feed reports its table."""
+        if batch.get("reset"):
+            touched = set(batch.get("tables", {}))
+        else:
+            touched = {change["table"] for change in batch.get("changes", [])}
+        if "ITEMSDB" in touched:
+            get_lookup_cache().invalidate()
+
+        view_tables = {
+            "ITEMS_LIST": "ITEMSDB",
+            "Restock List": "ITEMSDB",
+            "Employee Logs": "emp_logs",
+            "Admin Logs": "adm_logs",
+        }
+        if view_tables.get(self.current_view) not in touched:
+            return
+        if not self.table or not self.table.winfo_exists():
+            return
+        print(f"[DEBUG] Remote change in {sorted(touched)}, refreshing {self.current_view}")
+
+        # Re-run an active search so the filter survives the refresh
+        search_entry = getattr(self, "search_entry", None)
+        try:
+            keyword = search_entry.get().strip() if search_entry else ""
+        except tk.TclError:
+            keyword = ""
+        if keyword:
+            from gui.functions.admdash_f.ML.search_bar import search_items
+
+            search_items(self)
+        elif self.current_view == "ITEMS_LIST":
+            checked_ids = set()
+            if hasattr(self.table, "get_checked"):
+                for row_id in self.table.get_checked():
+                    values = self.table.item(row_id, "values")
+                    if values:
+                        checked_ids.add(str(values[0]))
+            self.load_data(preserve_checked_ids=checked_ids or None)
+        elif self.current_view == "Restock List":
+            self.refresh_current_view()
+        elif self.current_view == "Employee Logs":
+            self.view_logs()
+        else:
+            self.view_admin_logs()
+
     def load_data(self, preserve_checked_ids=None):
         """Load data into the table and auto-adjust column widths. Optionally preserve checked state by item ID. Robustly manage after callbacks."""
         # Set up a flag and timer for skeleton screen
@@ -1150,21 +1162,24 @@ class AdminDashboard:
             if hasattr(self, "_after_ids"):
                 self._after_ids.add(self._skeleton_timer_id)
 
-        # Execute Update Status and statssum queries first
-        try:
-            connection = self.db.connect()
-            cursor = connection.cursor()
-            cursor.execute("EXEC [Update Status]")
-            connection.commit()
-            cursor.execute("EXEC statssum")
-            connection.commit()
-        except Exception as e:
-            print(f"Error executing database queries: {e}")
-        finally:
-            if "cursor" in locals():
-                cursor.close()
-            if "connection" in locals():
-                connection.close()
+        # Execute Update Status and statssum queries first. With a write
+        # queue they run on the writer thread and the table loads when done.
+        queued = hasattr(self.db, "submit_query")
+        if not queued:
+            try:
+                connection = self.db.connect()
+                cursor = connection.cursor()
+                cursor.execute("EXEC [Update Status]")
+                connection.commit()
+                cursor.execute("EXEC statssum")
+                connection.commit()
+            except Exception as e:
+                print(f"Error executing database queries: {e}")
+            finally:
+                if "cursor" in locals():
+                    cursor.close()
+                if "connection" in locals():
+                    connection.close()
 
         # Now load the real data
         def finish_loading():
@@ -1194,7 +1209,6 @@ class AdminDashboard:
                         db=self.db,
                         default_columns=self.default_columns,
                         default_column_widths=self.default_column_widths,
-                        format_row=self.format_row,
                         update_stats=self.update_stats,
                     )
                 else:
@@ -1243,6 +1257,12 @@ class AdminDashboard:
             if self.root and self.root.winfo_exists():
                 finish_loading()
 
+        if queued and self.root and self.root.winfo_exists():
+            refresh_item_status(
+                self.db, on_tk(self.root, lambda ticket: _delayed_finish_loading())
+            )
+            return
+
         # Run finish_loading as soon as possible after DB work
         if self.root and self.root.winfo_exists():
             finish_id = self.root.after(0, _delayed_finish_loading)
@@ -1274,6 +1294,17 @@ class AdminDashboard:
             self.total_cost_label,
         )
 
+    def toggle_archived_logs(self):
+        """Show or hide archived log rows in the current log view."""
+        self.show_archived_logs = not self.show_archived_logs
+        self.archived_logs_button.config(
+            text="Hide Archived Logs" if self.show_archived_logs else "Show Archived Logs"
+        )
+        if self.current_view == "Admin Logs":
+            self.view_admin_logs()
+        elif self.current_view == "Employee Logs":
+            self.view_logs()
+
     def view_admin_logs(self):
         """Load and display the contents of the Admin Logs sheet in the Treeview."""
         # ...existing code...
@@ -1307,6 +1338,8 @@ class AdminDashboard:
             self.clear_employee_logs_button.pack_forget()
         if hasattr(self, "delete_log_button"):
             self.delete_log_button.pack_forget()
+        if hasattr(self, "archived_logs_button"):
+            self.archived_logs_button.pack_forget()
 
         # Handle logs views specifically
         if view_name in ("Admin Logs", "Employee Logs"):
@@ -1323,6 +1356,8 @@ class AdminDashboard:
             # Show the delete log button for both log views
             if hasattr(self, "delete_log_button"):
                 self.delete_log_button.pack(pady=3)
+            if hasattr(self, "archived_logs_button"):
+                self.archived_logs_button.pack(pady=3)
 
             # Show correct clear button for the specific log view
             if view_name == "Admin Logs" and hasattr(self, "clear_admin_logs_button"):
@@ -1702,8 +1737,15 @@ class AdminDashboard:
     def view_restock_list(self):
         print("[DEBUG] Loading restock list view...")
         try:
-            self._safe_reset_table()
-            self.create_items_table()
+            # Already showing the restock list: diff rows into the same table
+            reuse = (
+                self.current_view == "Restock List"
+                and getattr(self, "table", None) is not None
+                and self.table.winfo_exists()
+            )
+            if not reuse:
+                self._safe_reset_table()
+                self.create_items_table()
             db_path = get_db_path()
             load_restock_list(str(db_path), self.table)
             self.set_current_view("Restock List")
@@ -1878,17 +1920,31 @@ class AdminDashboard:
                 )
                 return
 
-            connector.execute_query(query, params)
+            row_id = selected[0]
 
-            # Sound removed
-            self.show_toast("success", "Success", "Log entry deleted.")
-            # Remove from Treeview
-            self.table.delete(selected[0])
-            # Refresh the view
-            if self.current_view == "Admin Logs":
-                self.view_admin_logs()
-            else:
-                self.view_logs()
+            def deleted(ticket):
+                if ticket.error is not None:
+                    self.show_toast(
+                        "error", "Delete Error", f"Failed to delete log entry: {ticket.error}"
+                    )
+                    return
+                # Sound removed
+                self.show_toast("success", "Success", "Log entry deleted.")
+                # Remove from Treeview
+                try:
+                    self.table.delete(row_id)
+                except tk.TclError:
+                    pass  # View was reloaded while the delete committed
+                # Refresh the view
+                if self.current_view == "Admin Logs":
+                    self.view_admin_logs()
+                elif self.current_view == "Employee Logs":
+                    self.view_logs()
+
+            # Queued, so the dashboard stays responsive while the file is locked
+            tx = transaction(connector)
+            tx.execute_query(query, params)
+            tx.submit(on_tk(self.root, deleted))
         except Exception as e:
             # Sound removed
             self.show_toast("error", "Delete Error", f"Failed to delete log entry: {e}")
@@ -2,7 +2,7 @@ import tkinter as tk
 from PIL import Image, ImageTk, ImageDraw, ImageFont
 import os
 from backend.database import get_connector, get_db_path
-from cryptography.fernet import Fernet
+from backend.config.key_service import get_key_service
 from .employee_login import WelcomeWindow
 from backend.utils.window_icon import set_window_icon
 from .admin_dashboard import AdminDashboard
@@ -19,32 +19,18 @@ ENTRY_BG = "#23272b"
 BUTTON_BG = "#8E1616"
 BUTTON_FG = "#E8C999"
 
-# DB and Fernet key paths
+# DB path
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = get_db_path()
-FERNET_KEY_PATH = os.path.abspath(os.path.join(BASE_DIR, "config", "fernet_key.py"))
 
 
 def load_fernet_key():
-    try:
-        import importlib.util
-
-        spec = importlib.util.spec_from_file_location("fernet_key", FERNET_KEY_PATH)
-        fernet_key_mod = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(fernet_key_mod)
-        if fernet_key_mod.FERNET_KEY and fernet_key_mod.FERNET_KEY != b"":
-            return fernet_key_mod.FERNET_KEY
-    except Exception as e:
-        print(f"Error loading Fernet key: {e}")  # Log error for debugging
-    key = Fernet.generate_key()
-    with open(FERNET_KEY_PATH, "w") as f:
-        f.write("# Fernet key for 2FA\nfrom cryptography.fernet import Fernet\n")
-        f.write(f"FERNET_KEY = {repr(key)}\n")
-    return key
-
-
-FERNET_KEY = load_fernet_key()
-fernet = Fernet(FERNET_KEY)
+    """Current primary Fernet key (loaded once by the key service)."""
+    return get_key_service().primary_key
+
+
+# Shared cipher: decrypts values under current and retired keys
+fernet = get_key_service()
 
 
 def create_text_image(text, font_size, is_bold=False):
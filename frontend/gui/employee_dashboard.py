@@ -5,6 +5,8 @@ from pathlib import Path
 from .globals import global_state
 from backend.config.gui_config import configure_window, center_window
 from backend.database import get_connector, get_db_path
+from backend.database.change_feed import get_change_feed
+from backend.database.queries import fetch_item_catalog, fetch_item_types
 from .functions.emplydash_f.emplydash_utils import (
     focus_next_widget,
     update_clock,
@@ -15,6 +17,9 @@ from .functions.style.admscrl import configure_custom_scrollbar
 from PIL import Image, ImageTk
 from backend.utils.window_icon import set_window_icon
 from backend.utils.notification_manager import NotificationManager
+from backend.utils import row_model
+from backend.utils.table_diff import sync_rows
+from backend.utils.warmup import get_warm_up
 # Removed unused imports: numpy, create_window_icon
 # Sound imports removed
 
@@ -42,19 +47,11 @@ class MainBrowser:
             for btn in self.type_buttons:
                 btn.destroy()
         self.type_buttons = []
-        # Fetch unique types from the database
+        # Fetch unique types (prefetched by the loading screen on first open)
         try:
-            from backend.database import get_connector
-
-            db = get_connector()
-            db.connect()
-            cursor = db.connection.cursor()
-            cursor.execute(
-                "SELECT DISTINCT [TYPE] FROM [ITEMSDB] WHERE [TYPE] IS NOT NULL AND [TYPE] <> ''"
-            )
-            type_rows = cursor.fetchall()
-            db.connection.close()
-            unique_types = sorted(set(row[0].strip() for row in type_rows if row[0]))
+            unique_types = get_warm_up().take("item_types")
+            if unique_types is None:
+                unique_types = fetch_item_types(get_connector())
         except Exception as e:
             print(f"Error fetching types: {e}")
             unique_types = []
@@ -457,6 +454,12 @@ class MainBrowser:
         # Load initial data after UI is ready for faster perceived load
         self.root.after(100, self.load_items)
 
+        # Reload the list when another workstation changes ITEMSDB
+        self.active_type_filter = None
+        self.change_listener = get_change_feed().attach(
+            self.root, self.on_remote_change, tables=("ITEMSDB",)
+        )
+
         # Bind focus events to pause and resume updates
         self.root.bind("<FocusIn>", self.resume_updates)
         self.root.bind("<FocusOut>", self.pause_updates)
@@ -641,7 +644,24 @@ class MainBrowser:
         except Exception as e:
             print(f"Error restoring checked items: {e}")
 
-    def load_items(self):
+    def on_remote_change(self, batch):
+        """Re-run whatever produced the current list (search, type filter or all)."""
+        if getattr(self, "is_closing", False):
+            return
+        try:
+            if not self.table.winfo_exists():
+                return
+            keyword = self.search_entry.get().strip()
+        except (AttributeError, tk.TclError):
+            return
+        if keyword:
+            self.search_items()
+        elif self.active_type_filter not in (None, "All"):
+            self.filter_by_type(self.active_type_filter)
+        else:
+            self.load_items(quiet=True)
+
+    def load_items(self, quiet=False):
         # Refresh type filter buttons before loading items
         self.refresh_type_buttons()
         # Only load items if table and root still exist
@@ -685,49 +705,39 @@ class MainBrowser:
                     self.scroll_y.destroy()
                 self._skeleton_shown = False
             try:
-                from backend.database import get_connector
-
-                db = get_connector()
-                db.connect()
-                cursor = db.connection.cursor()
-                # Only show items that are not out of stock
-                query = "SELECT [NAME], [BRAND], [TYPE], [LOCATION], [UNIT OF MEASURE], [STATUS], [BALANCE] FROM [ITEMSDB] WHERE [STATUS] <> 'Out of Stock' OR [STATUS] IS NULL OR [STATUS] = ''"
-                cursor.execute(query)
-                rows = cursor.fetchall()
-
-                self.table.delete(*self.table.get_children())
-                # Clear any stale checkbox references
-                self.table.clear_checked_items()
+                # Only show items that are not out of stock; the first load
+                # uses the catalog the loading screen already fetched
+                rows = get_warm_up().take("item_catalog")
+                if rows is None:
+                    rows = fetch_item_catalog(get_connector())
 
+                self.table.tag_configure(
+                    "outofstock", background="#555555", foreground="#999999"
+                )
+                keyed = []
                 for row in rows:
                     # Convert None values to empty strings for display
-                    display_row = tuple(
-                        value if value is not None else "" for value in row
+                    display_row = list(
+                        value if value is not None else "" for value in row[1:]
                     )
-                    item_id = self.table.insert("", tk.END, values=display_row)
-
                     # Check if item is out of stock and style it differently
-                    status = (
-                        display_row[5]
-                        if len(display_row) > 5 and display_row[5]
-                        else ""
-                    )
-                    if status.strip().lower() == "out of stock":
-                        # Apply styling to indicate out-of-stock status
-                        self.table.set(item_id, "STATUS", "🚫 Out of Stock")
-                        # Configure tag for out-of-stock items
-                        self.table.tag_configure(
-                            "outofstock", background="#555555", foreground="#999999"
-                        )
-                        self.table.item(item_id, tags=("outofstock",))
-                # Auto-sort rows A-Z by NAME after inserting
-                items = [
-                    (self.table.set(row_id, "NAME"), row_id)
-                    for row_id in self.table.get_children("")
-                ]
-                items.sort(key=lambda x: x[0].lower())
-                for index, (_, row_id) in enumerate(items):
-                    self.table.move(row_id, "", index)
+                    status = display_row[5] if display_row[5] else ""
+                    if str(status).strip().lower() == "out of stock":
+                        display_row[5] = "🚫 Out of Stock"
+                    keyed.append((row[0], tuple(display_row)))
+                # Rows sorted A-Z by NAME, keyed by item ID so only changed rows
+                # are repainted and checkboxes/scroll position are kept
+                keyed.sort(key=lambda r: str(r[1][0]).lower())
+                sync_rows(
+                    self.table,
+                    keyed,
+                    tags=lambda values: ("outofstock",)
+                    if values[5] == "🚫 Out of Stock"
+                    else (),
+                )
+                # Native values for header sorting; keep the user's sort on refresh
+                row_model.set_rows(self.table, ((row[0], row[1:]) for row in rows))
+                row_model.resort(self.table)
 
                 # Restore checkbox state for previously checked items
                 self.restore_checked_items(previously_checked)
@@ -736,7 +746,7 @@ class MainBrowser:
                     text=f"Loaded {len(rows)} item(s)", fg=SUCCESS_COLOR
                 )
                 # Show success notification for data loading
-                if len(rows) > 0:
+                if len(rows) > 0 and not quiet:
                     self.notification_manager.show_notification(
                         "Data Loaded",
                         f"Successfully loaded {len(rows)} item(s) from database.",
@@ -749,12 +759,6 @@ class MainBrowser:
                 )
             except Exception as e:
                 self.status_label.config(text=f"Error: {e}", fg=ERROR_COLOR)
-            finally:
-                try:
-                    cursor.close()
-                    db.connection.close()
-                except Exception:
-                    pass
 
         # Run finish_loading as soon as possible after DB work
         self.root.after(0, finish_loading)
@@ -1007,6 +1011,10 @@ class MainBrowser:
         """Clean up resources before closing the window."""
         self.is_closing = True
 
+        if getattr(self, "change_listener", None):
+            self.change_listener.cancel()
+            self.change_listener = None
+
         # Clean up notifications
         if hasattr(self, "notification_manager"):
             try:
@@ -1122,6 +1130,8 @@ class MainBrowser:
         self.refresh_type_buttons()
         """Filter the Items by type."""
 
+        self.active_type_filter = item_type
+
         # Store currently checked items (but only for non-"Out of Stock" filters)
         previously_checked = set()
         if item_type != "Out of Stock":
@@ -1331,13 +1341,8 @@ class MainBrowser:
         checkout_window.run()
 
     def sort_by_column(self, col, reverse):
-        # Get all items and their values for the given column
-        items = [(self.table.set(k, col), k) for k in self.table.get_children("")]
-        # Sort items (A-Z or Z-A)
-        items.sort(reverse=reverse)
-        # Rearrange items in sorted order
-        for index, (val, k) in enumerate(items):
-            self.table.move(k, "", index)
+        # In-memory reorder on typed values (A-Z or Z-A), no database access
+        row_model.sort_table(self.table, col, reverse)
         # Reverse sort next time
         self.table.heading(col, command=lambda: self.sort_by_column(col, not reverse))
 
@@ -4,7 +4,9 @@ from PIL import Image, ImageTk, ImageDraw, ImageFont
 from .globals import global_state
 from backend.config.gui_config import configure_window, center_window
 from backend.database import get_connector
+from backend.database.queries import fetch_employee_names
 from backend.utils.window_icon import set_window_icon
+from backend.utils.warmup import get_warm_up
 # Sound imports removed
 
 # Define colors - Dark muted pastel palette (consistent with dashboard)
@@ -193,10 +195,10 @@ class WelcomeWindow:
         self.valid_full_names = set()  # Store valid full name combinations
         self.suggestion_list = []  # List of dicts: { 'first': ..., 'last': ..., 'middle': ..., 'username': ... }
         try:
-            connector = get_connector()
-            rows = connector.fetchall(
-                "SELECT [First Name], [Last Name], [Middle Name], [Username] FROM [emp_list]"
-            )
+            # Prefetched by the loading screen when this is the first window
+            rows = get_warm_up().take("employee_names")
+            if rows is None:
+                rows = fetch_employee_names(get_connector())
             for row in rows:
                 first_name = str(row[0]).strip() if row[0] else ""
                 last_name = str(row[1]).strip() if row[1] else ""
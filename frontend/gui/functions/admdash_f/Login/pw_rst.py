@@ -221,19 +221,26 @@ class PasswordResetWizard:
             if new_pw != confirm_pw:
                 self.show_toast("Passwords do not match.")
                 return
-            try:
-                # Use connector pattern instead of direct database access
-                from backend.database import get_connector
-                connector = get_connector(self.DB_PATH)
-                encrypted_pw = self.fernet.encrypt(new_pw.encode()).decode()
-                connector.execute_query(
-                    "UPDATE [Emp_list] SET [Password]=? WHERE LCase([Username])=?", 
-                    (encrypted_pw, self.username.lower())
-                )
+            def saved(ticket):
+                if ticket.error is not None:
+                    print(f"[PW RESET] Password update failed: {ticket.error}")
+                    self.show_toast("Database error.")
+                    return
                 self.show_toast("Password reset successful!", color="#388e3c", duration=2000)
                 # Close after 3 seconds
                 self.modal.after(2000, self.modal.destroy)
+            try:
+                # Use connector pattern instead of direct database access; the
+                # write is queued, so the modal stays responsive while the file is locked
+                from backend.database import get_connector, queries
+                from backend.database.write_queue import on_tk
+                connector = get_connector(self.DB_PATH)
+                encrypted_pw = self.fernet.encrypt(new_pw.encode()).decode()
+                tx = queries.transaction(connector)
+                queries.update_user_password(tx, self.username.lower(), encrypted_pw)
+                tx.submit(on_tk(self.modal, saved))
             except Exception as e:
+                print(f"[PW RESET] Password update failed: {e}")
                 self.show_toast("Database error.")
         button_1 = Button(self.modal, image=button_image_1, borderwidth=0, highlightthickness=0, bg="#000000", activebackground="#000000", command=on_submit, relief="flat")
         button_1.image = button_image_1
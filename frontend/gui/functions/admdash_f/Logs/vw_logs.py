@@ -1,6 +1,11 @@
 from tkinter import messagebox
-from datetime import datetime, date, time
-from backend.database import get_connector, get_db_path
+from backend.database import get_connector, get_db_path, queries
+from backend.database.audit_log import flush_audit_log
+from backend.database.log_archive import get_log_archive
+from backend.database.write_queue import on_tk
+from backend.utils.table_loader import LOG_FORMATTERS, fit_columns, format_columns, load_rows
+
+LOG_COLUMN_MAX_WIDTH = 700
 
 
 def _table_exists(db_path, table_name):
@@ -65,11 +70,34 @@ def _get_table_columns(db_path, table_name):
             pass
 
 
+def _with_archived(dashboard, db_path, table, rows, columns):
+    """Append archived rows (oldest period last) when the dashboard asks for them."""
+    if not getattr(dashboard, "show_archived_logs", False):
+        return rows
+    if [c.upper() for c in columns][:1] != ["DATE"]:
+        return rows
+    try:
+        archived = get_log_archive(db_path).read(table)
+    except Exception as e:
+        print(f"[WARNING] Could not read archived {table}: {e}")
+        return rows
+    return list(rows) + archived
+
+
+def _load_log_rows(table, rows, columns):
+    """Fill a logs table: per-column formatting, bulk insert, sampled widths."""
+    display = format_columns(rows, columns, LOG_FORMATTERS)
+    load_rows(table, display)
+    fit_columns(table, display, columns, min_width=120, max_width=LOG_COLUMN_MAX_WIDTH)
+
+
 def view_logs(dashboard, current_view_callback):
     """Load and display the contents of the Employee Logs table in the Treeview with consistent style."""
     from gui.functions.admdash_f.table_utils import create_logs_table
 
     db_path = get_db_path()
+    # Make queued audit rows visible before reading the table
+    flush_audit_log()
     if not _table_exists(db_path, "emp_logs"):
         messagebox.showerror(
             "Error", "Employee logs table 'emp_logs' not found in database."
@@ -99,42 +127,11 @@ def view_logs(dashboard, current_view_callback):
                 if "DATE" in tbl_cols
                 else ["TIME", "NAME", "DETAILS"]
             )
+        rows = _with_archived(dashboard, db_path, "emp_logs", rows, columns)
         create_logs_table(dashboard, columns=columns)
-        dashboard.table.delete(*dashboard.table.get_children())
-
-        # Format DATE and TIME columns for display
-        def _format_value(col_name, val):
-            if val is None:
-                return ""
-            upper = col_name.upper()
-            try:
-                if upper == "DATE":
-                    if isinstance(val, datetime):
-                        return val.strftime("%Y-%m-%d")
-                    if isinstance(val, date):
-                        return val.strftime("%Y-%m-%d")
-                    # fallback: string, split by space
-                    s = str(val)
-                    return s.split(" ")[0]
-                if upper == "TIME":
-                    if isinstance(val, datetime):
-                        return val.strftime("%H:%M:%S")
-                    if isinstance(val, time):
-                        return val.strftime("%H:%M:%S")
-                    # fallback: string, take last part if contains space
-                    s = str(val)
-                    return s.split(" ")[-1]
-            except Exception:
-                return str(val)
-            return str(val)
-
-        for row in rows:
-            formatted_row = []
-            for i, col in enumerate(columns):
-                col_name = col.upper()
-                val = row[i] if i < len(row) else None
-                formatted_row.append(_format_value(col_name, val))
-            dashboard.table.insert("", "end", values=formatted_row)
+
+        # Format DATE and TIME per column, then insert in bulk
+        _load_log_rows(dashboard.table, rows, columns)
         if cursor:
             cursor.close()
         if connector:
@@ -161,6 +158,8 @@ def view_admin_logs(dashboard, current_view_callback):
     from gui.functions.admdash_f.table_utils import create_logs_table
 
     db_path = get_db_path()
+    # Make queued audit rows visible before reading the table
+    flush_audit_log()
     if not _table_exists(db_path, "adm_logs"):
         messagebox.showerror(
             "Error", "Admin logs table 'adm_logs' not found in database."
@@ -190,40 +189,11 @@ def view_admin_logs(dashboard, current_view_callback):
                 if "DATE" in tbl_cols
                 else ["TIME", "USER", "DETAILS"]
             )
+        rows = _with_archived(dashboard, db_path, "adm_logs", rows, columns)
         create_logs_table(dashboard, columns=columns)
-        dashboard.table.delete(*dashboard.table.get_children())
-
-        # Format DATE and TIME columns for display
-        def _format_value(col_name, val):
-            if val is None:
-                return ""
-            upper = col_name.upper()
-            try:
-                if upper == "DATE":
-                    if isinstance(val, datetime):
-                        return val.strftime("%Y-%m-%d")
-                    if isinstance(val, date):
-                        return val.strftime("%Y-%m-%d")
-                    s = str(val)
-                    return s.split(" ")[0]
-                if upper == "TIME":
-                    if isinstance(val, datetime):
-                        return val.strftime("%H:%M:%S")
-                    if isinstance(val, time):
-                        return val.strftime("%H:%M:%S")
-                    s = str(val)
-                    return s.split(" ")[-1]
-            except Exception:
-                return str(val)
-            return str(val)
-
-        for row in rows:
-            formatted_row = []
-            for i, col in enumerate(columns):
-                col_name = col.upper()
-                val = row[i] if i < len(row) else None
-                formatted_row.append(_format_value(col_name, val))
-            dashboard.table.insert("", "end", values=formatted_row)
+
+        # Format DATE and TIME per column, then insert in bulk
+        _load_log_rows(dashboard.table, rows, columns)
         if cursor:
             cursor.close()
         if connector:
@@ -256,13 +226,21 @@ def clear_admin_logs(dashboard, reset_table_columns, clear_table, set_current_vi
         return
 
     db_path = get_db_path()
-    try:
-        connector = get_connector(db_path)
-        connector.execute_query("DELETE FROM [adm_logs]")
+
+    def cleared(ticket):
+        if ticket.error is not None:
+            messagebox.showerror("Error", f"Failed to clear Admin Logs: {ticket.error}")
+            return
         messagebox.showinfo("Success", "Admin Logs cleared.")
         view_admin_logs(dashboard, set_current_view)
         if hasattr(dashboard, "set_current_view"):
             dashboard.set_current_view("Admin Logs")
+
+    try:
+        # Queued, so the dashboard stays responsive while the file is locked
+        tx = queries.transaction(get_connector(db_path))
+        queries.clear_admin_logs(tx)
+        tx.submit(on_tk(dashboard.root, cleared))
     except Exception as e:
         messagebox.showerror("Error", f"Failed to clear Admin Logs: {e}")
 
@@ -278,12 +256,20 @@ def clear_employee_logs(dashboard, reset_table_columns, clear_table, set_current
         return
 
     db_path = get_db_path()
-    try:
-        connector = get_connector(db_path)
-        connector.execute_query("DELETE FROM [emp_logs]")
+
+    def cleared(ticket):
+        if ticket.error is not None:
+            messagebox.showerror("Error", f"Failed to clear Employee Logs: {ticket.error}")
+            return
         messagebox.showinfo("Success", "Employee Logs cleared.")
         view_logs(dashboard, set_current_view)
         if hasattr(dashboard, "set_current_view"):
             dashboard.set_current_view("Employee Logs")
+
+    try:
+        # Queued, so the dashboard stays responsive while the file is locked
+        tx = queries.transaction(get_connector(db_path))
+        queries.clear_emp_logs(tx)
+        tx.submit(on_tk(dashboard.root, cleared))
     except Exception as e:
         messagebox.showerror("Error", f"Failed to clear Employee Logs: {e}")
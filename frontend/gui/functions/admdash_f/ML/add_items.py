@@ -2,12 +2,13 @@ import tkinter as tk
 from tkinter import messagebox
 from tkinter import ttk
 from pathlib import Path
-from datetime import datetime
 from PIL import Image, ImageTk
 from gui.functions.admdash_f.draft_manager import DraftManager
 from backend.utils.window_icon import set_window_icon
 from backend.database import get_connector, get_db_path  # centralized DB access
 from backend.database import queries
+from backend.database.lookup_cache import get_lookup_cache
+from backend.database.write_queue import on_tk
 
 
 def relative_to_assets(path: str) -> Path:
@@ -80,45 +81,10 @@ def add_item(root, db, load_data_callback, current_view=None, username="Admin"):
                     add_window.destroy()
                     return
 
-        # Helper for logging admin actions (reuse connection passed, create table if needed best-effort)
+        # Helper for logging admin actions (queued on the write-behind audit writer)
         def _log_admin_action(connection, username, details):
             try:
-                cursor = connection.cursor()
-                now = datetime.now()
-                log_date = now.strftime("%Y-%m-%d")
-                log_time = now.strftime("%H:%M:%S")
-                try:
-                    cursor.execute(
-                        "INSERT INTO [adm_logs] ([DATE],[TIME],[USER],[DETAILS]) VALUES (?,?,?,?)",
-                        (log_date, log_time, username, details),
-                    )
-                    connection.commit()
-                except Exception as insert_err:
-                    if "adm_logs" in str(insert_err).lower():
-                        try:
-                            cursor.execute(
-                                """
-                                CREATE TABLE adm_logs (
-                                    ID AUTOINCREMENT PRIMARY KEY,
-                                    [DATE] DATETIME,
-                                    [TIME] TEXT(8),
-                                    [USER] TEXT(255),
-                                    [DETAILS] TEXT(255)
-                                )
-                                """
-                            )
-                            connection.commit()
-                            cursor.execute(
-                                "INSERT INTO [adm_logs] ([DATE],[TIME],[USER],[DETAILS]) VALUES (?,?,?,?)",
-                                (log_date, log_time, username, details),
-                            )
-                            connection.commit()
-                        except Exception as create_err:
-                            print(
-                                f"[LOGGING] Failed creating adm_logs table: {create_err}"
-                            )
-                    else:
-                        print(f"[LOGGING] Insert failed: {insert_err}")
+                queries.queue_admin_log(username, details)
             except Exception as e:
                 print(f"[LOGGING] Unexpected error: {e}")
 
@@ -500,6 +466,360 @@ def add_item(root, db, load_data_callback, current_view=None, username="Admin"):
             elif button_num in [8, 9, 10, 11, 12]:  # Helper buttons
                 handle_helper_button(button_num, entries, db, add_window)
 
+        def show_save_error(e):
+            """Error dialog for a failed save (raised here or by the queued write)."""
+            error_dialog = tk.Toplevel(add_window)
+            error_dialog.overrideredirect(True)
+            error_dialog.withdraw()
+            error_dialog.after(10, error_dialog.deiconify)
+            error_dialog.attributes("-alpha", 1.0)
+            error_dialog.configure(bg="#000000")
+            error_dialog.resizable(False, False)
+
+            # Create custom title bar
+            title_bar = tk.Frame(error_dialog, bg="#800000", height=30)
+            title_bar.pack(fill=tk.X)
+
+            title_label = tk.Label(
+                title_bar,
+                text="Error",
+                bg="#800000",
+                fg="white",
+                font=("Inter", 10),
+            )
+            title_label.pack(side=tk.LEFT, padx=10, pady=5)
+
+            # Add window dragging
+            def start_move(event):
+                error_dialog.x = event.x_root - error_dialog.winfo_x()
+                error_dialog.y = event.y_root - error_dialog.winfo_y()
+
+            def do_move(event):
+                if hasattr(error_dialog, "x"):
+                    x = event.x_root - error_dialog.x
+                    y = event.y_root - error_dialog.y
+                    error_dialog.geometry(f"+{x}+{y}")
+
+            title_bar.bind("<Button-1>", start_move)
+            title_bar.bind("<B1-Motion>", do_move)
+            title_bar.configure(cursor="hand2")
+
+            # Message
+            msg_label = tk.Label(
+                error_dialog,
+                text=f"An error occurred: {str(e)}",
+                bg="#000000",
+                fg="white",
+                font=("Inter", 10),
+                wraplength=300,
+            )
+            msg_label.pack(padx=20, pady=20)
+
+            # Button frame
+            button_frame = tk.Frame(error_dialog, bg="#000000")
+            button_frame.pack(pady=10)
+
+            # OK button
+            ok_btn = tk.Button(
+                button_frame,
+                text="OK",
+                command=error_dialog.destroy,
+                bg="#800000",
+                fg="white",
+                font=("Inter", 10),
+                width=8,
+            )
+            ok_btn.pack(padx=5)
+
+            # Center dialog on parent window
+            error_dialog.transient(add_window)
+            error_dialog.grab_set()
+            error_dialog.update_idletasks()
+            x = (
+                add_window.winfo_x()
+                + (add_window.winfo_width() - error_dialog.winfo_width()) // 2
+            )
+            y = (
+                add_window.winfo_y()
+                + (add_window.winfo_height() - error_dialog.winfo_height()) // 2
+            )
+            error_dialog.geometry(f"+{x}+{y}")
+
+            # Window state handlers
+            def on_focus_in(event):
+                error_dialog.attributes("-alpha", 1.0)
+                error_dialog.attributes("-topmost", True)
+
+            def on_focus_out(event):
+                error_dialog.attributes("-alpha", 0.95)
+                error_dialog.attributes("-topmost", False)
+
+            error_dialog.bind("<FocusIn>", on_focus_in)
+            error_dialog.bind("<FocusOut>", on_focus_out)
+            error_dialog.bind("<Escape>", lambda e: error_dialog.destroy())
+
+            error_dialog.focus_force()
+
+        def item_saved(ticket, values):
+            """Tk-thread completion of the queued INSERT from save_item."""
+            try:
+                window_open = bool(add_window.winfo_exists())
+            except tk.TclError:
+                window_open = False
+            if ticket.error is not None:
+                print(f"[ERROR] Failed to add item {values['NAME']}: {ticket.error}")
+                if window_open:
+                    show_save_error(ticket.error)
+                return
+
+            get_lookup_cache().add_item(
+                values["NAME"],
+                {
+                    field: values[field]
+                    for field in (
+                        "BRAND",
+                        "TYPE",
+                        "LOCATION",
+                        "UNIT OF MEASURE",
+                        "SUPPLIER",
+                    )
+                },
+            )
+
+            # [Update Status] and statssum are queued (and coalesced) on the writer
+            queries.refresh_item_status(db)
+
+            # Log the action using centralized helper
+            try:
+                details = f"Added {values['IN']}x of {values['NAME']} from {values['SUPPLIER']}"
+                queries.queue_admin_log(username, details)
+            except Exception as e:
+                print(f"[LOGGING] Unexpected logging error: {e}")
+
+            # Delete any drafts for this item from ANI_DRAFTS table
+            _drop_item_drafts(db, values["NAME"])
+
+            # Call load_data_callback to refresh the table and trigger stats update
+            load_data_callback()
+
+            # Force an update of the stats panel through the admin dashboard
+            if hasattr(root, "update_stats"):
+                root.update_stats()
+
+            if not window_open:
+                return
+
+            # Show success dialog
+            success_dialog = tk.Toplevel(add_window)
+            success_dialog.overrideredirect(True)
+            success_dialog.withdraw()
+            success_dialog.after(10, success_dialog.deiconify)
+            success_dialog.attributes("-alpha", 1.0)
+            success_dialog.configure(bg="#000000")
+            success_dialog.resizable(False, False)
+
+            # Create custom title bar
+            title_bar = tk.Frame(success_dialog, bg="#800000", height=30)
+            title_bar.pack(fill=tk.X)
+
+            title_label = tk.Label(
+                title_bar,
+                text="Success",
+                bg="#800000",
+                fg="white",
+                font=("Inter", 10),
+            )
+            title_label.pack(side=tk.LEFT, padx=10, pady=5)
+
+            # Add window dragging
+            def start_move(event):
+                success_dialog.x = event.x_root - success_dialog.winfo_x()
+                success_dialog.y = event.y_root - success_dialog.winfo_y()
+
+            def do_move(event):
+                if hasattr(success_dialog, "x"):
+                    x = event.x_root - success_dialog.x
+                    y = event.y_root - success_dialog.y
+                    success_dialog.geometry(f"+{x}+{y}")
+
+            title_bar.bind("<Button-1>", start_move)
+            title_bar.bind("<B1-Motion>", do_move)
+            title_bar.configure(cursor="hand2")
+
+            # Message
+            msg_label = tk.Label(
+                success_dialog,
+                text="Item added successfully!",
+                bg="#000000",
+                fg="white",
+                font=("Inter", 10),
+                wraplength=300,
+            )
+            msg_label.pack(padx=20, pady=20)
+
+            # Button frame
+            button_frame = tk.Frame(success_dialog, bg="#000000")
+            button_frame.pack(pady=10)
+
+            # OK button
+            ok_btn = tk.Button(
+                button_frame,
+                text="OK",
+                command=success_dialog.destroy,
+                bg="#800000",
+                fg="white",
+                font=("Inter", 10),
+                width=8,
+            )
+            ok_btn.pack(padx=5)
+
+            # Center dialog on parent window
+            success_dialog.transient(add_window)
+            success_dialog.grab_set()
+            success_dialog.update_idletasks()
+            x = (
+                add_window.winfo_x()
+                + (add_window.winfo_width() - success_dialog.winfo_width()) // 2
+            )
+            y = (
+                add_window.winfo_y()
+                + (add_window.winfo_height() - success_dialog.winfo_height()) // 2
+            )
+            success_dialog.geometry(f"+{x}+{y}")
+
+            # Window state handlers
+            def on_focus_in(event):
+                success_dialog.attributes("-alpha", 1.0)
+                success_dialog.attributes("-topmost", True)
+
+            def on_focus_out(event):
+                success_dialog.attributes("-alpha", 0.95)
+                success_dialog.attributes("-topmost", False)
+
+            success_dialog.bind("<FocusIn>", on_focus_in)
+            success_dialog.bind("<FocusOut>", on_focus_out)
+            success_dialog.bind("<Escape>", lambda e: success_dialog.destroy())
+
+            success_dialog.focus_force()
+            add_window.wait_window(success_dialog)
+
+            # Custom dialog to keep add_window in front
+            dialog = tk.Toplevel(add_window)
+            dialog.overrideredirect(True)
+            dialog.withdraw()
+            dialog.after(10, dialog.deiconify)
+            dialog.attributes("-alpha", 1.0)
+            dialog.configure(bg="#000000")
+            dialog.resizable(False, False)
+
+            # Create custom title bar
+            title_bar = tk.Frame(dialog, bg="#800000", height=30)
+            title_bar.pack(fill=tk.X)
+
+            title_label = tk.Label(
+                title_bar,
+                text="Add Another Item",
+                bg="#800000",
+                fg="white",
+                font=("Inter", 10),
+            )
+            title_label.pack(side=tk.LEFT, padx=10, pady=5)
+
+            # Add window dragging
+            def start_move(event):
+                dialog.x = event.x_root - dialog.winfo_x()
+                dialog.y = event.y_root - dialog.winfo_y()
+
+            def do_move(event):
+                if hasattr(dialog, "x"):
+                    x = event.x_root - dialog.x
+                    y = event.y_root - dialog.y
+                    dialog.geometry(f"+{x}+{y}")
+
+            title_bar.bind("<Button-1>", start_move)
+            title_bar.bind("<B1-Motion>", do_move)
+            title_bar.configure(cursor="hand2")
+
+            # Message
+            msg_label = tk.Label(
+                dialog,
+                text="Would you like to add another item?",
+                bg="#000000",
+                fg="white",
+                font=("Inter", 11),
+                wraplength=250,
+            )
+            msg_label.pack(padx=20, pady=20)
+
+            # Buttons frame
+            btn_frame = tk.Frame(dialog, bg="#000000")
+            btn_frame.pack(pady=10)
+
+            def on_yes():
+                dialog.destroy()
+                for entry in entries.values():
+                    if isinstance(entry, ttk.Combobox):
+                        entry.set("")
+                    else:
+                        entry.delete(0, tk.END)
+
+            def on_no():
+                dialog.destroy()
+                add_window.destroy()
+
+            yes_btn = tk.Button(
+                btn_frame,
+                text="Yes",
+                command=on_yes,
+                bg="#800000",
+                fg="white",
+                font=("Inter", 10),
+                width=10,
+            )
+            no_btn = tk.Button(
+                btn_frame,
+                text="No",
+                command=on_no,
+                bg="#800000",
+                fg="white",
+                font=("Inter", 10),
+                width=10,
+            )
+            yes_btn.pack(side=tk.LEFT, padx=5)
+            no_btn.pack(side=tk.LEFT, padx=5)
+
+            # Center dialog on parent window
+            dialog.transient(add_window)
+            dialog.grab_set()
+            dialog.update_idletasks()
+            dialog_width = 300
+            dialog_height = 150
+            x = (
+                add_window.winfo_x()
+                + (add_window.winfo_width() - dialog_width) // 2
+            )
+            y = (
+                add_window.winfo_y()
+                + (add_window.winfo_height() - dialog_height) // 2
+            )
+            dialog.geometry(f"{dialog_width}x{dialog_height}+{x}+{y}")
+
+            # Window state handlers
+            def on_focus_in(event):
+                dialog.attributes("-alpha", 1.0)
+                dialog.attributes("-topmost", True)
+
+            def on_focus_out(event):
+                dialog.attributes("-alpha", 0.95)
+                dialog.attributes("-topmost", False)
+
+            dialog.bind("<FocusIn>", on_focus_in)
+            dialog.bind("<FocusOut>", on_focus_out)
+            dialog.bind("<Escape>", lambda e: on_no())
+
+            dialog.focus_force()
+            add_window.wait_window(dialog)
+
         def save_item():
             # Get values from entries
             values = {
@@ -719,8 +1039,10 @@ def add_item(root, db, load_data_callback, current_view=None, username="Admin"):
                     error_dialog.focus_force()
                     return
 
-                # Insert new item with explicit column names
-                cursor.execute(
+                # Insert the new item; the write is queued, so the window stays
+                # responsive while the file is locked (item_saved finishes up)
+                tx = queries.transaction(db)
+                tx.execute_query(
                     """
                     INSERT INTO ITEMSDB (
                         [NAME], [BRAND], [TYPE], [LOCATION], [UNIT OF MEASURE], 
@@ -739,285 +1061,7 @@ def add_item(root, db, load_data_callback, current_view=None, username="Admin"):
                         values["SUPPLIER"],
                     ),
                 )
-                connection.commit()
-
-                # Execute the Access database queries after adding item
-                try:
-                    print(
-                        "[DEBUG] Executing 'Update Status' query from Access database..."
-                    )
-                    cursor.execute("EXEC [Update Status]")
-                    connection.commit()
-                    print("[DEBUG] 'Update Status' query executed successfully")
-
-                    print("[DEBUG] Executing 'statssum' query from Access database...")
-                    cursor.execute("EXEC statssum")
-                    connection.commit()
-                    print("[DEBUG] 'statssum' query executed successfully")
-                except Exception as query_error:
-                    print(
-                        f"[WARNING] Access queries failed, using fallback: {query_error}"
-                    )
-                    # Fallback to direct SQL if Access queries fail
-                    try:
-                        fallback_sql = """
-                        UPDATE ITEMSDB
-                        SET STATUS = IIf(BALANCE > 0 AND BALANCE <= [MIN STOCK], 'Low in Stock', IIf(BALANCE = 0, 'Out of Stock', 'In Stock'))
-                        WHERE BALANCE IS NOT NULL AND [MIN STOCK] IS NOT NULL;
-                        """
-                        cursor.execute(fallback_sql)
-                        connection.commit()
-                        print("[DEBUG] Fallback SQL executed successfully")
-                    except Exception as fallback_error:
-                        print(
-                            f"[ERROR] Both Access queries and fallback SQL failed: {fallback_error}"
-                        )
-
-                # Log the action using centralized helper
-                try:
-                    details = f"Added {values['IN']}x of {values['NAME']} from {values['SUPPLIER']}"
-                    queries.insert_admin_log(db, username, details)
-                except Exception as e:
-                    print(f"[LOGGING] Unexpected logging error: {e}")
-
-                # Show success dialog
-                success_dialog = tk.Toplevel(add_window)
-                success_dialog.overrideredirect(True)
-                success_dialog.withdraw()
-                success_dialog.after(10, success_dialog.deiconify)
-                success_dialog.attributes("-alpha", 1.0)
-                success_dialog.configure(bg="#000000")
-                success_dialog.resizable(False, False)
-
-                # Create custom title bar
-                title_bar = tk.Frame(success_dialog, bg="#800000", height=30)
-                title_bar.pack(fill=tk.X)
-
-                title_label = tk.Label(
-                    title_bar,
-                    text="Success",
-                    bg="#800000",
-                    fg="white",
-                    font=("Inter", 10),
-                )
-                title_label.pack(side=tk.LEFT, padx=10, pady=5)
-
-                # Add window dragging
-                def start_move(event):
-                    success_dialog.x = event.x_root - success_dialog.winfo_x()
-                    success_dialog.y = event.y_root - success_dialog.winfo_y()
-
-                def do_move(event):
-                    if hasattr(success_dialog, "x"):
-                        x = event.x_root - success_dialog.x
-                        y = event.y_root - success_dialog.y
-                        success_dialog.geometry(f"+{x}+{y}")
-
-                title_bar.bind("<Button-1>", start_move)
-                title_bar.bind("<B1-Motion>", do_move)
-                title_bar.configure(cursor="hand2")
-
-                # Message
-                msg_label = tk.Label(
-                    success_dialog,
-                    text="Item added successfully!",
-                    bg="#000000",
-                    fg="white",
-                    font=("Inter", 10),
-                    wraplength=300,
-                )
-                msg_label.pack(padx=20, pady=20)
-
-                # Button frame
-                button_frame = tk.Frame(success_dialog, bg="#000000")
-                button_frame.pack(pady=10)
-
-                # OK button
-                ok_btn = tk.Button(
-                    button_frame,
-                    text="OK",
-                    command=success_dialog.destroy,
-                    bg="#800000",
-                    fg="white",
-                    font=("Inter", 10),
-                    width=8,
-                )
-                ok_btn.pack(padx=5)
-
-                # Center dialog on parent window
-                success_dialog.transient(add_window)
-                success_dialog.grab_set()
-                success_dialog.update_idletasks()
-                x = (
-                    add_window.winfo_x()
-                    + (add_window.winfo_width() - success_dialog.winfo_width()) // 2
-                )
-                y = (
-                    add_window.winfo_y()
-                    + (add_window.winfo_height() - success_dialog.winfo_height()) // 2
-                )
-                success_dialog.geometry(f"+{x}+{y}")
-
-                # Window state handlers
-                def on_focus_in(event):
-                    success_dialog.attributes("-alpha", 1.0)
-                    success_dialog.attributes("-topmost", True)
-
-                def on_focus_out(event):
-                    success_dialog.attributes("-alpha", 0.95)
-                    success_dialog.attributes("-topmost", False)
-
-                success_dialog.bind("<FocusIn>", on_focus_in)
-                success_dialog.bind("<FocusOut>", on_focus_out)
-                success_dialog.bind("<Escape>", lambda e: success_dialog.destroy())
-
-                success_dialog.focus_force()
-                add_window.wait_window(success_dialog)
-
-                # Ensure the database connection is refreshed before reloading data
-                connection.close()
-                connection = db.connect()
-
-                # Delete any drafts for this item from ANI_DRAFTS table
-                try:
-                    cursor = connection.cursor()
-                    cursor.execute(
-                        "DELETE FROM ANI_DRAFTS WHERE [Item Name] = ?",
-                        (values["NAME"],),
-                    )
-                    connection.commit()
-                except Exception as e:
-                    # Only log serious errors, ignore table not found
-                    if not str(e).startswith(
-                        "('42S02'"
-                    ):  # Not a "table not found" error
-                        print(f"Error handling drafts: {e}")
-                finally:
-                    cursor.close()
-
-                # Call load_data_callback to refresh the table and trigger stats update
-                load_data_callback()
-
-                # Force an update of the stats panel through the admin dashboard
-                if hasattr(root, "update_stats"):
-                    root.update_stats()
-
-                # Custom dialog to keep add_window in front
-                dialog = tk.Toplevel(add_window)
-                dialog.overrideredirect(True)
-                dialog.withdraw()
-                dialog.after(10, dialog.deiconify)
-                dialog.attributes("-alpha", 1.0)
-                dialog.configure(bg="#000000")
-                dialog.resizable(False, False)
-
-                # Create custom title bar
-                title_bar = tk.Frame(dialog, bg="#800000", height=30)
-                title_bar.pack(fill=tk.X)
-
-                title_label = tk.Label(
-                    title_bar,
-                    text="Add Another Item",
-                    bg="#800000",
-                    fg="white",
-                    font=("Inter", 10),
-                )
-                title_label.pack(side=tk.LEFT, padx=10, pady=5)
-
-                # Add window dragging
-                def start_move(event):
-                    dialog.x = event.x_root - dialog.winfo_x()
-                    dialog.y = event.y_root - dialog.winfo_y()
-
-                def do_move(event):
-                    if hasattr(dialog, "x"):
-                        x = event.x_root - dialog.x
-                        y = event.y_root - dialog.y
-                        dialog.geometry(f"+{x}+{y}")
-
-                title_bar.bind("<Button-1>", start_move)
-                title_bar.bind("<B1-Motion>", do_move)
-                title_bar.configure(cursor="hand2")
-
-                # Message
-                msg_label = tk.Label(
-                    dialog,
-                    text="Would you like to add another item?",
-                    bg="#000000",
-                    fg="white",
-                    font=("Inter", 11),
-                    wraplength=250,
-                )
-                msg_label.pack(padx=20, pady=20)
-
-                # Buttons frame
-                btn_frame = tk.Frame(dialog, bg="#000000")
-                btn_frame.pack(pady=10)
-
-                def on_yes():
-                    dialog.destroy()
-                    for entry in entries.values():
-                        if isinstance(entry, ttk.Combobox):
-                            entry.set("")
-                        else:
-                            entry.delete(0, tk.END)
-
-                def on_no():
-                    dialog.destroy()
-                    add_window.destroy()
-
-                yes_btn = tk.Button(
-                    btn_frame,
-                    text="Yes",
-                    command=on_yes,
-                    bg="#800000",
-                    fg="white",
-                    font=("Inter", 10),
-                    width=10,
-                )
-                no_btn = tk.Button(
-                    btn_frame,
-                    text="No",
-                    command=on_no,
-                    bg="#800000",
-                    fg="white",
-                    font=("Inter", 10),
-                    width=10,
-                )
-                yes_btn.pack(side=tk.LEFT, padx=5)
-                no_btn.pack(side=tk.LEFT, padx=5)
-
-                # Center dialog on parent window
-                dialog.transient(add_window)
-                dialog.grab_set()
-                dialog.update_idletasks()
-                dialog_width = 300
-                dialog_height = 150
-                x = (
-                    add_window.winfo_x()
-                    + (add_window.winfo_width() - dialog_width) // 2
-                )
-                y = (
-                    add_window.winfo_y()
-                    + (add_window.winfo_height() - dialog_height) // 2
-                )
-                dialog.geometry(f"{dialog_width}x{dialog_height}+{x}+{y}")
-
-                # Window state handlers
-                def on_focus_in(event):
-                    dialog.attributes("-alpha", 1.0)
-                    dialog.attributes("-topmost", True)
-
-                def on_focus_out(event):
-                    dialog.attributes("-alpha", 0.95)
-                    dialog.attributes("-topmost", False)
-
-                dialog.bind("<FocusIn>", on_focus_in)
-                dialog.bind("<FocusOut>", on_focus_out)
-                dialog.bind("<Escape>", lambda e: on_no())
-
-                dialog.focus_force()
-                add_window.wait_window(dialog)
+                tx.submit(on_tk(add_window, lambda ticket: item_saved(ticket, values)))
 
             except ValueError:
                 # Create custom error dialog for invalid numbers
@@ -1114,98 +1158,7 @@ def add_item(root, db, load_data_callback, current_view=None, username="Admin"):
                 error_dialog.focus_force()
 
             except Exception as e:
-                # Create custom error dialog for general errors
-                error_dialog = tk.Toplevel(add_window)
-                error_dialog.overrideredirect(True)
-                error_dialog.withdraw()
-                error_dialog.after(10, error_dialog.deiconify)
-                error_dialog.attributes("-alpha", 1.0)
-                error_dialog.configure(bg="#000000")
-                error_dialog.resizable(False, False)
-
-                # Create custom title bar
-                title_bar = tk.Frame(error_dialog, bg="#800000", height=30)
-                title_bar.pack(fill=tk.X)
-
-                title_label = tk.Label(
-                    title_bar,
-                    text="Error",
-                    bg="#800000",
-                    fg="white",
-                    font=("Inter", 10),
-                )
-                title_label.pack(side=tk.LEFT, padx=10, pady=5)
-
-                # Add window dragging
-                def start_move(event):
-                    error_dialog.x = event.x_root - error_dialog.winfo_x()
-                    error_dialog.y = event.y_root - error_dialog.winfo_y()
-
-                def do_move(event):
-                    if hasattr(error_dialog, "x"):
-                        x = event.x_root - error_dialog.x
-                        y = event.y_root - error_dialog.y
-                        error_dialog.geometry(f"+{x}+{y}")
-
-                title_bar.bind("<Button-1>", start_move)
-                title_bar.bind("<B1-Motion>", do_move)
-                title_bar.configure(cursor="hand2")
-
-                # Message
-                msg_label = tk.Label(
-                    error_dialog,
-                    text=f"An error occurred: {str(e)}",
-                    bg="#000000",
-                    fg="white",
-                    font=("Inter", 10),
-                    wraplength=300,
-                )
-                msg_label.pack(padx=20, pady=20)
-
-                # Button frame
-                button_frame = tk.Frame(error_dialog, bg="#000000")
-                button_frame.pack(pady=10)
-
-                # OK button
-                ok_btn = tk.Button(
-                    button_frame,
-                    text="OK",
-                    command=error_dialog.destroy,
-                    bg="#800000",
-                    fg="white",
-                    font=("Inter", 10),
-                    width=8,
-                )
-                ok_btn.pack(padx=5)
-
-                # Center dialog on parent window
-                error_dialog.transient(add_window)
-                error_dialog.grab_set()
-                error_dialog.update_idletasks()
-                x = (
-                    add_window.winfo_x()
-                    + (add_window.winfo_width() - error_dialog.winfo_width()) // 2
-                )
-                y = (
-                    add_window.winfo_y()
-                    + (add_window.winfo_height() - error_dialog.winfo_height()) // 2
-                )
-                error_dialog.geometry(f"+{x}+{y}")
-
-                # Window state handlers
-                def on_focus_in(event):
-                    error_dialog.attributes("-alpha", 1.0)
-                    error_dialog.attributes("-topmost", True)
-
-                def on_focus_out(event):
-                    error_dialog.attributes("-alpha", 0.95)
-                    error_dialog.attributes("-topmost", False)
-
-                error_dialog.bind("<FocusIn>", on_focus_in)
-                error_dialog.bind("<FocusOut>", on_focus_out)
-                error_dialog.bind("<Escape>", lambda e: error_dialog.destroy())
-
-                error_dialog.focus_force()
+                show_save_error(e)
             finally:
                 if "connection" in locals():
                     connection.close()
@@ -1217,23 +1170,34 @@ def add_item(root, db, load_data_callback, current_view=None, username="Admin"):
     add_material_to_jjcims(root, db, load_data_callback)
 
 
+def _drop_item_drafts(db, name):
+    """Remove drafts of an item that was just added (ANI_DRAFTS may not exist)."""
+
+    def finished(ticket):
+        # Only log serious errors, ignore table not found
+        if ticket.error is not None and not str(ticket.error).startswith("('42S02'"):
+            print(f"Error handling drafts: {ticket.error}")
+
+    query = "DELETE FROM ANI_DRAFTS WHERE [Item Name] = ?"
+    if hasattr(db, "submit_query"):
+        db.submit_query(query, (name,), callback=finished)
+        return
+    try:
+        db.execute_query(query, (name,))
+    except Exception as e:
+        if not str(e).startswith("('42S02'"):
+            print(f"Error handling drafts: {e}")
+
+
 def load_combo_data(db, field):
-    """Load unique values from database for combo boxes"""
+    """Load unique values for combo boxes from the shared lookup cache"""
     try:
-        connection = db.connect()
-        cursor = connection.cursor()
-        cursor.execute(
-            f"SELECT DISTINCT [{field}] FROM ITEMSDB WHERE [{field}] IS NOT NULL ORDER BY [{field}]"
-        )
-        values = [row[0] for row in cursor.fetchall()]
+        values = get_lookup_cache().values(field, db)
         values.append("Add +")  # Add the "Add +" option
         return values
     except Exception as e:
         print(f"Error loading {field} data: {e}")
         return ["Add +"]
-    finally:
-        if "connection" in locals():
-            connection.close()
 
 
 def add_new_value(db, field, combo, add_window):
@@ -1246,18 +1210,14 @@ def add_new_value(db, field, combo, add_window):
         """Handle the input when Enter is pressed or focus is lost"""
         new_value = combo.get().strip()
         if new_value and new_value != "Add +":
-            # Check if this value exists in the database
+            # Check if this value is already in use
             try:
-                connection = db.connect()
-                cursor = connection.cursor()
-                cursor.execute(
-                    f"SELECT COUNT(*) FROM ITEMSDB WHERE [{field}] = ?", (new_value,)
-                )
-                count = cursor.fetchone()[0]
-
-                if count == 0:
+                current_values = list(combo["values"])
+                if (
+                    not get_lookup_cache().contains(field, new_value, db)
+                    and new_value not in current_values
+                ):
                     # Value doesn't exist, update combo values
-                    current_values = list(combo["values"])
                     if "Add +" in current_values:
                         current_values.insert(-1, new_value)  # Insert before "Add +"
                     else:
@@ -1266,9 +1226,6 @@ def add_new_value(db, field, combo, add_window):
                     combo["values"] = current_values
             except Exception as e:
                 print(f"Error checking value existence: {e}")
-            finally:
-                if "connection" in locals():
-                    connection.close()
 
         combo.configure(state="readonly")  # Make readonly again
 
@@ -1327,17 +1284,9 @@ def handle_combo_selection(event, combo, field, db, add_window):
     if combo.get() == "Add +":
         add_new_value(db, field, combo, add_window)
     else:
-        # When a value is selected, check if it's still used in the database
+        # When a value is selected, check if it's still used by any item
         try:
-            connection = db.connect()
-            cursor = connection.cursor()
-            # Count occurrences of this value
-            cursor.execute(
-                f"SELECT COUNT(*) FROM ITEMSDB WHERE [{field}] = ?", (combo.get(),)
-            )
-            count = cursor.fetchone()[0]
-
-            if count == 0:
+            if get_lookup_cache().count(field, combo.get(), db) == 0:
                 # If value is not used anymore, remove it from combo box
                 current_values = list(combo["values"])
                 if combo.get() in current_values:
@@ -1346,9 +1295,6 @@ def handle_combo_selection(event, combo, field, db, add_window):
                     combo.set("")  # Clear the selection
         except Exception as e:
             print(f"Error checking value usage: {e}")
-        finally:
-            if "connection" in locals():
-                connection.close()
 
 
 def handle_helper_button(button_num, entries, db, add_window):
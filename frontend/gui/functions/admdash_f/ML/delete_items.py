@@ -2,6 +2,8 @@ import tkinter as tk
 from tkinter import messagebox
 from datetime import datetime
 from backend.database import queries
+from backend.database.lookup_cache import get_lookup_cache
+from backend.database.write_queue import on_tk
 # Removed openpyxl usage; logging now goes to adm_logs table
 # Sound imports removed
 
@@ -31,44 +33,47 @@ def delete_item(table, db, update_stats, username="Admin"):
     if not confirm:
         return
 
-    try:
-        connection = db.connect()
-        cursor = connection.cursor()
-
-        for item_id in selected_items:
-            row = table.item(item_id, "values")
-            material_to_delete = row[0]  # NAME column
-            supplier = row[1] if len(row) > 1 else ""  # SUPPLIER column
-            # Use centralized helper
-            try:
-                queries.delete_item_by_name(db, material_to_delete)
-            except Exception as e:
-                messagebox.showerror(
-                    "Error", f"Failed to delete {material_to_delete}: {e}"
-                )
-                continue
-            table.delete(item_id)
-            queries.insert_admin_log(
-                db,
-                username,
-                f"Deleted material: {material_to_delete} from supplier: {supplier}",
-            )
+    deleted = []
+    for item_id in selected_items:
+        row = table.item(item_id, "values")
+        material_to_delete = row[0]  # NAME column
+        supplier = row[1] if len(row) > 1 else ""  # SUPPLIER column
+        deleted.append((item_id, material_to_delete, supplier))
 
-        connection.commit()
+    def finished(ticket):
+        if ticket.error is not None:
+            messagebox.showerror("Error", f"Failed to delete material(s): {ticket.error}")
+            return
+        cache = get_lookup_cache()
+        for item_id, name, _ in deleted:
+            cache.remove_item(name)
+        try:
+            table.delete(*[item_id for item_id, _, _ in deleted])
+        except tk.TclError:
+            return  # View was closed or reloaded while the delete committed
         messagebox.showinfo("Success", "Selected material(s) deleted successfully!")
         update_stats()
+
+    # One transaction: every delete and its log line commit (or fail) together.
+    # It is queued, so the window stays responsive while the file is locked
+    try:
+        tx = queries.transaction(db)
+        queries.delete_items_by_name(tx, [name for _, name, _ in deleted])
+        queries.insert_admin_logs(
+            tx,
+            [
+                (username, f"Deleted material: {name} from supplier: {supplier}")
+                for _, name, supplier in deleted
+            ],
+        )
+        tx.submit(on_tk(table, finished))
     except Exception as e:
         messagebox.showerror("Error", f"Failed to delete material(s): {e}")
-    finally:
-        if "cursor" in locals() and cursor:
-            cursor.close()
-        if "connection" in locals() and connection:
-            connection.close()
 
 
 def _log_admin_action(connection, username, details):
     # Keep a thin shim that uses centralized helper for backward compatibility
     try:
-        queries.insert_admin_log(connection, username, details)
+        queries.queue_admin_log(username, details)
     except Exception as e:
         print(f"[LOGGING] Failed to write admin log: {e}")
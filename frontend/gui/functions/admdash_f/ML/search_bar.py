@@ -1,6 +1,12 @@
 import tkinter as tk
 import os
-from backend.database import get_connector, get_db_path
+import threading
+from backend.database import DB_TYPE, MYSQL_AVAILABLE, get_connector, get_db_path
+from backend.database.audit_log import flush_audit_log
+from backend.database.log_archive import get_log_archive
+from backend.database.log_index import LogQuery, search_logs
+from backend.database.restock_forecast import FORECAST_COLUMNS
+from backend.database.write_queue import on_tk
 
 # Define headers and search configurations for each view
 VIEW_CONFIGS = {
@@ -66,6 +72,20 @@ VIEW_CONFIGS = {
     },
 }
 
+# Log views search the inverted log index (see backend.database.log_index)
+LOG_VIEWS = {"Employee Logs": "emp_logs", "Admin Logs": "adm_logs"}
+
+
+def _log_search_available():
+    """The log index reads the Access file directly; API mode has no log search."""
+    return not (DB_TYPE == "mysql" and MYSQL_AVAILABLE)
+
+
+def _view_searchable(current_view):
+    return current_view in VIEW_CONFIGS or (
+        current_view in LOG_VIEWS and _log_search_available()
+    )
+
 
 def _resolve_db_path():
     """Return the canonical ACCDB path."""
@@ -76,6 +96,72 @@ def _resolve_db_path():
         return None
 
 
+def _restock_only(connector, rows, headers):
+    """Keep rows (ID first, then headers) that belong on the restock list."""
+    from gui.functions.admdash_f.vrl import select_restock
+
+    ids, kept, _ = select_restock(
+        connector, [row[0] for row in rows], [row[1:] for row in rows], headers
+    )
+    return [(item_id,) + tuple(row) for item_id, row in zip(ids, kept)]
+
+
+def _search_logs(dashboard, current_view, keyword):
+    """Search the current log view through the log index.
+
+    Terms must all match (prefix match); "quoted phrases", user:<name>,
+    from:YYYY-MM-DD and to:YYYY-MM-DD narrow the result. Flushing the audit
+    writer and syncing the index hit the database and disk, so they run on a
+    worker thread and the rows are shown back on the Tk thread.
+    """
+    if hasattr(dashboard, "suggestions_popup"):
+        dashboard.suggestions_popup.withdraw()
+    if not keyword:
+        if current_view == "Admin Logs":
+            dashboard.view_admin_logs()
+        else:
+            dashboard.view_logs()
+        return
+    if not dashboard.table:
+        return
+    table = LOG_VIEWS[current_view]
+    db_path = _resolve_db_path()
+    include_archived = getattr(dashboard, "show_archived_logs", False)
+    # Only the newest search may fill the table
+    seq = getattr(dashboard, "_log_search_seq", 0) + 1
+    dashboard._log_search_seq = seq
+
+    def show(rows):
+        if rows is None or seq != dashboard._log_search_seq:
+            return
+        if getattr(dashboard, "current_view", None) != current_view:
+            return
+        if not dashboard.table:
+            return
+        dashboard.table.delete(*dashboard.table.get_children())
+        for row in rows:
+            dashboard.table.insert("", tk.END, values=row)
+        print(f"[DEBUG] Log search '{keyword}' in {table}: {len(rows)} rows")
+
+    deliver = on_tk(dashboard.table, show)
+
+    def work():
+        rows = None
+        try:
+            flush_audit_log()
+            rows = search_logs(get_connector(db_path), table, keyword, db_path=db_path)
+            if include_archived:
+                query = LogQuery(keyword)
+                rows = rows + [
+                    r for r in get_log_archive(db_path).read(table) if query.matches(r)
+                ]
+        except Exception as e:
+            print(f"[ERROR] Log search failed: {e}")
+        deliver(rows)
+
+    threading.Thread(target=work, name="LogSearch", daemon=True).start()
+
+
 def search_items(dashboard, event=None):
     """Content-aware search that adapts to the current view/tab."""
     try:
@@ -87,6 +173,13 @@ def search_items(dashboard, event=None):
             f"[DEBUG] Search initiated - Current view: {current_view}, Keyword: '{keyword}'"
         )
 
+        if current_view in LOG_VIEWS:
+            if _log_search_available():
+                _search_logs(dashboard, current_view, keyword)
+            elif hasattr(dashboard, "suggestions_popup"):
+                dashboard.suggestions_popup.withdraw()
+            return
+
         # Check if current view supports search
         if current_view not in VIEW_CONFIGS:
             print(f"[DEBUG] View '{current_view}' not found in VIEW_CONFIGS")
@@ -183,6 +276,9 @@ def search_items(dashboard, event=None):
             try:
                 # Validate filter_query
                 column_list = ", ".join([f"[{col}]" for col in headers])
+                if current_view == "Restock List":
+                    # ID keys the usage history for the Forecast columns
+                    column_list = "[ID], " + column_list
 
                 # Build case-insensitive search conditions
                 conditions = []
@@ -208,58 +304,9 @@ def search_items(dashboard, event=None):
                     cursor.execute(filter_query, params)
                     rows = cursor.fetchall()
 
-                    # For Restock List, we need to filter the results to only show items needing restocking
+                    # For Restock List, only show items needing restocking
                     if current_view == "Restock List":
-                        # Filter in Python to only include items that need restocking
-                        status_index = (
-                            headers.index("STATUS") if "STATUS" in headers else -1
-                        )
-                        balance_index = (
-                            headers.index("BALANCE") if "BALANCE" in headers else -1
-                        )
-                        min_stock_index = (
-                            headers.index("MIN STOCK") if "MIN STOCK" in headers else -1
-                        )
-
-                        filtered_rows = []
-                        for row in rows:
-                            if len(row) > status_index and status_index >= 0:
-                                status = (
-                                    str(row[status_index]).lower()
-                                    if row[status_index]
-                                    else ""
-                                )
-                                if status and (
-                                    "out of stock" in status or "low in stock" in status
-                                ):
-                                    filtered_rows.append(row)
-                                    continue
-
-                            if (
-                                balance_index >= 0
-                                and min_stock_index >= 0
-                                and len(row) > max(balance_index, min_stock_index)
-                            ):
-                                balance = (
-                                    row[balance_index]
-                                    if row[balance_index] not in (None, "")
-                                    else 0
-                                )
-                                min_stock = (
-                                    row[min_stock_index]
-                                    if row[min_stock_index] not in (None, "")
-                                    else 0
-                                )
-                                try:
-                                    balance = float(balance) if balance else 0
-                                    min_stock = float(min_stock) if min_stock else 0
-                                    if balance <= min_stock:
-                                        filtered_rows.append(row)
-                                except (ValueError, TypeError):
-                                    # Skip if we can't convert to numbers
-                                    pass
-
-                        rows = filtered_rows
+                        rows = _restock_only(db, rows, headers)
 
                     print(f"[DEBUG] Initial search found {len(rows)} rows")
                 except Exception as ex:
@@ -296,59 +343,8 @@ def search_items(dashboard, event=None):
                         rows = cursor.fetchall()
 
                         # Apply same filtering for Restock List view
-                        if current_view == "Restock List" and rows:
-                            status_index = (
-                                headers.index("STATUS") if "STATUS" in headers else -1
-                            )
-                            balance_index = (
-                                headers.index("BALANCE") if "BALANCE" in headers else -1
-                            )
-                            min_stock_index = (
-                                headers.index("MIN STOCK")
-                                if "MIN STOCK" in headers
-                                else -1
-                            )
-
-                            filtered_rows = []
-                            for row in rows:
-                                if len(row) > status_index and status_index >= 0:
-                                    status = (
-                                        str(row[status_index]).lower()
-                                        if row[status_index]
-                                        else ""
-                                    )
-                                    if status and (
-                                        "out of stock" in status
-                                        or "low in stock" in status
-                                    ):
-                                        filtered_rows.append(row)
-                                        continue
-
-                                if (
-                                    balance_index >= 0
-                                    and min_stock_index >= 0
-                                    and len(row) > max(balance_index, min_stock_index)
-                                ):
-                                    balance = (
-                                        row[balance_index]
-                                        if row[balance_index] not in (None, "")
-                                        else 0
-                                    )
-                                    min_stock = (
-                                        row[min_stock_index]
-                                        if row[min_stock_index] not in (None, "")
-                                        else 0
-                                    )
-                                    try:
-                                        balance = float(balance) if balance else 0
-                                        min_stock = float(min_stock) if min_stock else 0
-                                        if balance <= min_stock:
-                                            filtered_rows.append(row)
-                                    except (ValueError, TypeError):
-                                        # Skip if we can't convert to numbers
-                                        pass
-
-                            rows = filtered_rows
+                        if current_view == "Restock List":
+                            rows = _restock_only(db, rows, headers)
 
                         print(f"[DEBUG] Flexible search found {len(rows)} rows")
                     except Exception as ex:
@@ -361,6 +357,19 @@ def search_items(dashboard, event=None):
                 print(f"Database error in filter query: {e}")
                 rows = []
 
+            display_rows = None
+            if current_view == "Restock List" and dashboard.table:
+                from gui.functions.admdash_f.vrl import forecast_rows
+
+                display_rows = forecast_rows(
+                    db,
+                    dashboard.table,
+                    [row[0] for row in rows],
+                    [row[1:] for row in rows],
+                    headers,
+                )
+                headers = headers + list(FORECAST_COLUMNS)
+
             if dashboard.table:
                 # Clear existing data
                 dashboard.table.delete(*dashboard.table.get_children())
@@ -406,25 +415,9 @@ def search_items(dashboard, event=None):
                 # Insert filtered rows and preserve checkbox states
                 for i, row in enumerate(rows):
                     # Format the row appropriately based on current view
-                    if current_view == "Restock List":
-                        # Use the formatting function from vrl.py for consistent formatting
-                        try:
-                            from gui.functions.admdash_f.vrl import format_row
-
-                            sanitized_row = tuple(format_row(row, headers))
-                            print(f"[DEBUG] Row {i}: Formatted - {sanitized_row}")
-                        except ImportError as ie:
-                            print(f"[DEBUG] Import error for format_row: {ie}")
-                            # Fallback to basic sanitization if vrl.py not available
-                            sanitized_row = tuple(
-                                value if value is not None else "" for value in row
-                            )
-                            print(f"[DEBUG] Row {i}: Basic format - {sanitized_row}")
-                        except Exception as fe:
-                            print(f"[DEBUG] Format error for row {i}: {fe}")
-                            sanitized_row = tuple(
-                                value if value is not None else "" for value in row
-                            )
+                    if display_rows is not None:
+                        # Formatted by vrl.forecast_rows (incl. Forecast columns)
+                        sanitized_row = tuple(display_rows[i])
                     else:
                         # For other views, use basic sanitization
                         sanitized_row = tuple(
@@ -544,7 +537,7 @@ def select_suggestion(dashboard, event=None):
 def show_search_bar(dashboard):
     """Show the search bar if the current view supports search."""
     current_view = getattr(dashboard, "current_view", "ITEMS_LIST")
-    if current_view in VIEW_CONFIGS:
+    if _view_searchable(current_view):
         if hasattr(dashboard, "search_container"):
             dashboard.search_container.pack(
                 side=tk.RIGHT, padx=(30, 10), pady=5
@@ -562,7 +555,7 @@ def hide_search_bar(dashboard):
 def update_search_bar_visibility(dashboard):
     """Update search bar visibility based on current view."""
     current_view = getattr(dashboard, "current_view", "ITEMS_LIST")
-    if current_view in VIEW_CONFIGS:
+    if _view_searchable(current_view):
         show_search_bar(dashboard)
     else:
         hide_search_bar(dashboard)
@@ -2,6 +2,7 @@ import tkinter as tk
 from tkinter import messagebox
 from tkinter import ttk
 import time
+from backend.utils.frame_clock import animate
 from backend.database import get_connector, get_db_path
 
 
@@ -247,79 +248,22 @@ class StatsPanel:
                 self.system_tips
             )
 
-            # Create sliding animation
+            # Create sliding animation: precomputed slide-out then slide-in positions
             next_tip = self.system_tips[self.current_tip_index]
+            frames = [(pos / 100, None) for pos in range(100, -100, -10)]
+            frames += [(pos / 100, next_tip) for pos in range(-100, 1, 10)]
 
-            def slide_out(pos=100):
-                try:
-                    # Check for destroyed state before proceeding
-                    if self._is_destroyed:
-                        return
-
-                    # Make sure self.parent and self.tip_label still exist
-                    if not hasattr(self, "parent") or not hasattr(self, "tip_label"):
-                        return
-
-                    if (
-                        not self.parent.winfo_exists()
-                        or not self.tip_label.winfo_exists()
-                    ):
-                        return
-
-                    if pos <= -100:
-                        self.tip_label.config(text=next_tip)
-                        slide_in()
-                    else:
-                        self.tip_label.place(relx=pos / 100, rely=0, relwidth=1)
-                        # Cancel any existing timer
-                        if hasattr(self, "timer") and self.timer:
-                            try:
-                                self.parent.after_cancel(self.timer)
-                            except Exception:
-                                pass
-
-                        # Create a named callback that can be canceled if needed
-                        # schedule next frame
-                        self.timer = self.parent.after(5, lambda: slide_out(pos - 10))
-                        # Timer ID is just stored as is - no need to set attributes on it
-                except Exception as e:
-                    print(f"Error in slide_out: {e}")  # Log the specific error
-
-            def slide_in(pos=-100):
-                try:
-                    # Check for destroyed state before proceeding
-                    if self._is_destroyed:
-                        return
-
-                    # Make sure self.parent and self.tip_label still exist
-                    if not hasattr(self, "parent") or not hasattr(self, "tip_label"):
-                        return
-
-                    if (
-                        not self.parent.winfo_exists()
-                        or not self.tip_label.winfo_exists()
-                    ):
-                        return
-
-                    if pos >= 0:
-                        self.tip_label.place(relx=0, rely=0, relwidth=1)
-                    else:
-                        self.tip_label.place(relx=pos / 100, rely=0, relwidth=1)
-                        # Cancel any existing timer
-                        if hasattr(self, "timer") and self.timer:
-                            try:
-                                self.parent.after_cancel(self.timer)
-                            except Exception:
-                                pass
-
-                        # Create a named callback that can be canceled if needed
-                        # schedule next frame
-                        self.timer = self.parent.after(5, lambda: slide_in(pos + 10))
-                        # Timer ID is just stored as is - no need to set attributes on it
-                except Exception as e:
-                    print(f"Error in slide_in: {e}")  # Log the specific error
-
-            slide_out()
+            def apply_frame(frame):
+                relx, text = frame
+                if text is not None and self.tip_label.cget("text") != text:
+                    self.tip_label.config(text=text)
+                self.tip_label.place(relx=relx, rely=0, relwidth=1)
+
+            # Cancel any slide still in progress
+            if hasattr(self, "timer") and self.timer:
+                self.timer.cancel()
+
+            self.timer = animate(self.tip_label, frames, apply_frame, interval_ms=16)
 
             # Schedule next tip change - cancel any existing timer first
             if hasattr(self, "next_tip_timer") and self.next_tip_timer:
@@ -410,10 +354,7 @@ class StatsPanel:
         """Cleanup timers when the panel is destroyed."""
         try:
             if hasattr(self, "timer") and self.timer:
-                try:
-                    self.parent.after_cancel(self.timer)
-                except Exception:
-                    pass
+                self.timer.cancel()
                 self.timer = None
 
             if hasattr(self, "next_tip_timer") and self.next_tip_timer:
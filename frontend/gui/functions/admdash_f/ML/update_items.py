@@ -2,11 +2,14 @@ from pathlib import Path
 import tkinter as tk
 from tkinter import ttk
 from datetime import datetime
-from backend.database import queries
+from backend.database import ItemConflictError, queries
+from backend.database.lookup_cache import get_lookup_cache
+from backend.database.write_queue import on_tk
 
 # Legacy Excel logging imports removed (logs now stored in adm_logs table)
 import re
 from backend.utils.window_icon import set_window_icon
+from backend.utils.frame_clock import fade_window
 
 OUTPUT_PATH = Path(__file__).parent
 
@@ -18,6 +21,7 @@ class ToastNotification:
         self.type = type
         self.duration = duration
         self._after_ids = set()
+        self._hiding = False
 
         # Window
         self.toast = tk.Toplevel(parent)
@@ -78,33 +82,23 @@ class ToastNotification:
 
     def show_toast(self):
         self.toast.deiconify()
-        self.animate_in(0.0)
-
-    def animate_in(self, alpha):
-        if alpha < 0.9 and self.toast.winfo_exists():
-            self.toast.attributes("-alpha", alpha)
-            self._safe_after(20, lambda: self.animate_in(alpha + 0.1))
-        else:
-            if self.toast.winfo_exists():
-                self.toast.attributes("-alpha", 0.9)
+        fade_window(self.toast, 0.0, 0.9)
 
     def hide_toast(self):
-        if self.toast.winfo_exists():
-            self.animate_out(0.9)
+        if self._hiding or not self.toast.winfo_exists():
+            return
+        self._hiding = True
+        fade_window(self.toast, 0.9, 0.0, on_done=self._destroy)
 
-    def animate_out(self, alpha):
-        if alpha > 0 and self.toast.winfo_exists():
-            self.toast.attributes("-alpha", alpha)
-            self._safe_after(20, lambda: self.animate_out(alpha - 0.1))
-        else:
-            for after_id in list(self._after_ids):
-                try:
-                    self.toast.after_cancel(after_id)
-                except Exception:
-                    pass
-            self._after_ids.clear()
-            if self.toast.winfo_exists():
-                self.toast.destroy()
+    def _destroy(self):
+        for after_id in list(self._after_ids):
+            try:
+                self.toast.after_cancel(after_id)
+            except Exception:
+                pass
+        self._after_ids.clear()
+        if self.toast.winfo_exists():
+            self.toast.destroy()
 
 
 def show_toast(parent, message, type="info", duration=3000):
@@ -322,6 +316,7 @@ class UpdateItemsWindow:
         self.refresh_callback = refresh_callback
         self.on_close = on_close
         self.current_index = 0
+        self.row_versions = {}  # items_data index -> (ID, ROW_VERSION) as last read
 
         # Bind keyboard shortcuts
         self.root.bind("<Return>", lambda e: self.save_changes())
@@ -348,30 +343,24 @@ class UpdateItemsWindow:
             ("Supplier:", "[SUPPLIER]", "combobox"),
         ]
 
-        # Get unique values from database for comboboxes
+        # Get unique values for comboboxes from the shared lookup cache
         self.combobox_values = {}
-        cursor = self.db_connection.cursor()
-
-        combobox_fields = {
-            "[BRAND]": "BRAND",
-            "[TYPE]": "TYPE",
-            "[LOCATION]": "LOCATION",
-            "[UNIT OF MEASURE]": "[UNIT OF MEASURE]",
-            "[SUPPLIER]": "SUPPLIER",
-        }
-
-        for field_key, db_column in combobox_fields.items():
+        lookup_cache = get_lookup_cache()
+
+        for field_key in (
+            "[BRAND]",
+            "[TYPE]",
+            "[LOCATION]",
+            "[UNIT OF MEASURE]",
+            "[SUPPLIER]",
+        ):
             try:
-                # Get unique values for each field, excluding None/empty values
-                cursor.execute(
-                    f"SELECT DISTINCT {db_column} FROM ITEMSDB WHERE {db_column} IS NOT NULL AND {db_column} <> '' ORDER BY {db_column}"
-                )
-                values = [row[0] for row in cursor.fetchall()]
+                values = lookup_cache.values(field_key, self.db_connection)
                 self.combobox_values[field_key] = (
                     values if values else [""]
                 )  # Fallback to empty string if no values found
             except Exception as e:
-                print(f"Error fetching values for {db_column}: {str(e)}")
+                print(f"Error fetching values for {field_key}: {str(e)}")
                 self.combobox_values[field_key] = [
                     ""
                 ]  # Fallback to empty string on error
@@ -924,6 +913,7 @@ class UpdateItemsWindow:
             return
 
         self.current_index = idx
+        self._read_current_row(idx)
         item_data = self.items_data[idx]
 
         # Debug print
@@ -987,6 +977,35 @@ class UpdateItemsWindow:
                 entry.delete(0, tk.END)
                 entry.insert(0, str(value) if value is not None else "")
 
+    # items_data column -> API field, for rows read back from the server
+    SERVER_FIELDS = {
+        0: "NAME", 1: "BRAND", 2: "TYPE", 3: "LOCATION", 4: "UNIT_OF_MEASURE",
+        5: "STATUS", 6: "IN", 7: "OUT", 8: "BALANCE", 14: "Supplier",
+    }
+
+    def _apply_server_row(self, idx, current):
+        """Merge a server row into items_data[idx] and remember its version."""
+        row = list(self.items_data[idx])
+        for column, key in self.SERVER_FIELDS.items():
+            if column < len(row) and key in current:
+                row[column] = current[key]
+        self.items_data[idx] = tuple(row)
+        if current.get("ID") is not None and current.get("ROW_VERSION") is not None:
+            self.row_versions[idx] = (current["ID"], current["ROW_VERSION"])
+
+    def _read_current_row(self, idx):
+        """Read the row and its ROW_VERSION so the save only applies to what was shown.
+
+        Versioned connectors only (MySQL/API mode); Access keeps the table values.
+        """
+        try:
+            current = queries.fetch_item_current(self.db_connection, self.items_data[idx][0])
+        except Exception as e:
+            print(f"[UpdateItems] Could not read current row: {e}")
+            return
+        if current:
+            self._apply_server_row(idx, current)
+
     def save_changes(self, prompt=True):
         def clean_numeric(value):
             value = re.sub(r"[^\d.]", "", str(value))
@@ -1104,40 +1123,7 @@ class UpdateItemsWindow:
                     # Access connector expects column names without brackets in helpers
                     fields_to_update[col] = value
 
-                if item_id is not None:
-                    # Update by ID
-                    queries.update_item_by_id(
-                        self.db_connection, item_id, fields_to_update
-                    )
-                else:
-                    # No ID available; perform an UPDATE by NAME using a helper call that builds SQL
-                    # Use update_item_by_id with a WHERE on NAME by executing a custom query via connector
-                    set_clause = ", ".join(
-                        [f"[{k}] = ?" for k in fields_to_update.keys()]
-                    )
-                    params = tuple(fields_to_update.values()) + (original_name,)
-                    query = f"UPDATE ITEMSDB SET {set_clause} WHERE NAME = ?"
-                    self.db_connection.execute_query(query, params)
-
-                # Attempt to run Access stored queries; if connector doesn't support EXEC syntax, ignore failures
-                try:
-                    self.db_connection.execute_query("EXEC [Update Status]")
-                    self.db_connection.execute_query("EXEC statssum")
-                except Exception:
-                    # Fallback: recalc STATUS with local SQL
-                    fallback_sql = (
-                        "UPDATE ITEMSDB "
-                        "SET STATUS = IIf(BALANCE > 0 AND BALANCE <= [MIN STOCK], 'Low in Stock', "
-                        "IIf(BALANCE = 0, 'Out of Stock', 'In Stock')) "
-                        "WHERE BALANCE IS NOT NULL AND [MIN STOCK] IS NOT NULL;"
-                    )
-                    try:
-                        self.db_connection.execute_query(fallback_sql)
-                    except Exception:
-                        # If fallback also fails, continue without raising so UI can handle gracefully
-                        pass
-
-                # Create a concise but detailed log message
+                # Build the log line first so it commits with the update
                 change_descriptions = []
                 for field, value in updated_data.items():
                     original_value = self.items_data[self.current_index][
@@ -1174,21 +1160,29 @@ class UpdateItemsWindow:
                         username = self.root.master.username
                     except Exception:
                         username = "Admin"
-                queries.insert_admin_log(self.db_connection, username, log_message)
-
-                if prompt:
-                    show_toast(self.root, "Item updated successfully!", type="success")
-
-                # Update local data
-                item_list = list(self.items_data[self.current_index])
-                for field, value in updated_data.items():
-                    idx = self.get_field_index(field)
-                    item_list[idx] = value
-                self.items_data[self.current_index] = tuple(item_list)
+                # One transaction: the update, the STATUS recompute and the log.
+                # It is queued, so the window stays responsive while the file is locked
+                index = self.current_index
+                versioned = self.row_versions.get(index)
+                tx = queries.transaction(self.db_connection)
+                if versioned is not None:
+                    queries.update_item_by_id(
+                        tx, versioned[0], fields_to_update, expected_version=versioned[1]
+                    )
+                elif item_id is not None:
+                    queries.update_item_by_id(tx, item_id, fields_to_update)
+                else:
+                    queries.update_item_by_name(tx, original_name, fields_to_update)
+                if hasattr(self.db_connection, "submit_query"):
+                    queries.recompute_item_status(tx)
+                queries.insert_admin_log(tx, username, log_message)
+
+                def finished(ticket):
+                    self._update_saved(
+                        ticket, index, original_name, fields_to_update, updated_data, prompt
+                    )
 
-                # Refresh the parent window if callback exists
-                if self.refresh_callback:
-                    self.refresh_callback()
+                tx.submit(on_tk(self.root, finished))
 
                 # Do NOT close the update window after saving; user must close manually
                 return False  # Window not closed
@@ -1205,6 +1199,64 @@ class UpdateItemsWindow:
                 show_toast(self.root, str(ve), type="error")
             return False
 
+    def _update_saved(self, ticket, index, original_name, fields_to_update, updated_data, prompt):
+        """Tk-thread completion of a queued save_changes transaction."""
+        window_open = True
+        try:
+            window_open = bool(self.root.winfo_exists())
+        except tk.TclError:
+            window_open = False
+
+        if isinstance(ticket.error, ItemConflictError):
+            # Someone else changed the item since it was shown: show their
+            # values instead of overwriting them
+            self.row_versions.pop(index, None)
+            if ticket.error.current:
+                self._apply_server_row(index, ticket.error.current)
+            if window_open and index == self.current_index:
+                self.load_item(index)
+            if prompt and window_open:
+                show_toast(
+                    self.root,
+                    "This item was changed by another user. Its current values are shown; re-apply your edits.",
+                    type="warning",
+                )
+            return
+        if ticket.error is not None:
+            if prompt and window_open:
+                show_toast(
+                    self.root,
+                    f"Failed to update database: {str(ticket.error)}",
+                    type="error",
+                )
+            return
+
+        get_lookup_cache().update_item(
+            original_name,
+            fields_to_update,
+            new_name=fields_to_update.get("NAME"),
+        )
+
+        # STATUS was recomputed inside the transaction; only the saved
+        # statssum query is left, queued (and coalesced) on the writer
+        if hasattr(self.db_connection, "submit_query"):
+            self.db_connection.submit_query("EXEC statssum", coalesce_key="statssum")
+
+        # Update local data
+        if index < len(self.items_data):
+            item_list = list(self.items_data[index])
+            for field, value in updated_data.items():
+                idx = self.get_field_index(field)
+                item_list[idx] = value
+            self.items_data[index] = tuple(item_list)
+
+        if prompt and window_open:
+            show_toast(self.root, "Item updated successfully!", type="success")
+
+        # Refresh the parent window if callback exists
+        if self.refresh_callback:
+            self.refresh_callback()
+
     def get_field_index(self, field):
         mapping = {
             "NAME": 0,  # Column 0
@@ -1222,50 +1274,16 @@ class UpdateItemsWindow:
         return mapping.get(field.strip("[]"), -1)
 
     def _log_to_admin_sheet(self, log_entry):
-        """Insert log entry into adm_logs table (DATE, TIME, USER, DETAILS).
+        """Queue a log entry for the adm_logs table (DATE, TIME, USER, DETAILS).
 
-        Replaces legacy Excel logging. Accepts a list [DATE, TIME, USER, DETAILS].
-        Attempts to create adm_logs table if missing (best-effort, silent on failure).
+        Replaces legacy Excel logging. Accepts a list [DATE, TIME, USER, DETAILS];
+        the row is journaled and written by the background audit writer.
         """
-        if not hasattr(self, "db_connection") or self.db_connection is None:
-            try:
-                self.db_connection = self.db
-            except Exception:
-                return
         try:
-            cursor = self.db_connection.cursor()
-            try:
-                cursor.execute(
-                    "INSERT INTO [adm_logs] ([DATE],[TIME],[USER],[DETAILS]) VALUES (?,?,?,?)",
-                    tuple(log_entry[:4]),
-                )
-                self.db_connection.commit()
-            except Exception as insert_err:
-                if "adm_logs" in str(insert_err).lower():
-                    try:
-                        cursor.execute(
-                            """
-                            CREATE TABLE adm_logs (
-                                ID AUTOINCREMENT PRIMARY KEY,
-                                [DATE] DATETIME,
-                                [TIME] TEXT(8),
-                                [USER] TEXT(255),
-                                [DETAILS] TEXT(255)
-                            )
-                            """
-                        )
-                        self.db_connection.commit()
-                        cursor.execute(
-                            "INSERT INTO [adm_logs] ([DATE],[TIME],[USER],[DETAILS]) VALUES (?,?,?,?)",
-                            tuple(log_entry[:4]),
-                        )
-                        self.db_connection.commit()
-                    except Exception as create_err:
-                        print(f"[LOGGING] Failed to create adm_logs: {create_err}")
-                else:
-                    print(f"[LOGGING] Insert failed: {insert_err}")
-        except Exception as outer_err:
-            print(f"[LOGGING] Unexpected logging error: {outer_err}")
+            date_str, time_str, user, details = log_entry[:4]
+            queries.queue_admin_log(user, details, when=(date_str, time_str))
+        except Exception as e:
+            print(f"[LOGGING] Unexpected logging error: {e}")
 
     def _validate_number(self, event):
         """Validates that only numbers are entered while allowing essential keys"""
@@ -2,7 +2,7 @@ import tkinter as tk
 from gui.functions.admdash_f.checkbox_treeview import CheckboxTreeview
 from tkinter import ttk
 from gui.functions.admdash_f.table_utils import load_data
-from backend.database import get_db_path
+from backend.utils import row_model
 
 # Updated headers for ITEMSDB Treeview
 DEFAULT_COLUMNS = [
@@ -125,56 +125,10 @@ def view_items_treeview(dashboard):
     )
 
     def sort_column(col):
-        """Sort treeview column with A-Z indicator."""
-        # Check if we're in restock list view and refresh data first
-        if (
-            hasattr(dashboard, "current_view")
-            and dashboard.current_view == "Restock List"
-        ):
-            print("[DEBUG] Refreshing restock data before sorting...")
-            from gui.functions.admdash_f.vrl import load_restock_list
-
-            load_restock_list(get_db_path(), dashboard.table)
-
+        """Sort treeview column with A-Z indicator (in memory, typed values)."""
         dashboard.sort_states[col] = not dashboard.sort_states[col]  # Toggle sort state
         reverse = dashboard.sort_states[col]
-        # Get all items
-        rows_list = [
-            (dashboard.table.set(k, col), k) for k in dashboard.table.get_children("")
-        ]
-
-        # Convert numbers to float for proper numeric sorting
-        if col in NUMERIC_COLUMNS:
-            rows_list = [
-                (float("".join(filter(str.isdigit, i[0]))) if i[0].strip() else 0, i[1])
-                for i in rows_list
-            ]
-        # Special handling for LAST PO column
-        elif col == "LAST PO":
-            from datetime import datetime
-
-            def parse_date(date_str):
-                try:
-                    # Remove any time component
-                    date_part = date_str.split(" ")[0].split("T")[0]
-                    return datetime.strptime(date_part, "%Y/%m/%d")
-                except Exception:
-                    try:
-                        return datetime.strptime(date_str, "%Y-%m-%d")
-                    except Exception:
-                        return datetime.min  # Return minimum date if parsing fails
-
-            rows_list = [
-                (parse_date(i[0]) if i[0].strip() else datetime.min, i[1])
-                for i in rows_list
-            ]
-
-        # Sort the list
-        rows_list.sort(reverse=reverse)
-
-        # Rearrange items in sorted positions
-        for index, (val, k) in enumerate(rows_list):
-            dashboard.table.move(k, "", index)
+        row_model.sort_table(dashboard.table, col, reverse)
 
         # Update headings to show sort state
         arrow = " ▼" if reverse else " ▲"
@@ -1,10 +1,10 @@
-import os
 import tkinter as tk
 from tkinter import messagebox, ttk
-import importlib.util
-from cryptography.fernet import Fernet
+from backend.config.key_service import get_key_service
 from datetime import datetime
 from backend.database import get_db_path, get_connector
+from backend.database.unit_of_work import transaction
+from backend.database.write_queue import on_tk
 
 
 class AccountSettingsWizard:
@@ -26,11 +26,7 @@ class AccountSettingsWizard:
         self.original_values = {}
 
         # Paths
-        base = os.path.dirname(__file__)
         self.db_path = get_db_path()
-        self.key_path = os.path.abspath(
-            os.path.join(base, "../../../config/fernet_key.py")
-        )
 
         # Root container
         self.container = tk.Frame(
@@ -157,20 +153,12 @@ class AccountSettingsWizard:
         if not encrypted:
             return ""
         try:
-            spec = importlib.util.spec_from_file_location("fernet_key", self.key_path)
-            mod = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(mod)
-            fernet = Fernet(mod.FERNET_KEY)
-            return fernet.decrypt(encrypted.encode()).decode()
+            return get_key_service().decrypt_text(encrypted)
         except Exception:
             return None
 
     def _encrypt_password(self, plain: str):
-        spec = importlib.util.spec_from_file_location("fernet_key", self.key_path)
-        mod = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(mod)
-        fernet = Fernet(mod.FERNET_KEY)
-        return fernet.encrypt(plain.encode()).decode()
+        return get_key_service().encrypt_text(plain)
 
     def _store_original(self):
         self.original_values = {
@@ -490,8 +478,30 @@ class AccountSettingsWizard:
             encrypted_pw = self._encrypt_password(self.password_var.get().strip())
             original_username = getattr(self.app.parent, "username", self.username)
             
-            # Execute update using connector's API
-            connector.execute_query(
+            new_username = self.username_var.get().strip()
+
+            def saved(ticket):
+                if ticket.error is not None:
+                    self.save_btn.config(state="normal")
+                    messagebox.showerror("Error", f"Failed to save: {ticket.error}")
+                    return
+                if hasattr(self.app.parent, "username"):
+                    self.app.parent.username = new_username
+                self.username = self.app.parent.username
+                self._store_original()
+                self.changed = False
+                self.save_btn.config(state="disabled")
+                self.cancel_btn.config(state="disabled")
+                self.status_label.config(
+                    text="Saved at " + datetime.now().strftime("%H:%M:%S")
+                )
+                messagebox.showinfo("Success", "Account settings saved.")
+                self._exit_edit_mode()
+
+            # Execute update using connector's API; queued, so the window
+            # stays responsive while the file is locked
+            tx = transaction(connector)
+            tx.execute_query(
                 """
                 UPDATE [emp_list]
                 SET [First Name]=?, [Last Name]=?, [Username]=?, [Password]=?
@@ -500,23 +510,14 @@ class AccountSettingsWizard:
                 (
                     self.first_name_var.get().strip(),
                     self.last_name_var.get().strip(),
-                    self.username_var.get().strip(),
+                    new_username,
                     encrypted_pw,
                     original_username,
                 )
             )
-            if hasattr(self.app.parent, "username"):
-                self.app.parent.username = self.username_var.get().strip()
-            self.username = self.app.parent.username
-            self._store_original()
-            self.changed = False
             self.save_btn.config(state="disabled")
-            self.cancel_btn.config(state="disabled")
-            self.status_label.config(
-                text="Saved at " + datetime.now().strftime("%H:%M:%S")
-            )
-            messagebox.showinfo("Success", "Account settings saved.")
-            self._exit_edit_mode()
+            self.status_label.config(text="Saving...")
+            tx.submit(on_tk(self.container, saved))
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save: {e}")
 
@@ -8,6 +8,7 @@ import shutil
 from datetime import datetime
 import re
 from backend.database import get_db_path
+from backend.database.lookup_cache import get_lookup_cache
 
 
 class BackupRestoreSection(Frame):
@@ -453,6 +454,7 @@ class BackupRestoreSection(Frame):
             dest_db = get_db_path()
             if os.path.exists(src_db):
                 shutil.copy2(src_db, dest_db)
+                get_lookup_cache().invalidate()
             else:
                 self.show_toast(
                     f"File not found: {os.path.basename(src_db)}", success=False
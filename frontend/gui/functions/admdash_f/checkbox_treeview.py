@@ -1,7 +1,8 @@
+import itertools
 import tkinter as tk
 from tkinter import ttk
 from pathlib import Path
-from PIL import Image, ImageTk
+from backend.utils.image_manager import ImageManager
 
 class CheckboxTreeview(ttk.Treeview):
     def __init__(self, master=None, **kw):
@@ -11,10 +12,12 @@ class CheckboxTreeview(ttk.Treeview):
         # Load and resize icons to 25x25 (same as employee version, adjust if needed)
         selected_path = Path(__file__).resolve().parent.parent.parent.parent / "assets" / "adm_select.png"
         deselected_path = Path(__file__).resolve().parent.parent.parent.parent / "assets" / "adm_dselect.png"
-        self.selected_icon = ImageTk.PhotoImage(Image.open(selected_path).resize((25, 25), Image.LANCZOS))
-        self.deselected_icon = ImageTk.PhotoImage(Image.open(deselected_path).resize((25, 25), Image.LANCZOS))
+        # Shared across every table instance via the ImageManager registry
+        self.selected_icon = ImageManager.load_image(selected_path, (25, 25), "RGBA", master=self)
+        self.deselected_icon = ImageManager.load_image(deselected_path, (25, 25), "RGBA", master=self)
         self._checked_items = set()
         self._image_refs = {}  # Prevent garbage collection
+        self._iid_seq = itertools.count(1)  # Generated row ids are never reused
         self._is_destroyed = False  # Track if widget has been destroyed
         self.bind("<Button-1>", self._on_click)
         self.bind("<Destroy>", self._on_destroy)  # Bind to destruction event
@@ -45,7 +48,7 @@ class CheckboxTreeview(ttk.Treeview):
         icon = self.selected_icon if checked else self.deselected_icon
         # Store image reference to prevent garbage collection
         if iid is None:
-            iid = f"item_{id(values)}_{len(self._image_refs)}"
+            iid = f"item_{next(self._iid_seq)}"
         self._image_refs[iid] = icon
         kw["image"] = icon  # This will display in the #0 column
         kw["text"] = ""    # No text in the #0 column
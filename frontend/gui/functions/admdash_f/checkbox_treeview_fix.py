@@ -1,3 +1,4 @@
+import itertools
 import tkinter as tk
 from tkinter import ttk
 from pathlib import Path
@@ -15,6 +16,7 @@ class CheckboxTreeview(ttk.Treeview):
         self.deselected_icon = ImageTk.PhotoImage(Image.open(deselected_path).resize((25, 25), Image.LANCZOS))
         self._checked_items = set()
         self._image_refs = {}  # Prevent garbage collection
+        self._iid_seq = itertools.count(1)  # Generated row ids are never reused
         self._is_destroyed = False  # Track if widget has been destroyed
         self.bind("<Button-1>", self._on_click)
         self.bind("<Destroy>", self._on_destroy)  # Bind to destruction event
@@ -45,7 +47,7 @@ class CheckboxTreeview(ttk.Treeview):
         icon = self.selected_icon if checked else self.deselected_icon
         # Store image reference to prevent garbage collection
         if iid is None:
-            iid = f"item_{id(values)}_{len(self._image_refs)}"
+            iid = f"item_{next(self._iid_seq)}"
         self._image_refs[iid] = icon
         kw["image"] = icon  # This will display in the #0 column
         kw["text"] = ""    # No text in the #0 column
@@ -3,6 +3,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
 import traceback
+from backend.database import queries
 
 class DraftManager:
     def __init__(self, parent_window, db, entries, username):
@@ -148,29 +149,18 @@ class DraftManager:
             return
 
         try:
-            connection = self.db.connect()
-            cursor = connection.cursor()
-
-            cursor.execute("""
-                INSERT INTO ANI_DRAFTS (
-                    [Date], [Item Name], [Brand], [Type], [Location], 
-                    [Unit of Measure], [In], [Minimum Stock], [Price per Unit], [Supplier]
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            # Adds a new draft row; earlier drafts of the item are kept
+            queries.save_item_draft(self.db, (
                 draft_values["DATE"], draft_values["NAME"], draft_values["BRAND"], 
                 draft_values["TYPE"], draft_values["LOCATION"], draft_values["UNIT_OF_MEASURE"],
                 draft_values["IN"], draft_values["MIN_STOCK"], draft_values["PRICE_PER_UNIT"],
                 draft_values["SUPPLIER"]
             ))
-            connection.commit()
             self._show_dialog("info", "Success", "Draft saved successfully!", self.parent_window)
 
         except Exception as e:
             self._show_dialog("error", "Error", f"Failed to save draft: {str(e)}", self.parent_window)
             traceback.print_exc()
-        finally:
-            if 'connection' in locals():
-                connection.close()
 
     def create_draft_window(self):
         """Create the draft selection window"""
@@ -350,10 +340,7 @@ class DraftManager:
     def _load_drafts(self):
         """Load drafts from database into the Treeview"""
         try:
-            connection = self.db.connect()
-            cursor = connection.cursor()
-            cursor.execute("SELECT [Date], [Item Name] FROM ANI_DRAFTS ORDER BY [Date] DESC")
-            drafts = cursor.fetchall()
+            drafts = queries.fetch_item_drafts(self.db)
             
             if not drafts:
                 self._show_dialog("info", "No Drafts", "No drafts available.", self.parent_window)
@@ -382,9 +369,6 @@ class DraftManager:
             if self.draft_window:
                 self.draft_window.destroy()
             return False
-        finally:
-            if 'connection' in locals():
-                connection.close()
 
     def _select_draft(self):
         """Handle draft selection and loading"""
@@ -393,19 +377,10 @@ class DraftManager:
             return
         
         try:
-            connection = self.db.connect()
-            cursor = connection.cursor()
             item_name = self.draft_list.item(selected[0])['values'][1]
             date = self.draft_list.item(selected[0])['values'][0]
             
-            cursor.execute("""
-                SELECT [Item Name], [Brand], [Type], [Location], [Unit of Measure],
-                       [In], [Minimum Stock], [Price per Unit], [Supplier]
-                FROM ANI_DRAFTS
-                WHERE [Item Name] = ? AND [Date] = ?
-            """, (item_name, date))
-            
-            draft = cursor.fetchone()
+            draft = queries.fetch_item_draft(self.db, item_name, date)
             if draft:
                 # Map draft values to entries
                 self.entries["entry_1"].delete(0, tk.END)
@@ -427,9 +402,6 @@ class DraftManager:
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load draft: {str(e)}")
             traceback.print_exc()
-        finally:
-            if 'connection' in locals():
-                connection.close()
 
     def _delete_draft(self):
         """Delete the selected draft"""
@@ -447,14 +419,7 @@ class DraftManager:
                                    f"Are you sure you want to delete the draft for '{item_name}'?"):
                 return
                 
-            connection = self.db.connect()
-            cursor = connection.cursor()
-            
-            cursor.execute("""
-                DELETE FROM ANI_DRAFTS
-                WHERE [Item Name] = ? AND [Date] = ?
-            """, (item_name, date))
-            connection.commit()
+            queries.delete_item_draft(self.db, item_name, date)
             
             # Remove from treeview
             self.draft_list.delete(selected[0])
@@ -468,9 +433,6 @@ class DraftManager:
         except Exception as e:
             self._show_dialog("error", "Error", f"Failed to delete draft: {str(e)}")
             traceback.print_exc()
-        finally:
-            if 'connection' in locals():
-                connection.close()
 
     def _add_control_buttons(self):
         """Add Load, Delete and Cancel buttons to the draft window"""
@@ -50,6 +50,11 @@ def export_to_xlsx(table, current_view):
         for row in rows:
             ws.append(row)
 
+        # Restock list: add the per-supplier purchase plan from the forecast
+        plan = getattr(table, "_purchase_plan", None)
+        if current_view == "Restock List" and plan:
+            write_purchase_plan(wb.create_sheet("Purchase Plan"), plan)
+
         # Save the workbook
         wb.save(file_path)
         messagebox.showinfo("Success", f"Data exported successfully to {file_path}!")
@@ -57,6 +62,18 @@ def export_to_xlsx(table, current_view):
         messagebox.showerror("Error", f"Failed to export data: {e}")
 
 
+def write_purchase_plan(ws, plan):
+    """Write a restock purchase plan (see restock_forecast.purchase_plan) to ws."""
+    ws.append(["SUPPLIER", "ITEM", "REORDER QTY", "PRICE PER UNIT", "COST"])
+    for group in plan:
+        for name, qty, price, cost in group["lines"]:
+            ws.append([group["supplier"], name, qty, price, cost])
+        ws.append(
+            [f"{group['supplier']} TOTAL", "", group["total_qty"], "", group["total_cost"]]
+        )
+        ws.append([])
+
+
 def export_to_csv(table, current_view):
     """Export the currently visible data in the Treeview to a CSV file."""
     try:
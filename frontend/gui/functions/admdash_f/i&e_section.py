@@ -16,6 +16,7 @@ import os
 import shutil
 import csv
 from backend.database import get_db_path, get_connector
+from backend.database.lookup_cache import get_lookup_cache
 
 # Optional dependencies
 try:
@@ -413,6 +414,8 @@ class ImportFrame(Frame):
 
             # Copy file to destination
             shutil.copy2(source_path, str(destination_path))
+            # Imported database replaces every item; rebuild lookups on next use
+            get_lookup_cache().invalidate()
 
             return True
 
@@ -1,11 +1,12 @@
 import os
-import importlib.util
 import pyotp
 import tkinter as tk
 from pathlib import Path
 from tkinter import messagebox
-from cryptography.fernet import Fernet
+from backend.config.key_service import get_key_service
 from backend.database import get_db_path
+from backend.database.unit_of_work import transaction
+from backend.database.write_queue import on_tk
 
 # Import all the functional components from the original admin settings
 from .backup_restore_section import BackupRestoreSection
@@ -460,17 +461,9 @@ class IntegratedAdminSettings:
 
             # Database connection
             db_path = get_db_path()
-            key_path = os.path.abspath(
-                os.path.join(os.path.dirname(__file__), "../../../config/fernet_key.py")
-            )
 
             # Encrypt password
-            spec = importlib.util.spec_from_file_location("fernet_key", key_path)
-            fernet_key_mod = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(fernet_key_mod)
-            key = fernet_key_mod.FERNET_KEY
-            fernet = Fernet(key)
-            encrypted_password = fernet.encrypt(password.encode()).decode()
+            encrypted_password = get_key_service().encrypt_text(password)
 
             # Update database
             original_username = getattr(self.parent, "username", username)
@@ -479,8 +472,24 @@ class IntegratedAdminSettings:
             from backend.database import get_connector
             connector = get_connector(db_path)
             
-            # Execute query using connector's API
-            connector.execute_query(
+            def saved(ticket):
+                if ticket.error is not None:
+                    print(f"Error saving account settings: {ticket.error}")
+                    messagebox.showerror(
+                        "Error", f"Failed to save account settings: {ticket.error}"
+                    )
+                    return
+                # Update parent username if changed
+                if hasattr(self.parent, "username"):
+                    self.parent.username = username
+
+                messagebox.showinfo("Success", "Account settings saved successfully!")
+                self.show_account_settings()  # Reload data
+
+            # Execute query using connector's API; queued, so the settings
+            # stay responsive while the file is locked
+            tx = transaction(connector)
+            tx.execute_query(
                 """
                 UPDATE [Emp_list] 
                 SET [First Name]=?, [Last Name]=?, [Username]=?, [Password]=? 
@@ -494,13 +503,7 @@ class IntegratedAdminSettings:
                     original_username,
                 )
             )
-
-            # Update parent username if changed
-            if hasattr(self.parent, "username"):
-                self.parent.username = username
-
-            messagebox.showinfo("Success", "Account settings saved successfully!")
-            self.show_account_settings()  # Reload data
+            tx.submit(on_tk(self.parent.root, saved))
 
         except Exception as e:
             print(f"Error saving account settings: {e}")
@@ -779,6 +782,27 @@ class IntegratedAdminSettings:
                     emp_columns = [desc[0] for desc in cursor.description]
                     emp_data = cursor.fetchall()
 
+                    # Optionally add rows moved to the log archive
+                    archived = {}
+                    from backend.database.log_archive import get_log_archive
+
+                    archive = get_log_archive()
+                    if (
+                        archive.row_count("adm_logs") or archive.row_count("emp_logs")
+                    ) and messagebox.askyesno(
+                        "Archived Logs", "Include archived log entries in the export?"
+                    ):
+                        archived = {
+                            "admin archive": (
+                                ["DATE", "TIME", "USER", "DETAILS"],
+                                archive.read("adm_logs"),
+                            ),
+                            "employees archive": (
+                                ["DATE", "TIME", "NAME", "DETAILS"],
+                                archive.read("emp_logs"),
+                            ),
+                        }
+
                     # Create Excel file with multiple sheets
                     with pd.ExcelWriter(target_file, engine="openpyxl") as writer:
                         if admin_data:
@@ -789,6 +813,12 @@ class IntegratedAdminSettings:
                             emp_df = pd.DataFrame(emp_data, columns=emp_columns)
                             emp_df.to_excel(writer, sheet_name="employees", index=False)
 
+                        for sheet, (columns, rows) in archived.items():
+                            if rows:
+                                pd.DataFrame(rows, columns=columns).to_excel(
+                                    writer, sheet_name=sheet, index=False
+                                )
+
                     messagebox.showinfo(
                         "Success", f"Logs exported successfully!\n{target_file}"
                     )
@@ -4,41 +4,21 @@ from backend.utils.font_utils import get_bold_font
 from backend.database import get_db_path
 
 
-def execute_access_queries():
-    """Execute the Access database queries: Update Status and statssum"""
-    try:
-        # Get database path
-        db_path = get_db_path()
+def execute_access_queries(callback=None):
+    """Queue the Access database queries: Update Status and statssum.
 
-        # Connect using connector pattern that abstracts database type
+    Returns immediately; the queries run on the database's write queue
+    (falling back to a plain STATUS update if they fail) and
+    callback(ticket) fires when they are done.
+    """
+    try:
         from backend.database import get_connector
-        connector = get_connector(db_path)
-        
-        # Execute Update Status query
-        print("[DEBUG] Executing 'Update Status' query...")
-        connector.execute_query("EXEC [Update Status]")
-        print("[DEBUG] 'Update Status' query executed successfully")
-
-        # Execute statssum query
-        print("[DEBUG] Executing 'statssum' query...")
-        connector.execute_query("EXEC statssum")
-        print("[DEBUG] 'statssum' query executed successfully")
+        from backend.database.queries import refresh_item_status
 
+        connector = get_connector(get_db_path())
+        return refresh_item_status(connector, callback)
     except Exception as e:
         print(f"[ERROR] Failed to execute queries: {e}")
-        # Try fallback SQL if queries fail
-        try:
-            print("[DEBUG] Attempting fallback SQL execution...")
-            fallback_sql = """
-            UPDATE ITEMSDB
-            SET STATUS = IIf(BALANCE > 0 AND BALANCE <= [MIN STOCK], 'Low in Stock', IIf(BALANCE = 0, 'Out of Stock', 'In Stock'))
-            WHERE BALANCE IS NOT NULL AND [MIN STOCK] IS NOT NULL;
-            """
-            connector = get_connector(get_db_path())  # Get a fresh connector
-            connector.execute_query(fallback_sql)
-            print("[DEBUG] Fallback SQL executed successfully")
-        except Exception as fallback_error:
-            print(f"[ERROR] Fallback SQL also failed: {fallback_error}")
 
 
 def create_frame_outline(
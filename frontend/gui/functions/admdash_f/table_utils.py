@@ -1,7 +1,9 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import tkinter.font as tkfont
 from gui.functions.admdash_f.checkbox_treeview import CheckboxTreeview
+from backend.utils import row_model
+from backend.utils.table_diff import grow_column_widths, sync_rows
+from backend.utils.table_loader import ITEM_FORMATTERS, fit_columns, format_columns
 
 # Updated column widths for better readability
 EXTENDED_COLUMN_WIDTHS = {
@@ -29,14 +31,12 @@ def reset_table_columns(table, columns, column_widths):
         table.column(col, width=column_widths.get(col, 100), anchor=anchor)
 
 # Utility: Auto-adjust column widths
-def auto_adjust_column_widths(table):
-    font = tkfont.nametofont("TkDefaultFont")
-    for col in table["columns"]:
-        max_width = font.measure(col)
-        for row_id in table.get_children():
-            value = str(table.set(row_id, col))
-            max_width = max(max_width, font.measure(value))
-        table.column(col, width=max_width + 20)
+# rows: display rows if the caller has them; otherwise the table is read once.
+# Only the longest distinct values per column are measured (memoized widths).
+def auto_adjust_column_widths(table, rows=None):
+    if rows is None:
+        rows = [table.item(row_id, "values") for row_id in table.get_children()]
+    fit_columns(table, rows)
 
 # Utility: Clear all rows
 def clear_table(table):
@@ -49,40 +49,40 @@ def clear_table(table):
 # default_columns/widths are lists/dicts
 # This is a general loader for admin tables
 
-def load_data(table, db, default_columns, default_column_widths, format_row, update_stats):
+def load_data(table, db, default_columns, default_column_widths, format_row=None, update_stats=None):
     try:
         # Set new columns for the table
         extended_columns = [
             "NAME", "BRAND", "TYPE", "LOCATION", "UNIT OF MEASURE", "STATUS", "IN", "OUT", "BALANCE", "MIN STOCK", "DEFICIT", "PRICE PER UNIT", "COST", "LAST PO", "SUPPLIER"
         ]
-        reset_table_columns(table, extended_columns, EXTENDED_COLUMN_WIDTHS)
-        clear_table(table)
+        if list(table["columns"]) != extended_columns:
+            reset_table_columns(table, extended_columns, EXTENDED_COLUMN_WIDTHS)
         connection = db.connect()
         cursor = connection.cursor()
         query = (
-            "SELECT [NAME], [BRAND], [TYPE], [LOCATION], [UNIT OF MEASURE], [STATUS], [IN], [OUT], [BALANCE], [MIN STOCK], [DEFICIT], [PRICE PER UNIT], [COST], [LAST PO], [SUPPLIER] "
+            "SELECT [ID], [NAME], [BRAND], [TYPE], [LOCATION], [UNIT OF MEASURE], [STATUS], [IN], [OUT], [BALANCE], [MIN STOCK], [DEFICIT], [PRICE PER UNIT], [COST], [LAST PO], [SUPPLIER] "
             "FROM ITEMSDB"
         )
         cursor.execute(query)
         rows = cursor.fetchall()
-        for row in rows:
-            formatted_row = format_row(row, extended_columns)
-            table.insert("", "end", values=formatted_row)
-        # Auto-sort by NAME column (A-Z)
-        name_col_index = extended_columns.index("NAME")
-        items = [(table.set(row_id, "NAME"), row_id) for row_id in table.get_children("")]
-        items.sort(key=lambda x: x[0].lower())
-        for index, (_, row_id) in enumerate(items):
-            table.move(row_id, '', index)
+        # Rows keyed by item ID, sorted A-Z by NAME; only changed rows are repainted.
+        # Formatting runs per column over the whole result unless a custom
+        # per-row formatter is supplied.
+        if format_row is None:
+            display = format_columns([row[1:] for row in rows], extended_columns, ITEM_FORMATTERS)
+        else:
+            display = [format_row(row[1:], extended_columns) for row in rows]
+        keyed = [(row[0], values) for row, values in zip(rows, display)]
+        keyed.sort(key=lambda r: str(r[1][0] or "").lower())
+        sync_rows(table, keyed)
+        # Native values (numbers, dates) back the header sort
+        row_model.set_rows(table, ((row[0], row[1:]) for row in rows), extended_columns)
         # Add sorting functionality to column headers
         sort_states = {col: False for col in extended_columns}
         def sort_column(col):
             sort_states[col] = not sort_states[col]
             reverse = sort_states[col]
-            items = [(table.set(row_id, col), row_id) for row_id in table.get_children("")]
-            items.sort(key=lambda x: x[0].lower() if isinstance(x[0], str) else x[0], reverse=reverse)
-            for index, (_, row_id) in enumerate(items):
-                table.move(row_id, '', index)
+            row_model.sort_table(table, col, reverse)
             # Update headings to show sort state
             arrow = " ▼" if reverse else " ▲"
             for c in extended_columns:
@@ -92,8 +92,9 @@ def load_data(table, db, default_columns, default_column_widths, format_row, upd
             def make_sort_command(col_name):
                 return lambda: sort_column(col_name)
             table.heading(col, text=col, command=make_sort_command(col))
-        auto_adjust_column_widths(table)
-        update_stats()
+        grow_column_widths(table)
+        if update_stats:
+            update_stats()
     except Exception as e:
         messagebox.showerror("Error", f"Failed to load data: {e}")
     finally:
@@ -104,48 +105,7 @@ def load_data(table, db, default_columns, default_column_widths, format_row, upd
 
 def format_row(row, columns):
     """Format row values, especially for currency columns and dates."""
-    formatted_row = []
-    for idx, value in enumerate(row):
-        if value is None:
-            formatted_row.append("")
-        elif columns[idx] == "LAST PO" and value:
-            try:
-                from datetime import datetime
-                # Handle different types of date inputs
-                if isinstance(value, str):
-                    # Split on space or 'T' to remove time component if present
-                    date_part = value.split(' ')[0].split('T')[0]
-                    # Remove any time component that might be remaining
-                    date_part = date_part.split('.')[0]
-                    
-                    # Try different possible date formats
-                    for fmt in ['%Y-%m-%d', '%Y/%m/%d']:
-                        try:
-                            dt = datetime.strptime(date_part, fmt)
-                            formatted_row.append(dt.strftime('%Y/%m/%d'))
-                            break
-                        except ValueError:
-                            continue
-                    else:
-                        # If no format matched, just use the date part
-                        formatted_row.append(date_part)
-                else:
-                    # Handle datetime objects
-                    formatted_row.append(value.strftime('%Y/%m/%d'))
-            except Exception as e:
-                # If parsing fails, just take the first 10 characters if it's a string
-                if isinstance(value, str):
-                    formatted_row.append(value[:10].replace('-', '/'))
-                else:
-                    formatted_row.append(str(value))
-        elif columns[idx] in {"PRICE PER UNIT", "COST"}:
-            try:
-                formatted_row.append(f"₱{float(value):,.2f}")
-            except ValueError:
-                formatted_row.append("₱0.00")
-        else:
-            formatted_row.append(value)
-    return tuple(formatted_row)
+    return format_columns([row], columns, ITEM_FORMATTERS)[0]
 
 # Factory: Create admin items table (with checkboxes and custom style)
 def create_items_table(dashboard):
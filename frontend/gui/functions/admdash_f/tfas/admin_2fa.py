@@ -1,6 +1,7 @@
 import tkinter as tk
 import pyotp
 from backend.utils.window_icon import set_window_icon
+from backend.utils.frame_clock import fade_window
 # Sound imports removed
 # No scanline import needed
 
@@ -53,64 +54,32 @@ class Admin2FA:
 
     def fade_in(self):
         """Smooth fade-in animation for the overlay"""
-        alpha = self.overlay.attributes("-alpha")
-        if alpha < 0.7:
-            alpha += 0.1
-            self.overlay.attributes("-alpha", alpha)
-            self.overlay.after(20, self.fade_in)
+        fade_window(self.overlay, 0.0, 0.7, duration_ms=140)
 
     def fade_out(self, callback):
         """Smooth fade-out animation for the overlay"""
-        try:
-            if not hasattr(self, "overlay") or not self.overlay.winfo_exists():
-                callback()
-                return
-            alpha = self.overlay.attributes("-alpha")
-            if alpha > 0:
-                alpha -= 0.1
-                self.overlay.attributes("-alpha", alpha)
-                # Use a lambda with proper error handling
-                self.overlay.after(20, lambda: self.safe_continue_fade_out(callback))
-            else:
-                self.overlay.after(
-                    1, callback
-                )  # Schedule callback for next event loop iteration
-        except Exception:
-            # If there's any error during fade out, just call the callback
-            try:
-                callback()
-            except Exception:
-                pass
 
-    def safe_continue_fade_out(self, callback):
-        """Safely continue the fade out animation."""
-        try:
-            if (
-                hasattr(self, "overlay")
-                and self.overlay
-                and self.overlay.winfo_exists()
-            ):
-                self.fade_out(callback)
-            else:
-                callback()
-        except Exception:
+        def finish():
             try:
                 callback()
             except Exception:
                 pass
 
-    def continue_fade_out(self, callback):
-        """Continue the fade out animation."""
         try:
-            if hasattr(self, "overlay") and self.overlay.winfo_exists():
-                self.fade_out(callback)
-            else:
-                callback()
+            if not hasattr(self, "overlay") or not self.overlay.winfo_exists():
+                finish()
+                return
+            alpha = float(self.overlay.attributes("-alpha"))
+            fade_window(
+                self.overlay,
+                alpha,
+                0.0,
+                duration_ms=max(int(alpha * 200), 20),
+                on_done=finish,
+            )
         except Exception:
-            try:
-                callback()
-            except Exception:
-                pass
+            # If there's any error during fade out, just call the callback
+            finish()
 
     def close_windows(self):
         """Properly close both windows with fade effect"""
@@ -8,8 +8,9 @@ from tkinter import Tk, Canvas, Entry, Button, PhotoImage, Frame, Toplevel
 import sys
 import pyodbc
 import os
-from cryptography.fernet import Fernet
-from backend.database import get_db_path
+from backend.config.key_service import get_key_service
+from backend.database import get_db_path, queries
+from backend.database.write_queue import on_tk
 # from utils.window_icon import set_window_icon  # unused
 
 # Helper for asset paths (relative to workspace root)
@@ -25,30 +26,10 @@ def relative_to_assets(step, path):
     return step_assets(step) / Path(path)
 
 
-# Fernet key loader (from setup_2fa_utils)
-def load_fernet_key(fernet_key_path):
-    # Support both Python file with FERNET_KEY variable and raw key file
-    if os.path.exists(fernet_key_path):
-        if fernet_key_path.endswith(".py"):
-            import importlib.util
-
-            spec = importlib.util.spec_from_file_location(
-                "fernet_key_module", fernet_key_path
-            )
-            fernet_key_module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(fernet_key_module)
-            key = getattr(fernet_key_module, "FERNET_KEY", None)
-            if not key:
-                raise ValueError("FERNET_KEY variable not found in fernet_key.py")
-        else:
-            with open(fernet_key_path, "rb") as f:
-                key = f.read()
-    else:
-        key = Fernet.generate_key()
-        # Default to writing as raw key file
-        with open(fernet_key_path, "wb") as f:
-            f.write(key)
-    return key
+# Fernet key loader: the key file is owned by the process-wide key service,
+# fernet_key_path is accepted for compatibility with existing callers.
+def load_fernet_key(fernet_key_path=None):
+    return get_key_service().primary_key
 
 
 # Employee list loader (from setup_2fa_utils)
@@ -818,20 +799,21 @@ class MultiStep2FAWizardforsett:
             if totp.verify(code):
                 # Save/encrypt secret to DB
                 try:
-                    fernet = Fernet(self.fernet_key)
-                    encrypted_secret = fernet.encrypt(secret.encode()).decode("utf-8")
-                    
-                    # Use connector pattern instead of direct pyodbc connection
+                    encrypted_secret = get_key_service().encrypt_text(secret)
                     from backend.database import get_connector
                     connector = get_connector(self.db_path)
-                    
-                    # Execute query using connector's API
-                    connector.execute_query(
-                        "UPDATE [Emp_list] SET [2FA Secret]=? WHERE username=?",
-                        (encrypted_secret, self.username),
-                    )
-                    toast("2FA setup complete!", color="#228B22")
-                    self.show_step(4)
+                    # Queued, so the wizard stays responsive while the file is locked
+                    tx = queries.transaction(connector)
+                    queries.set_user_2fa_secret(tx, self.username, encrypted_secret)
+
+                    def saved(ticket):
+                        if ticket.error is not None:
+                            toast(f"DB Error: {ticket.error}", color="#800000")
+                            return
+                        toast("2FA setup complete!", color="#228B22")
+                        self.show_step(4)
+
+                    tx.submit(on_tk(self.root, saved))
                 except Exception as e:
                     print(
                         f"[DEBUG][step3] Exception during DB update: {e}",
@@ -1064,20 +1046,21 @@ class MultiStep2FAWizardforsett:
                     toast("Invalid 2FA key format!", color="#800000")
                     return
                 try:
-                    fernet = Fernet(self.fernet_key)
-                    encrypted_secret = fernet.encrypt(key.encode()).decode("utf-8")
-                    
-                    # Use connector pattern instead of direct pyodbc connection
+                    encrypted_secret = get_key_service().encrypt_text(key)
                     from backend.database import get_connector
                     connector = get_connector(self.db_path)
-                    
-                    # Execute query using connector's API
-                    connector.execute_query(
-                        "UPDATE [Emp_list] SET [2FA Secret]=? WHERE username=?",
-                        (encrypted_secret, self.username),
-                    )
-                    toast("2FA key imported!", color="#228B22")
-                    self.show_step(4)
+                    # Queued, so the wizard stays responsive while the file is locked
+                    tx = queries.transaction(connector)
+                    queries.set_user_2fa_secret(tx, self.username, encrypted_secret)
+
+                    def saved(ticket):
+                        if ticket.error is not None:
+                            toast(f"DB Error: {ticket.error}", color="#800000")
+                            return
+                        toast("2FA key imported!", color="#228B22")
+                        self.show_step(4)
+
+                    tx.submit(on_tk(self.root, saved))
                 except Exception as e:
                     toast(f"DB Error: {e}", color="#800000")
 
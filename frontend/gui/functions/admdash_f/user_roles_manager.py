@@ -3,6 +3,11 @@ from tkinter import messagebox
 from tkinter import ttk
 import pyotp
 import os
+from backend.config.key_service import get_key_service
+from backend.database import queries
+from backend.database.table_versions import bump as bump_table_versions
+from backend.database.write_queue import on_tk
+from backend.utils import table_diff
 # Sound imports removed
 
 
@@ -11,6 +16,8 @@ class UserRolesManager:
         self.parent_settings = parent_settings
         self.settings_win = settings_win
         self.user_tree = None
+        # Every loaded employee keyed by Treeview iid (the username); the
+        # table shows the subset matching the search box
         self.original_user_data = {}
         self.save_roles_btn = None
         self.cancel_roles_btn = None
@@ -164,10 +171,9 @@ class UserRolesManager:
             messagebox.showerror("Validation", "All fields required.")
             return
         # Simple uniqueness check
-        for _, info in self.original_user_data.items():
-            if info["username"].lower() == d["username"].lower():
-                messagebox.showerror("Validation", "Username already exists.")
-                return
+        if self._find_user(d["username"]):
+            messagebox.showerror("Validation", "Username already exists.")
+            return
         self._wizard_go_next()
 
     def _wizard_add_emp_step_credentials(self, parent, close_cb):
@@ -701,49 +707,20 @@ class UserRolesManager:
         ).pack(side="left")
 
         def apply_bulk():
-            successes = 0
-            failures = []
-            for uname in list(d["selected"]):
-                u = None
-                for oid, ou in self.original_user_data.items():
-                    if ou["username"] == uname:
-                        u = ou
-                        break
-                if not u:
-                    continue
-                res = (
-                    self.update_employee_in_database(
-                        uname,
-                        u["first_name"],
-                        u["last_name"],
-                        None,
-                        None,
-                        d["new_level"],
-                    )
-                    if hasattr(self, "update_employee_in_database")
-                    else (False, "Missing update method")
-                )
-                if isinstance(res, tuple):
-                    success, msg = res
-                else:
-                    success = True
-                if success:
-                    successes += 1
-                else:
-                    failures.append(uname)
-            if successes:
-                extra = f" Failed: {', '.join(failures)}" if failures else ""
-                messagebox.showinfo(
-                    "Bulk Operation",
-                    f"Successfully updated {successes} employee(s).{extra}",
-                )
-                self._hide_wizard()
-                self.load_user_data()
-            else:
-                failure_list = ", ".join(failures) if failures else "Unknown error"
+            selected = list(d["selected"])
+            successes, error = self.bulk_set_access_level(selected, d["new_level"])
+            if error:
                 messagebox.showerror(
-                    "Bulk Operation", f"Failed to update employees: {failure_list}"
+                    "Bulk Operation", f"Failed to update employees: {error}"
                 )
+                return
+            unchanged = len(selected) - successes
+            extra = f" {unchanged} needed no change." if unchanged else ""
+            messagebox.showinfo(
+                "Bulk Operation",
+                f"Successfully updated {successes} employee(s).{extra}",
+            )
+            self._hide_wizard()
 
         tk.Button(
             nav,
@@ -1185,8 +1162,7 @@ class UserRolesManager:
                     self.user_tree.heading(col, text=f"{col} ↕")
 
             # Reorder items in treeview
-            for index, (item, values) in enumerate(items_data):
-                self.user_tree.move(item, "", index)
+            self.user_tree.set_children("", *[item for item, _ in items_data])
 
         except Exception as e:
             print(f"[DEBUG] Error sorting treeview: {e}")
@@ -1200,16 +1176,13 @@ class UserRolesManager:
             if hasattr(self, "settings_win") and self.settings_win:
                 self.settings_win.after(50, self.load_user_data)
             return
-        # Clear existing data and reset state
-        try:
-            self.user_tree.delete(*self.user_tree.get_children())
-        except Exception:
-            pass
+        # Reset state; rows are replaced by diff in filter_users
         self.original_user_data.clear()
         self.sort_column = None
         self.sort_reverse = False
         self.has_pending_changes = False
         self.pending_changes.clear()
+        table_diff.reset(self.user_tree)
         try:
             self.user_tree.heading("Last Name", text="Last Name ↕")
             self.user_tree.heading("First Name", text="First Name ↕")
@@ -1225,19 +1198,14 @@ class UserRolesManager:
             rows = connector.fetchall(
                 "SELECT [Last Name], [First Name], [Middle Name], [Username], [Access Level] FROM [emp_list] ORDER BY [Last Name], [First Name]"
             )
-            for row in rows:
-                last_name = row[0] or ""
-                first_name = row[1] or ""
-                access_level = row[4] or "Level 1"
-                item_id = self.user_tree.insert(
-                    "", "end", values=(last_name, first_name, access_level)
-                )
-                self.original_user_data[item_id] = {
-                    "last_name": last_name,
-                    "first_name": first_name,
+            for index, row in enumerate(rows):
+                username = row[3] or ""
+                self.original_user_data[username or f"user-{index}"] = {
+                    "last_name": row[0] or "",
+                    "first_name": row[1] or "",
                     "middle_name": row[2] or "",
-                    "username": row[3] or "",
-                    "access_level": access_level,
+                    "username": username,
+                    "access_level": row[4] or "Level 1",
                 }
             print(f"[DEBUG] Loaded {len(rows)} user records")
         except Exception as e:
@@ -1248,6 +1216,17 @@ class UserRolesManager:
                     connector.close()
             except Exception:
                 pass
+        self.filter_users()
+
+    def _find_user(self, username):
+        """(iid, user data) for username (case-insensitive), or None."""
+        if username in self.original_user_data:
+            return username, self.original_user_data[username]
+        wanted = (username or "").lower()
+        for iid, info in self.original_user_data.items():
+            if info["username"].lower() == wanted:
+                return iid, info
+        return None
 
     def save_changes_test(self):
         """Test save method without authentication to debug freezing"""
@@ -1281,22 +1260,30 @@ class UserRolesManager:
         print("[DEBUG] Connecting to database (test mode)...")
         from backend.database import get_connector, get_db_path
 
+        def saved(ticket):
+            if ticket.error is not None:
+                print(f"[DEBUG] Test save error: {ticket.error}")
+                messagebox.showerror("Error", f"Failed to save changes: {ticket.error}")
+                return
+            print("[DEBUG] Test save completed successfully")
+            messagebox.showinfo(
+                "Success", f"Successfully updated {len(changes)} user(s) (test mode)."
+            )
+            self.load_user_data()
+
         connector = None
         try:
             connector = get_connector(get_db_path())
+            # One queued transaction, so the window stays responsive while the file is locked
+            tx = queries.transaction(connector)
             for i, change in enumerate(changes):
                 print(
                     f"[DEBUG] Processing change {i + 1}/{len(changes)}: {change['username']} -> {change['new_level']}"
                 )
-                connector.execute_query(
-                    "UPDATE [emp_list] SET [Access Level]=? WHERE [Username]=?",
-                    (change["new_level"], change["username"]),
+                queries.update_user_access_level(
+                    tx, change["username"], change["new_level"]
                 )
-            print("[DEBUG] Test save completed successfully")
-            messagebox.showinfo(
-                "Success", f"Successfully updated {len(changes)} user(s) (test mode)."
-            )
-            self.load_user_data()
+            tx.submit(on_tk(self.user_tree, saved))
         except Exception as e:
             print(f"[DEBUG] Test save error: {e}")
             messagebox.showerror("Error", f"Failed to save changes: {e}")
@@ -1348,18 +1335,44 @@ class UserRolesManager:
             if not self.authenticate_admin_promotions(promotion_changes):
                 return
 
-        # Apply changes to database
-        conn = None
-        cursor = None
-        connector = None
+        def saved(ticket):
+            if ticket.error is not None:
+                print(f"[DEBUG] Save error: {ticket.error}")
+                messagebox.showerror("Error", f"Failed to save changes: {ticket.error}")
+                return
+            print("[DEBUG] Database changes completed successfully")
+
+            # Count demotions for success message
+            demoted_users = [
+                c
+                for c in changes
+                if c["old_level"] in ["Level 2", "Level 3"]
+                and c["new_level"] == "Level 1"
+            ]
+
+            if demoted_users:
+                success_msg = f"Successfully updated {len(changes)} user(s).\n\n"
+                success_msg += f"Security Notice: Cleared credentials for {len(demoted_users)} demoted user(s):\n"
+                for user in demoted_users:
+                    success_msg += f"• {user['first_name']} {user['last_name']}\n"
+                success_msg += "\nThese users will need to reset their passwords before logging in again."
+                messagebox.showinfo("Success", success_msg)
+            else:
+                messagebox.showinfo(
+                    "Success", f"Successfully updated {len(changes)} user(s)."
+                )
+
+            print("[DEBUG] Refreshing user data after save...")
+            self.load_user_data()  # Refresh the data
+
+        # Apply changes to database: one queued transaction (the write queue
+        # bumps emp_list's version), so the window stays responsive while
+        # the file is locked
         try:
             from backend.database import get_connector, get_db_path
 
-            print("[DEBUG] Connecting to database for save operation...")
             connector = get_connector(get_db_path())
-
-            conn = connector.connect()
-            cursor = conn.cursor()
+            tx = queries.transaction(connector)
 
             print(f"[DEBUG] Applying {len(changes)} changes to database...")
             for i, change in enumerate(changes):
@@ -1373,67 +1386,26 @@ class UserRolesManager:
                     and change["new_level"] == "Level 1"
                 ):
                     # Clear password and 2FA secret for demoted users
-                    cursor.execute(
+                    tx.execute_query(
                         "UPDATE [emp_list] SET [Access Level]=?, [Password]=?, [2FA Secret]=? WHERE [Username]=?",
                         (change["new_level"], None, None, change["username"]),
                     )
                     print(
-                        f"[DEBUG] Cleared credentials for demoted user: {change['username']}"
+                        f"[DEBUG] Clearing credentials for demoted user: {change['username']}"
                     )
                 else:
                     # Normal access level update without clearing credentials
-                    cursor.execute(
+                    tx.execute_query(
                         "UPDATE [emp_list] SET [Access Level]=? WHERE [Username]=?",
                         (change["new_level"], change["username"]),
                     )
 
-                # Commit after each change to prevent large transaction locks
-                conn.commit()
-
-            print("[DEBUG] Database changes completed successfully")
-
-            # Count demotions for success message
-            demoted_users = [
-                c
-                for c in changes
-                if c["old_level"] in ["Level 2", "Level 3"]
-                and c["new_level"] == "Level 1"
-            ]
-
-            if demoted_users:
-                success_msg = f"Successfully updated {len(changes)} user(s).\n\n"
-                success_msg += f"Security Notice: Cleared credentials for {len(demoted_users)} demoted user(s):\n"
-                for user in demoted_users:
-                    success_msg += f"• {user['first_name']} {user['last_name']}\n"
-                success_msg += "\nThese users will need to reset their passwords before logging in again."
-                messagebox.showinfo("Success", success_msg)
-            else:
-                messagebox.showinfo(
-                    "Success", f"Successfully updated {len(changes)} user(s)."
-                )
-
-            print("[DEBUG] Refreshing user data after save...")
-            self.load_user_data()  # Refresh the data
+            tx.submit(on_tk(self.user_tree, saved))
 
         except Exception as e:
             print(f"[DEBUG] Save error: {e}")
             messagebox.showerror("Error", f"Failed to save changes: {e}")
 
-        finally:
-            try:
-                if cursor:
-                    cursor.close()
-            except Exception:
-                pass
-            try:
-                if connector:
-                    connector.close()
-                    print("[DEBUG] Database connection closed")
-                elif conn:
-                    conn.close()
-            except Exception as close_error:
-                print(f"[DEBUG] Error closing database connection: {close_error}")
-
     def authenticate_sensitive_changes(self, sensitive_changes):
         """Require password and 2FA authentication from users being demoted"""
         for change in sensitive_changes:
@@ -1812,6 +1784,19 @@ The user being demoted must provide their credentials to surrender their current
 
         return auth_result["success"]
 
+    # ---------------- Credential Encryption ----------------
+    def _encrypt_password(self, password):
+        return get_key_service().encrypt_text(password)
+
+    def _decrypt_password(self, encrypted):
+        return get_key_service().decrypt_text(encrypted)
+
+    def _encrypt_2fa_secret(self, secret):
+        return get_key_service().encrypt_text(secret)
+
+    def _decrypt_2fa_secret(self, encrypted):
+        return get_key_service().decrypt_text(encrypted)
+
     def verify_target_user_credentials_flexible(
         self, target_username, password, tfa_code, auth_method
     ):
@@ -2548,6 +2533,7 @@ The user being demoted must provide their credentials to surrender their current
                         (change["new_level"], change["username"]),
                     )
 
+                bump_table_versions(cursor, ("emp_list",))
                 conn.commit()
 
             cursor.close()
@@ -2869,6 +2855,7 @@ The user being demoted must provide their credentials to surrender their current
                     error_msg = f"Update operation affected 0 rows. Username '{old_username}' may not exist."
                     print(f"[DEBUG] {error_msg}")
                     return {"success": False, "error": error_msg}
+                bump_table_versions(cursor, ("emp_list",))
                 conn.commit()
                 # Verify update
                 verify_cursor = conn.cursor()
@@ -2940,41 +2927,26 @@ The user being demoted must provide their credentials to surrender their current
             return False
 
     def filter_users(self, *args):
-        """Filter users based on search query"""
+        """Filter users based on search query (rows are diffed, not rebuilt)"""
         try:
-            if not self.user_tree or not hasattr(self, "search_var"):
+            if not self.user_tree:
                 return
 
-            search_query = self.search_var.get().lower().strip()
-
-            # Store all original data in a separate backup if not already done
-            if not hasattr(self, "all_user_data"):
-                self.all_user_data = self.original_user_data.copy()
-
-            # Clear current display
-            for item in self.user_tree.get_children():
-                self.user_tree.delete(item)
-
-            # Clear the current mapping
-            self.original_user_data.clear()
+            search_query = (
+                self.search_var.get().lower().strip()
+                if hasattr(self, "search_var")
+                else ""
+            )
 
-            # Collect matching items
+            # Collect matching users from the index
             matching_items = []
-            for item_id, user_data in self.all_user_data.items():
-                first_name = user_data["first_name"].lower()
-                last_name = user_data["last_name"].lower()
-                username = user_data["username"].lower()
-                access_level = user_data["access_level"].lower()
-
-                # Check if search query matches any field
-                if (
-                    not search_query
-                    or search_query in first_name
-                    or search_query in last_name
-                    or search_query in username
-                    or search_query in access_level
+            for item_id, user_data in self.original_user_data.items():
+                if search_query and not any(
+                    search_query in user_data[field].lower()
+                    for field in ("first_name", "last_name", "username", "access_level")
                 ):
-                    matching_items.append(user_data)
+                    continue
+                matching_items.append((item_id, user_data))
 
             # Sort matching items if there's an active sort
             if self.sort_column and matching_items:
@@ -2986,25 +2958,20 @@ The user being demoted must provide their credentials to surrender their current
                 if self.sort_column in column_map:
                     sort_key = column_map[self.sort_column]
                     matching_items.sort(
-                        key=lambda x: str(x[sort_key]).lower(),
+                        key=lambda x: str(x[1][sort_key]).lower(),
                         reverse=self.sort_reverse,
                     )
 
-            # Insert sorted and filtered results
-            visible_count = 0
-            for user_data in matching_items:
-                new_item_id = self.user_tree.insert(
-                    "",
-                    "end",
-                    values=(
-                        user_data["last_name"],
-                        user_data["first_name"],
-                        user_data["access_level"],
-                    ),
+            # Pending (unsaved) level changes stay visible while filtering
+            rows = []
+            for item_id, user_data in matching_items:
+                level = self.pending_changes.get(item_id, {}).get(
+                    "new_level", user_data["access_level"]
                 )
-                # Update mapping for new item ID
-                self.original_user_data[new_item_id] = user_data.copy()
-                visible_count += 1
+                rows.append(
+                    (item_id, (user_data["last_name"], user_data["first_name"], level))
+                )
+            table_diff.sync_rows(self.user_tree, rows)
 
             # Update header display to show current sort
             if self.sort_column:
@@ -3016,23 +2983,21 @@ The user being demoted must provide their credentials to surrender their current
                         self.user_tree.heading(col, text=f"{col} ↕")
 
             # Update statistics
-            self.update_statistics(visible_count)
+            self.update_statistics(len(rows), [values for _, values in rows])
 
         except Exception as e:
             print(f"[DEBUG] Error filtering users: {e}")
 
     def clear_search(self):
-        """Clear search and reload all users"""
+        """Clear search and show all loaded users"""
         try:
             if hasattr(self, "search_var"):
-                self.search_var.set("")
-                # Reload all data when search is cleared
-                self.load_user_data()
+                self.search_var.set("")  # trace re-filters from the index
         except Exception as e:
             print(f"[DEBUG] Error clearing search: {e}")
 
-    def update_statistics(self, visible_count=None):
-        """Update statistics display"""
+    def update_statistics(self, visible_count=None, rows=None):
+        """Update statistics display (rows: the visible row values, if known)"""
         try:
             if not hasattr(self, "stats_label") or not self.stats_label:
                 return
@@ -3041,7 +3006,12 @@ The user being demoted must provide their credentials to surrender their current
             level_counts = {"Level 1": 0, "Level 2": 0, "Level 3": 0}
             total_count = 0
 
-            if visible_count is None:
+            if rows is not None:
+                for values in rows:
+                    if values[2] in level_counts:
+                        level_counts[values[2]] += 1
+                total_count = len(rows) if visible_count is None else visible_count
+            elif visible_count is None:
                 # Count from treeview (all visible items)
                 for item in self.user_tree.get_children():
                     values = self.user_tree.item(item)["values"]
@@ -3203,6 +3173,96 @@ The user being demoted must provide their credentials to surrender their current
             print(f"[DEBUG] Error getting user count by level: {e}")
             return 0
 
+    # ---------------- Bulk User Operations ----------------
+    def _bulk_targets(self, usernames, keep=None):
+        """Known, distinct usernames from usernames, minus the signed-in admin."""
+        current_username = (
+            getattr(self.parent_settings.parent, "username", None) or ""
+        ).lower()
+        targets = []
+        for username in dict.fromkeys(usernames):
+            found = self._find_user(username)
+            if not found or found[1]["username"].lower() == current_username:
+                continue
+            if keep is None or keep(found[1]):
+                targets.append(found)
+        return targets
+
+    def _run_bulk(self, operation, targets, *args):
+        """Run queries.<operation> for targets on one connection; (count, error)."""
+        from backend.database import get_connector
+
+        connector = None
+        try:
+            connector = get_connector()
+            count = getattr(queries, operation)(
+                connector,
+                [info["username"] for _, info in targets],
+                *args,
+                actor=getattr(self.parent_settings.parent, "username", None),
+            )
+            return count, None
+        except Exception as e:
+            print(f"[DEBUG] Bulk {operation} failed: {e}")
+            return 0, str(e)
+        finally:
+            try:
+                if connector:
+                    connector.close()
+            except Exception:
+                pass
+
+    def bulk_set_access_level(self, usernames, new_level):
+        """Change the level of usernames in one UPDATE; returns (count, error).
+
+        Users already at new_level are left out of the statement.
+        """
+        targets = self._bulk_targets(
+            usernames, keep=lambda info: info["access_level"] != new_level
+        )
+        count, error = self._run_bulk("bulk_set_access_level", targets, new_level)
+        if not error:
+            for item_id, info in targets:
+                info["access_level"] = new_level
+                self.pending_changes.pop(item_id, None)
+            self.has_pending_changes = bool(self.pending_changes)
+            self.filter_users()
+        return count, error
+
+    def bulk_reset_passwords(self, usernames, temporary_password):
+        """Give usernames one temporary password in one UPDATE; (count, error).
+
+        Level 1 users have no password and are skipped.
+        """
+        targets = self._bulk_targets(
+            usernames, keep=lambda info: info["access_level"] != "Level 1"
+        )
+        if not targets:
+            return 0, None
+        return self._run_bulk(
+            "bulk_reset_passwords", targets, self._encrypt_password(temporary_password)
+        )
+
+    def bulk_delete_users(self, usernames):
+        """Remove usernames in one DELETE; returns (count, error)."""
+        targets = self._bulk_targets(usernames)
+        count, error = self._run_bulk("bulk_delete_users", targets)
+        if not error:
+            for item_id, _ in targets:
+                self.original_user_data.pop(item_id, None)
+                self.pending_changes.pop(item_id, None)
+            self.has_pending_changes = bool(self.pending_changes)
+            self.filter_users()
+        return count, error
+
+    def remove_employee_from_database(self, username):
+        count, error = self.bulk_delete_users([username])
+        if error:
+            return False, error
+        if not count:
+            return False, "Employee not found"
+        return True, "Employee removed"
+
     def bulk_operations_dialog(self):
         """Show dialog for bulk operations on multiple employees"""
         try:
@@ -3339,7 +3399,10 @@ The user being demoted must provide their credentials to surrender their current
                         continue
 
                     employee_tree.insert(
-                        "", "end", values=("☐", name, username, access_level)
+                        "",
+                        "end",
+                        iid=item_id,
+                        values=("☐", name, username, access_level),
                     )
 
             # Toggle selection
@@ -3468,6 +3531,56 @@ The user being demoted must provide their credentials to surrender their current
             )
             level_combo.pack(side="left", padx=(10, 0))
 
+            tk.Radiobutton(
+                operations_frame,
+                text="Reset Password (Level 2/3 users)",
+                variable=operation_var,
+                value="reset_password",
+                font=("Segoe UI", 10),
+                bg="#000000",
+                fg="#fffde7",
+                selectcolor="#23272b",
+                activebackground="#000000",
+                activeforeground="#fffde7",
+            ).pack(anchor="w", pady=(10, 0))
+
+            password_frame = tk.Frame(operations_frame, bg="#000000")
+            password_frame.pack(anchor="w", padx=(20, 0), pady=(5, 0))
+
+            tk.Label(
+                password_frame,
+                text="Temporary Password:",
+                font=("Segoe UI", 10),
+                bg="#000000",
+                fg="#fffde7",
+            ).pack(side="left")
+
+            temp_password_var = tk.StringVar()
+            tk.Entry(
+                password_frame,
+                textvariable=temp_password_var,
+                show="*",
+                font=("Segoe UI", 10),
+                bg="#23272b",
+                fg="#fffde7",
+                insertbackground="#fffde7",
+                relief="flat",
+                width=20,
+            ).pack(side="left", padx=(10, 0))
+
+            tk.Radiobutton(
+                operations_frame,
+                text="Remove Employees",
+                variable=operation_var,
+                value="delete",
+                font=("Segoe UI", 10),
+                bg="#000000",
+                fg="#fffde7",
+                selectcolor="#23272b",
+                activebackground="#000000",
+                activeforeground="#fffde7",
+            ).pack(anchor="w", pady=(10, 0))
+
             # Buttons frame
             btn_frame = tk.Frame(main_frame, bg="#000000")
             btn_frame.pack(anchor="e", pady=(20, 0))
@@ -3480,67 +3593,43 @@ The user being demoted must provide their credentials to surrender their current
                     return
 
                 operation = operation_var.get()
+                count = len(selected_items)
+                usernames = list(selected_items)  # row iids are usernames
+
                 if operation == "change_access_level":
                     new_level = new_level_var.get()
-
-                    # Confirm operation
-                    count = len(selected_items)
                     confirm_msg = f"Are you sure you want to change the access level of {count} selected employee(s) to {new_level}?"
+                    if not messagebox.askyesno("Confirm Bulk Operation", confirm_msg):
+                        return
+                    updated, error = self.bulk_set_access_level(usernames, new_level)
+                elif operation == "reset_password":
+                    temp_password = temp_password_var.get()
+                    if len(temp_password) < 6:
+                        messagebox.showwarning(
+                            "Temporary Password",
+                            "Enter a temporary password of at least 6 characters.",
+                        )
+                        return
+                    confirm_msg = f"Reset the password of the Level 2/3 users among the {count} selected employee(s)?"
+                    if not messagebox.askyesno("Confirm Bulk Operation", confirm_msg):
+                        return
+                    updated, error = self.bulk_reset_passwords(usernames, temp_password)
+                else:
+                    confirm_msg = f"Are you sure you want to remove {count} selected employee(s)?\n\nThis action cannot be undone."
+                    if not messagebox.askyesno("Confirm Bulk Operation", confirm_msg):
+                        return
+                    updated, error = self.bulk_delete_users(usernames)
 
-                    if messagebox.askyesno("Confirm Bulk Operation", confirm_msg):
-                        success_count = 0
-                        failed_users = []
-
-                        for item in selected_items:
-                            values = employee_tree.item(item)["values"]
-                            username = values[2]  # Username is at index 2
-
-                            # Find the user data
-                            user_data = None
-                            for (
-                                orig_item_id,
-                                orig_user_data,
-                            ) in self.original_user_data.items():
-                                if orig_user_data["username"] == username:
-                                    user_data = orig_user_data
-                                    break
-
-                            if user_data:
-                                # FIX: pass correct arguments (new_username=None, new_password=None, access_level=new_level)
-                                # Previous code mistakenly passed new_level as new_password causing password overwrite attempts
-                                success, message = self.update_employee_in_database(
-                                    username,  # original_username
-                                    user_data["first_name"],
-                                    user_data["last_name"],
-                                    None,  # new_username
-                                    None,  # new_password
-                                    new_level,  # access_level
-                                )
-
-                                if success:
-                                    success_count += 1
-                                else:
-                                    failed_users.append(
-                                        f"{user_data['first_name']} {user_data['last_name']}"
-                                    )
-
-                        # Show results
-                        if success_count > 0:
-                            result_msg = (
-                                f"Successfully updated {success_count} employee(s)."
-                            )
-                            if failed_users:
-                                result_msg += (
-                                    f"\n\nFailed to update: {', '.join(failed_users)}"
-                                )
-                            messagebox.showinfo("Bulk Operation Complete", result_msg)
-                            dialog.destroy()
-                            self.load_user_data()  # Refresh the main list
-                        elif failed_users:
-                            messagebox.showerror(
-                                "Bulk Operation Failed",
-                                f"Failed to update: {', '.join(failed_users)}",
-                            )
+                if error:
+                    messagebox.showerror(
+                        "Bulk Operation Failed", f"No employees were changed: {error}"
+                    )
+                    return
+                result_msg = f"Successfully updated {updated} employee(s)."
+                if updated < count:
+                    result_msg += f"\n{count - updated} selected employee(s) needed no change."
+                messagebox.showinfo("Bulk Operation Complete", result_msg)
+                dialog.destroy()
 
             def cancel_bulk():
                 dialog.destroy()
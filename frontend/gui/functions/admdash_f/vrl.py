@@ -1,33 +1,44 @@
 """
 Vendor Restock List Module (vrl.py)
 
-This module handles the display and management of items that need restocking.
-The restock list is based on the STATUS field in the ITEMSDB table,
-specifically items with status 'Out of Stock' or 'Low in Stock'.
-Results are ordered to show 'Out of Stock' items first, then 'Low in Stock' items.
+This module handles the display and management of items that need restocking:
+items with status 'Out of Stock' or 'Low in Stock' (or at/below MIN STOCK),
+and items whose forecast DAYS LEFT is within the restock lead time.
+Results show 'Out of Stock' items first, then 'Low in Stock' items, then the
+rest by days left.
 
 Functions:
 - load_restock_list: Load items needing restocking into a treeview
-- format_row: Format data for display in the treeview
+- format_rows / format_row: Format data for display in the treeview
 - sort_restock_column: Sort the treeview by column
 - auto_resize_column_on_right_click: Auto-resize column on right-click
 - auto_resize_column: Resize a column to fit content
 - preserve_column_widths: Preserve column widths between view changes
 - refresh_restock_list_after_update: Refresh the restock list after changes
+- select_restock: Pick and order the restock rows (status or forecast based)
+- forecast_rows: Append the Forecast columns and build the purchase plan
+
+The Forecast columns (AVG DAILY USE, DAYS LEFT, REORDER QTY) come from
+backend.database.restock_forecast, computed over every item at once, so an
+item still "In Stock" is listed when it runs out within the lead time.
+The resulting per-supplier purchase plan is kept on the treeview and written
+as an extra sheet by the Excel export.
 
 Modified: August 6, 2025
 """
 
 import pyodbc
-import decimal
 import os
-from datetime import datetime
 
 from backend.database import get_connector, get_db_path
+from backend.database import restock_forecast
+from backend.utils import row_model
+from backend.utils.table_diff import sync_rows
+from backend.utils.table_loader import currency, display_value, format_columns, slash_date
 
 
 def load_restock_list(access_db_path: str | None = None, treeview=None):
-    """Populate the restock Treeview with items whose STATUS is Low/Out of Stock.
+    """Populate the restock Treeview with items that are low or about to run out.
 
     Centralized DB path resolution via get_db_path / get_connector.
     """
@@ -62,98 +73,92 @@ def load_restock_list(access_db_path: str | None = None, treeview=None):
             "LAST PO",
             "SUPPLIER",
         ]
-        # Attempt prioritized query with Access-specific IIf ordering
+        # Every item is read: one that is still "In Stock" belongs on the
+        # list when it runs out within the lead time at its recent use
         rows = []
+        ids = []
         try:
             cursor.execute(
                 """
-                SELECT NAME, BRAND, TYPE, LOCATION, [UNIT OF MEASURE], STATUS,
-                       [IN], OUT, BALANCE, [MIN STOCK], DEFICIT, [PRICE PER UNIT], COST, [LAST PO], SUPPLIER,
-                       IIf(STATUS='Out of Stock',1,IIf(STATUS='Low in Stock',2,3)) AS SortOrder
+                SELECT ID, NAME, BRAND, TYPE, LOCATION, [UNIT OF MEASURE], STATUS,
+                       [IN], OUT, BALANCE, [MIN STOCK], DEFICIT, [PRICE PER UNIT], COST, [LAST PO], SUPPLIER
                 FROM ITEMSDB
-                WHERE STATUS IN ('Out of Stock','Low in Stock')
-                ORDER BY SortOrder, NAME
                 """
             )
             raw = cursor.fetchall()
-            if raw:
-                rows = [r[:-1] for r in raw]  # strip SortOrder
-                print(f"[DEBUG] Restock (IIf) rows: {len(rows)}")
-        except Exception as primary_err:
-            print(f"[WARNING] IIf ordering failed: {primary_err}; falling back")
-            try:
-                cursor.execute(
-                    """
-                    SELECT NAME, BRAND, TYPE, LOCATION, [UNIT OF MEASURE], STATUS,
-                           [IN], OUT, BALANCE, [MIN STOCK], DEFICIT, [PRICE PER UNIT], COST, [LAST PO], SUPPLIER
-                    FROM ITEMSDB
-                    WHERE STATUS IN ('Out of Stock','Low in Stock')
-                    """
+            ids = [r[0] for r in raw]
+            rows = [r[1:] for r in raw]
+        except Exception as query_err:
+            print(f"[ERROR] Restock query failed: {query_err}")
+
+        ids, rows, result = select_restock(connector, ids, rows, columns)
+        print(f"[DEBUG] Restock rows: {len(rows)}")
+        extra, natives = _forecast(connector, treeview, ids, rows, columns, result)
+        display_rows = [
+            values + list(more)
+            for values, more in zip(format_rows(rows, columns), extra)
+        ]
+        columns = columns + list(restock_forecast.FORECAST_COLUMNS)
+
+        # Configure columns only when the layout changes, so a refresh keeps
+        # user-resized widths and sort indicators
+        if list(treeview["columns"]) != columns:
+            treeview["columns"] = columns
+            widths = {
+                "NAME": 180,
+                "BRAND": 120,
+                "TYPE": 120,
+                "LOCATION": 120,
+                "UNIT OF MEASURE": 120,
+                "STATUS": 100,
+                "IN": 80,
+                "OUT": 80,
+                "BALANCE": 80,
+                "MIN STOCK": 90,
+                "DEFICIT": 80,
+                "PRICE PER UNIT": 120,
+                "COST": 120,
+                "LAST PO": 120,
+                "SUPPLIER": 150,
+                "AVG DAILY USE": 110,
+                "DAYS LEFT": 90,
+                "REORDER QTY": 100,
+            }
+            for col in columns:
+                treeview.heading(
+                    col,
+                    text=col,
+                    anchor="center",
+                    command=lambda c=col: sort_restock_column(treeview, c),
                 )
-                raw = cursor.fetchall()
-
-                def status_key(r):
-                    status = r[5]
-                    if status == "Out of Stock":
-                        return (0, r[0])
-                    if status == "Low in Stock":
-                        return (1, r[0])
-                    return (2, r[0])
-
-                rows = sorted(raw, key=status_key)
-                print(f"[DEBUG] Restock (fallback) rows: {len(rows)}")
-            except Exception as fallback_err:
-                print(f"[ERROR] Restock queries failed entirely: {fallback_err}")
-                rows = []
-
-        # Clear existing content
-        for rid in treeview.get_children():
-            treeview.delete(rid)
-
-        treeview["columns"] = columns
-        widths = {
-            "NAME": 180,
-            "BRAND": 120,
-            "TYPE": 120,
-            "LOCATION": 120,
-            "UNIT OF MEASURE": 120,
-            "STATUS": 100,
-            "IN": 80,
-            "OUT": 80,
-            "BALANCE": 80,
-            "MIN STOCK": 90,
-            "DEFICIT": 80,
-            "PRICE PER UNIT": 120,
-            "COST": 120,
-            "LAST PO": 120,
-            "SUPPLIER": 150,
-        }
-        for col in columns:
-            treeview.heading(
-                col,
-                text=col,
-                anchor="center",
-                command=lambda c=col: sort_restock_column(treeview, c),
-            )
-            anchor = (
-                "center"
-                if col in {"IN", "OUT", "BALANCE", "MIN STOCK", "DEFICIT", "STATUS"}
-                else ("e" if col in {"PRICE PER UNIT", "COST"} else "w")
-            )
-            treeview.column(
-                col,
-                width=widths.get(col, 100),
-                anchor=anchor,
-                minwidth=60,
-                stretch=False,
+                anchor = (
+                    "center"
+                    if col
+                    in {"IN", "OUT", "BALANCE", "MIN STOCK", "DEFICIT", "STATUS"}
+                    | set(restock_forecast.FORECAST_COLUMNS)
+                    else ("e" if col in {"PRICE PER UNIT", "COST"} else "w")
+                )
+                treeview.column(
+                    col,
+                    width=widths.get(col, 100),
+                    anchor=anchor,
+                    minwidth=60,
+                    stretch=False,
+                )
+
+            treeview.bind(
+                "<Button-3>", lambda e: auto_resize_column_on_right_click(e, treeview)
             )
 
-        treeview.bind(
-            "<Button-3>", lambda e: auto_resize_column_on_right_click(e, treeview)
+        # Diff against the rows already shown (keyed by item ID)
+        sync_rows(treeview, zip(ids, display_rows))
+        # Typed values for header sorting; keep the active sort across refreshes
+        row_model.set_rows(
+            treeview,
+            ((i, tuple(row) + more) for i, row, more in zip(ids, rows, natives)),
+            columns,
         )
-
-        for row in rows:
-            treeview.insert("", "end", values=format_row(row, columns))
+        row_model.resort(treeview)
         print(f"[DEBUG] Restock list loaded successfully: {len(rows)} rows")
     except pyodbc.Error as db_err:
         print(f"[ERROR] Database error loading restock list: {db_err}")
@@ -172,6 +177,115 @@ def load_restock_list(access_db_path: str | None = None, treeview=None):
             pass
 
 
+def _forecast_all(connector, ids, rows, columns):
+    """Forecast arrays for every row: one usage query, NumPy over all rows."""
+    usage = restock_forecast.load_usage(connector) if rows else {}
+    return restock_forecast.forecast(
+        [r[columns.index("BALANCE")] for r in rows],
+        [r[columns.index("MIN STOCK")] for r in rows],
+        restock_forecast.usage_for(ids, usage),
+    )
+
+
+STATUS_ORDER = {"out of stock": 0, "low in stock": 1}
+
+
+def select_restock(connector, ids, rows, columns):
+    """Keep the rows that belong on the restock list; returns (ids, rows, forecast).
+
+    A row belongs when it is Low/Out of Stock (or at/below MIN STOCK) or runs
+    out within the lead time at its recent daily use. Rows are ordered Out of
+    Stock, Low in Stock, then by days left and NAME. forecast is None when it
+    could not be computed (the list then falls back to STATUS alone).
+    """
+    if not rows:
+        return [], [], None
+    status_idx = columns.index("STATUS")
+    statuses = [r[status_idx] for r in rows]
+    try:
+        result = _forecast_all(connector, ids, rows, columns)
+        days_left = result["days_left"]
+    except Exception as e:
+        print(f"[WARNING] Restock forecast failed, listing by STATUS only: {e}")
+        result, days_left = None, [float("inf")] * len(rows)
+    mask = restock_forecast.restock_mask(
+        statuses,
+        [r[columns.index("BALANCE")] for r in rows],
+        [r[columns.index("MIN STOCK")] for r in rows],
+        days_left,
+    )
+    keep = [i for i, wanted in enumerate(mask) if wanted]
+    keep.sort(
+        key=lambda i: (
+            STATUS_ORDER.get(str(statuses[i] or "").strip().lower(), 2),
+            float(days_left[i]),
+            str(rows[i][0] or "").lower(),
+        )
+    )
+    if result is not None:
+        result = {name: values[keep] for name, values in result.items()}
+    return [ids[i] for i in keep], [rows[i] for i in keep], result
+
+
+def _forecast(connector, treeview, ids, rows, columns, result=None):
+    """Forecast columns for rows as (display tuples, native value tuples).
+
+    The forecast runs once over every row (NumPy arrays, no per-item
+    queries) unless result already holds it; the per-supplier purchase plan
+    is stored on the treeview for the Excel export.
+    """
+    try:
+        price_idx = columns.index("PRICE PER UNIT")
+        supplier_idx = columns.index("SUPPLIER")
+        if result is None:
+            result = _forecast_all(connector, ids, rows, columns)
+        treeview._purchase_plan = restock_forecast.purchase_plan(
+            [r[0] for r in rows],
+            [r[supplier_idx] for r in rows],
+            result["reorder_qty"],
+            [r[price_idx] for r in rows],
+        )
+        natives = list(
+            zip(
+                result["avg_daily"].tolist(),
+                result["days_left"].tolist(),
+                result["reorder_qty"].tolist(),
+            )
+        )
+        return restock_forecast.format_forecast(result), natives
+    except Exception as e:
+        print(f"[WARNING] Restock forecast failed: {e}")
+        treeview._purchase_plan = []
+        return [("", "", "")] * len(rows), [(None, None, None)] * len(rows)
+
+
+def forecast_rows(connector, treeview, ids, rows, columns):
+    """Format restock rows and append the Forecast columns."""
+    extra, _ = _forecast(connector, treeview, ids, rows, columns)
+    return [
+        values + list(more) for values, more in zip(format_rows(rows, columns), extra)
+    ]
+
+
+RESTOCK_FORMATTERS = {
+    "PRICE PER UNIT": currency,
+    "COST": currency,
+    "LAST PO": slash_date,
+}
+
+
+def format_rows(rows, columns):
+    """Format restock rows for display, one column at a time.
+
+    Price and cost get the peso sign, other numbers are shown as whole
+    numbers or with two decimals, LAST PO is shown as YYYY/MM/DD.
+    """
+    return [
+        list(values)
+        for values in format_columns(rows, columns, RESTOCK_FORMATTERS, display_value)
+    ]
+
+
 def format_row(row, columns):
     """
     Format a row of data for display in the Treeview.
@@ -183,89 +297,12 @@ def format_row(row, columns):
     Returns:
         list: A formatted row.
     """
-    formatted = []
-
-    # Find indices of special columns
-    price_col_idx = None
-    cost_col_idx = None
-    date_col_idx = None
-
-    for i, col_name in enumerate(columns):
-        if col_name == "PRICE PER UNIT":
-            price_col_idx = i
-        elif col_name == "COST":
-            cost_col_idx = i
-        elif col_name == "LAST PO":
-            date_col_idx = i
-
-    for i, value in enumerate(row):
-        if value is None:
-            formatted.append("")
-        elif isinstance(value, decimal.Decimal):
-            # Format numeric values - add currency symbol for price and cost columns
-            if i == price_col_idx or i == cost_col_idx:
-                formatted.append(f"₱{float(value):,.2f}")
-            else:
-                # For other decimal values, check if they're whole numbers
-                float_val = float(value)
-                if float_val.is_integer():
-                    formatted.append(f"{int(float_val):,}")  # Show as whole number
-                else:
-                    formatted.append(f"{float_val:,.2f}")
-        elif isinstance(value, (int, float)):
-            # Format numeric values - add currency symbol for price and cost columns
-            if i == price_col_idx or i == cost_col_idx:
-                formatted.append(f"₱{value:,.2f}")
-            else:
-                # For other numeric values, check if they're whole numbers
-                if isinstance(value, int) or (
-                    isinstance(value, float) and value.is_integer()
-                ):
-                    formatted.append(f"{int(value):,}")  # Show as whole number
-                else:
-                    formatted.append(f"{value:,.2f}")
-        elif i == date_col_idx:  # LAST PO (date) column
-            # Format date to show only date, no time
-            if isinstance(value, str):
-                try:
-                    # Try to parse the date from string and format it
-                    if "/" in value:
-                        # Already formatted as date
-                        formatted.append(
-                            value.split()[0]
-                        )  # Take only date part if there's time
-                    else:
-                        # Try to parse different date formats
-                        try:
-                            date = datetime.strptime(value.split()[0], "%Y-%m-%d")
-                            formatted.append(date.strftime("%Y/%m/%d"))
-                        except ValueError:
-                            try:
-                                date = datetime.strptime(value.split()[0], "%m/%d/%Y")
-                                formatted.append(date.strftime("%Y/%m/%d"))
-                            except ValueError:
-                                formatted.append(
-                                    value.split()[0]
-                                )  # Just remove time if present
-                except (ValueError, IndexError):
-                    formatted.append(str(value))
-            else:
-                # For datetime objects
-                try:
-                    formatted.append(value.strftime("%Y/%m/%d"))
-                except (AttributeError, ValueError):
-                    formatted.append(str(value))
-        else:
-            # Strip unnecessary quotes or characters from strings
-            formatted.append(str(value).strip("'\""))
-    return formatted
+    return format_rows([row], columns)[0]
 
 
 def sort_restock_column(treeview, col):
     """Sort restock list by column with proper data type handling."""
     try:
-        # Check if we need to refresh the data from the database
-        # We can avoid refreshing when sorting to improve performance
         print("[DEBUG] Sorting restock data by column", col)
 
         # Check if treeview has sort state tracking
@@ -280,40 +317,8 @@ def sort_restock_column(treeview, col):
         treeview._sort_states[col] = not treeview._sort_states[col]
         reverse = treeview._sort_states[col]
 
-        # Get all items
-        items = [(treeview.set(k, col), k) for k in treeview.get_children("")]
-
-        # Define numeric columns
-        numeric_columns = [
-            "IN",
-            "OUT",
-            "BALANCE",
-            "MIN STOCK",
-            "DEFICIT",
-            "PRICE PER UNIT",
-            "COST",
-        ]
-
-        # Convert values for sorting
-        def convert_value(value):
-            if not value:
-                return 0 if col in numeric_columns else ""
-
-            if col in numeric_columns:
-                # Remove currency symbols and commas for numeric columns
-                cleaned = str(value).replace("₱", "").replace(",", "").strip()
-                try:
-                    return float(cleaned)
-                except ValueError:
-                    return 0
-            return str(value).lower()  # Case-insensitive string sorting
-
-        # Sort items
-        items.sort(key=lambda x: convert_value(x[0]), reverse=reverse)
-
-        # Rearrange items in sorted positions
-        for index, (_, k) in enumerate(items):
-            treeview.move(k, "", index)
+        # Reorder in memory on typed values; DAYS LEFT without usage is infinite
+        row_model.sort_table(treeview, col, reverse)
 
         # Update column header to show sort indicator
         indicator = " ▼" if reverse else " ▲"
@@ -4,6 +4,7 @@ import tkinter as tk
 from tkinter import messagebox
 from backend.database import get_connector, get_db_path
 from backend.database import queries
+from backend.database.write_queue import on_tk
 from pathlib import Path
 
 # openpyxl removed - logging now uses Access DB via AccessConnector
@@ -431,17 +432,19 @@ class CheckoutWindow:
         self.is_closing = False
 
     def confirm_order(self):
-        """Confirm the order and update the database."""
-        if getattr(self, "is_closing", False):
+        """Confirm the order and update the database.
+
+        The OUT updates are queued on the database's write queue; the window
+        stays responsive while they commit (or back off on a locked file) and
+        _order_written finishes the order once every update reported back.
+        """
+        if getattr(self, "is_closing", False) or getattr(self, "_confirming", False):
             return
         try:
+            order = []
             # Iterate over the selected items and their quantities
             for item in self.selected_items:
                 name = item[0]  # The first element is the NAME
-                brand = item[1]  # The second element is the BRAND
-                item_type = item[2]  # The third element is the TYPE
-                location = item[3]  # The fourth element is the LOCATION
-
                 try:
                     quantity = int(self.quantity_inputs[name].get())
                     if quantity <= 0:
@@ -451,37 +454,60 @@ class CheckoutWindow:
                         "Input Error", f"Invalid quantity for item {name}."
                     )
                     continue
-
+                order.append((item, quantity))
+
+            self._confirming = True
+            self._pending_writes = len(order)
+            self.confirm_button.config(state=tk.DISABLED)
+            if not order:
+                self._finish_order()
+                return
+            for item, quantity in order:
                 # Update the database using centralized query helper
-                try:
-                    queries.update_item_out(self.db, name, quantity)
-                except Exception as e:
-                    messagebox.showerror(
-                        "Database Error",
-                        f"Failed to update database for item {name}: {e}",
-                    )
-                    continue
-
-                # Log the action to JJCIMS.accdb in the new location
-                log_file_path = Path(get_db_path())
-
-                # Ensure the directory exists
-                log_file_path.parent.mkdir(parents=True, exist_ok=True)
-
-                # Fetch unit_of_measure from ITEMSDB based on the item name
-                unit_of_measure = queries.get_unit_of_measure(self.db, name) or "pcs"
-
-                # Create details string with all relevant information
-                details = f"Took {quantity} {unit_of_measure} of {brand} {name} ({item_type}) from {location}."
-
-                # log_entry list not used; logs are written to Access DB instead
-
-                # Insert the log entry into the emp_logs table in the Access database
-                try:
-                    queries.insert_emp_log(self.db, global_state.current_user, details)
-                except Exception as e:
-                    messagebox.showerror("Log Error", f"Failed to write to logs: {e}")
+                done = on_tk(
+                    self.root,
+                    lambda ticket, item=item, quantity=quantity: self._order_written(
+                        item, quantity, ticket.error
+                    ),
+                )
+                queries.update_item_out(self.db, item[0], quantity, callback=done)
+        except Exception as e:
+            self._confirming = False
+            messagebox.showerror("Error", f"Failed to confirm order: {e}")
 
+    def _order_written(self, item, quantity, error):
+        """One OUT update committed (or failed): log it, finish after the last."""
+        name = item[0]  # The first element is the NAME
+        brand = item[1]  # The second element is the BRAND
+        item_type = item[2]  # The third element is the TYPE
+        location = item[3]  # The fourth element is the LOCATION
+        self._pending_writes -= 1
+        if error is not None:
+            messagebox.showerror(
+                "Database Error",
+                f"Failed to update database for item {name}: {error}",
+            )
+        else:
+            # Fetch unit_of_measure from ITEMSDB based on the item name
+            unit_of_measure = queries.get_unit_of_measure(self.db, name) or "pcs"
+
+            # Create details string with all relevant information
+            details = f"Took {quantity} {unit_of_measure} of {brand} {name} ({item_type}) from {location}."
+
+            # Queue the emp_logs entry and its stock_movements ledger row;
+            # the audit writer flushes both in the background
+            try:
+                queries.queue_emp_log(global_state.current_user, details)
+                queries.queue_stock_movement(
+                    name, quantity, "OUT", global_state.current_user
+                )
+            except Exception as e:
+                messagebox.showerror("Log Error", f"Failed to write to logs: {e}")
+        if self._pending_writes <= 0:
+            self._finish_order()
+
+    def _finish_order(self):
+        try:
             # Show success message
             messagebox.showinfo("Success", "Order confirmed and inventory updated!")
 
@@ -2,6 +2,7 @@ import tkinter as tk
 from tkinter import messagebox
 from backend.database import get_connector
 from backend.database import queries
+from backend.database.table_versions import bump as bump_table_versions
 
 
 def forgot_password(
@@ -157,6 +158,7 @@ def reset_password(parent, open_dialogs, DB_PATH, fernet, username):
                 "UPDATE [emp_list] SET [Password]=? WHERE LCase([Username])=?",
                 (encrypted_pw, username.lower()),
             )
+            bump_table_versions(cursor, ("emp_list",))
             conn.commit()
             # success
             new_pw_entry.delete(0, tk.END)
@@ -8,8 +8,46 @@ import time
 import math
 from backend.utils.image_effects import create_scanline_effect
 from backend.utils.window_icon import set_window_icon
+from backend.utils.frame_clock import animate, SpriteSequence
+from backend.utils.warmup import get_warm_up
 # Sound imports removed
 
+LOGO_LEVELS = 16  # brightness steps pre-rendered for logo fades/pulse
+CIRCLE_STEP_DEGREES = 4  # rotation step between precomputed spinner frames
+# The splash closes once warm-up is done, but is shown at least this long
+# (no flash on a fast machine) and at most this long (a hung step)
+SPLASH_MIN_MS = int(os.environ.get("JJCIMS_SPLASH_MIN_MS", "1000"))
+SPLASH_MAX_MS = int(os.environ.get("JJCIMS_SPLASH_MAX_MS", "30000"))
+STATUS_FONT_SIZE = 24
+
+
+def _font_path():
+    import platform
+
+    if platform.system() == "Windows":
+        return "C:\\Windows\\Fonts\\segoeuib.ttf"  # Bold Segoe UI
+    if platform.system() == "Darwin":  # macOS
+        return "/System/Library/Fonts/SF-Pro-Display-Bold.otf"  # SF Pro Bold
+    return "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"  # DejaVu Sans Bold
+
+
+_fonts = {}
+# FreeType faces are not safe to draw with from two threads at once; the
+# warm-up renders status text while the UI thread may render the same font
+_text_lock = threading.Lock()
+
+
+def load_splash_font(font_size):
+    """Splash font per size, loaded from disk once."""
+    font = _fonts.get(font_size)
+    if font is None:
+        try:
+            font = ImageFont.truetype(_font_path(), font_size)
+        except Exception:
+            font = ImageFont.load_default()
+        _fonts[font_size] = font
+    return font
+
 
 class LoadingScreen:
     def __init__(self):
@@ -26,29 +64,29 @@ class LoadingScreen:
         self.center_window()
 
         # Animation variables
-        self.rotation_angle = 0
         self.animation_running = True
-        self.current_logo = "windows"  # "windows" or "jjcfpis"
-        self.logo_timer = 0
-        self.fade_alpha = 255  # Start fully visible
-        self.fade_direction = 1
-        self.transition_phase = "showing"  # "showing", "fading_out", "fading_in"
-
-        # Enhanced animation variables
-        self.pulse_intensity = 0
-        self.glow_radius = 0
-        self.particle_positions = []
-        self.progress_value = 0
 
         # Preloading variables
         self.preload_complete = False
         self.preload_progress = 0
         self.preload_status = "Initializing..."
+        self.warm_up = get_warm_up()
+        self.status_frames = {}  # status text -> PIL image rendered off-thread
 
         # Store after job IDs for cleanup
         self.after_jobs = []
         self.window_destroyed = False
 
+        # Frame-clock animations and their precomputed sprite frames
+        self.logo_animation = None
+        self.circle_animation = None
+        self.logo_frames = {}  # (logo, level) -> PIL frame rendered off-thread
+        self.logo_photos = {}  # (logo, level) -> PhotoImage
+        self.circle_sprites = None
+        self.circle_sprites_pending = None
+        self.circle_progress_shown = None
+        self.status_shown = "Initializing..."
+
         # Load and prepare images
         self.load_images()
 
@@ -80,33 +118,33 @@ class LoadingScreen:
             win_logo_path = os.path.abspath(
                 os.path.join(os.path.dirname(__file__), "..", "assets", "winLogo.png")
             )
-            self.win_logo_original = Image.open(win_logo_path).convert("RGBA")
-            self.win_logo_original = self.win_logo_original.resize(
-                (500, 500), Image.Resampling.LANCZOS
+            # Decoded and resized once, then served from the asset cache
+            self.win_logo_original = ImageManager.get_pil(
+                win_logo_path, (500, 500), "RGBA"
             )
 
             # Load JJCFPIS logo - bigger size
             jjc_logo_path = os.path.abspath(
                 os.path.join(os.path.dirname(__file__), "..", "assets", "JJCFPIS.png")
             )
-            self.jjc_logo_original = Image.open(jjc_logo_path).convert("RGBA")
-            self.jjc_logo_original = self.jjc_logo_original.resize(
-                (600, 600), Image.Resampling.LANCZOS
+            self.jjc_logo_original = ImageManager.get_pil(
+                jjc_logo_path, (600, 600), "RGBA"
             )
 
-            # Store references in ImageManager
-            self.image_manager = ImageManager()
-            self.image_manager.load_image(win_logo_path, (500, 500))
-            self.image_manager.load_image(jjc_logo_path, (600, 600))
-
         except Exception as e:
             print(f"Error loading images: {e}")
             # Create placeholder images if files not found - bigger sizes
             self.win_logo_original = Image.new("RGBA", (500, 500), (255, 111, 0, 255))
             self.jjc_logo_original = Image.new("RGBA", (600, 600), (255, 111, 0, 255))
 
-    def create_loading_circle(self, size=160):
-        """Create a stylized circular loading indicator with scanline interlacing"""
+    def create_loading_circle(self, size=160, progress=None):
+        """Create a stylized circular loading indicator with scanline interlacing
+
+        progress defaults to preload_progress; sprite builders on worker
+        threads pass it explicitly.
+        """
+        if progress is None:
+            progress = self.preload_progress
         img = Image.new("RGBA", (size, size), (0, 0, 0, 0))
         draw = ImageDraw.Draw(img)
 
@@ -122,7 +160,7 @@ class LoadingScreen:
         )
 
         # Calculate progress arc based on loading progress
-        progress_degrees = int((self.preload_progress / 100) * 360)
+        progress_degrees = int((progress / 100) * 360)
 
         # Draw progress arc
         if progress_degrees > 0:
@@ -215,43 +253,30 @@ class LoadingScreen:
         temp_img = Image.new("RGBA", (1000, font_size + padding * 2), (0, 0, 0, 0))
         draw = ImageDraw.Draw(temp_img)
 
-        try:
-            # Try platform-specific font paths
-            import platform
-
-            if platform.system() == "Windows":
-                font_path = "C:\\Windows\\Fonts\\segoeuib.ttf"  # Bold Segoe UI
-            elif platform.system() == "Darwin":  # macOS
-                font_path = (
-                    "/System/Library/Fonts/SF-Pro-Display-Bold.otf"  # SF Pro Bold
-                )
-            else:  # Linux and others
-                font_path = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"  # DejaVu Sans Bold
-            font = ImageFont.truetype(font_path, font_size)
-        except:
-            font = ImageFont.load_default()
+        with _text_lock:
+            font = load_splash_font(font_size)
 
-        # Get text size
-        text_bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = text_bbox[2] - text_bbox[0]
-        text_height = text_bbox[3] - text_bbox[1]
+            # Get text size
+            text_bbox = draw.textbbox((0, 0), text, font=font)
+            text_width = text_bbox[2] - text_bbox[0]
+            text_height = text_bbox[3] - text_bbox[1]
 
-        # Create final image
-        img = Image.new(
-            "RGBA", (text_width + padding * 2, text_height + padding * 2), (0, 0, 0, 0)
-        )
-        draw = ImageDraw.Draw(img)
+            # Create final image
+            img = Image.new(
+                "RGBA", (text_width + padding * 2, text_height + padding * 2), (0, 0, 0, 0)
+            )
+            draw = ImageDraw.Draw(img)
 
-        # Simple, clean glow effect - Black Mesa style
-        glow_color = (255, 111, 0, 80)
-        for offset in range(2):
-            draw.text((padding + offset, padding), text, font=font, fill=glow_color)
-            draw.text((padding - offset, padding), text, font=font, fill=glow_color)
-            draw.text((padding, padding + offset), text, font=font, fill=glow_color)
-            draw.text((padding, padding - offset), text, font=font, fill=glow_color)
+            # Simple, clean glow effect - Black Mesa style
+            glow_color = (255, 111, 0, 80)
+            for offset in range(2):
+                draw.text((padding + offset, padding), text, font=font, fill=glow_color)
+                draw.text((padding - offset, padding), text, font=font, fill=glow_color)
+                draw.text((padding, padding + offset), text, font=font, fill=glow_color)
+                draw.text((padding, padding - offset), text, font=font, fill=glow_color)
 
-        # Main text - clean and crisp
-        draw.text((padding, padding), text, font=font, fill=(255, 111, 0, 255))
+            # Main text - clean and crisp
+            draw.text((padding, padding), text, font=font, fill=(255, 111, 0, 255))
 
         # Minimal scanline effect for that retro feel
         img = create_scanline_effect(
@@ -283,7 +308,7 @@ class LoadingScreen:
         self.circle_label.pack()
 
         # Status text (bigger, clean)
-        status_img = self.create_animated_text("Initializing...", 24)
+        status_img = self.create_animated_text("Initializing...", STATUS_FONT_SIZE)
         status_photo = ImageTk.PhotoImage(status_img)
         self.status_label = tk.Label(self.main_frame, image=status_photo, bg="#000000")
         self.status_label.image = status_photo
@@ -304,129 +329,172 @@ class LoadingScreen:
         """Initialize the logo displays with Windows logo first"""
         try:
             # Start with Windows logo
-            self.current_logo_photo = ImageTk.PhotoImage(self.win_logo_original)
+            self.current_logo_photo = self.logo_photo(("windows", LOGO_LEVELS))
             self.logo_label.configure(image=self.current_logo_photo)
 
             # Initialize loading circle with bigger size
-            circle_img = self.create_loading_circle(150)
-            self.circle_photo = ImageTk.PhotoImage(circle_img)
-            self.circle_label.configure(image=self.circle_photo)
+            self.circle_sprites = self.build_circle_sprites(self.preload_progress)
+            self.circle_progress_shown = self.preload_progress
+            self.circle_label.configure(image=self.circle_sprites.photo(0))
 
         except Exception as e:
             print(f"Error initializing logo displays: {e}")
 
+    def render_logo_frame(self, key):
+        """Render one (logo, brightness level) frame as a PIL image."""
+        logo, level = key
+        brightness = level / LOGO_LEVELS
+        if logo == "windows":
+            # Simple brightness adjustment
+            return ImageEnhance.Brightness(self.win_logo_original).enhance(brightness)
+        # Simple brightness adjustment plus minimal scanlines for that retro feel
+        faded_logo = ImageEnhance.Brightness(self.jjc_logo_original).enhance(brightness)
+        return create_scanline_effect(
+            faded_logo, num_lines=40, line_opacity=0.12, glow_amount=1.2
+        )
+
+    def logo_photo(self, key):
+        """PhotoImage for a logo frame; each distinct frame is rendered once."""
+        photo = self.logo_photos.get(key)
+        if photo is None:
+            frame = self.logo_frames.pop(key, None) or self.render_logo_frame(key)
+            photo = ImageTk.PhotoImage(frame, master=self.root)
+            self.logo_photos[key] = photo
+        return photo
+
+    def prerender_logo_frames(self, keys):
+        """Render the logo sprite frames in the background (PIL only, no Tk)."""
+
+        def work():
+            for key in keys:
+                if self.window_destroyed:
+                    return
+                if key not in self.logo_frames and key not in self.logo_photos:
+                    try:
+                        self.logo_frames[key] = self.render_logo_frame(key)
+                    except Exception as e:
+                        print(f"Logo prerender error: {e}")
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def logo_timeline(self):
+        """Precomputed (logo, level) frames for the intro and the idle pulse.
+
+        Timing at 30fps: 0-60 frames (2s showing Windows), 60-81 frames
+        (0.7s fade out), 81-102 frames (0.7s fade in JJCFPIS), then a gentle
+        brightness pulse on the JJCFPIS logo.
+        """
+
+        def level(alpha):
+            return max(0, min(LOGO_LEVELS, round(alpha / 255 * LOGO_LEVELS)))
+
+        def pulse(t):
+            return 220 + int(35 * math.sin(t * 0.1))
+
+        intro = [("windows", level(pulse(t))) for t in range(60)]
+        intro += [("windows", level(255 - 255 * t / 21)) for t in range(1, 22)]
+        intro += [("jjcfpis", level(255 * t / 21)) for t in range(1, 22)]
+        idle = [("jjcfpis", level(pulse(t))) for t in range(63)]  # one 2pi period
+        return intro, idle
+
     def animate_logo_sequence(self):
         """Animate the logo sequence with proper fade in/out transitions (0.7s each)"""
         if not self.animation_running or self.window_destroyed:
             return
 
-        self.logo_timer += 1
-
-        # Timing at 60fps: 0-120 frames (2s showing Windows), 120-162 frames (0.7s fade out),
-        # 162-204 frames (0.7s fade in JJCFPIS), 204-324 frames (2s showing JJCFPIS)
-
-        if self.logo_timer == 120:  # Start fading out Windows logo after 2 seconds
-            self.transition_phase = "fading_out"
-            self.fade_direction = -1
-
-        elif self.logo_timer == 162:  # Switch to JJCFPIS logo and start fading in
-            self.current_logo = "jjcfpis"
-            self.transition_phase = "fading_in"
-            self.fade_alpha = 0  # Start invisible
-            self.fade_direction = 1
-
-        elif self.logo_timer == 204:  # Finished fading in, now showing
-            self.transition_phase = "showing"
-
-        # Handle fade transitions (0.7 seconds = 42 frames at 60fps)
-        if self.transition_phase == "fading_out":
-            self.fade_alpha -= 6  # Fade out speed (255/42 ≈ 6)
-            if self.fade_alpha < 0:
-                self.fade_alpha = 0
-        elif self.transition_phase == "fading_in":
-            self.fade_alpha += 6  # Fade in speed (255/42 ≈ 6)
-            if self.fade_alpha > 255:
-                self.fade_alpha = 255
-        elif self.transition_phase == "showing":
-            # Enhanced gentle brightness pulse while showing
-            pulse_speed = 0.1
-            self.fade_alpha = 220 + int(35 * math.sin(self.logo_timer * pulse_speed))
-
-        # Apply fade to current logo with clean, elegant effects
-        try:
-            if self.current_logo == "windows":
-                # Simple brightness adjustment
-                enhancer = ImageEnhance.Brightness(self.win_logo_original)
-                faded_logo = enhancer.enhance(self.fade_alpha / 255.0)
-
-                self.current_logo_photo = ImageTk.PhotoImage(faded_logo)
-            else:  # jjcfpis
-                # Simple brightness adjustment
-                enhancer = ImageEnhance.Brightness(self.jjc_logo_original)
-                faded_logo = enhancer.enhance(self.fade_alpha / 255.0)
-
-                # Add minimal scanline effect to JJCFPIS logo for that retro feel
-                scanlined_logo = create_scanline_effect(
-                    faded_logo, num_lines=40, line_opacity=0.12, glow_amount=1.2
-                )
-
-                self.current_logo_photo = ImageTk.PhotoImage(scanlined_logo)
+        intro, idle = self.logo_timeline()
+        self.prerender_logo_frames(list(dict.fromkeys(intro + idle)))
 
+        def show(key):
+            self.current_logo_photo = self.logo_photo(key)
             self.logo_label.configure(image=self.current_logo_photo)
-        except Exception as e:
-            print(f"Logo animation error: {e}")
 
-        # Continue animation
-        if self.animation_running and not self.window_destroyed:
-            job_id = self.root.after(
-                33, self.animate_logo_sequence
-            )  # ~30fps for better performance
-            self.after_jobs.append(job_id)
+        def start_idle_pulse():
+            if self.animation_running and not self.window_destroyed:
+                self.logo_animation = animate(
+                    self.logo_label, idle, show, interval_ms=33, loop=True
+                )
+
+        self.logo_animation = animate(
+            self.logo_label, intro, show, interval_ms=33, on_done=start_idle_pulse
+        )
+
+    def build_circle_sprites(self, progress):
+        """Precompute the rotation frames of the loading circle for progress."""
+        circle_img = self.create_loading_circle(150, progress)
+        return SpriteSequence.rotations(circle_img, CIRCLE_STEP_DEGREES, self.root)
 
     def animate_loading_circle(self):
         """Animate the loading circle with smooth rotation at ~20fps"""
         if not self.animation_running or self.window_destroyed:
             return
 
-        # Smooth rotation at approximately 20fps (50ms intervals)
-        self.rotation_angle += 2  # Slower, smoother rotation (2 degrees per frame)
-        if self.rotation_angle >= 360:
-            self.rotation_angle = 0
-
-        # Update pulse intensity for subtle effects
-        self.pulse_intensity += 1
-
-        try:
-            # Create clean loading circle
-            circle_img = self.create_loading_circle(150)
+        def show(index):
+            sprites = self.circle_sprites
+            self.circle_photo = sprites.photo(index % len(sprites))
+            self.circle_label.configure(image=self.circle_photo)
 
-            # Apply smooth rotation
-            rotated_circle = circle_img.rotate(
-                -self.rotation_angle, resample=Image.Resampling.BILINEAR
-            )
+        # Rotation frames are precomputed; each tick only swaps the image
+        self.circle_animation = animate(
+            self.circle_label,
+            range(len(self.circle_sprites)),
+            show,
+            interval_ms=50,
+            loop=True,
+        )
 
-            self.circle_photo = ImageTk.PhotoImage(rotated_circle)
+    def refresh_circle_sprites(self):
+        """Rebuild the rotation frames off the UI thread when progress changes."""
+        ready = self.circle_sprites_pending
+        if ready is not None and not isinstance(ready, threading.Thread):
+            # Frames finished building: swap them in at the current angle
+            self.circle_sprites_pending = None
+            self.circle_sprites = ready
+            index = max(getattr(self.circle_animation, "index", 0), 0)
+            self.circle_photo = ready.photo(index % len(ready))
             self.circle_label.configure(image=self.circle_photo)
+            return
 
-        except Exception as e:
-            print(f"Circle animation error: {e}")
+        progress = self.preload_progress
+        if ready is None and progress != self.circle_progress_shown:
+            self.circle_progress_shown = progress
 
-        # Continue animation at 20fps for smooth rotation (50ms intervals)
-        if self.animation_running and not self.window_destroyed:
-            job_id = self.root.after(50, self.animate_loading_circle)
-            self.after_jobs.append(job_id)
+            def work():
+                try:
+                    self.circle_sprites_pending = self.build_circle_sprites(progress)
+                except Exception as e:
+                    print(f"Circle prerender error: {e}")
+                    self.circle_sprites_pending = None
+
+            worker = threading.Thread(target=work, daemon=True)
+            self.circle_sprites_pending = worker
+            worker.start()
 
     def update_progress_display(self):
-        """Update status text - minimal and clean"""
+        """Show the warm-up's real progress and status - minimal and clean"""
         if not self.animation_running or self.window_destroyed:
             return
 
         try:
-            # Update status text with bigger, clean font
-            status_img = self.create_animated_text(self.preload_status, 24)
-            status_photo = ImageTk.PhotoImage(status_img)
-            self.status_label.configure(image=status_photo)
-            self.status_label.image = status_photo
+            progress, running = self.warm_up.progress()
+            self.preload_progress = progress
+            if self.warm_up.done.is_set():
+                self.preload_complete = True
+                self.preload_status = "Ready!"
+            elif running:
+                self.preload_status = running
+
+            # Re-render the status text only when it actually changes
+            if self.preload_status != self.status_shown:
+                status_img = self.status_frames.get(
+                    self.preload_status
+                ) or self.create_animated_text(self.preload_status, STATUS_FONT_SIZE)
+                status_photo = ImageTk.PhotoImage(status_img)
+                self.status_label.configure(image=status_photo)
+                self.status_label.image = status_photo
+                self.status_shown = self.preload_status
+
+            self.refresh_circle_sprites()
 
         except Exception as e:
             print(f"Progress update error: {e}")
@@ -448,6 +516,9 @@ class LoadingScreen:
         """Stop all animations"""
         try:
             self.animation_running = False
+            for animation in (self.logo_animation, self.circle_animation):
+                if animation is not None:
+                    animation.cancel()
             # Cancel all scheduled after jobs
             for job_id in self.after_jobs:
                 try:
@@ -483,102 +554,126 @@ class LoadingScreen:
             except:
                 pass
 
-    def show_for_duration(self, duration=12000):
-        """Show loading screen for specified duration (in milliseconds) - 12.5 seconds total"""
-
-        def close_after_delay():
-            # Wait for preloading to complete or timeout
-            max_wait_time = duration / 1000
-            start_time = time.time()
-
-            while time.time() - start_time < max_wait_time:
-                if self.preload_complete:
-                    break
-                time.sleep(0.1)
-
-            # Ensure minimum display time for smooth experience
-            total_time = time.time() - start_time
-            if total_time < (duration / 1000):
-                time.sleep((duration / 1000) - total_time)
+    def close_when_ready(self, min_ms=SPLASH_MIN_MS, max_ms=SPLASH_MAX_MS):
+        """Close the splash as soon as warm-up is done (within [min_ms, max_ms])."""
+        opened = time.monotonic()
+
+        def check():
+            if self.window_destroyed:
+                return
+            shown_ms = (time.monotonic() - opened) * 1000
+            ready = self.warm_up.done.is_set()
+            if (ready and shown_ms >= min_ms) or shown_ms >= max_ms:
+                if not ready:
+                    print("[LoadingScreen] Warm-up still running, opening anyway")
+                self.close()
+                return
+            job_id = self.root.after(50, check)
+            self.after_jobs.append(job_id)
 
-            if self.animation_running and not self.window_destroyed:
-                try:
-                    if hasattr(self, "root") and self.root and self.root.winfo_exists():
-                        self.root.after(0, self.close)
-                    else:
-                        self.close()
-                except Exception as e:
-                    print(f"Error scheduling close: {e}")
-                    self.close()
+        check()
 
-        # Start the close timer in a separate thread
-        threading.Thread(target=close_after_delay, daemon=True).start()
+    def show_for_duration(self, duration=SPLASH_MAX_MS):
+        """Close once warm-up is done; duration (ms) is only the upper bound now."""
+        self.close_when_ready(max_ms=duration)
 
     def run(self):
         """Run the loading screen"""
         self.root.mainloop()
 
     def start_preloading(self):
-        """Start preloading all main windows in background"""
-
-        def preload_windows():
+        """Start the warm-up pipeline; its steps run in parallel in the background.
+
+        Database steps wait for the first connection, so the driver loads
+        once; images, text and window imports do not touch the database.
+        Progress is read back by update_progress_display.
+        """
+        warm_up = self.warm_up
+        connect = "Connecting to database..."
+        try:
+            warm_up.add(connect, self.preload_connection, weight=3)
+            warm_up.add("Loading item catalog...", self.preload_item_catalog, weight=3, after=(connect,))
+            warm_up.add("Loading employees...", self.preload_employee_names, weight=1, after=(connect,))
+            warm_up.add("Loading item types...", self.preload_item_lists, weight=2, after=(connect,))
+            warm_up.add("Preparing images...", self.preload_images, weight=2)
+            warm_up.add("Preparing text...", self.preload_text, weight=1)
+            warm_up.add("Loading windows...", self.preload_windows, weight=4, after=(connect,))
+            warm_up.add("Finalizing Components...", self.finalize_preload, weight=1, after=("Loading windows...",))
+        except RuntimeError:
+            pass  # already started by an earlier splash in this process
+        warm_up.start()
+
+    def preload_connection(self):
+        """Resolve the DB path and open a first connection (loads the driver)."""
+        from backend.database import DB_TYPE, get_connector, get_db_path
+
+        connector = get_connector(get_db_path())
+        connection = connector.connect()
+        if connection is not connector:
+            connection.close()  # pooled by the ODBC driver manager for the next open
+        if DB_TYPE == "mysql":
+            from backend.database.local_replica import get_local_replica
+
+            replica = get_local_replica(getattr(connector, "api_url", None))
+            if replica is not None:
+                replica.start()
+
+    def preload_item_catalog(self):
+        """Fetch the employee dashboard's item list for its first load."""
+        from backend.database import get_connector
+        from backend.database.queries import fetch_item_catalog
+
+        self.warm_up.put("item_catalog", fetch_item_catalog(get_connector()))
+
+    def preload_employee_names(self):
+        """Fetch emp_list names for the welcome window's name check."""
+        from backend.database import get_connector
+        from backend.database.queries import fetch_employee_names
+
+        self.warm_up.put("employee_names", fetch_employee_names(get_connector()))
+
+    def preload_item_lists(self):
+        """Fetch the type buttons and the item form lookup values (facets)."""
+        from backend.database import get_connector
+        from backend.database.lookup_cache import get_lookup_cache
+        from backend.database.queries import fetch_item_types
+
+        connector = get_connector()
+        self.warm_up.put("item_types", fetch_item_types(connector))
+        get_lookup_cache().ensure_loaded(connector)
+
+    def preload_images(self):
+        """Decode and resize the common assets into ImageManager's cache."""
+        from backend.utils.image_manager import ATLAS_SPECS, ImageManager
+
+        root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+        for path, size, mode in ATLAS_SPECS:
+            if self.window_destroyed:
+                return
+            ImageManager.get_pil(os.path.join(root, path), size, mode)
+
+    def preload_text(self):
+        """Render every status line of the splash ahead of time (PIL only)."""
+        for status in self.warm_up.labels() + ["Ready!"]:
+            if self.window_destroyed:
+                return
+            if status not in self.status_frames:
+                self.status_frames[status] = self.create_animated_text(status, STATUS_FONT_SIZE)
+
+    def preload_windows(self):
+        """Import the window modules one after another (imports share locks)."""
+        for preload in (
+            self.preload_welcome_window,
+            self.preload_employee_dashboard,
+            self.preload_admin_login,
+            self.preload_admin_dashboard,
+        ):
+            if self.window_destroyed:
+                return
             try:
-                preload_steps = [
-                    ("Loading Admin Dashboard...", self.preload_admin_dashboard, 1.5),
-                    (
-                        "Loading Employee Dashboard...",
-                        self.preload_employee_dashboard,
-                        1.5,
-                    ),
-                    (
-                        "Loading Fabrication Window...",
-                        self.preload_fabrication_window,
-                        1.5,
-                    ),
-                    ("Loading Admin Login...", self.preload_admin_login, 1.5),
-                    ("Loading Welcome Window...", self.preload_welcome_window, 1.5),
-                    ("Finalizing Components...", self.finalize_preload, 2.0),
-                ]
-
-                total_steps = len(preload_steps)
-                current_time = 0
-                target_ready_time = 7.5  # "Ready!" should appear at 7.5 seconds
-
-                for i, (status, preload_func, step_duration) in enumerate(
-                    preload_steps
-                ):
-                    if not self.animation_running:
-                        break
-
-                    self.preload_status = status
-                    self.preload_progress = int(
-                        (current_time / target_ready_time) * 100
-                    )
-
-                    try:
-                        preload_func()
-                        time.sleep(step_duration)  # Use specific duration for each step
-                        current_time += step_duration
-                    except Exception as e:
-                        print(f"Preload error for {status}: {e}")
-                        time.sleep(0.2)
-                        current_time += 0.2
-
-                # Ensure we hit exactly 7.5 seconds before showing "Ready!"
-                remaining_time = target_ready_time - current_time
-                if remaining_time > 0:
-                    time.sleep(remaining_time)
-
-                self.preload_complete = True
-                self.preload_status = "Ready!"
-                self.preload_progress = 100
-
+                preload()
             except Exception as e:
-                print(f"Preloading error: {e}")
-                self.preload_complete = True
-
-        # Start preloading in background thread
-        threading.Thread(target=preload_windows, daemon=True).start()
+                print(f"[LoadingScreen] {preload.__name__} failed: {e}")
 
     def preload_admin_dashboard(self):
         """Preload AdminDashboard class"""
@@ -590,11 +685,6 @@ class LoadingScreen:
         from gui.employee_dashboard import MainBrowser
         # Just import the class, don't instantiate
 
-    def preload_fabrication_window(self):
-        """Preload fabricateWindow class"""
-        # Fabricate window import removed (feature deprecated)
-        # Just import the class, don't instantiate
-
     def preload_admin_login(self):
         """Preload AdminLogin class"""
         from gui.admin_login import AdminLogin
@@ -606,13 +696,14 @@ class LoadingScreen:
         # Just import the class, don't instantiate
 
     def finalize_preload(self):
-        """Finalize preloading process"""
-        # Import additional modules that might be needed
-        import pyodbc
-        import openpyxl
-        import cryptography
-        import pyotp
-        import qrcode
+        """Import the remaining heavy libraries; missing optional ones are skipped."""
+        import importlib
+
+        for module in ("pyodbc", "openpyxl", "cryptography", "pyotp", "qrcode"):
+            try:
+                importlib.import_module(module)
+            except ImportError as e:
+                print(f"[LoadingScreen] {module} not available: {e}")
 
     # Removed cluttered functions for clean Black Mesa style:
     # - create_particle_effect (too busy)
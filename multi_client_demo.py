@@ -1,11 +1,11 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import os
-import threading
 import time
 from dotenv import load_dotenv
 from backend.database import get_connector
 from backend.database import queries
+from backend.database.change_feed import get_change_feed
 
 # Load environment variables
 load_dotenv()
@@ -30,8 +30,8 @@ class MultiClientDashboard(tk.Tk):
         # Load initial data
         self.load_data()
         
-        # Setup auto-refresh for real-time updates
-        self.auto_refresh()
+        # Apply pushed changes for real-time updates
+        self.listen_for_changes()
     
     def create_ui(self):
         # Main frame
@@ -126,18 +126,20 @@ class MultiClientDashboard(tk.Tk):
             for row in self.logs_table.get_children():
                 self.logs_table.delete(row)
             
-            # Load items
+            # Load items (row iid is the item ID so pushed changes can find them)
             items = queries.fetch_items_for_employee_dashboard(self.connector)
             for item in items:
                 # Convert None values to empty strings
-                sanitized_item = tuple(str(x) if x is not None else "" for x in item)
-                self.items_table.insert("", tk.END, values=sanitized_item)
+                sanitized_item = self.sanitize(item)
+                self.items_table.insert(
+                    "", tk.END, iid=sanitized_item[0] or None, values=sanitized_item
+                )
             
             # Load logs
             logs = queries.fetch_emp_logs(self.connector)
             for log in logs:
                 # Convert None values to empty strings
-                sanitized_log = tuple(str(x) if x is not None else "" for x in log)
+                sanitized_log = self.sanitize(log)
                 self.logs_table.insert("", tk.END, values=sanitized_log)
             
             self.status_label.config(text=f"Data loaded at {time.strftime('%H:%M:%S')}")
@@ -150,21 +152,60 @@ class MultiClientDashboard(tk.Tk):
         """Add a test log entry to demonstrate real-time updates"""
         try:
             queries.insert_emp_log(self.connector, "Test User", "Added from multi-client demo")
-            self.load_data()
+            if os.environ.get("JJCIMS_DB_TYPE") != "mysql":
+                self.load_data()  # MySQL mode receives the new row from the feed
             messagebox.showinfo("Success", "Test log added successfully")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to add log: {e}")
     
-    def auto_refresh(self):
-        """Set up automatic refresh of data every 30 seconds"""
-        def refresh_loop():
-            while True:
-                time.sleep(30)
-                self.after(0, self.load_data)
-        
-        # Start auto-refresh in a background thread
-        refresh_thread = threading.Thread(target=refresh_loop, daemon=True)
-        refresh_thread.start()
+    @staticmethod
+    def sanitize(row):
+        """Convert a row (tuple or API dict) to display strings."""
+        if isinstance(row, dict):
+            row = tuple(row.values())
+        return tuple(str(x) if x is not None else "" for x in row)
+
+    def listen_for_changes(self):
+        """Replace polling with the change feed; only changed rows are touched."""
+        self.change_listener = get_change_feed().attach(
+            self, self.apply_changes, tables=("ITEMSDB", "emp_logs")
+        )
+
+    def apply_changes(self, batch):
+        """Apply one change batch from the feed to the tables."""
+        if batch.get("reset"):
+            # Access file-watch (or too many changes): reload everything
+            self.load_data()
+            return
+
+        for change in batch.get("changes", []):
+            table, op, row = change["table"], change["op"], change.get("row")
+            if table == "ITEMSDB":
+                iid = str(change["id"])
+                if op == "delete":
+                    if self.items_table.exists(iid):
+                        self.items_table.delete(iid)
+                    continue
+                values = self.sanitize(
+                    (row.get("ID"), row.get("NAME"), row.get("Supplier"), row.get("PO_no"))
+                )
+                if self.items_table.exists(iid):
+                    self.items_table.item(iid, values=values)
+                else:
+                    self.items_table.insert("", tk.END, iid=iid, values=values)
+            elif table == "emp_logs":
+                if op == "clear":
+                    self.logs_table.delete(*self.logs_table.get_children())
+                elif op == "upsert" and row:
+                    values = self.sanitize(
+                        (row.get("DATE"), row.get("TIME"), row.get("NAME"), row.get("DETAILS"))
+                    )
+                    # Logs are listed newest first
+                    self.logs_table.insert("", 0, values=values)
+
+        self.status_label.config(
+            text=f"Updated to version {batch.get('version')} at {time.strftime('%H:%M:%S')}"
+        )
 
 if __name__ == "__main__":
     app = MultiClientDashboard()